@@ -128,6 +128,10 @@ def create_app(config_class=DevelopmentConfig):
     # Desabilitar redirecionamento automático para evitar problemas CORS
     app.url_map.strict_slashes = False
 
+    # jsonify/success_response com orjson (datas, Decimal e UUID nativos)
+    from .utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     # CORS
     allowed_origins = [
         "http://localhost:5173", "http://localhost:5174",
@@ -369,18 +373,44 @@ def create_app(config_class=DevelopmentConfig):
                     except:
                         pass
 
-    # Middleware de tracking de atividade - DESABILITADO para economizar DB
-    # @app.before_request
-    # def track_user_activity():
-    #     try:
-    #         # Permite desligar rastreamento para evitar hits desnecessários ao DB
-    #         if app.config.get('USER_ACTIVITY_ENABLED', False) is True:
-    #             from .middleware.user_activity import track_user_activity as track
-    #             track()
-    #     except Exception as e:
-    #         module_logger.error(f"Erro no middleware de atividade: {e}")
-    
-    # DESABILITADO para economizar horas de banco de dados
+    # Middleware de tracking de atividade: grava em memória/Redis e o banco
+    # recebe apenas upserts em lote do flusher de presença
+    from .services.presence_service import init_presence
+    init_presence(app)
+
+    # Instrumentação opcional de queries/latência por requisição (REQUEST_METRICS_ENABLED)
+    from .services.request_metrics import init_request_metrics
+    init_request_metrics(app)
+
+    # Profiler por amostragem, armado sob demanda pelas ferramentas do admin
+    from .services.profiler_service import init_profiler
+    init_profiler(app)
+
+    # Compressão br/gzip negociada pelo Accept-Encoding (COMPRESSION_ENABLED).
+    # Registrada por último para rodar antes dos demais after_request.
+    from .services.compressao_service import init_compressao
+    init_compressao(app)
+
+    # Verificador do LanguageTool do editor (sessão com pool + cache por parágrafo)
+    from .services.languagetool_service import init_languagetool
+    init_languagetool(app)
+
+    # Serviços de IA (um por worker, criados no primeiro uso) e Environment dos prompts
+    from .services.container_servicos import init_servicos
+    init_servicos(app)
+
+    # Pool limitado para as chamadas de IA em modo assíncrono (job_id + consulta)
+    from .services.fila_ia_service import init_fila_ia
+    init_fila_ia(app)
+
+    @app.before_request
+    def track_user_activity():
+        try:
+            if app.config.get('USER_ACTIVITY_ENABLED', False) is True:
+                from .middleware.user_activity import track_user_activity as track
+                track()
+        except Exception as e:
+            module_logger.error(f"Erro no middleware de atividade: {e}")
 
     with app.app_context():
         @event.listens_for(db.engine, "connect")
@@ -1,12 +1,73 @@
 """
 Configuração JWT para autenticação da API.
 """
+from dataclasses import asdict, dataclass
+from flask import current_app
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 from datetime import timedelta
 # Importação movida para dentro das funções para evitar circular import
 
 jwt = JWTManager()
 
+IDENTIDADE_CACHE_PREFIX = "jwt_identidade:"
+
+
+@dataclass(frozen=True)
+class UsuarioIdentidade:
+    """Snapshot enxuto do usuário autenticado, guardado no cache da aplicação."""
+    id: int
+    username: str
+    email: str
+    is_admin: bool
+    is_supervisor: bool
+    is_approved: bool
+
+
+def _chave_identidade(user_id):
+    return f"{IDENTIDADE_CACHE_PREFIX}{int(user_id)}"
+
+
+def carregar_identidade_usuario(user_id):
+    """
+    Retorna o UsuarioIdentidade do usuário, consultando o banco só quando
+    o snapshot não está no cache (TTL curto: JWT_IDENTITY_CACHE_TIMEOUT).
+    """
+    from app import cache
+    from app.models.user import User
+
+    chave = _chave_identidade(user_id)
+    try:
+        dados = cache.get(chave)
+    except Exception:
+        dados = None
+    if dados:
+        return UsuarioIdentidade(**dados)
+
+    row = (
+        User.query.with_entities(
+            User.id, User.username, User.email, User.is_admin, User.is_supervisor, User.is_approved
+        )
+        .filter_by(id=int(user_id))
+        .one_or_none()
+    )
+    if row is None:
+        return None
+    identidade = UsuarioIdentidade(*row)
+    try:
+        cache.set(chave, asdict(identidade), timeout=current_app.config.get("JWT_IDENTITY_CACHE_TIMEOUT", 60))
+    except Exception:
+        pass
+    return identidade
+
+
+def invalidar_identidade_usuario(user_id):
+    """Descarta o snapshot em cache (chamar após alterar aprovação/papéis ou excluir o usuário)."""
+    from app import cache
+    try:
+        cache.delete(_chave_identidade(user_id))
+    except Exception:
+        pass
+
 def init_jwt(app):
     """Inicializa a configuração JWT na aplicação Flask."""
     app.config['JWT_SECRET_KEY'] = app.config.get('SECRET_KEY', 'dev-secret-key')
@@ -33,12 +94,11 @@ def user_identity_lookup(user):
 
 @jwt.user_lookup_loader
 def user_lookup_callback(_jwt_header, jwt_data):
-    """Define como o usuário é recuperado do token."""
-    from app.models.user import User
+    """Define como o usuário é recuperado do token (snapshot em cache, ver carregar_identidade_usuario)."""
     identity = jwt_data["sub"]
     # Converter string de volta para int
     user_id = int(identity)
-    return User.query.filter_by(id=user_id).one_or_none()
+    return carregar_identidade_usuario(user_id)
 
 @jwt.expired_token_loader
 def expired_token_callback(jwt_header, jwt_payload):
@@ -16,7 +16,8 @@ from .api.parada_routes import parada_api_bp
 from .api.admin_routes import admin_api_bp
 from .api.analisador_routes import analisador_api_bp
 from .api.config_routes import config_api_bp
-# from .admin.routes_online_users import online_users_bp
+from .admin.routes_online_users import online_users_bp
+from .admin.routes_request_metrics import request_metrics_bp
 from .main.routes import main_bp
 
 def register_blueprints(app):
@@ -36,5 +37,6 @@ def register_blueprints(app):
     app.register_blueprint(admin_api_bp)
     app.register_blueprint(analisador_api_bp)
     app.register_blueprint(config_api_bp)
-    # app.register_blueprint(online_users_bp)  # desativado para evitar chamadas que acordam o DB
+    app.register_blueprint(online_users_bp)  # lê da presença em memória/Redis, não acorda o DB
+    app.register_blueprint(request_metrics_bp)  # resumo em memória do processo, não acorda o DB
     app.register_blueprint(main_bp)
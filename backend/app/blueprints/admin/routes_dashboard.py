@@ -15,8 +15,6 @@ from app.services.dashboard.comparativo_dashboard import \
 from app.services.dashboard.main_dashboard import get_main_dashboard_data
 from app.services.dashboard.ocorrencia_dashboard import \
     get_ocorrencia_dashboard_data
-from app.services.report.ronda_service import RondaReportService
-from app.services.report.ocorrencia_service import OcorrenciaReportService
 from app.utils.locale_config import LocaleConfig
 
 from . import admin_bp
@@ -288,6 +286,7 @@ def export_ronda_dashboard_pdf():
         }
         
         # Gera o PDF
+        from app.services.report.ronda_service import RondaReportService  # reportlab só carrega ao exportar
         report_service = RondaReportService()
         pdf_buffer = report_service.generate_ronda_dashboard_pdf(dashboard_data, filters_info)
         
@@ -366,6 +365,7 @@ def export_ocorrencia_dashboard_pdf():
         }
         
         # Gera o PDF
+        from app.services.report.ocorrencia_service import OcorrenciaReportService  # reportlab só carrega ao exportar
         report_service = OcorrenciaReportService()
         pdf_buffer = report_service.generate_ocorrencia_dashboard_pdf(dashboard_data, filters_info)
         
@@ -543,6 +543,7 @@ def export_ronda_dashboard_pdf_html():
         dashboard_data = get_ronda_dashboard_data(filters)
         
         # Usar o serviço de relatório existente que já usa ReportLab
+        from app.services.report.ronda_service import RondaReportService  # reportlab só carrega ao exportar
         report_service = RondaReportService()
         
         # Preparar informações dos filtros para o relatório
@@ -686,6 +687,7 @@ def export_ronda_dashboard_pdf_compact():
         }
         
         # Gera o PDF compacto
+        from app.services.report.ronda_service import RondaReportService  # reportlab só carrega ao exportar
         report_service = RondaReportService()
         pdf_buffer = report_service.generate_compact_ronda_dashboard_pdf(dashboard_data, filters_info)
         
@@ -764,6 +766,7 @@ def export_ocorrencia_dashboard_pdf_compact():
         }
         
         # Gera o PDF compacto
+        from app.services.report.ocorrencia_service import OcorrenciaReportService  # reportlab só carrega ao exportar
         report_service = OcorrenciaReportService()
         pdf_buffer = report_service.generate_compact_ocorrencia_dashboard_pdf(dashboard_data, filters_info)
         
@@ -0,0 +1,101 @@
+# app/blueprints/admin/routes_online_users.py
+import logging
+from datetime import datetime
+
+import pytz
+from flask import Blueprint, jsonify, render_template
+from flask_login import login_required
+
+from app.decorators.admin_required import admin_required
+from app.services.presence_service import get_presence_tracker
+
+online_users_bp = Blueprint("online_users", __name__, url_prefix="/admin/online")
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TZ = pytz.timezone("America/Sao_Paulo")
+FORMATO_DATA = "%d/%m/%Y %H:%M:%S"
+
+
+def _usuarios_online_locais():
+    """Usuários online (tier rápido de presença) com horário já no fuso local."""
+    usuarios = get_presence_tracker().listar_online()
+    for usuario in usuarios:
+        usuario["last_activity"] = usuario["last_activity"].astimezone(LOCAL_TZ)
+    return usuarios
+
+
+@online_users_bp.route("/")
+@login_required
+@admin_required
+def online_users():
+    try:
+        return render_template(
+            "admin/online_users.html",
+            title="Usuários Online",
+            online_users=_usuarios_online_locais(),
+        )
+    except Exception as e:
+        logger.error(f"Erro ao carregar usuários online: {e}", exc_info=True)
+        return render_template(
+            "admin/online_users.html", title="Usuários Online", error="Erro ao carregar usuários online."
+        )
+
+
+@online_users_bp.route("/api/online-users")
+@login_required
+@admin_required
+def api_online_users():
+    try:
+        usuarios = _usuarios_online_locais()
+        for usuario in usuarios:
+            usuario["last_activity"] = usuario["last_activity"].strftime(FORMATO_DATA)
+        return jsonify({
+            "success": True,
+            "users": usuarios,
+            "count": len(usuarios),
+            "timestamp": datetime.now(LOCAL_TZ).strftime(FORMATO_DATA),
+        })
+    except Exception as e:
+        logger.error(f"Erro na API de usuários online: {e}", exc_info=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@online_users_bp.route("/api/cleanup-sessions", methods=["POST"])
+@login_required
+@admin_required
+def api_cleanup_sessions():
+    """Força o flush da presença (grava sessões pendentes e remove as expiradas)."""
+    try:
+        gravadas = get_presence_tracker().flush()
+        return jsonify({"success": True, "flushed": gravadas})
+    except Exception as e:
+        logger.error(f"Erro ao limpar sessões: {e}", exc_info=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@online_users_bp.route("/api/debug-sessions")
+@login_required
+@admin_required
+def api_debug_sessions():
+    try:
+        tracker = get_presence_tracker()
+        sessoes = tracker.listar_sessoes(tracker.expiracao_minutos)
+        return jsonify({
+            "success": True,
+            "total_sessions": len(sessoes),
+            "sessions": [
+                {
+                    "id": session_id[:12],
+                    "user_id": dados["user_id"],
+                    "session_id": session_id,
+                    "ip_address": dados.get("ip_address"),
+                    "last_activity": datetime.fromtimestamp(dados["last_seen"], LOCAL_TZ).strftime(FORMATO_DATA),
+                    "created_at": "N/A",
+                }
+                for session_id, dados in sorted(sessoes.items(), key=lambda item: item[1]["last_seen"], reverse=True)
+            ],
+        })
+    except Exception as e:
+        logger.error(f"Erro ao depurar sessões: {e}", exc_info=True)
+        return jsonify({"success": False, "error": str(e)}), 500
@@ -0,0 +1,58 @@
+# app/blueprints/admin/routes_request_metrics.py
+import logging
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, url_for
+from flask_login import login_required
+
+from app.decorators.admin_required import admin_required
+from app.services.fila_ia_service import get_fila_ia
+from app.services.request_metrics import get_request_metrics
+
+request_metrics_bp = Blueprint("request_metrics", __name__, url_prefix="/admin/metricas-requisicoes")
+
+logger = logging.getLogger(__name__)
+
+
+@request_metrics_bp.route("/")
+@login_required
+@admin_required
+def resumo():
+    metricas = get_request_metrics()
+    return render_template(
+        "admin/request_metrics.html",
+        title="Métricas de Requisições",
+        habilitado=metricas is not None,
+        endpoints=metricas.resumo() if metricas else [],
+        lento_ms=metricas.lento_ms if metricas else None,
+        janela=metricas.janela if metricas else None,
+        fila_ia=get_fila_ia().metricas(),
+    )
+
+
+@request_metrics_bp.route("/api/resumo")
+@login_required
+@admin_required
+def api_resumo():
+    metricas = get_request_metrics()
+    if metricas is None:
+        return jsonify({"success": False, "message": "Instrumentação desabilitada (REQUEST_METRICS_ENABLED)."}), 404
+    return jsonify({"success": True, "endpoints": metricas.resumo()})
+
+
+@request_metrics_bp.route("/api/fila-ia")
+@login_required
+@admin_required
+def api_fila_ia():
+    """Profundidade e tempos da fila de IA do modo assíncrono (deste processo)."""
+    return jsonify({"success": True, "fila_ia": get_fila_ia().metricas()})
+
+
+@request_metrics_bp.route("/limpar", methods=["POST"])
+@login_required
+@admin_required
+def limpar():
+    metricas = get_request_metrics()
+    if metricas is not None:
+        metricas.limpar()
+        flash("Métricas de requisições zeradas.", "success")
+    return redirect(url_for("request_metrics.resumo"))
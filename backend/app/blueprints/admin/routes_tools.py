@@ -2,8 +2,8 @@
 import logging
 from datetime import datetime
 
-from flask import (flash, g, jsonify, redirect, render_template, request,
-                   url_for)
+from flask import (Response, current_app, flash, g, jsonify, redirect,
+                   render_template, request, url_for)
 from flask_login import current_user, login_required
 
 from app.decorators.admin_required import admin_required
@@ -11,10 +11,12 @@ from app.forms import FormatEmailReportForm
 from app.models import User
 from app import db, cache
 import time
+from app.services.container_servicos import get_servico
 from app.services.escala_service import get_escala_mensal, salvar_escala_mensal
 from app.services.justificativa_service import JustificativaAtestadoService
 from app.services.justificativa_troca_plantao_service import \
     JustificativaTrocaPlantaoService
+from app.services.profiler_service import get_profiler
 
 from . import admin_bp
 
@@ -24,13 +26,13 @@ logger = logging.getLogger(__name__)
 # ... (funções auxiliares _get_justificativa... permanecem iguais) ...
 def _get_justificativa_atestado_service():
     if "justificativa_atestado_service" not in g:
-        g.justificativa_atestado_service = JustificativaAtestadoService()
+        g.justificativa_atestado_service = get_servico(JustificativaAtestadoService)
     return g.justificativa_atestado_service
 
 
 def _get_justificativa_troca_plantao_service():
     if "justificativa_troca_plantao_service" not in g:
-        g.justificativa_troca_plantao_service = JustificativaTrocaPlantaoService()
+        g.justificativa_troca_plantao_service = get_servico(JustificativaTrocaPlantaoService)
     return g.justificativa_troca_plantao_service
 
 
@@ -257,3 +259,62 @@ def whatsapp_config_tool():
         "admin/whatsapp_config.html", title="Conexão WhatsApp (Rondas)",
         whatsapp_service_url=whatsapp_url
     )
+
+
+@admin_bp.route("/ferramentas/profiler", methods=["GET"])
+@login_required
+@admin_required
+def profiler_painel():
+    profiler = get_profiler()
+    endpoints = sorted({
+        regra.endpoint for regra in current_app.url_map.iter_rules()
+        if regra.endpoint != "static" and not regra.endpoint.startswith("admin.profiler")
+    })
+    return render_template(
+        "admin/profiler.html",
+        title="Profiler de Requisições",
+        profiler=profiler,
+        perfis=profiler.listar(),
+        endpoints=endpoints,
+    )
+
+
+@admin_bp.route("/ferramentas/profiler/armar", methods=["POST"])
+@login_required
+@admin_required
+def profiler_armar():
+    requisicoes = request.form.get("requisicoes", default=1, type=int)
+    endpoint = (request.form.get("endpoint") or "").strip() or None
+    if endpoint and endpoint not in current_app.view_functions:
+        flash(f"Endpoint desconhecido: {endpoint}", "danger")
+        return redirect(url_for("admin.profiler_painel"))
+    profiler = get_profiler()
+    profiler.armar(requisicoes, endpoint)
+    logger.info(f"Admin '{current_user.username}' armou o profiler ({profiler.restantes} req., endpoint={endpoint or 'qualquer'}).")
+    flash(f"Profiler armado para as próximas {profiler.restantes} requisição(ões) de {endpoint or 'qualquer endpoint'}.", "success")
+    return redirect(url_for("admin.profiler_painel"))
+
+
+@admin_bp.route("/ferramentas/profiler/desarmar", methods=["POST"])
+@login_required
+@admin_required
+def profiler_desarmar():
+    get_profiler().desarmar()
+    flash("Profiler desarmado.", "info")
+    return redirect(url_for("admin.profiler_painel"))
+
+
+@admin_bp.route("/ferramentas/profiler/<int:perfil_id>/download", methods=["GET"])
+@login_required
+@admin_required
+def profiler_download(perfil_id):
+    perfil = get_profiler().obter(perfil_id)
+    if perfil is None:
+        flash("Perfil não encontrado (apenas os últimos ficam em memória).", "warning")
+        return redirect(url_for("admin.profiler_painel"))
+    nome = f"perfil_{perfil['id']}_{perfil['endpoint']}_{perfil['criado_em']:%Y%m%d_%H%M%S}.folded"
+    return Response(
+        perfil["colapsado"],
+        mimetype="text/plain",
+        headers={"Content-Disposition": f"attachment; filename={nome}"},
+    )
@@ -5,6 +5,7 @@ from flask import flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from app import db
+from app.auth.jwt_auth import invalidar_identidade_usuario
 from app.decorators.admin_required import admin_required
 from app.models import User
 from app.services.user_service import delete_user_and_dependencies
@@ -39,6 +40,7 @@ def approve_user(user_id):
     if not user.is_approved:
         user.is_approved = True
         db.session.commit()
+        invalidar_identidade_usuario(user.id)
         flash(f"Usuário {user.username} aprovado com sucesso.", "success")
     return redirect(url_for("admin.manage_users"))
 
@@ -52,6 +54,7 @@ def revoke_user(user_id):
         if user.is_approved:
             user.is_approved = False
             db.session.commit()
+            invalidar_identidade_usuario(user.id)
             flash(f"Aprovação de {user.username} foi revogada.", "success")
     else:
         flash("Você não pode revogar sua própria aprovação.", "danger")
@@ -71,6 +74,7 @@ def toggle_admin(user_id):
                 f"Usuário {user.username} também foi aprovado automaticamente.", "info"
             )
         db.session.commit()
+        invalidar_identidade_usuario(user.id)
         status = (
             "promovido a administrador"
             if user.is_admin
@@ -99,6 +103,7 @@ def toggle_supervisor(user_id):
         user.is_approved = True
         flash(f"Usuário {user.username} também foi aprovado automaticamente.", "info")
     db.session.commit()
+    invalidar_identidade_usuario(user.id)
     status = (
         "promovido a supervisor" if user.is_supervisor else "rebaixado de supervisor"
     )
@@ -118,6 +123,7 @@ def delete_user(user_id):
     sucesso, mensagem = delete_user_and_dependencies(user_id)
 
     if sucesso:
+        invalidar_identidade_usuario(user_id)
         flash(mensagem, "success")
     else:
         logger.error(f"Falha ao deletar usuário ID {user_id}: {mensagem}")
@@ -11,7 +11,8 @@ from . import (
     admin_routes,
     analisador_routes,
     config_routes,
-    colaborador_routes
+    colaborador_routes,
+    lookup_routes
 )
 from . import text_routes
 
@@ -22,7 +23,7 @@ from . import text_routes
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
-from app.models.condominio import Condominio
+from app.services.lookup_service import responder_lookup
 
 @api_bp.route('/users', methods=['GET'])
 @api_bp.route('/users/', methods=['GET'])
@@ -50,13 +51,7 @@ def list_users_simple():
 def list_condominios_simple():
     """Listar condomínios para filtros do frontend."""
     try:
-        condominios = Condominio.query.order_by(Condominio.nome).all()
-        return jsonify({
-            'condominios': [{
-                'id': condominio.id,
-                'nome': condominio.nome
-            } for condominio in condominios]
-        }), 200
+        return responder_lookup('condominios', 'condominios', envelope=False)
     except Exception as e:
         return jsonify({'error': 'Erro ao listar condomínios'}), 500
 
@@ -3,10 +3,13 @@ APIs de administração para gerenciamento de usuários, colaboradores, escalas
 """
 from functools import wraps
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
+from app.auth.jwt_auth import invalidar_identidade_usuario
 from app.models.user import User
 from app.models.colaborador import Colaborador
 from app.models.escala_mensal import EscalaMensal
+from app.services.busca_service import filtrar_colaboradores_por_nome
+from app.services.container_servicos import get_servico
 from app.services.escala_service import get_escala_mensal, salvar_escala_mensal
 from app.services.justificativa_service import JustificativaAtestadoService
 from app.services.justificativa_troca_plantao_service import JustificativaTrocaPlantaoService
@@ -25,10 +28,7 @@ def admin_required(f):
     """Decorator para verificar se o usuário é admin."""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or not user.is_admin:
+        if not current_user or not current_user.is_admin:
             return jsonify({'error': 'Acesso negado. Apenas administradores.'}), 403
         return f(*args, **kwargs)
     return decorated_function
@@ -58,8 +58,8 @@ def list_users():
             'is_admin': user.is_admin,
             'is_supervisor': user.is_supervisor,
             'is_approved': user.is_approved,
-            'date_registered': user.date_registered.isoformat() if user.date_registered else None,
-            'last_login': user.last_login.isoformat() if user.last_login else None
+            'date_registered': user.date_registered,
+            'last_login': user.last_login
         })
     
     return jsonify({
@@ -86,6 +86,7 @@ def approve_user(user_id):
     
     user.is_approved = True
     db.session.commit()
+    invalidar_identidade_usuario(user.id)
     
     logger.info(f"Usuário {user.username} aprovado")
     return jsonify({'message': f'Usuário {user.username} aprovado com sucesso'}), 200
@@ -95,10 +96,9 @@ def approve_user(user_id):
 @admin_required
 def revoke_user(user_id):
     """Revogar aprovação de um usuário."""
-    current_user_id = get_jwt_identity()
     user = User.query.get_or_404(user_id)
     
-    if user.id == current_user_id:
+    if user.id == current_user.id:
         return jsonify({'error': 'Você não pode revogar sua própria aprovação'}), 400
     
     if not user.is_approved:
@@ -106,6 +106,7 @@ def revoke_user(user_id):
     
     user.is_approved = False
     db.session.commit()
+    invalidar_identidade_usuario(user.id)
     
     logger.info(f"Aprovação de {user.username} foi revogada")
     return jsonify({'message': f'Aprovação de {user.username} foi revogada'}), 200
@@ -115,10 +116,9 @@ def revoke_user(user_id):
 @admin_required
 def toggle_admin(user_id):
     """Alternar status de administrador de um usuário."""
-    current_user_id = get_jwt_identity()
     user = User.query.get_or_404(user_id)
     
-    if user.id == current_user_id:
+    if user.id == current_user.id:
         return jsonify({'error': 'Você não pode alterar seu próprio status de administrador'}), 400
     
     user.is_admin = not user.is_admin
@@ -126,6 +126,7 @@ def toggle_admin(user_id):
         user.is_approved = True
     
     db.session.commit()
+    invalidar_identidade_usuario(user.id)
     
     status = "promovido a administrador" if user.is_admin else "rebaixado de administrador"
     logger.info(f"Usuário {user.username} foi {status}")
@@ -140,10 +141,9 @@ def toggle_admin(user_id):
 @admin_required
 def toggle_supervisor(user_id):
     """Alternar status de supervisor de um usuário."""
-    current_user_id = get_jwt_identity()
     user = User.query.get_or_404(user_id)
     
-    if user.id == current_user_id:
+    if user.id == current_user.id:
         return jsonify({'error': 'Você não pode alterar seu próprio status de supervisor'}), 400
     
     user.is_supervisor = not user.is_supervisor
@@ -151,6 +151,7 @@ def toggle_supervisor(user_id):
         user.is_approved = True
     
     db.session.commit()
+    invalidar_identidade_usuario(user.id)
     
     status = "promovido a supervisor" if user.is_supervisor else "rebaixado de supervisor"
     logger.info(f"Usuário {user.username} foi {status}")
@@ -165,16 +166,16 @@ def toggle_supervisor(user_id):
 @admin_required
 def delete_user(user_id):
     """Deletar um usuário."""
-    current_user_id = get_jwt_identity()
     user = User.query.get_or_404(user_id)
     
-    if user.id == current_user_id:
+    if user.id == current_user.id:
         return jsonify({'error': 'Você não pode deletar sua própria conta'}), 400
     
     try:
         from app.services.user_service import delete_user_and_dependencies
         delete_user_and_dependencies(user)
         db.session.commit()
+        invalidar_identidade_usuario(user_id)
         
         logger.info(f"Usuário {user.username} foi deletado")
         return jsonify({'message': f'Usuário {user.username} foi deletado com sucesso'}), 200
@@ -204,9 +205,11 @@ def list_colaboradores():
     if status:
         query = query.filter_by(status=status)
     if nome:
-        query = query.filter(Colaborador.nome_completo.ilike(f'%{nome}%'))
+        query = filtrar_colaboradores_por_nome(query, nome)
+    else:
+        query = query.order_by(Colaborador.nome_completo)
     
-    colaboradores_pagination = query.order_by(Colaborador.nome_completo).paginate(
+    colaboradores_pagination = query.paginate(
         page=page, per_page=per_page
     )
     
@@ -217,7 +220,7 @@ def list_colaboradores():
             'nome_completo': col.nome_completo,
             'cargo': col.cargo,
             'matricula': col.matricula,
-            'data_admissao': col.data_admissao.isoformat() if col.data_admissao else None,
+            'data_admissao': col.data_admissao,
             'status': col.status
         })
     
@@ -266,7 +269,7 @@ def create_colaborador():
                 'nome_completo': novo_colaborador.nome_completo,
                 'cargo': novo_colaborador.cargo,
                 'matricula': novo_colaborador.matricula,
-                'data_admissao': novo_colaborador.data_admissao.isoformat() if novo_colaborador.data_admissao else None,
+                'data_admissao': novo_colaborador.data_admissao,
                 'status': novo_colaborador.status
             }
         }), 201
@@ -288,7 +291,7 @@ def get_colaborador(colaborador_id):
         'nome_completo': colaborador.nome_completo,
         'cargo': colaborador.cargo,
         'matricula': colaborador.matricula,
-        'data_admissao': colaborador.data_admissao.isoformat() if colaborador.data_admissao else None,
+        'data_admissao': colaborador.data_admissao,
         'status': colaborador.status
     }), 200
 
@@ -323,7 +326,7 @@ def update_colaborador(colaborador_id):
                 'nome_completo': colaborador.nome_completo,
                 'cargo': colaborador.cargo,
                 'matricula': colaborador.matricula,
-                'data_admissao': colaborador.data_admissao.isoformat() if colaborador.data_admissao else None,
+                'data_admissao': colaborador.data_admissao,
                 'status': colaborador.status
             }
         }), 200
@@ -416,7 +419,7 @@ def generate_justificativa_atestado():
         return jsonify({'error': 'Texto do atestado é obrigatório'}), 400
     
     try:
-        service = JustificativaAtestadoService()
+        service = get_servico(JustificativaAtestadoService)
         justificativa = service.gerar_justificativa(data['texto_atestado'])
         
         return jsonify({
@@ -438,7 +441,7 @@ def generate_justificativa_troca_plantao():
         return jsonify({'error': 'Dados da troca são obrigatórios'}), 400
     
     try:
-        service = JustificativaTrocaPlantaoService()
+        service = get_servico(JustificativaTrocaPlantaoService)
         justificativa = service.gerar_justificativa(data['dados_troca'])
         
         return jsonify({
@@ -461,7 +464,7 @@ def formatar_email():
     
     try:
         from app.services.email_format_service import EmailFormatService
-        service = EmailFormatService()
+        service = get_servico(EmailFormatService)
         email_formatado = service.formatar_email(data['conteudo'])
         
         return jsonify({
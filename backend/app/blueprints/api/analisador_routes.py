@@ -1,10 +1,12 @@
 """
 APIs para análise de relatórios usando IA.
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.models.processing_history import ProcessingHistory
+from app.services.container_servicos import get_servico
+from app.services.fila_ia_service import FilaIACheia, get_fila_ia
 from app.services.patrimonial_report_service import PatrimonialReportService
 from app.utils.classificador import classificar_ocorrencia
 from app import db
@@ -14,27 +16,42 @@ logger = logging.getLogger(__name__)
 
 analisador_api_bp = Blueprint('analisador_api', __name__, url_prefix='/api/analisador')
 
-@analisador_api_bp.route('/processar-relatorio', methods=['POST'])
-@jwt_required()
-def processar_relatorio():
-    """Processar relatório usando IA."""
-    data = request.get_json()
-    current_user_id = get_jwt_identity()
-    
-    if not data or not data.get('relatorio_bruto'):
-        return jsonify({'error': 'Relatório bruto é obrigatório'}), 400
-    
+def _quer_assincrono(data) -> bool:
+    """`"assincrono": true` no corpo ou `?assincrono=1`: a rota só enfileira e devolve o job."""
+    valor = data.get('assincrono') if isinstance(data, dict) else None
+    if valor is None:
+        valor = request.args.get('assincrono', '')
+    return str(valor).lower() in ('1', 'true', 'sim')
+
+
+def _enfileirar(tipo, funcao, *args, user_id):
+    """Resposta 202 com o job (ou 503 se a fila de IA estiver cheia)."""
+    try:
+        job = get_fila_ia().submeter(tipo, funcao, *args, user_id=user_id)
+    except FilaIACheia as e:
+        logger.warning(str(e))
+        resposta = jsonify({'error': 'Muitas análises em andamento, tente novamente em instantes'})
+        resposta.headers['Retry-After'] = '5'
+        return resposta, 503
+    status_url = url_for('analisador_api.obter_job', job_id=job['id'])
+    resposta = jsonify({'job_id': job['id'], 'status': job['status'], 'status_url': status_url})
+    resposta.headers['Location'] = status_url
+    return resposta, 202
+
+
+def _gerar_relatorio(relatorio_bruto, user_id):
+    """Classifica, gera o relatório patrimonial e grava o histórico (também em caso de erro)."""
     try:
         # Classificar ocorrência
-        classificacao = classificar_ocorrencia(data['relatorio_bruto'])
+        classificacao = classificar_ocorrencia(relatorio_bruto)
         
         # Processar relatório patrimonial
-        patrimonial_service = PatrimonialReportService()
-        relatorio_processado = patrimonial_service.gerar_relatorio_seguranca(data['relatorio_bruto'])
+        patrimonial_service = get_servico(PatrimonialReportService)
+        relatorio_processado = patrimonial_service.gerar_relatorio_seguranca(relatorio_bruto)
         
         # Salvar histórico
         history = ProcessingHistory(
-            user_id=current_user_id,
+            user_id=user_id,
             processing_type="patrimonial_report",
             success=True,
             error_message=None
@@ -42,16 +59,17 @@ def processar_relatorio():
         db.session.add(history)
         db.session.commit()
         
-        return jsonify({
+        return {
             'classificacao': classificacao,
             'relatorio_processado': relatorio_processado
-        }), 200
+        }
         
     except Exception as e:
         # Salvar histórico de erro
         try:
+            db.session.rollback()
             history = ProcessingHistory(
-                user_id=current_user_id,
+                user_id=user_id,
                 processing_type="patrimonial_report",
                 success=False,
                 error_message=str(e)
@@ -60,10 +78,92 @@ def processar_relatorio():
             db.session.commit()
         except Exception as history_error:
             logger.error(f"Erro ao salvar histórico: {history_error}")
-        
+        raise
+
+
+def _processar_lote(textos, ids, user_id):
+    from app.services.analise_lote_service import AnaliseLoteService
+
+    try:
+        resultado = get_servico(AnaliseLoteService).processar(textos, user_id=user_id)
+    except Exception:
+        db.session.rollback()
+        raise
+    for id_informado, item in zip(ids, resultado['resultados']):
+        item['id'] = id_informado
+    return resultado
+
+
+@analisador_api_bp.route('/processar-relatorio', methods=['POST'])
+@jwt_required()
+def processar_relatorio():
+    """Processar relatório usando IA (com `assincrono`, devolve 202 e o job para consulta)."""
+    data = request.get_json()
+    current_user_id = get_jwt_identity()
+    
+    if not data or not data.get('relatorio_bruto'):
+        return jsonify({'error': 'Relatório bruto é obrigatório'}), 400
+
+    if _quer_assincrono(data):
+        return _enfileirar('processar-relatorio', _gerar_relatorio, data['relatorio_bruto'], current_user_id,
+                           user_id=current_user_id)
+    
+    try:
+        return jsonify(_gerar_relatorio(data['relatorio_bruto'], current_user_id)), 200
+    except Exception as e:
         logger.error(f"Erro ao processar relatório: {e}")
         return jsonify({'error': 'Erro ao processar relatório'}), 500
 
+@analisador_api_bp.route('/processar-relatorios', methods=['POST'])
+@jwt_required()
+def processar_relatorios_em_lote():
+    """
+    Processar vários relatórios de uma vez. Aceita `relatorios` como lista de
+    textos ou de objetos {id, relatorio_bruto}; o `id` informado volta em
+    cada resultado, na mesma ordem da entrada. Com `assincrono`, devolve 202
+    e o job para consulta.
+    """
+    from flask import current_app
+
+    data = request.get_json(silent=True) or {}
+    relatorios = data.get('relatorios')
+    if not isinstance(relatorios, list) or not relatorios:
+        return jsonify({'error': 'Informe a lista de relatórios em "relatorios"'}), 400
+    maximo = current_app.config.get('ANALISE_LOTE_MAX_RELATORIOS', 30)
+    if len(relatorios) > maximo:
+        return jsonify({'error': f'No máximo {maximo} relatórios por requisição'}), 400
+
+    ids, textos = [], []
+    for posicao, relatorio in enumerate(relatorios, start=1):
+        if isinstance(relatorio, dict):
+            ids.append(relatorio.get('id', posicao))
+            relatorio = relatorio.get('relatorio_bruto')
+        else:
+            ids.append(posicao)
+        if not isinstance(relatorio, str) or not relatorio.strip():
+            return jsonify({'error': f'Relatório bruto vazio na posição {posicao}'}), 400
+        textos.append(relatorio.strip())
+
+    user_id = int(get_jwt_identity())
+    if _quer_assincrono(data):
+        return _enfileirar('processar-relatorios', _processar_lote, textos, ids, user_id, user_id=user_id)
+
+    try:
+        resultado = _processar_lote(textos, ids, user_id)
+    except Exception as e:
+        logger.error(f"Erro ao processar relatórios em lote: {e}", exc_info=True)
+        return jsonify({'error': 'Erro ao processar relatórios'}), 500
+    return jsonify(resultado), 200
+
+@analisador_api_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def obter_job(job_id):
+    """Estado de um processamento assíncrono; `resultado` vem preenchido quando `status` é 'concluido'."""
+    job = get_fila_ia().obter_job(job_id)
+    if job is None or str(job.get('user_id')) != str(get_jwt_identity()):
+        return jsonify({'error': 'Job não encontrado ou expirado'}), 404
+    return jsonify(job), 200
+
 @analisador_api_bp.route('/historico', methods=['GET'])
 @jwt_required()
 def obter_historico():
@@ -75,7 +175,7 @@ def obter_historico():
     try:
         historico_pagination = ProcessingHistory.query.filter_by(
             user_id=current_user_id
-        ).order_by(ProcessingHistory.data_processamento.desc()).paginate(
+        ).order_by(ProcessingHistory.timestamp.desc()).paginate(
             page=page, per_page=per_page
         )
         
@@ -86,7 +186,7 @@ def obter_historico():
                 'tipo_processamento': h.processing_type,
                 'sucesso': h.success,
                 'mensagem_erro': h.error_message,
-                'data_processamento': h.data_processamento.isoformat() if h.data_processamento else None
+                'data_processamento': h.timestamp
             })
         
         return jsonify({
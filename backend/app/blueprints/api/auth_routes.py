@@ -2,7 +2,7 @@
 APIs de autenticação usando JWT.
 """
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, current_user
 from app.models.user import User
 from app.models.login_history import LoginHistory
 from app import db
@@ -152,7 +152,7 @@ def get_profile():
                 'is_admin': user.is_admin,
                 'is_supervisor': user.is_supervisor,
                 'is_approved': user.is_approved,
-                'last_login': user.last_login.isoformat() if user.last_login else None
+                'last_login': user.last_login
             },
             message='Perfil obtido com sucesso'
         )
@@ -178,8 +178,7 @@ def logout():
 def refresh():
     """Renovar token JWT."""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_user
         
         if not user:
             return error_response('Usuário não encontrado', status_code=404)
@@ -2,6 +2,7 @@ from flask import jsonify, request, current_app
 from flask_jwt_extended import jwt_required
 from app import db
 from app.models.colaborador import Colaborador
+from app.services.busca_service import filtrar_colaboradores_por_nome
 from . import api_bp
 
 @api_bp.route('/colaboradores', methods=['GET'])
@@ -20,9 +21,11 @@ def list_colaboradores():
             query = query.filter_by(status=status)
         
         if search:
-            query = query.filter(Colaborador.nome_completo.ilike(f'%{search}%'))
+            query = filtrar_colaboradores_por_nome(query, search)
+        else:
+            query = query.order_by(Colaborador.nome_completo)
         
-        pagination = query.order_by(Colaborador.nome_completo).paginate(
+        pagination = query.paginate(
             page=page, per_page=per_page, error_out=False
         )
         
@@ -32,7 +35,7 @@ def list_colaboradores():
                 'nome_completo': c.nome_completo,
                 'cargo': c.cargo,
                 'matricula': c.matricula,
-                'data_admissao': c.data_admissao.isoformat() if c.data_admissao else None,
+                'data_admissao': c.data_admissao,
                 'status': c.status
             } for c in pagination.items],
             'pagination': {
@@ -91,7 +94,7 @@ def get_colaborador(id):
             'nome_completo': colaborador.nome_completo,
             'cargo': colaborador.cargo,
             'matricula': colaborador.matricula,
-            'data_admissao': colaborador.data_admissao.isoformat() if colaborador.data_admissao else None,
+            'data_admissao': colaborador.data_admissao,
             'status': colaborador.status
         }), 200
     except Exception as e:
@@ -2,13 +2,13 @@
 APIs para gerenciar configurações do sistema.
 """
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.user import User
+from flask_jwt_extended import jwt_required, current_user
 from app.models.ocorrencia_tipo import OcorrenciaTipo
 from app.models.orgao_publico import OrgaoPublico
 from app.models.logradouro import Logradouro
 from app.models.condominio import Condominio
 from app import db
+from app.services.lookup_service import responder_lookup
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,10 +21,7 @@ def admin_required(f):
     
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or not user.is_admin:
+        if not current_user or not current_user.is_admin:
             return jsonify({'error': 'Acesso negado. Apenas administradores.'}), 403
         return f(*args, **kwargs)
     return decorated_function
@@ -38,16 +35,7 @@ def admin_required(f):
 def list_tipos_ocorrencia():
     """Listar tipos de ocorrência."""
     try:
-        tipos = OcorrenciaTipo.query.order_by(OcorrenciaTipo.nome).all()
-        
-        return jsonify({
-            'tipos': [{
-                'id': t.id,
-                'nome': t.nome,
-                'descricao': t.descricao
-            } for t in tipos]
-        }), 200
-        
+        return responder_lookup('tipos_ocorrencia', 'tipos', envelope=False)
     except Exception as e:
         logger.error(f"Erro ao listar tipos de ocorrência: {e}")
         return jsonify({'error': 'Erro ao listar tipos de ocorrência'}), 500
@@ -147,17 +135,7 @@ def delete_tipo_ocorrencia(tipo_id):
 def list_orgaos_publicos():
     """Listar órgãos públicos."""
     try:
-        orgaos = OrgaoPublico.query.order_by(OrgaoPublico.nome).all()
-        
-        return jsonify({
-            'orgaos': [{
-                'id': o.id,
-                'nome': o.nome,
-                'tipo': o.tipo,
-                'contato': o.contato
-            } for o in orgaos]
-        }), 200
-        
+        return responder_lookup('orgaos_publicos', 'orgaos', envelope=False)
     except Exception as e:
         logger.error(f"Erro ao listar órgãos públicos: {e}")
         return jsonify({'error': 'Erro ao listar órgãos públicos'}), 500
@@ -262,15 +240,7 @@ def delete_orgao_publico(orgao_id):
 def list_logradouros():
     """Listar logradouros."""
     try:
-        logradouros = Logradouro.query.order_by(Logradouro.nome).all()
-        
-        return jsonify({
-            'logradouros': [{
-                'id': l.id,
-                'nome': l.nome
-            } for l in logradouros]
-        }), 200
-        
+        return responder_lookup('logradouros', 'logradouros', envelope=False)
     except Exception as e:
         logger.error(f"Erro ao listar logradouros: {e}")
         return jsonify({'error': 'Erro ao listar logradouros'}), 500
@@ -315,15 +285,7 @@ def create_logradouro():
 def list_condominios():
     """Listar condomínios."""
     try:
-        condominios = Condominio.query.order_by(Condominio.nome).all()
-        
-        return jsonify({
-            'condominios': [{
-                'id': c.id,
-                'nome': c.nome
-            } for c in condominios]
-        }), 200
-        
+        return responder_lookup('condominios', 'condominios', envelope=False)
     except Exception as e:
         logger.error(f"Erro ao listar condomínios: {e}")
         return jsonify({'error': 'Erro ao listar condomínios'}), 500
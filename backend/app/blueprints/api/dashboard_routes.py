@@ -4,7 +4,7 @@ APIs de dashboard para fornecer dados para o frontend.
 import logging
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from sqlalchemy import func, desc
 
 from app import db, cache
@@ -20,7 +20,7 @@ logger = logging.getLogger(__name__)
 def test_jwt():
     """Endpoint de teste para verificar se o JWT está funcionando."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_user
     
     if not user:
         return jsonify({'error': 'Usuário não encontrado'}), 404
@@ -51,52 +51,42 @@ def test_public():
         'timestamp': datetime.now().isoformat()
     }), 200
 
+@cache.cached(timeout=300, key_prefix='dashboard_stats_gerais')
+def _calcular_stats_gerais():
+    """Contadores globais do dashboard (iguais para todos os usuários, por isso ficam em cache)."""
+    # Estatísticas de ocorrências
+    total_ocorrencias = Ocorrencia.query.count()
+    
+    # Estatísticas de rondas
+    total_rondas = Ronda.query.count()
+    
+    # Estatísticas de condomínios
+    total_condominios = Condominio.query.count()
+    
+    # Calculate stats for the last month
+    last_month = datetime.now() - timedelta(days=30)
+    ocorrencias_ultimo_mes = Ocorrencia.query.filter(Ocorrencia.data_hora_ocorrencia >= last_month).count()
+    rondas_ultimo_mes = Ronda.query.filter(Ronda.data_plantao_ronda >= last_month).count()
+    rondas_em_andamento = Ronda.query.filter(Ronda.status == 'Em Andamento').count()
+
+    return {
+        'total_ocorrencias': total_ocorrencias,
+        'total_rondas': total_rondas,
+        'total_condominios': total_condominios,
+        'rondas_em_andamento': rondas_em_andamento,
+        'ocorrencias_ultimo_mes': ocorrencias_ultimo_mes,
+        'rondas_ultimo_mes': rondas_ultimo_mes
+    }
+
+
 @dashboard_api_bp.route('/stats', methods=['GET'])
 @jwt_required()
-@cache.cached(timeout=300, key_prefix='dashboard_stats')
 def get_dashboard_stats():
     """Obter estatísticas gerais do dashboard."""
     try:
-        # Estatísticas de ocorrências
-        total_ocorrencias = Ocorrencia.query.count()
-        ocorrencias_hoje = Ocorrencia.query.filter(
-            func.date(Ocorrencia.data_hora_ocorrencia) == datetime.now().date()
-        ).count()
-        
-        # Estatísticas de rondas
-        total_rondas = Ronda.query.count()
-        rondas_hoje = Ronda.query.filter(
-            func.date(Ronda.data_plantao_ronda) == datetime.now().date()
-        ).count()
-        
-        # Estatísticas de usuários
-        total_usuarios = User.query.filter_by(is_approved=True).count()
-        usuarios_online = User.query.filter(
-            User.last_login >= datetime.now() - timedelta(hours=1)
-        ).count()
-        
-        # Estatísticas de condomínios
-        total_condominios = Condominio.query.count()
-        
-        # Get current user for the response
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        # Calculate stats for the last month
-        last_month = datetime.now() - timedelta(days=30)
-        ocorrencias_ultimo_mes = Ocorrencia.query.filter(Ocorrencia.data_hora_ocorrencia >= last_month).count()
-        rondas_ultimo_mes = Ronda.query.filter(Ronda.data_plantao_ronda >= last_month).count()
-        rondas_em_andamento = Ronda.query.filter(Ronda.status == 'Em Andamento').count()
-
+        user = current_user
         stats = {
-            'stats': {
-                'total_ocorrencias': total_ocorrencias,
-                'total_rondas': total_rondas,
-                'total_condominios': total_condominios,
-                'rondas_em_andamento': rondas_em_andamento,
-                'ocorrencias_ultimo_mes': ocorrencias_ultimo_mes,
-                'rondas_ultimo_mes': rondas_ultimo_mes
-            },
+            'stats': _calcular_stats_gerais(),
             'user': {
                 'id': user.id,
                 'username': user.username,
@@ -133,7 +123,7 @@ def get_recent_ocorrencias():
                 'id': o.id,
                 'tipo': o.tipo.nome if o.tipo else 'N/A',
                 'condominio': o.condominio.nome if o.condominio else 'N/A',
-                'data': o.data_hora_ocorrencia.isoformat() if o.data_hora_ocorrencia else None,
+                'data': o.data_hora_ocorrencia,
                 'descricao': o.relatorio_final or 'Sem descrição',
                 'status': o.status,
                 'turno': o.turno,
@@ -166,7 +156,7 @@ def get_recent_rondas():
             rondas_data.append({
                 'id': r.id,
                 'condominio': r.condominio.nome if r.condominio else 'N/A',
-                'data_plantao': r.data_plantao_ronda.isoformat() if r.data_plantao_ronda else None,
+                'data_plantao': r.data_plantao_ronda,
                 'escala_plantao': r.escala_plantao,
                 'status': r.status,
                 'total_rondas': r.total_rondas_no_log or 0,
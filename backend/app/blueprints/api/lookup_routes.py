@@ -0,0 +1,37 @@
+"""
+Pacote de listas de apoio (lookups) para o boot do PWA em uma única requisição.
+"""
+import logging
+
+from flask import request
+from flask_jwt_extended import jwt_required
+
+from app.blueprints.api import api_bp
+from app.blueprints.api.utils import success_response, error_response
+from app.services.lookup_service import LOOKUPS, obter_pacote, responder_condicional
+
+logger = logging.getLogger(__name__)
+
+
+@api_bp.route('/lookups', methods=['GET'])
+@jwt_required()
+def listar_lookups():
+    """
+    Todas as listas de apoio (ou só as de `?incluir=condominios,colaboradores`),
+    com ETag do pacote: a revalidação responde 304 sem consultar o banco.
+    """
+    incluir = request.args.get('incluir', '')
+    nomes = [nome.strip() for nome in incluir.split(',') if nome.strip()] or list(LOOKUPS)
+    desconhecidos = [nome for nome in nomes if nome not in LOOKUPS]
+    if desconhecidos:
+        return error_response(
+            f"Lookups desconhecidos: {', '.join(desconhecidos)}. Disponíveis: {', '.join(LOOKUPS)}",
+            status_code=400
+        )
+
+    try:
+        etag, pacote = obter_pacote(nomes)
+        return responder_condicional(etag, lambda: success_response(data=pacote, message='Listas obtidas com sucesso'))
+    except Exception as e:
+        logger.error(f"Erro ao montar o pacote de lookups: {e}")
+        return error_response('Erro interno ao obter listas', status_code=500)
@@ -10,14 +10,13 @@ from sqlalchemy import desc
 
 from app import db
 from app.models import Ocorrencia, OcorrenciaTipo, Condominio, User, Colaborador, OrgaoPublico
-from app.services import ocorrencia_service
+from app.services import busca_service, ocorrencia_service
+from app.auth.jwt_auth import carregar_identidade_usuario
 from app.blueprints.api.utils import success_response, error_response, pagination_response
+from app.services.container_servicos import get_servico
+from app.services.lookup_service import responder_lookup
 import io
 from flask import send_file
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml.ns import qn
 
 ocorrencia_api_bp = Blueprint('ocorrencia_api', __name__, url_prefix='/api/ocorrencias')
 
@@ -25,11 +24,11 @@ logger = logging.getLogger(__name__)
 
 
 def get_user_name(user_id):
-    """Obtém o nome do usuário pelo ID."""
+    """Obtém o nome do usuário pelo ID (snapshot em cache, sem consulta por linha)."""
     if not user_id:
         return 'N/A'
     try:
-        user = User.query.get(user_id)
+        user = carregar_identidade_usuario(user_id)
         return user.username if user else 'N/A'
     except Exception:
         return 'N/A'
@@ -84,12 +83,12 @@ def listar_ocorrencias():
                     'id': o.id,
                     'tipo': o.tipo.nome if o.tipo else 'N/A',
                     'condominio': o.condominio.nome if o.condominio else 'N/A',
-                    'data_hora_ocorrencia': o.data_hora_ocorrencia.isoformat() if o.data_hora_ocorrencia else None,
+                    'data_hora_ocorrencia': o.data_hora_ocorrencia,
                     'descricao': o.relatorio_final,
                     'status': o.status,
                     'endereco': o.endereco_especifico,
                     'turno': o.turno,
-                    'data_criacao': o.data_criacao.isoformat() if o.data_criacao else None,
+                    'data_criacao': o.data_criacao,
                     'registrado_por': get_user_name(o.registrado_por_user_id),
                     'supervisor': get_user_name(o.supervisor_id),
                     'registrado_por_user_id': o.registrado_por_user_id,
@@ -144,13 +143,13 @@ def obter_ocorrencia(ocorrencia_id):
                 'nome': ocorrencia.condominio.nome,
                 'endereco': None
             } if ocorrencia.condominio else None,
-            'data_hora_ocorrencia': ocorrencia.data_hora_ocorrencia.isoformat() if ocorrencia.data_hora_ocorrencia else None,
+            'data_hora_ocorrencia': ocorrencia.data_hora_ocorrencia,
             'relatorio_final': ocorrencia.relatorio_final,
             'status': ocorrencia.status,
             'endereco_especifico': ocorrencia.endereco_especifico,
             'turno': ocorrencia.turno,
-            'data_criacao': ocorrencia.data_criacao.isoformat() if ocorrencia.data_criacao else None,
-            'data_modificacao': ocorrencia.data_modificacao.isoformat() if ocorrencia.data_modificacao else None,
+            'data_criacao': ocorrencia.data_criacao,
+            'data_modificacao': ocorrencia.data_modificacao,
             'registrado_por': get_user_name(ocorrencia.registrado_por_user_id),
             'registrado_por_obj': {
                 'id': ocorrencia.registrado_por_user_id,
@@ -375,8 +374,8 @@ def analisar_relatorio():
         try:
             from app.services.patrimonial_report_service import PatrimonialReportService
             
-            # Instancia o serviço de relatório patrimonial (usa o template padrão)
-            report_service = PatrimonialReportService()
+            # Instância única do app (container_servicos)
+            report_service = get_servico(PatrimonialReportService)
             
             # Gera o relatório corrigido usando a IA
             relatorio_corrigido = report_service.gerar_relatorio_seguranca(relatorio_bruto)
@@ -418,24 +417,41 @@ def analisar_relatorio():
 
 
 
+@ocorrencia_api_bp.route('/busca', methods=['GET'])
+@jwt_required()
+def buscar_ocorrencias():
+    """Busca textual ranqueada nos relatórios, com trechos destacados."""
+    texto = request.args.get('q', '').strip()
+    if not texto:
+        return error_response('Informe o termo de busca (q)', status_code=400)
+    try:
+        filters = {
+            'status': request.args.get('status', ''),
+            'condominio_id': request.args.get('condominio_id', type=int),
+            'supervisor_id': request.args.get('supervisor_id', type=int),
+            'tipo_id': request.args.get('tipo_id', type=int),
+            'data_inicio': request.args.get('data_inicio', ''),
+            'data_fim': request.args.get('data_fim', ''),
+        }
+        resultado = busca_service.buscar_ocorrencias(
+            texto,
+            filters=filters,
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', 20, type=int),
+            ordenar=request.args.get('ordenar', 'relevancia'),
+        )
+        return success_response(data=resultado, message='Busca realizada com sucesso')
+    except Exception as e:
+        logger.error(f"Erro na busca de ocorrências: {e}")
+        return error_response('Erro interno na busca de ocorrências', status_code=500)
+
+
 @ocorrencia_api_bp.route('/tipos', methods=['GET'])
 @jwt_required()
 def listar_tipos_ocorrencia():
     """Listar tipos de ocorrência."""
     try:
-        tipos = OcorrenciaTipo.query.order_by(OcorrenciaTipo.nome).all()
-        
-        tipos_data = [{
-            'id': tipo.id,
-            'nome': tipo.nome,
-            'descricao': tipo.descricao
-        } for tipo in tipos]
-        
-        return success_response(
-            data={'tipos': tipos_data},
-            message='Tipos de ocorrência obtidos com sucesso'
-        )
-        
+        return responder_lookup('tipos_ocorrencia', 'tipos', message='Tipos de ocorrência obtidos com sucesso')
     except Exception as e:
         logger.error(f"Erro ao listar tipos de ocorrência: {e}")
         return error_response('Erro interno ao listar tipos de ocorrência', status_code=500)
@@ -446,42 +462,18 @@ def listar_tipos_ocorrencia():
 def listar_condominios():
     """Listar condomínios."""
     try:
-        condominios = Condominio.query.order_by(Condominio.nome).all()
-        
-        condominios_data = [{
-            'id': condominio.id,
-            'nome': condominio.nome,
-            'endereco': None
-        } for condominio in condominios]
-        
-        return success_response(
-            data={'condominios': condominios_data},
-            message='Condomínios obtidos com sucesso'
-        )
-        
+        return responder_lookup('condominios', 'condominios', message='Condomínios obtidos com sucesso')
     except Exception as e:
         logger.error(f"Erro ao listar condomínios: {e}")
-        return error_response('Erro interno ao listar condomínios', status_code=500) 
+        return error_response('Erro interno ao listar condomínios', status_code=500)
+
 
 @ocorrencia_api_bp.route('/colaboradores', methods=['GET'])
 @jwt_required()
 def listar_colaboradores():
     """Listar colaboradores."""
     try:
-        colaboradores = Colaborador.query.order_by(Colaborador.nome_completo).all()
-        
-        colaboradores_data = [{
-            'id': col.id,
-            'nome': col.nome_completo,
-            'cargo': col.cargo,
-            'matricula': col.matricula
-        } for col in colaboradores]
-        
-        return success_response(
-            data={'colaboradores': colaboradores_data},
-            message='Colaboradores obtidos com sucesso'
-        )
-        
+        return responder_lookup('colaboradores', 'colaboradores', message='Colaboradores obtidos com sucesso')
     except Exception as e:
         logger.error(f"Erro ao listar colaboradores: {e}")
         return error_response('Erro interno ao listar colaboradores', status_code=500)
@@ -492,19 +484,7 @@ def listar_colaboradores():
 def listar_orgaos_publicos():
     """Listar órgãos públicos."""
     try:
-        orgaos = OrgaoPublico.query.order_by(OrgaoPublico.nome).all()
-        
-        orgaos_data = [{
-            'id': org.id,
-            'nome': org.nome,
-            'contato': org.contato
-        } for org in orgaos]
-        
-        return success_response(
-            data={'orgaos_publicos': orgaos_data},
-            message='Órgãos públicos obtidos com sucesso'
-        )
-        
+        return responder_lookup('orgaos_publicos', 'orgaos_publicos', message='Órgãos públicos obtidos com sucesso')
     except Exception as e:
         logger.error(f"Erro ao listar órgãos públicos: {e}")
         return error_response('Erro interno ao listar órgãos públicos', status_code=500)
@@ -513,6 +493,11 @@ def listar_orgaos_publicos():
 @jwt_required()
 def exportar_ocorrencias_docx():
     """Exportar ocorrências selecionadas para DOCX."""
+    # python-docx só é carregado quando alguém exporta (não pesa no boot do worker)
+    from docx import Document
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
     try:
         data = request.get_json()
         if not data or not data.get('ocorrencia_ids'):
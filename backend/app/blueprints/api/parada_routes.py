@@ -6,14 +6,15 @@ import os
 import tempfile
 from datetime import datetime, date, timedelta
 from flask import request, jsonify, Blueprint
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import desc, func
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+from sqlalchemy import desc
 
 from app import db
 from app.models import Parada, Condominio, User
 from app.services.parada_routes_core.routes_service import ParadaRoutesService
 from app.services.excel_processor import ExcelProcessor
 from app.services.parada_utils import get_system_user
+from app.services.entity_resolver import get_entity_resolver, obter_ou_criar_condominio_id
 from app.blueprints.api.utils import success_response, error_response
 
 logger = logging.getLogger(__name__)
@@ -70,18 +71,18 @@ def listar_paradas():
                     'id': p.id,
                     'condominio': {'id': p.condominio.id, 'nome': p.condominio.nome} if p.condominio else None,
                     'condominio_id': p.condominio_id,
-                    'data_plantao_parada': p.data_plantao_parada.isoformat() if p.data_plantao_parada else None,
+                    'data_plantao_parada': p.data_plantao_parada,
                     'escala_plantao': p.escala_plantao,
                     'turno_parada': p.turno_parada,
                     'supervisor': {'id': p.supervisor.id, 'username': p.supervisor.username} if p.supervisor else None,
                     'supervisor_id': p.supervisor_id,
                     'user': p.criador.username if p.criador else 'N/A',
                     'user_id': p.user_id,
-                    'data_criacao': p.data_hora_inicio.isoformat() if p.data_hora_inicio else None,
+                    'data_criacao': p.data_hora_inicio,
                     'total_paradas_no_log': p.total_paradas_no_log,
                     'duracao_minutos': p.duracao_total_paradas_minutos,
                     'log_parada_bruto': p.log_parada_bruto,
-                    'primeiro_evento_log_dt': p.primeiro_evento_log_dt.isoformat() if p.primeiro_evento_log_dt else None
+                    'primeiro_evento_log_dt': p.primeiro_evento_log_dt
                 })
             except Exception as e:
                 logger.error(f"Erro ao serializar parada {p.id}: {e}")
@@ -137,7 +138,7 @@ def obter_parada(parada_id):
                 'nome': p.condominio.nome
             } if p.condominio else None,
             'condominio_id': p.condominio_id,
-            'data_plantao_parada': p.data_plantao_parada.isoformat() if p.data_plantao_parada else None,
+            'data_plantao_parada': p.data_plantao_parada,
             'escala_plantao': p.escala_plantao,
             'turno_parada': p.turno_parada,
             'log_parada_bruto': p.log_parada_bruto,
@@ -152,9 +153,9 @@ def obter_parada(parada_id):
                 'id': p.criador.id,
                 'username': p.criador.username
             } if p.criador else None,
-            'data_criacao': p.data_hora_inicio.isoformat() if p.data_hora_inicio else None,
-            'primeiro_evento_log_dt': p.primeiro_evento_log_dt.isoformat() if p.primeiro_evento_log_dt else None,
-            'ultimo_evento_log_dt': p.ultimo_evento_log_dt.isoformat() if p.ultimo_evento_log_dt else None
+            'data_criacao': p.data_hora_inicio,
+            'primeiro_evento_log_dt': p.primeiro_evento_log_dt,
+            'ultimo_evento_log_dt': p.ultimo_evento_log_dt
         }
         
         return success_response(
@@ -171,13 +172,10 @@ def obter_parada(parada_id):
 def deletar_parada(parada_id):
     """Deletar parada (Apenas Admins)."""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or not user.is_admin:
+        if not current_user or not current_user.is_admin:
             return error_response('Apenas administradores podem deletar paradas', status_code=403)
             
-        success, message, status_code = ParadaRoutesService.excluir_parada(parada_id, user)
+        success, message, status_code = ParadaRoutesService.excluir_parada(parada_id, current_user)
         if success:
             return success_response(data={'parada_id': parada_id}, message=message)
         else:
@@ -255,13 +253,9 @@ def upload_processar_parada():
             
             supervisor_id_db = None
             if parsed_data.get("supervisor"):
-                sup_name = parsed_data["supervisor"].strip().lower()
-                supervisors = User.query.filter_by(is_supervisor=True).all()
-                for s in supervisors:
-                    username_lower = s.username.lower()
-                    if sup_name in username_lower or username_lower in sup_name:
-                        supervisor_id_db = str(s.id)
-                        break
+                sup_id = get_entity_resolver().resolver_supervisor_id(parsed_data["supervisor"])
+                if sup_id:
+                    supervisor_id_db = str(sup_id)
             
             total_paradas_salvas = 0
             messages = []
@@ -270,19 +264,14 @@ def upload_processar_parada():
                 if not rounds:
                     continue
                 try:
-                    condominio = Condominio.query.filter(func.lower(Condominio.nome) == func.lower(condo_name)).first()
-                    if not condominio:
-                        condominio = Condominio(nome=condo_name)
-                        db.session.add(condominio)
-                        db.session.flush()
-                        logger.info(f"Condomínio '{condo_name}' criado via importação REST API.")
+                    condominio_id = obter_ou_criar_condominio_id(condo_name, get_entity_resolver())
                         
                     log_bruto = ExcelProcessor.generate_simulated_whatsapp_log_parada(parsed_data, condo_name)
                     if not log_bruto:
                         continue
                         
                     parada_data = {
-                        "condominio_id": str(condominio.id),
+                        "condominio_id": str(condominio_id),
                         "data_plantao": parsed_data.get("data_iso"),
                         "escala_plantao": parsed_data.get("escala_plantao"),
                         "log_bruto": log_bruto,
@@ -5,12 +5,13 @@ Versão refatorada - usando apenas modelo Ronda unificado.
 import logging
 from datetime import datetime
 from flask import request, jsonify, Blueprint
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from sqlalchemy import desc, func
 
 from app import db
 from app.models import Ronda, Condominio, User
 from app.blueprints.api.utils import success_response, error_response
+from app.services.lookup_service import responder_lookup
 
 logger = logging.getLogger(__name__)
 
@@ -110,19 +111,19 @@ def listar_rondas():
                     'id': r.id,
                     'condominio': {'id': r.condominio.id, 'nome': r.condominio.nome} if r.condominio else None,
                     'condominio_id': r.condominio_id,
-                    'data_plantao_ronda': r.data_plantao_ronda.isoformat() if r.data_plantao_ronda else None,
+                    'data_plantao_ronda': r.data_plantao_ronda,
                     'escala_plantao': r.escala_plantao,
                     'turno_ronda': r.turno_ronda,
                     'supervisor': {'id': r.supervisor.id, 'username': r.supervisor.username} if r.supervisor else None,
                     'supervisor_id': r.supervisor_id,
                     'user': r.criador.username if r.criador else 'N/A',
                     'user_id': r.user_id,
-                    'data_criacao': r.data_hora_inicio.isoformat() if r.data_hora_inicio else None,
+                    'data_criacao': r.data_hora_inicio,
                     'total_rondas_no_log': r.total_rondas_no_log,
                     'duracao_minutos': r.duracao_total_rondas_minutos,
                     'log_ronda_bruto': r.log_ronda_bruto,
                     'status': r.status,
-                    'primeiro_evento_log_dt': r.primeiro_evento_log_dt.isoformat() if r.primeiro_evento_log_dt else None
+                    'primeiro_evento_log_dt': r.primeiro_evento_log_dt
                 })
             except Exception as e:
                 logger.error(f"Erro ao serializar ronda {r.id}: {e}")
@@ -175,7 +176,7 @@ def obter_ronda(ronda_id):
                 'id': ronda.condominio.id,
                 'nome': ronda.condominio.nome
             } if ronda.condominio else None,
-            'data_plantao_ronda': ronda.data_plantao_ronda.isoformat() if ronda.data_plantao_ronda else None,
+            'data_plantao_ronda': ronda.data_plantao_ronda,
             'escala_plantao': ronda.escala_plantao,
             'status': ronda.status,
             'tipo': ronda.tipo,
@@ -189,8 +190,8 @@ def obter_ronda(ronda_id):
                 'id': ronda.criador.id,
                 'username': ronda.criador.username
             } if ronda.criador else None,
-            'data_criacao': ronda.data_criacao.isoformat() if ronda.data_criacao else None,
-            'data_modificacao': ronda.data_modificacao.isoformat() if ronda.data_modificacao else None
+            'data_criacao': ronda.data_criacao,
+            'data_modificacao': ronda.data_modificacao
         }
         
         return success_response(
@@ -269,10 +270,10 @@ def atualizar_ronda(ronda_id):
             return error_response('Dados não fornecidos', status_code=400)
         
         # Verificar permissões
-        user = User.query.get(current_user_id)
+        user = current_user
         if not user:
             return error_response('Usuário não encontrado', status_code=404)
-        if not (user.is_admin or ronda.supervisor_id == current_user_id or ronda.user_id == current_user_id):
+        if not (user.is_admin or ronda.supervisor_id == user.id or ronda.user_id == user.id):
             return error_response('Sem permissão para editar esta ronda', status_code=403)
         
         # Atualizar campos permitidos
@@ -321,8 +322,7 @@ def deletar_ronda(ronda_id):
         current_user_id = get_jwt_identity()
         
         # Apenas admins podem deletar
-        user = User.query.get(current_user_id)
-        if not user or not user.is_admin:
+        if not current_user or not current_user.is_admin:
             return error_response('Apenas administradores podem deletar rondas', status_code=403)
         
         db.session.delete(ronda)
@@ -346,19 +346,7 @@ def deletar_ronda(ronda_id):
 def listar_condominios():
     """Listar condomínios para rondas."""
     try:
-        condominios = Condominio.query.order_by(Condominio.nome).all()
-        
-        condominios_data = [{
-            'id': condominio.id,
-            'nome': condominio.nome,
-            'endereco': condominio.endereco
-        } for condominio in condominios]
-        
-        return success_response(
-            data={'condominios': condominios_data},
-            message='Condomínios obtidos com sucesso'
-        )
-        
+        return responder_lookup('condominios', 'condominios', message='Condomínios obtidos com sucesso')
     except Exception as e:
         logger.error(f"Erro ao listar condomínios: {e}")
         return error_response('Erro interno ao listar condomínios', status_code=500)
@@ -369,22 +357,7 @@ def listar_condominios():
 def listar_supervisores():
     """Listar supervisores para rondas."""
     try:
-        supervisores = User.query.filter_by(
-            is_supervisor=True, 
-            is_approved=True
-        ).order_by(User.username).all()
-        
-        supervisores_data = [{
-            'id': supervisor.id,
-            'username': supervisor.username,
-            'email': supervisor.email
-        } for supervisor in supervisores]
-        
-        return success_response(
-            data={'supervisores': supervisores_data},
-            message='Supervisores obtidos com sucesso'
-        )
-        
+        return responder_lookup('supervisores', 'supervisores', message='Supervisores obtidos com sucesso')
     except Exception as e:
         logger.error(f"Erro ao listar supervisores: {e}")
         return error_response('Erro interno ao listar supervisores', status_code=500)
@@ -395,19 +368,7 @@ def listar_supervisores():
 def listar_status():
     """Listar status disponíveis para rondas."""
     try:
-        status_list = [
-            "Agendada",
-            "Em Andamento", 
-            "Concluída",
-            "Cancelada",
-            "Pausada"
-        ]
-        
-        return success_response(
-            data={'status': status_list},
-            message='Status obtidos com sucesso'
-        )
-        
+        return responder_lookup('status_ronda', 'status', message='Status obtidos com sucesso')
     except Exception as e:
         logger.error(f"Erro ao listar status: {e}")
         return error_response('Erro interno ao listar status', status_code=500)
@@ -418,19 +379,7 @@ def listar_status():
 def listar_tipos():
     """Listar tipos disponíveis para rondas."""
     try:
-        tipos_list = [
-            "Regular",
-            "Esporádica",
-            "Emergencial",
-            "Noturna",
-            "Diurna"
-        ]
-        
-        return success_response(
-            data={'tipos': tipos_list},
-            message='Tipos obtidos com sucesso'
-        )
-        
+        return responder_lookup('tipos_ronda', 'tipos', message='Tipos obtidos com sucesso')
     except Exception as e:
         logger.error(f"Erro ao listar tipos: {e}")
         return error_response('Erro interno ao listar tipos', status_code=500)
@@ -453,6 +402,7 @@ def upload_processar_ronda():
         from app.services.ronda_utils import get_system_user
         from app.services.ronda_routes_core.routes_service import RondaRoutesService
         from app.services.excel_processor import ExcelProcessor
+        from app.services.entity_resolver import get_entity_resolver
 
         if 'file' not in request.files:
             return error_response('Nenhum arquivo enviado', status_code=400)
@@ -487,50 +437,37 @@ def upload_processar_ronda():
             
             supervisor_id_db = None
             if parsed_data.get("supervisor"):
-                sup_name = parsed_data["supervisor"].strip().lower()
-                supervisors = User.query.filter_by(is_supervisor=True).all()
-                for s in supervisors:
-                    username_lower = s.username.lower()
-                    if sup_name in username_lower or username_lower in sup_name:
-                        supervisor_id_db = str(s.id)
-                        break
+                sup_id = get_entity_resolver().resolver_supervisor_id(parsed_data["supervisor"])
+                if sup_id:
+                    supervisor_id_db = str(sup_id)
             
             total_rondas_salvas = 0
             messages = []
             
+            itens_lote = []
             for condo_name, rounds in parsed_data.get("condominios", {}).items():
                 if not rounds:
                     continue
-                try:
-                    condominio = Condominio.query.filter(func.lower(Condominio.nome) == func.lower(condo_name)).first()
-                    if not condominio:
-                        condominio = Condominio(nome=condo_name)
-                        db.session.add(condominio)
-                        db.session.flush()
-                        logger.info(f"Condomínio '{condo_name}' criado via importação REST API.")
-                        
-                    log_bruto = ExcelProcessor.generate_simulated_whatsapp_log(parsed_data, condo_name)
-                    if not log_bruto:
-                        continue
-                        
-                    ronda_data = {
-                        "condominio_id": str(condominio.id),
-                        "data_plantao": parsed_data.get("data_iso"),
-                        "escala_plantao": parsed_data.get("escala_plantao"),
-                        "log_bruto": log_bruto,
-                        "ronda_id": None,
-                        "supervisor_id": supervisor_id_db,
-                    }
-                    
-                    success, message, status_code, ronda_id = RondaRoutesService.salvar_ronda(ronda_data, system_user)
-                    if success:
-                        total_rondas_salvas += 1
-                        messages.append(f"Ronda para {condo_name} salva com ID {ronda_id}.")
-                    else:
-                        messages.append(f"Falha em {condo_name}: {message}")
-                except Exception as e_condo:
-                    messages.append(f"Erro em {condo_name}: {str(e_condo)}")
-                    
+                log_bruto = ExcelProcessor.generate_simulated_whatsapp_log(parsed_data, condo_name)
+                if not log_bruto:
+                    continue
+                itens_lote.append({
+                    "nome_condominio": condo_name,
+                    "data_plantao": parsed_data.get("data_iso"),
+                    "escala_plantao": parsed_data.get("escala_plantao"),
+                    "log_bruto": log_bruto,
+                    "supervisor_id": supervisor_id_db,
+                })
+
+            resultados = RondaRoutesService.salvar_rondas_em_lote(itens_lote, system_user)
+            for item, resultado in zip(itens_lote, resultados):
+                condo_name = item["nome_condominio"]
+                if resultado["success"]:
+                    total_rondas_salvas += 1
+                    messages.append(f"Ronda para {condo_name} salva com ID {resultado['ronda_id']}.")
+                else:
+                    messages.append(f"Falha em {condo_name}: {resultado['message']}")
+
             return success_response(
                 data={
                     'total_salvas': total_rondas_salvas,
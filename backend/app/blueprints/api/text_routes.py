@@ -4,6 +4,7 @@ from flask_login import login_required
 from app.blueprints.api import api_bp
 from app.services.text_tools import clean_text, languagetool_check, ai_transform, parse_eml_to_text
 from app.services.consolidated_report_service import ConsolidatedReportService
+from app.services.container_servicos import get_servico
 
 
 @api_bp.route('/text/clean', methods=['POST'])
@@ -39,7 +40,8 @@ def api_text_analyze():
     text = data.get('text', '')
     if not text:
         return jsonify({ 'matches': [] })
-    result = languagetool_check(text)
+    # incremental=False verifica o documento inteiro de uma vez (regras entre parágrafos)
+    result = languagetool_check(text, incremental=data.get('incremental', True) is not False)
     return jsonify(result)
 
 
@@ -65,7 +67,7 @@ def api_text_consolidate():
         return jsonify({'error': 'Nenhum dado bruto fornecido para consolidação.'}), 400
         
     try:
-        service = ConsolidatedReportService()
+        service = get_servico(ConsolidatedReportService)
         relatorio_consolidado = service.gerar_relatorio_consolidado(dados_brutos)
         return jsonify({'consolidated': relatorio_consolidado})
     except Exception as e:
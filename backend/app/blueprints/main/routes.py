@@ -13,6 +13,7 @@ from sqlalchemy import func
 import json
 from datetime import datetime, timedelta, timezone
 import calendar
+from app.services.container_servicos import get_servico
 from app.services.patrimonial_report_service import PatrimonialReportService
 from app.services import ocorrencia_service
 
@@ -25,7 +26,7 @@ UPTIME_TOKEN = os.getenv("UPTIME_TOKEN", "defaulttoken")
 
 def _get_patrimonial_service():
     if "patrimonial_service" not in g:
-        g.patrimonial_service = PatrimonialReportService()
+        g.patrimonial_service = get_servico(PatrimonialReportService)
     return g.patrimonial_service
 
 
@@ -207,7 +208,7 @@ def processar_relatorio_redirect():
         classificacao = classificar_ocorrencia(relatorio_bruto)
         
         # Processar relatório patrimonial
-        patrimonial_service = PatrimonialReportService()
+        patrimonial_service = get_servico(PatrimonialReportService)
         relatorio_processado = patrimonial_service.gerar_relatorio_seguranca(relatorio_bruto)
         
         # Salvar histórico
@@ -261,7 +262,7 @@ def processar_lote_inteligente_ajax():
     from app.services.ronda_routes_core.routes_service import RondaRoutesService
     from app.services.parada_routes_core.routes_service import ParadaRoutesService
     from app.services.ronda_utils import get_system_user
-    from app.models import Condominio, User
+    from app.services.entity_resolver import get_entity_resolver, obter_ou_criar_condominio_id
     
     files = request.files.getlist("files")
     google_files_json = request.form.get("google_files")
@@ -280,7 +281,7 @@ def processar_lote_inteligente_ajax():
     if not system_user:
         return jsonify({"success": False, "message": "Usuário do sistema não encontrado."}), 500
 
-    supervisores_db = User.query.filter_by(is_supervisor=True).all()
+    resolver = get_entity_resolver()
     
     total_rondas = 0
     total_paradas = 0
@@ -327,37 +328,31 @@ def processar_lote_inteligente_ajax():
         if ronda_success:
             sup_id = None
             if parsed_ronda.get("supervisor"):
-                sup_name = parsed_ronda["supervisor"].strip().lower()
-                for s in supervisores_db:
-                    if sup_name in s.username.lower() or s.username.lower() in sup_name:
-                        sup_id = str(s.id)
-                        break
+                sup_id_resolvido = resolver.resolver_supervisor_id(parsed_ronda["supervisor"])
+                if sup_id_resolvido:
+                    sup_id = str(sup_id_resolvido)
                         
+            itens_lote = []
             for condo_name, rounds in parsed_ronda.get("condominios", {}).items():
                 if not rounds: continue
-                
-                condominio = Condominio.query.filter(func.lower(Condominio.nome) == func.lower(condo_name)).first()
-                if not condominio:
-                    condominio = Condominio(nome=condo_name)
-                    db.session.add(condominio)
-                    db.session.flush()
-                    
+
                 log_bruto = ExcelProcessor.generate_simulated_whatsapp_log(parsed_ronda, condo_name)
                 if not log_bruto: continue
-                
-                ronda_data = {
-                    "condominio_id": str(condominio.id),
+
+                itens_lote.append({
+                    "nome_condominio": condo_name,
                     "data_plantao": parsed_ronda.get("data_iso"),
                     "escala_plantao": parsed_ronda.get("escala_plantao"),
                     "log_bruto": log_bruto,
-                    "ronda_id": None,
                     "supervisor_id": sup_id,
-                }
-                suc, msg, _, _ = RondaRoutesService.salvar_ronda(ronda_data, system_user)
-                if suc:
+                })
+
+            resultados = RondaRoutesService.salvar_rondas_em_lote(itens_lote, system_user)
+            for item, resultado in zip(itens_lote, resultados):
+                if resultado["success"]:
                     total_rondas += 1
                 else:
-                    logs.append(f"⚠️ {name}: Erro ronda {condo_name}: {msg}")
+                    logs.append(f"⚠️ {name}: Erro ronda {item['nome_condominio']}: {resultado['message']}")
 
         parsed_parada = ExcelProcessor.parse_excel_file_paradas(path)
         parada_success = parsed_parada.get("success", False)
@@ -365,26 +360,20 @@ def processar_lote_inteligente_ajax():
         if parada_success:
             sup_id = None
             if parsed_parada.get("supervisor"):
-                sup_name = parsed_parada["supervisor"].strip().lower()
-                for s in supervisores_db:
-                    if sup_name in s.username.lower() or s.username.lower() in sup_name:
-                        sup_id = str(s.id)
-                        break
+                sup_id_resolvido = resolver.resolver_supervisor_id(parsed_parada["supervisor"])
+                if sup_id_resolvido:
+                    sup_id = str(sup_id_resolvido)
                         
             for condo_name, rounds in parsed_parada.get("condominios", {}).items():
                 if not rounds: continue
                 
-                condominio = Condominio.query.filter(func.lower(Condominio.nome) == func.lower(condo_name)).first()
-                if not condominio:
-                    condominio = Condominio(nome=condo_name)
-                    db.session.add(condominio)
-                    db.session.flush()
+                condominio_id = obter_ou_criar_condominio_id(condo_name, resolver)
                     
                 log_bruto = ExcelProcessor.generate_simulated_whatsapp_log_parada(parsed_parada, condo_name)
                 if not log_bruto: continue
                 
                 parada_data = {
-                    "condominio_id": str(condominio.id),
+                    "condominio_id": str(condominio_id),
                     "data_plantao": parsed_parada.get("data_iso"),
                     "escala_plantao": parsed_parada.get("escala_plantao"),
                     "log_bruto": log_bruto,
@@ -430,7 +419,6 @@ def favicon():
 # ======================================================================
 # ROTA DE TESTE ISOLADO PARA A API DO GEMINI - ADICIONAR NO FINAL DO ARQUIVO DE ROTAS
 # ======================================================================
-import google.generativeai as genai
 
 @main_bp.route('/test-gemini')
 def test_gemini_route():
@@ -450,6 +438,7 @@ def test_gemini_route():
         logger.info("--- INICIANDO TESTE GEMINI ISOLADO ---")
         
         # Passo 1: Criar cliente com nova API
+        import google.generativeai as genai  # importação tardia (pesada), só para esta rota de diagnóstico
         client = genai.Client(api_key=test_api_key)
         logger.info("Cliente genai.Client() criado com sucesso.")
         
@@ -489,6 +478,7 @@ def list_gemini_models():
         logger.info("--- LISTANDO MODELOS GEMINI DISPONÍVEIS ---")
         
         # Cria cliente com nova API
+        import google.generativeai as genai  # importação tardia (pesada), só para esta rota de diagnóstico
         client = genai.Client(api_key=test_api_key)
         logger.info("Cliente genai.Client() criado com sucesso.")
         
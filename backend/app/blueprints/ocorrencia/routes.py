@@ -18,6 +18,7 @@ from app.forms import OcorrenciaForm
 from app.models import (Colaborador, Condominio, Ocorrencia, OcorrenciaTipo,
                         OrgaoPublico, User)
 from app.services import ocorrencia_service
+from app.services.container_servicos import get_servico
 from app.services.email_patrimonial_format_service import EmailPatrimonialFormatService
 from app.utils.classificador import classificar_ocorrencia
 
@@ -434,7 +435,7 @@ def gerar_email_patrimonial(ocorrencia_id):
         return jsonify({"erro": "A ocorrência não possui um relatório final para formatar."}), 400
 
     try:
-        service = EmailPatrimonialFormatService()
+        service = get_servico(EmailPatrimonialFormatService)
         email_formatado = service.formatar_email_patrimonial(ocorrencia.relatorio_final)
 
         return jsonify({
@@ -483,7 +484,7 @@ def gerar_email_consolidado():
     texto_unificado = "\n".join(blocos_texto)
 
     try:
-        service = EmailPatrimonialFormatService()
+        service = get_servico(EmailPatrimonialFormatService)
         email_formatado = service.formatar_email_consolidado(texto_unificado)
 
         return jsonify({
@@ -10,7 +10,6 @@ import pytz
 from flask import (Blueprint, flash, jsonify, redirect, render_template,
                    request, url_for, session, abort)
 from flask_login import current_user, login_required
-from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
 from app import db
@@ -18,6 +17,7 @@ from app.decorators.admin_required import admin_required
 from app.forms import TestarParadasForm
 from app.models import Condominio, EscalaMensal, Parada, User
 from app.services.parada_routes_core.routes_service import ParadaRoutesService
+from app.services.entity_resolver import get_entity_resolver, obter_ou_criar_condominio_id
 from app.services.parada_utils import get_system_user
 from app.services.excel_processor import ExcelProcessor
 
@@ -330,13 +330,9 @@ def processar_whatsapp_ajax():
         
         supervisor_id_db = "0"
         if parsed_data.get("supervisor"):
-            sup_name = parsed_data["supervisor"].strip().lower()
-            supervisors = User.query.filter_by(is_supervisor=True).all()
-            for s in supervisors:
-                username_lower = s.username.lower()
-                if sup_name in username_lower or username_lower in sup_name:
-                    supervisor_id_db = str(s.id)
-                    break
+            sup_id = get_entity_resolver().resolver_supervisor_id(parsed_data["supervisor"])
+            if sup_id:
+                supervisor_id_db = str(sup_id)
         
         return jsonify({
             'success': True,
@@ -410,13 +406,9 @@ def registrar_excel_lote_ajax():
             
         supervisor_id_db = None
         if parsed_data.get("supervisor"):
-            sup_name = parsed_data["supervisor"].strip().lower()
-            supervisors = User.query.filter_by(is_supervisor=True).all()
-            for s in supervisors:
-                username_lower = s.username.lower()
-                if sup_name in username_lower or username_lower in sup_name:
-                    supervisor_id_db = str(s.id)
-                    break
+            sup_id = get_entity_resolver().resolver_supervisor_id(parsed_data["supervisor"])
+            if sup_id:
+                supervisor_id_db = str(sup_id)
                     
         total_paradas_salvas = 0
         messages = []
@@ -426,19 +418,14 @@ def registrar_excel_lote_ajax():
                 continue
                 
             try:
-                condominio = Condominio.query.filter(func.lower(Condominio.nome) == func.lower(condo_name)).first()
-                if not condominio:
-                    condominio = Condominio(nome=condo_name)
-                    db.session.add(condominio)
-                    db.session.flush()
-                    logger.info(f"Condomínio '{condo_name}' criado automaticamente via AJAX lote paradas.")
+                condominio_id = obter_ou_criar_condominio_id(condo_name, get_entity_resolver())
                     
                 log_bruto = ExcelProcessor.generate_simulated_whatsapp_log_parada(parsed_data, condo_name)
                 if not log_bruto:
                     continue
                     
                 parada_data = {
-                    "condominio_id": str(condominio.id),
+                    "condominio_id": str(condominio_id),
                     "data_plantao": parsed_data.get("data_iso"),
                     "escala_plantao": parsed_data.get("escala_plantao"),
                     "log_bruto": log_bruto,
@@ -20,6 +20,7 @@ from app.models import Condominio, EscalaMensal, Ronda, User
 from app.services.ronda_routes_core.routes_service import RondaRoutesService
 from app.services.ronda_utils import get_system_user # Importa funções específicas
 from app.services.excel_processor import ExcelProcessor
+from app.services.entity_resolver import get_entity_resolver
 logger = logging.getLogger(__name__)
 
 ronda_bp = Blueprint(
@@ -328,13 +329,9 @@ def processar_whatsapp_ajax():
         # Tenta identificar o ID do supervisor pelo nome no cabeçalho do Excel (busca flexível)
         supervisor_id_db = "0"
         if parsed_data.get("supervisor"):
-            sup_name = parsed_data["supervisor"].strip().lower()
-            supervisors = User.query.filter_by(is_supervisor=True).all()
-            for s in supervisors:
-                username_lower = s.username.lower()
-                if sup_name in username_lower or username_lower in sup_name:
-                    supervisor_id_db = str(s.id)
-                    break
+            sup_id = get_entity_resolver().resolver_supervisor_id(parsed_data["supervisor"])
+            if sup_id:
+                supervisor_id_db = str(sup_id)
         
         return jsonify({
             'success': True,
@@ -431,55 +428,38 @@ def registrar_excel_lote_ajax():
         # Supervisor (busca flexível)
         supervisor_id_db = None
         if parsed_data.get("supervisor"):
-            sup_name = parsed_data["supervisor"].strip().lower()
-            supervisors = User.query.filter_by(is_supervisor=True).all()
-            for s in supervisors:
-                username_lower = s.username.lower()
-                if sup_name in username_lower or username_lower in sup_name:
-                    supervisor_id_db = str(s.id)
-                    break
+            sup_id = get_entity_resolver().resolver_supervisor_id(parsed_data["supervisor"])
+            if sup_id:
+                supervisor_id_db = str(sup_id)
                     
         total_rondas_salvas = 0
         messages = []
-        
+
+        # Condomínios ausentes são criados pelo próprio salvamento em lote
+        itens_lote = []
         for condo_name, rounds in parsed_data.get("condominios", {}).items():
             if not rounds:
                 continue
-                
-            try:
-                # Busca condomínio ou cria se não existir
-                condominio = Condominio.query.filter(func.lower(Condominio.nome) == func.lower(condo_name)).first()
-                if not condominio:
-                    condominio = Condominio(nome=condo_name)
-                    db.session.add(condominio)
-                    db.session.flush()
-                    logger.info(f"Condomínio '{condo_name}' criado automaticamente via AJAX lote.")
-                    
-                log_bruto = ExcelProcessor.generate_simulated_whatsapp_log(parsed_data, condo_name)
-                if not log_bruto:
-                    continue
-                    
-                ronda_data = {
-                    "condominio_id": str(condominio.id),
-                    "data_plantao": parsed_data.get("data_iso"),
-                    "escala_plantao": parsed_data.get("escala_plantao"),
-                    "log_bruto": log_bruto,
-                    "ronda_id": None,
-                    "supervisor_id": supervisor_id_db,
-                }
-                
-                success, message, status_code, ronda_id = RondaRoutesService.salvar_ronda(ronda_data, system_user)
-                
-                if success:
-                    total_rondas_salvas += 1
-                    messages.append(f"✅ <strong>{condo_name}</strong>: Ronda registrada com sucesso! ID: {ronda_id}")
-                else:
-                    messages.append(f"❌ <strong>{condo_name}</strong>: Falha ao registrar. Detalhes: {message}")
-            except Exception as e:
-                error_msg = f"Erro ao processar condomínio {condo_name}: {str(e)}"
-                messages.append(f"❌ <strong>{condo_name}</strong>: {error_msg}")
-                logger.error(error_msg, exc_info=True)
-                
+            log_bruto = ExcelProcessor.generate_simulated_whatsapp_log(parsed_data, condo_name)
+            if not log_bruto:
+                continue
+            itens_lote.append({
+                "nome_condominio": condo_name,
+                "data_plantao": parsed_data.get("data_iso"),
+                "escala_plantao": parsed_data.get("escala_plantao"),
+                "log_bruto": log_bruto,
+                "supervisor_id": supervisor_id_db,
+            })
+
+        resultados = RondaRoutesService.salvar_rondas_em_lote(itens_lote, system_user)
+        for item, resultado in zip(itens_lote, resultados):
+            condo_name = item["nome_condominio"]
+            if resultado["success"]:
+                total_rondas_salvas += 1
+                messages.append(f"✅ <strong>{condo_name}</strong>: Ronda registrada com sucesso! ID: {resultado['ronda_id']}")
+            else:
+                messages.append(f"❌ <strong>{condo_name}</strong>: Falha ao registrar. Detalhes: {resultado['message']}")
+
         if total_rondas_salvas > 0:
             return jsonify({
                 "success": True,
@@ -572,56 +552,38 @@ def upload_process_ronda():
             # Supervisor (busca flexível)
             supervisor_id_db = None
             if parsed_data.get("supervisor"):
-                sup_name = parsed_data["supervisor"].strip().lower()
-                supervisors = User.query.filter_by(is_supervisor=True).all()
-                for s in supervisors:
-                    username_lower = s.username.lower()
-                    if sup_name in username_lower or username_lower in sup_name:
-                        supervisor_id_db = str(s.id)
-                        break
+                sup_id = get_entity_resolver().resolver_supervisor_id(parsed_data["supervisor"])
+                if sup_id:
+                    supervisor_id_db = str(sup_id)
             
             total_rondas_salvas = 0
             messages = []
-            
+
+            itens_lote = []
             for condo_name, rounds in parsed_data.get("condominios", {}).items():
                 if not rounds:
                     continue
-                
-                try:
-                    # Busca condomínio ou cria se não existir
-                    condominio = Condominio.query.filter(func.lower(Condominio.nome) == func.lower(condo_name)).first()
-                    if not condominio:
-                        condominio = Condominio(nome=condo_name)
-                        db.session.add(condominio)
-                        db.session.flush()
-                        logger.info(f"Condomínio '{condo_name}' criado automaticamente.")
-                    
-                    log_bruto = ExcelProcessor.generate_simulated_whatsapp_log(parsed_data, condo_name)
-                    if not log_bruto:
-                        continue
-                    
-                    ronda_data = {
-                        "condominio_id": str(condominio.id),
-                        "data_plantao": parsed_data.get("data_iso"),
-                        "escala_plantao": parsed_data.get("escala_plantao"),
-                        "log_bruto": log_bruto,
-                        "ronda_id": None,
-                        "supervisor_id": supervisor_id_db,
-                    }
-                    
-                    success, message, status_code, ronda_id = RondaRoutesService.salvar_ronda(ronda_data, system_user)
-                    
-                    if success:
-                        total_rondas_salvas += 1
-                        messages.append(f"✅ Ronda para {condo_name} em {parsed_data.get('data_plantao')} registrada! ID: {ronda_id}")
-                    else:
-                        messages.append(f"❌ Falha ao registrar ronda para {condo_name}: {message}")
-                        logger.error(f"Erro ao salvar ronda via upload Excel: {message}")
-                except Exception as e:
-                    error_msg = f"Erro ao processar condomínio {condo_name}: {str(e)}"
-                    messages.append(f"❌ {error_msg}")
-                    logger.error(error_msg, exc_info=True)
-            
+                log_bruto = ExcelProcessor.generate_simulated_whatsapp_log(parsed_data, condo_name)
+                if not log_bruto:
+                    continue
+                itens_lote.append({
+                    "nome_condominio": condo_name,
+                    "data_plantao": parsed_data.get("data_iso"),
+                    "escala_plantao": parsed_data.get("escala_plantao"),
+                    "log_bruto": log_bruto,
+                    "supervisor_id": supervisor_id_db,
+                })
+
+            resultados = RondaRoutesService.salvar_rondas_em_lote(itens_lote, system_user)
+            for item, resultado in zip(itens_lote, resultados):
+                condo_name = item["nome_condominio"]
+                if resultado["success"]:
+                    total_rondas_salvas += 1
+                    messages.append(f"✅ Ronda para {condo_name} em {parsed_data.get('data_plantao')} registrada! ID: {resultado['ronda_id']}")
+                else:
+                    messages.append(f"❌ Falha ao registrar ronda para {condo_name}: {resultado['message']}")
+                    logger.error(f"Erro ao salvar ronda via upload Excel: {resultado['message']}")
+
             os.remove(temp_filepath)
             
             if total_rondas_salvas > 0:
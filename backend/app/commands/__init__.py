@@ -30,6 +30,9 @@ from .relatorios import (
     investigate_rondas_discrepancy_command,
     testar_dashboard_comparativo_command,
 )
+from .benchmark import benchmark_api_payloads_command, benchmark_parsers_command, benchmark_startup_command
+from .ocorrencias import reclassify_ocorrencias_command
+from .rondas import backfill_ronda_eventos_command, benchmark_event_matcher_command, reprocess_logs_command
 
 def register_commands(app):
     app.cli.add_command(seed_db_command)
@@ -60,4 +63,11 @@ def register_commands(app):
     app.cli.add_command(investigate_rondas_discrepancy_command)
     app.cli.add_command(testar_dashboard_comparativo_command)
     app.cli.add_command(logins_hoje_command)
-    app.cli.add_command(testar_fuso_horario_ocorrencia_command)
\ No newline at end of file
+    app.cli.add_command(testar_fuso_horario_ocorrencia_command)
+    app.cli.add_command(backfill_ronda_eventos_command)
+    app.cli.add_command(benchmark_event_matcher_command)
+    app.cli.add_command(reprocess_logs_command)
+    app.cli.add_command(benchmark_parsers_command)
+    app.cli.add_command(benchmark_startup_command)
+    app.cli.add_command(benchmark_api_payloads_command)
+    app.cli.add_command(reclassify_ocorrencias_command)
@@ -0,0 +1,171 @@
+# Arquivo para comandos de benchmark dos parsers e importadores
+import os
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+TAMANHO_MAXIMO = 1_000_000
+
+
+def _tamanhos(ctx, param, valor):
+    try:
+        tamanhos = [int(parte) for parte in valor.split(",") if parte.strip()]
+    except ValueError:
+        raise click.BadParameter("use inteiros separados por vírgula, ex.: 100,1000,10000")
+    if not tamanhos or any(t < 1 or t > TAMANHO_MAXIMO for t in tamanhos):
+        raise click.BadParameter(f"tamanhos devem estar entre 1 e {TAMANHO_MAXIMO:,}")
+    return tamanhos
+
+
+@click.command("benchmark-parsers")
+@click.option("--tamanhos", default="100,1000,10000", show_default=True, callback=_tamanhos,
+              help="Linhas de entrada por medição (até 1.000.000), separadas por vírgula.")
+@click.option("--caso", "casos", multiple=True,
+              help="Caso a medir (repetível; padrão: todos). Ex.: processar_log_de_rondas.")
+@click.option("--repeticoes", default=3, show_default=True, help="Execuções por medição (vale a melhor).")
+@click.option("--baseline", "baseline_path", default=None, type=click.Path(dir_okay=False),
+              help="Arquivo JSON de baseline (padrão: backend/benchmarks/baseline.json).")
+@click.option("--limite", default=0.25, show_default=True, help="Regressão tolerada (fração do tempo do baseline).")
+@click.option("--salvar-baseline", is_flag=True, help="Grava os resultados como novo baseline em vez de comparar.")
+@with_appcontext
+def benchmark_parsers_command(tamanhos, casos, repeticoes, baseline_path, limite, salvar_baseline):
+    """
+    Mede os parsers de ronda/parada, a importação de planilhas e a
+    classificação/extração de ocorrências sobre um corpus sintético
+    determinístico. Sai com código 1 se algum caso regredir além do limite.
+    """
+    from app.services.benchmark.suite import (
+        CASOS,
+        carregar_baseline,
+        comparar_com_baseline,
+        executar_suite,
+        salvar_baseline as gravar_baseline,
+    )
+
+    desconhecidos = set(casos) - set(CASOS)
+    if desconhecidos:
+        raise click.BadParameter(f"casos desconhecidos: {', '.join(sorted(desconhecidos))} (disponíveis: {', '.join(CASOS)})")
+    baseline_path = baseline_path or os.path.join(os.path.dirname(current_app.root_path), "benchmarks", "baseline.json")
+    baseline = carregar_baseline(baseline_path)
+
+    click.echo(f"⏱ Benchmark: tamanhos {tamanhos}, {repeticoes} repetições")
+
+    def mostrar(chave, resultado):
+        referencia = baseline.get("resultados", {}).get(chave)
+        comparacao = ""
+        if referencia and referencia.get("segundos"):
+            comparacao = f" (baseline {referencia['segundos']:.4f}s, {resultado['segundos'] / referencia['segundos'] - 1:+.1%})"
+        click.echo(f"   {chave}: {resultado['segundos']:.4f}s, {resultado['linhas_por_segundo']:,.0f} linhas/s{comparacao}")
+
+    resultados = executar_suite(tamanhos, casos=list(casos) or None, repeticoes=repeticoes, ao_medir=mostrar)
+
+    if salvar_baseline:
+        gravar_baseline(baseline_path, resultados, baseline)
+        click.echo(f"💾 Baseline gravado em {baseline_path}")
+        return
+    if not baseline:
+        click.echo(f"ℹ Sem baseline em {baseline_path}; use --salvar-baseline para criar um.")
+        return
+
+    regressoes = comparar_com_baseline(resultados, baseline, limite)
+    if not regressoes:
+        click.echo(f"✅ Nenhuma regressão acima de {limite:.0%}.")
+        return
+    for regressao in regressoes:
+        click.echo(
+            f"❌ {regressao['chave']}: {regressao['baseline']:.4f}s → {regressao['atual']:.4f}s ({regressao['variacao']:+.1%})"
+        )
+    click.get_current_context().exit(1)
+
+
+@click.command("benchmark-startup")
+@click.option("--config", "config_path", default=None,
+              help="Classe de configuração (ex.: config.ProductionConfig); padrão: a mesma do create_app().")
+@click.option("--repeticoes", default=3, show_default=True, help="Boots medidos (vale o melhor tempo).")
+@click.option("--max-boot-ms", default=None, type=float, help="Falha se o create_app passar deste tempo (ms).")
+@click.option("--max-rss-mb", default=None, type=float, help="Falha se o RSS após o boot passar deste valor (MB).")
+@click.option("--permitir", multiple=True, help="Módulo pesado tolerado no boot (repetível).")
+@click.option("--top", default=15, show_default=True, help="Quantos imports mais caros mostrar.")
+@click.option("--json", "saida_json", is_flag=True, help="Imprime o resultado em JSON (para CI).")
+def benchmark_startup_command(config_path, repeticoes, max_boot_ms, max_rss_mb, permitir, top, saida_json):
+    """
+    Mede o boot do worker em processos novos (create_app, RSS e
+    `-X importtime`) e sai com código 1 se estourar o orçamento ou se um
+    módulo pesado (SDK do Gemini, reportlab, docx, openpyxl...) for
+    carregado no boot.
+    """
+    import json
+
+    from app.services.benchmark.startup import medir_boot, verificar_orcamento
+
+    diretorio = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # backend/
+    resultado = medir_boot(diretorio, config=config_path, repeticoes=repeticoes, top=top)
+    violacoes = verificar_orcamento(resultado, max_boot_ms=max_boot_ms, max_rss_mb=max_rss_mb, permitir=permitir)
+
+    if saida_json:
+        click.echo(json.dumps({**resultado, "violacoes": violacoes}, ensure_ascii=False, indent=2))
+    else:
+        click.echo(
+            f"⏱ create_app: {resultado['boot_ms']:.0f} ms (melhor de {repeticoes}), "
+            f"RSS {resultado['rss_mb']:.1f} MB, {resultado['modulos_carregados']} módulos, "
+            f"imports {resultado['importacao_ms']:.0f} ms"
+        )
+        click.echo("   Imports de terceiros mais caros (tempo próprio):")
+        for modulo in resultado["mais_lentos"]:
+            click.echo(f"     {modulo['proprio_ms']:8.1f} ms  {modulo['modulo']}")
+        click.echo("   Módulos do app mais caros (cumulativo):")
+        for modulo in resultado["app_mais_lentos"]:
+            click.echo(f"     {modulo['cumulativo_ms']:8.1f} ms  {modulo['modulo']}")
+        for violacao in violacoes:
+            click.echo(f"❌ {violacao}")
+        if not violacoes:
+            click.echo("✅ Dentro do orçamento de inicialização.")
+    if violacoes:
+        click.get_current_context().exit(1)
+
+
+@click.command("benchmark-api-payloads")
+@click.option("--usuario", default=None, help="Username ou id do usuário autenticado (padrão: primeiro admin).")
+@click.option("--endpoint", "endpoints", multiple=True,
+              help="Endpoint a medir (repetível; padrão: os dos dashboards).")
+@click.option("--repeticoes", default=5, show_default=True, help="Requisições por medição (vale a mediana).")
+@click.option("--json", "saida_json", is_flag=True, help="Imprime o resultado em JSON.")
+@with_appcontext
+def benchmark_api_payloads_command(usuario, endpoints, repeticoes, saida_json):
+    """
+    Mede tamanho e latência dos payloads dos dashboards sem compressão,
+    com gzip e com brotli, e o custo de serializar cada um com a stdlib e
+    com orjson.
+    """
+    import json
+
+    from app.models import User
+    from app.services.benchmark.respostas import ENDPOINTS_DASHBOARD, medir_respostas
+
+    if usuario:
+        filtro = User.id == int(usuario) if usuario.isdigit() else User.username == usuario
+        user = User.query.filter(filtro).first()
+    else:
+        user = User.query.filter_by(is_admin=True).order_by(User.id).first()
+    if user is None:
+        raise click.BadParameter("usuário não encontrado (os endpoints de admin exigem um admin)", param_hint="--usuario")
+
+    linhas = medir_respostas(current_app._get_current_object(), user.id,
+                             endpoints=list(endpoints) or ENDPOINTS_DASHBOARD, repeticoes=repeticoes)
+    if saida_json:
+        click.echo(json.dumps(linhas, ensure_ascii=False, indent=2))
+        return
+
+    click.echo(f"📦 Payloads da API como {user.username} (mediana de {repeticoes} requisições)")
+    for linha in linhas:
+        b, lat, ser = linha["bytes"], linha["latencia_ms"], linha["serializacao_ms"]
+        click.echo(f"   {linha['endpoint']} [{linha['status']}]")
+        click.echo(
+            f"     bytes: {b['identity']:,} | gzip {b['gzip']:,} ({b['gzip'] / max(b['identity'], 1):.0%}) "
+            f"| br {b['br']:,} ({b['br'] / max(b['identity'], 1):.0%})"
+        )
+        click.echo(f"     latência: {lat['identity']:.1f} ms | gzip {lat['gzip']:.1f} ms | br {lat['br']:.1f} ms")
+        if ser:
+            orjson_ms = f" | orjson {ser['orjson']:.2f} ms" if "orjson" in ser else ""
+            click.echo(f"     serialização: stdlib {ser['stdlib']:.2f} ms{orjson_ms}")
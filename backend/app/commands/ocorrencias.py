@@ -1,2 +1,68 @@
 # Arquivo para comandos específicos de ocorrências
-# (Pode ser preenchido conforme surgirem comandos específicos) 
\ No newline at end of file
+import logging
+import multiprocessing
+
+import click
+from flask.cli import with_appcontext
+
+logger = logging.getLogger(__name__)
+
+
+@click.command("reclassify-ocorrencias")
+@click.option("--lote", "tamanho_lote", default=1000, show_default=True, help="Ocorrências lidas por lote.")
+@click.option("--workers", default=None, type=int, help="Processos paralelos (padrão: nº de CPUs; 1 = sem pool).")
+@click.option("--commit/--dry-run", "aplicar", default=False, show_default=True,
+              help="Grava os novos tipos (--commit) ou só calcula a matriz (--dry-run).")
+@click.option("--incluir-padrao", is_flag=True,
+              help="Textos sem palavra-chave vão para o tipo padrão (por padrão mantêm o tipo atual).")
+@click.option("--top", default=30, show_default=True, help="Mudanças (tipo atual → novo) listadas no resumo.")
+@click.option("--matriz-csv", "caminho_csv", default=None, type=click.Path(dir_okay=False),
+              help="Grava a matriz de confusão completa neste CSV.")
+@with_appcontext
+def reclassify_ocorrencias_command(tamanho_lote, workers, aplicar, incluir_padrao, top, caminho_csv):
+    """
+    Reclassifica as ocorrências gravadas com o MAPA_PALAVRAS_CHAVE_TIPO atual
+    e mostra a matriz de confusão tipo atual x tipo novo.
+    """
+    from app.services.reclassificacao_service import mudancas_da_matriz, reclassificar_ocorrencias, salvar_matriz_csv
+
+    click.echo(
+        f"🔄 Reclassificando ocorrências (lote={tamanho_lote}, workers={workers or multiprocessing.cpu_count()}, "
+        f"{'commit' if aplicar else 'dry-run'})"
+    )
+
+    def progresso(ultimo_id, resumo):
+        click.echo(f"   ✔ {resumo['processados']} processadas, {resumo['alterados']} com tipo novo (último id {ultimo_id})")
+
+    try:
+        resumo = reclassificar_ocorrencias(
+            tamanho_lote=tamanho_lote,
+            workers=workers,
+            aplicar=aplicar,
+            incluir_padrao=incluir_padrao,
+            ao_concluir_lote=progresso,
+        )
+    except Exception as e:
+        logger.error(f"Erro na reclassificação de ocorrências: {e}", exc_info=True)
+        click.echo(f"❌ Erro ao reclassificar: {e}. Os lotes anteriores já gravados permanecem.")
+        return
+
+    click.echo(
+        f"📊 {resumo['processados']} processadas, {resumo['alterados']} com tipo novo, "
+        f"{resumo['sem_palavra_chave']} sem palavra-chave"
+        f"{' (tipo padrão)' if incluir_padrao else ' (tipo mantido)'}"
+    )
+    mudancas = mudancas_da_matriz(resumo["matriz"])
+    if mudancas:
+        click.echo("   tipo atual → tipo novo:")
+        for antigo, novo, quantidade in mudancas[:top]:
+            click.echo(f"   {quantidade:>7}  {antigo} → {novo}")
+        if len(mudancas) > top:
+            click.echo(f"   ... mais {len(mudancas) - top} combinações")
+    for nome, quantidade in resumo["tipos_inexistentes"].most_common():
+        click.echo(f"   ⚠ '{nome}' não existe em ocorrencia_tipo ({quantidade} ocorrências mantidas)")
+    if caminho_csv:
+        salvar_matriz_csv(resumo["matriz"], caminho_csv)
+        click.echo(f"   matriz completa em {caminho_csv}")
+
+    click.echo("✅ Reclassificação gravada." if aplicar else "✅ Dry-run concluído; nada foi gravado.")
@@ -1,2 +1,177 @@
 # Arquivo para comandos específicos de rondas
-# (Pode ser preenchido conforme surgirem comandos específicos) 
\ No newline at end of file
+import logging
+import multiprocessing
+import os
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+
+@click.command("backfill-ronda-eventos")
+@click.option("--lote", "tamanho_lote", default=500, show_default=True, help="Rondas lidas por lote.")
+@click.option("--workers", default=None, type=int, help="Processos paralelos (padrão: nº de CPUs).")
+@click.option("--todas", is_flag=True, help="Reprocessa também rondas que já possuem eventos.")
+@with_appcontext
+def backfill_ronda_eventos_command(tamanho_lote, workers, todas):
+    """
+    Popula a tabela ronda_evento a partir de log_ronda_bruto.
+    O parsing roda em um pool de processos; a gravação é feita em bulk por lote.
+    """
+    from app.models import Condominio, Ronda
+    from app.services.reprocessamento_service import iterar_lotes_por_id
+    from app.services.ronda_evento_service import (
+        analisar_ronda_para_eventos,
+        inserir_linhas_ronda_evento,
+        remover_eventos_das_rondas,
+    )
+
+    query = db.session.query(
+        Ronda.id,
+        Ronda.log_ronda_bruto,
+        Condominio.nome,
+        Ronda.data_plantao_ronda,
+        Ronda.escala_plantao,
+    ).join(Condominio, Ronda.condominio_id == Condominio.id)
+    if not todas:
+        query = query.filter(~Ronda.eventos.any())
+
+    total_rondas = 0
+    total_eventos = 0
+    workers = workers or multiprocessing.cpu_count()
+    click.echo(f"🔄 Backfill de ronda_evento (lote={tamanho_lote}, workers={workers})")
+
+    with multiprocessing.Pool(processes=workers) as pool:
+        for lote in iterar_lotes_por_id(query, Ronda.id, tamanho_lote):
+            itens = [tuple(row) for row in lote]
+            resultados = pool.map(analisar_ronda_para_eventos, itens)
+            try:
+                remover_eventos_das_rondas(ronda_id for ronda_id, _ in resultados)
+                for _, linhas in resultados:
+                    total_eventos += inserir_linhas_ronda_evento(linhas)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                click.echo(f"❌ Erro ao gravar lote iniciado em {itens[0][0]}: {e}")
+                logger.error(f"Erro no backfill de ronda_evento: {e}", exc_info=True)
+                return
+            total_rondas += len(itens)
+            click.echo(f"   ✔ {total_rondas} rondas processadas, {total_eventos} eventos gravados (último id {itens[-1][0]})")
+
+    click.echo(f"✅ Backfill concluído: {total_rondas} rondas, {total_eventos} eventos.")
+
+
+@click.command("benchmark-event-matcher")
+@click.option("--arquivo", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Export do WhatsApp usado como corpus (padrão: corpus sintético).")
+@click.option("--linhas", "quantidade", default=20000, show_default=True, help="Tamanho do corpus sintético.")
+@click.option("--repeticoes", default=3, show_default=True, help="Passadas por medição (vale a melhor).")
+def benchmark_event_matcher_command(arquivo, quantidade, repeticoes):
+    """
+    Compara o EventMatcher com a busca sequencial original (ronda e parada):
+    verifica a equivalência sobre o corpus e mede linhas por segundo.
+    """
+    from app.services.event_matcher import (
+        comparar_com_busca_sequencial,
+        gerar_mensagens_sinteticas,
+        iterar_busca_sequencial,
+        medir_throughput,
+    )
+    from app.services.parada_logic import config as parada_config
+    from app.services.ronda_logic import config as ronda_config
+
+    if arquivo:
+        with open(arquivo, encoding="utf-8", errors="replace") as f:
+            mensagens = []
+            for linha in f:
+                match = ronda_config.REGEX_PREFIXO_LINHA.match(linha.strip())
+                mensagens.append(match.group(4).strip() if match else linha.strip())
+    else:
+        mensagens = gerar_mensagens_sinteticas(quantidade)
+    click.echo(f"📄 Corpus: {len(mensagens)} linhas ({arquivo or 'sintético'})")
+
+    cenarios = [
+        ("ronda", ronda_config.RONDA_EVENT_MATCHER, ronda_config.COMPILED_RONDA_EVENT_REGEXES),
+        (
+            "parada",
+            parada_config.PARADA_EVENT_MATCHER,
+            [p for p in parada_config.COMPILED_PARADA_EVENT_REGEXES if not p["keyword_only"]],
+        ),
+    ]
+    for nome, matcher, padroes in cenarios:
+        divergencias = comparar_com_busca_sequencial(matcher, padroes, mensagens)
+        sequencial = medir_throughput(lambda m: iterar_busca_sequencial(padroes, m), mensagens, repeticoes)
+        combinado = medir_throughput(matcher.iterar, mensagens, repeticoes)
+        click.echo(
+            f"   {nome}: sequencial {sequencial:,.0f} linhas/s | matcher {combinado:,.0f} linhas/s "
+            f"({combinado / sequencial:.2f}x) | divergências: {len(divergencias)}"
+        )
+        for mensagem, esperado, obtido in divergencias[:5]:
+            click.echo(f"      ⚠ {mensagem!r}: esperado {esperado}, obtido {obtido}")
+
+
+def _formatar_resumo_reprocessamento(tipo, resumo):
+    linhas = [
+        f"📊 {tipo}: {resumo['processados']} processados, {resumo['alterados']} alterados, {resumo['erros']} erros",
+        f"   relatórios alterados: {resumo['relatorios_alterados']}",
+        f"   totais alterados: {resumo['totais_alterados']} "
+        f"(↑ {resumo['totais_aumentaram']}, ↓ {resumo['totais_diminuiram']}, zerados {resumo['totais_zerados']}; "
+        f"saldo {resumo['delta_total']:+d})",
+        f"   durações alteradas: {resumo['duracoes_alteradas']} (saldo {resumo['delta_duracao_minutos']:+d} min)",
+    ]
+    maior = resumo["maior_variacao_total"]
+    if maior:
+        linhas.append(f"   maior variação: id {maior['id']} ({maior['antes']} → {maior['depois']})")
+    return "\n".join(linhas)
+
+
+@click.command("reprocess-logs")
+@click.option("--tipo", type=click.Choice(["rondas", "paradas", "todos"]), default="todos", show_default=True)
+@click.option("--lote", "tamanho_lote", default=500, show_default=True, help="Registros lidos por lote.")
+@click.option("--workers", default=None, type=int, help="Processos paralelos (padrão: nº de CPUs; 1 = sem pool).")
+@click.option("--checkpoint", "checkpoint_path", default=None, type=click.Path(dir_okay=False),
+              help="Arquivo de checkpoint (padrão: instance/reprocess_logs_checkpoint.json).")
+@click.option("--reiniciar", is_flag=True, help="Descarta o checkpoint e recomeça do primeiro id.")
+@click.option("--dry-run", is_flag=True, help="Só calcula as diferenças, sem gravar nada.")
+@with_appcontext
+def reprocess_logs_command(tipo, tamanho_lote, workers, checkpoint_path, reiniciar, dry_run):
+    """
+    Reprocessa os logs brutos gravados com as regras de parsing atuais e
+    atualiza relatório, totais e durações das linhas que mudaram.
+    Interrompido, retoma do checkpoint na próxima execução.
+    """
+    from app.services.reprocessamento_service import TIPOS, reprocessar_logs
+
+    checkpoint_path = checkpoint_path or os.path.join(current_app.instance_path, "reprocess_logs_checkpoint.json")
+    if reiniciar and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    tipos = TIPOS if tipo == "todos" else (tipo,)
+    click.echo(
+        f"🔄 Reprocessando {', '.join(tipos)} (lote={tamanho_lote}, workers={workers or multiprocessing.cpu_count()}"
+        f"{', dry-run' if dry_run else f', checkpoint={checkpoint_path}'})"
+    )
+
+    def progresso(tipo_atual, ultimo_id, resumo):
+        click.echo(f"   ✔ {tipo_atual}: {resumo['processados']} processados, {resumo['alterados']} alterados (último id {ultimo_id})")
+
+    for tipo_atual in tipos:
+        try:
+            resumo = reprocessar_logs(
+                tipo_atual,
+                tamanho_lote=tamanho_lote,
+                workers=workers,
+                checkpoint_path=checkpoint_path,
+                dry_run=dry_run,
+                ao_concluir_lote=progresso,
+            )
+        except Exception as e:
+            logger.error(f"Erro no reprocessamento de {tipo_atual}: {e}", exc_info=True)
+            click.echo(f"❌ Erro ao reprocessar {tipo_atual}: {e}. Execute novamente para retomar do checkpoint.")
+            return
+        click.echo(_formatar_resumo_reprocessamento(tipo_atual, resumo))
+
+    click.echo("✅ Reprocessamento concluído." if not dry_run else "✅ Dry-run concluído; nada foi gravado.")
@@ -1,82 +1,62 @@
 from flask import request, session, current_app
 from flask_login import current_user
-from flask_jwt_extended import get_jwt_identity
-from app.models.user_online import UserOnline
-from app.models.user import User
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from app.services.presence_service import get_presence_tracker
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _identificar_usuario():
+    """Retorna (user_id, session_id) do usuário autenticado via Flask-Login ou JWT, sem consultar o banco."""
+    # Só consulta o current_user se a sessão tiver login (evita o user_loader em requests da API)
+    if session.get("_user_id") and current_user.is_authenticated:
+        user_id = current_user.id
+        session_id = session.get("_id")
+    else:
+        try:
+            if not verify_jwt_in_request(optional=True):
+                return None, None
+            dados_jwt = get_jwt()
+        except Exception:
+            # JWT não válido ou não presente, continua normalmente
+            return None, None
+        user_id = int(dados_jwt["sub"])
+        session_id = dados_jwt.get("jti")
+
+    if not session_id:
+        bruto = f"{user_id}|{request.remote_addr}|{request.headers.get('User-Agent', '')}"
+        session_id = hashlib.sha1(bruto.encode()).hexdigest()
+    return user_id, str(session_id)
+
+
 def track_user_activity():
-    """Middleware para rastrear atividade dos usuários."""
+    """Middleware para rastrear atividade dos usuários (grava só no tier rápido de presença)."""
     try:
-        user_id = None
-        username = None
-        
-        # Verifica se usuário está autenticado via Flask-Login
-        if current_user.is_authenticated:
-            user_id = current_user.id
-            username = current_user.username
-        else:
-            # Verifica se usuário está autenticado via JWT
-            try:
-                jwt_user_id = get_jwt_identity()
-                if jwt_user_id:
-                    user = User.query.get(jwt_user_id)
-                    if user:
-                        user_id = user.id
-                        username = user.username
-            except Exception as jwt_error:
-                # JWT não válido ou não presente, continua normalmente
-                pass
-        
-        # Só rastreia se o usuário estiver autenticado
-        if user_id and username:
-            # Obtém informações da sessão e request
-            session_id = str(session.get('_id', hash(request.remote_addr + str(user_id))))
-            ip_address = request.remote_addr
-            user_agent = request.headers.get('User-Agent', '')
-            
-            # Log para debug (apenas em desenvolvimento)
-            if current_app.debug:
-                logger.debug(f"Rastreando atividade: User={username}, Session={session_id[:10]}...")
-            
-            # Atualiza atividade do usuário
-            # Evita tocar no banco em requests que não são da API/páginas úteis
-            if request.endpoint and not request.endpoint.startswith('static'):
-                UserOnline.update_activity(
-                    user_id=user_id,
-                    session_id=session_id,
-                    ip_address=ip_address,
-                    user_agent=user_agent
-                )
-            
-            # Log de sucesso para debug
-            if current_app.debug:
-                logger.debug(f"Atividade registrada com sucesso para {username}")
-            
-            # Limpa sessões antigas periodicamente (a cada 10% das requisições)
-            import random
-            if random.randint(1, 10) == 1 and request.endpoint and not request.endpoint.startswith('static'):
-                UserOnline.cleanup_old_sessions()
-        else:
-            # Log quando usuário não está autenticado
-            if current_app.debug:
-                logger.debug("Usuário não autenticado, pulando rastreamento")
-                
+        if not request.endpoint or request.endpoint.startswith('static'):
+            return
+
+        user_id, session_id = _identificar_usuario()
+        if not user_id:
+            return
+
+        registrado = get_presence_tracker().registrar_atividade(
+            user_id=user_id,
+            session_id=session_id,
+            ip_address=request.remote_addr,
+            user_agent=request.headers.get('User-Agent', ''),
+        )
+        if registrado and current_app.debug:
+            logger.debug(f"Atividade registrada: User={user_id}, Session={session_id[:10]}...")
+
     except Exception as e:
         logger.error(f"Erro ao rastrear atividade do usuário: {e}")
-        # Log mais detalhado em caso de erro
-        try:
-            if current_user.is_authenticated:
-                logger.error(f"Detalhes do erro - User ID: {current_user.id}, Session: {session.get('_id', 'N/A')}")
-            else:
-                logger.error("Erro ocorreu com usuário não autenticado")
-        except:
-            logger.error("Erro ao obter detalhes do usuário para log")
 
-def get_online_users_count():
-    return 0
 
-def get_online_users_list():
-    return []
\ No newline at end of file
+def get_online_users_count(minutes_threshold=15):
+    return len(get_online_users_list(minutes_threshold))
+
+
+def get_online_users_list(minutes_threshold=15):
+    return get_presence_tracker().listar_online(minutes_threshold)
@@ -2,6 +2,7 @@ from .user import User
 from .colaborador import Colaborador
 from .condominio import Condominio
 from .ronda import Ronda
+from .ronda_evento import RondaEvento
 from .parada import Parada
 from .processing_history import ProcessingHistory
 from .escala_mensal import EscalaMensal
@@ -39,6 +39,13 @@ class Ronda(db.Model):
     tipo = db.Column(db.String(50), nullable=True, default="tradicional")  # tradicional, esporadica
     status = db.Column(db.String(50), nullable=True, default="Agendada")
 
+    __table_args__ = (
+        db.UniqueConstraint(
+            "condominio_id", "data_plantao_ronda", "turno_ronda",
+            name="uq_ronda_condominio_data_turno",
+        ),
+    )
+
     condominio = db.relationship("Condominio", backref="rondas")
     
     # Relacionamentos com User (criador e supervisor)
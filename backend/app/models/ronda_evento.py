@@ -0,0 +1,27 @@
+from app import db
+
+
+class RondaEvento(db.Model):
+    """Ronda individual (par início/término) extraída do log de uma Ronda."""
+    __tablename__ = "ronda_evento"
+    id = db.Column(db.Integer, primary_key=True)
+    ronda_id = db.Column(
+        db.Integer,
+        db.ForeignKey("ronda.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    vtr = db.Column(db.String(30), nullable=True, index=True)
+    inicio = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+    termino = db.Column(db.DateTime(timezone=True), nullable=True)
+    duracao_min = db.Column(db.Integer, nullable=True)
+    # completa, sem_termino, sem_inicio, horario_invalido
+    status = db.Column(db.String(20), nullable=False, default="completa", index=True)
+
+    ronda = db.relationship(
+        "Ronda",
+        backref=db.backref("eventos", lazy="dynamic", cascade="all, delete-orphan", passive_deletes=True),
+    )
+
+    def __repr__(self) -> str:
+        return f'<RondaEvento {self.id} ronda={self.ronda_id} {self.vtr} {self.status}>'
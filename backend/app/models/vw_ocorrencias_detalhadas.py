@@ -13,4 +13,5 @@ class VWOcorrenciasDetalhadas(db.Model):
     condominio = db.Column(db.String)
     registrado_por = db.Column(db.String)
     supervisor = db.Column(db.String)
-    relatorio_final = deferred(db.Column(db.Text)) 
\ No newline at end of file
+    relatorio_final = deferred(db.Column(db.Text))
+    data_modificacao = db.Column(db.DateTime) 
\ No newline at end of file
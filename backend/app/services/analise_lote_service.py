@@ -0,0 +1,160 @@
+# app/services/analise_lote_service.py
+"""
+Análise de vários relatórios brutos em uma requisição (fim de plantão: os
+supervisores colam 20-30 relatórios de uma vez).
+
+1. Cada texto é classificado localmente (`classificar_ocorrencia`), sem IA.
+2. Os itens são empacotados em lotes que cabem em ANALISE_LOTE_TOKENS_POR_CHAMADA
+   (entrada + saída estimada) e ANALISE_LOTE_MAX_ITENS_POR_CHAMADA. Cada lote
+   vira um único prompt: as regras do relatório patrimonial seguidas de um
+   array JSON `[{"id", "relatorio_bruto"}]`, pedindo de volta um array
+   `[{"id", "relatorio_processado"}]`.
+3. Os lotes vão ao Gemini em paralelo (ANALISE_LOTE_CONCORRENCIA threads),
+   todos sob o limite de uso compartilhado das chaves do BaseGenerativeService.
+4. A resposta é separada por id. Itens que faltarem (ou um lote cuja
+   resposta não seja JSON) são refeitos um a um com o prompt individual.
+5. O histórico (ProcessingHistory) é gravado em um único INSERT em lote.
+"""
+import json
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from sqlalchemy import insert
+
+from app import db
+from app.models.processing_history import ProcessingHistory
+from app.utils.classificador import classificar_ocorrencia
+
+from .patrimonial_report_service import PatrimonialReportService
+
+# Português fica perto de 4 caracteres por token; 3,5 deixa margem
+CARACTERES_POR_TOKEN = 3.5
+# O relatório final sai maior que o bruto (modelo com campos fixos)
+FATOR_SAIDA = 1.5
+TAMANHO_MAXIMO_ERRO = 255  # ProcessingHistory.error_message
+
+_CERCA_CODIGO = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+
+
+def estimar_tokens(texto: str) -> int:
+    return math.ceil(len(texto) / CARACTERES_POR_TOKEN)
+
+
+def empacotar_itens(itens: list, tokens_por_chamada: int, max_itens: int) -> list:
+    """
+    Divide os itens em lotes, em ordem, sem passar do orçamento de tokens
+    (entrada + saída estimada) nem de `max_itens`. Um item que sozinho
+    estoura o orçamento vai em um lote só dele.
+    """
+    lotes, atual, custo_atual = [], [], 0
+    for item in itens:
+        custo = math.ceil(estimar_tokens(json.dumps(item, ensure_ascii=False)) * (1 + FATOR_SAIDA))
+        if atual and (custo_atual + custo > tokens_por_chamada or len(atual) >= max_itens):
+            lotes.append(atual)
+            atual, custo_atual = [], 0
+        atual.append(item)
+        custo_atual += custo
+    if atual:
+        lotes.append(atual)
+    return lotes
+
+
+def separar_resposta(texto: str) -> dict:
+    """
+    Array JSON da IA -> {str(id): relatorio_processado} (o modelo às vezes
+    devolve o id como texto); ValueError se não for o formato pedido.
+    """
+    dados = json.loads(_CERCA_CODIGO.sub("", texto or ""))
+    if not isinstance(dados, list):
+        raise ValueError("a resposta do lote não é um array JSON")
+    return {
+        str(item.get("id")): item["relatorio_processado"].strip()
+        for item in dados
+        if isinstance(item, dict) and isinstance(item.get("relatorio_processado"), str)
+        and item["relatorio_processado"].strip()
+    }
+
+
+class AnaliseLoteService(PatrimonialReportService):
+    """Relatório patrimonial de vários textos com poucos prompts e chamadas concorrentes."""
+
+    def __init__(self, model_name="gemini-2.5-flash", template_lote="patrimonial_security_report_lote_template.txt"):
+        super().__init__(model_name=model_name)
+        self._template_prompt(template_lote)  # valida já na construção
+        self._nome_template_lote = template_lote
+        config = current_app.config
+        self.tokens_por_chamada = config.get("ANALISE_LOTE_TOKENS_POR_CHAMADA", 8000)
+        self.max_itens_por_chamada = config.get("ANALISE_LOTE_MAX_ITENS_POR_CHAMADA", 8)
+        self.concorrencia = max(1, config.get("ANALISE_LOTE_CONCORRENCIA", 3))
+        # Os lotes concorrentes esperam a vez da chave em vez de cair direto para a próxima
+        self._espera_maxima_intervalo = config.get("ANALISE_LOTE_ESPERA_MAXIMA", 30)
+
+    def _construir_prompt_lote(self, itens: list) -> str:
+        return self._template_prompt(self._nome_template_lote).render(itens_json=json.dumps(itens, ensure_ascii=False, indent=1))
+
+    def _processar_lote(self, app, itens: list) -> dict:
+        """Roda em uma thread do pool: {id: (relatorio_processado | None, erro | None)}."""
+        with app.app_context():
+            resultados, pendentes = {}, itens
+            if len(itens) > 1:
+                try:
+                    processados = separar_resposta(self._call_generative_model(self._construir_prompt_lote(itens)))
+                    for item in itens:
+                        if str(item["id"]) in processados:
+                            resultados[item["id"]] = (processados[str(item["id"])], None)
+                    pendentes = [item for item in itens if item["id"] not in resultados]
+                except (ValueError, TypeError) as e:
+                    self.logger.warning(f"Resposta do lote de {len(itens)} itens fora do formato ({e}); refazendo um a um.")
+                except RuntimeError as e:
+                    return {item["id"]: (None, str(e)) for item in itens}
+            for item in pendentes:
+                try:
+                    resultados[item["id"]] = (self.gerar_relatorio_seguranca(item["relatorio_bruto"]), None)
+                except (ValueError, RuntimeError) as e:
+                    resultados[item["id"]] = (None, str(e))
+            return resultados
+
+    def processar(self, textos: list, user_id: int) -> dict:
+        """
+        Classifica e processa `textos`, grava o histórico em lote e devolve
+        {'resultados': [...na ordem de entrada...], 'resumo': {...}}.
+        """
+        itens = [{"id": i, "relatorio_bruto": texto} for i, texto in enumerate(textos, start=1)]
+        classificacoes = [classificar_ocorrencia(texto) for texto in textos]
+        lotes = empacotar_itens(itens, self.tokens_por_chamada, self.max_itens_por_chamada)
+        self.logger.info(f"Análise em lote: {len(itens)} relatórios em {len(lotes)} chamadas.")
+
+        app = current_app._get_current_object()
+        processados = {}
+        with ThreadPoolExecutor(max_workers=min(self.concorrencia, len(lotes))) as executor:
+            for parcial in executor.map(lambda lote: self._processar_lote(app, lote), lotes):
+                processados.update(parcial)
+
+        resultados = []
+        for item, classificacao in zip(itens, classificacoes):
+            relatorio, erro = processados[item["id"]]
+            resultados.append({
+                "classificacao": classificacao,
+                "relatorio_processado": relatorio,
+                "sucesso": erro is None,
+                "erro": erro,
+            })
+
+        db.session.execute(insert(ProcessingHistory), [
+            {
+                "user_id": user_id,
+                "processing_type": "patrimonial_report",
+                "success": r["sucesso"],
+                "error_message": r["erro"][:TAMANHO_MAXIMO_ERRO] if r["erro"] else None,
+            }
+            for r in resultados
+        ])
+        db.session.commit()
+
+        sucesso = sum(1 for r in resultados if r["sucesso"])
+        return {
+            "resultados": resultados,
+            "resumo": {"total": len(resultados), "sucesso": sucesso, "falhas": len(resultados) - sucesso, "lotes": len(lotes)},
+        }
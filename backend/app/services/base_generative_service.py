@@ -2,15 +2,58 @@
 import hashlib  # <-- NOVA IMPORTAÇÃO para criar chaves de cache estáveis
 import logging
 import os
+import threading
 import time
 from datetime import datetime, timedelta
 from flask import request, current_app
 from flask_login import current_user
 
-import google.generativeai as genai
-
 from app import cache, db  # <-- NOVA IMPORTAÇÃO
 from app.models.gemini_usage import GeminiUsageLog  # <-- NOVA IMPORTAÇÃO
+from app.services.container_servicos import obter_ambiente_prompts
+
+_USO_API_COMPARTILHADO = {
+    "GOOGLE_API_KEY_1": {"last_used": None, "daily_count": 0, "last_reset": None},
+    "GOOGLE_API_KEY_2": {"last_used": None, "daily_count": 0, "last_reset": None}
+}
+_USO_API_LOCK = threading.Lock()
+
+# genai.configure() troca a API key do processo inteiro: com chamadas
+# concorrentes (AnaliseLoteService, fila de IA) uma thread sobrescreveria a
+# chave da outra. Cada chamada usa um cliente preso à sua própria key.
+_CLIENTES_GEMINI = {}
+_CLIENTES_GEMINI_LOCK = threading.Lock()
+
+
+def _cliente_gemini(api_key: str):
+    """Cliente GenerativeService (reaproveitado) configurado só com esta API key."""
+    with _CLIENTES_GEMINI_LOCK:
+        cliente = _CLIENTES_GEMINI.get(api_key)
+        if cliente is None:
+            import google.ai.generativelanguage as glm
+            from google.api_core import client_options as client_options_lib
+
+            cliente = glm.GenerativeServiceClient(
+                client_options=client_options_lib.ClientOptions(api_key=api_key)
+            )
+            _CLIENTES_GEMINI[api_key] = cliente
+        return cliente
+
+
+def _gerar_conteudo(cliente, model_name: str, prompt: str):
+    """
+    generateContent direto no cliente da key, sem passar por GenerativeModel
+    (que só aceita o cliente global de genai.configure). A resposta é
+    embrulhada no mesmo tipo que GenerativeModel devolve (.text, .prompt_feedback).
+    """
+    import google.ai.generativelanguage as glm
+    from google.generativeai.types import generation_types
+
+    requisicao = glm.GenerateContentRequest(
+        model=f"models/{model_name}",
+        contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+    )
+    return generation_types.GenerateContentResponse.from_response(cliente.generate_content(requisicao))
 
 
 class BaseGenerativeService:
@@ -20,17 +63,17 @@ class BaseGenerativeService:
         self.model_name = model_name
         self._google_api_key = None
         
-        # Rate limiting para APIs Gemini
-        self._api_usage = {
-            "GOOGLE_API_KEY_1": {"last_used": None, "daily_count": 0, "last_reset": None},
-            "GOOGLE_API_KEY_2": {"last_used": None, "daily_count": 0, "last_reset": None}
-        }
+        # Rate limiting para APIs Gemini: o uso das chaves é compartilhado por
+        # todos os serviços do processo (chamadas concorrentes respeitam o mesmo limite)
+        self._api_usage = _USO_API_COMPARTILHADO
         
         # Limites de rate (ajuste conforme necessário)
         self._rate_limits = {
             "requests_per_day": 45,  # Deixe margem de segurança
             "min_interval_seconds": 2  # Intervalo mínimo entre requisições
         }
+        # Quanto esperar pela vez da chave antes de desistir dela e tentar a próxima
+        self._espera_maxima_intervalo = self._rate_limits["min_interval_seconds"]
 
         try:
             # Tenta usar GOOGLE_API_KEY_1 primeiro, depois GOOGLE_API_KEY_2 como fallback
@@ -46,8 +89,12 @@ class BaseGenerativeService:
                     "API Key do Google (GOOGLE_API_KEY_1 ou GOOGLE_API_KEY_2) não configurada nas variáveis de ambiente."
                 )
 
-            # Configura a API key
-            genai.configure(api_key=self._google_api_key)
+            # Importação tardia: google.generativeai (e o grpc por baixo) leva
+            # quase 1s para carregar e só é necessário quando um serviço de IA é usado.
+            # A key não é configurada aqui (genai.configure é global ao processo):
+            # cada chamada usa o cliente da sua key (_cliente_gemini).
+            import google.generativeai as genai
+
             self.client = genai
             self.logger.info(
                 "Configuração da API Key do Google bem-sucedida para o serviço."
@@ -71,6 +118,21 @@ class BaseGenerativeService:
                 f"Falha catastrófica na inicialização do serviço de IA: {e}"
             ) from e
 
+    # Nome do template de prompt do serviço (definido pelas subclasses)
+    _nome_template = None
+
+    @property
+    def _template(self):
+        """
+        Template de prompt buscado no Environment do app a cada uso (em produção
+        é uma consulta ao cache do Environment). O serviço é único por worker:
+        guardar o objeto Template impediria a recarga automática em DEBUG.
+        """
+        return self._template_prompt(self._nome_template) if self._nome_template else None
+
+    def _template_prompt(self, nome_template: str):
+        return obter_ambiente_prompts().get_template(nome_template)
+
     def _log_api_usage(self, api_key_name: str, prompt_length: int, response_length: int = None, 
                       cache_hit: bool = False, success: bool = True, error_message: str = None):
         """Registra o uso da API no banco de dados."""
@@ -116,33 +178,48 @@ class BaseGenerativeService:
             db.session.rollback()
 
     def _check_rate_limit(self, api_key_name: str) -> bool:
-        """Verifica se a API key pode ser usada baseado no rate limiting."""
-        now = datetime.now()
-        usage = self._api_usage[api_key_name]
-        
-        # Reset diário se necessário
-        if usage["last_reset"] is None or (now - usage["last_reset"]).days >= 1:
-            usage["daily_count"] = 0
-            usage["last_reset"] = now
-            self.logger.info(f"🔄 Reset diário do contador para {api_key_name}")
-        
-        # Verifica limite diário
-        if usage["daily_count"] >= self._rate_limits["requests_per_day"]:
-            self.logger.warning(f"⚠️ Limite diário atingido para {api_key_name}: {usage['daily_count']}/{self._rate_limits['requests_per_day']}")
-            return False
-        
-        # Verifica intervalo mínimo
-        if usage["last_used"] and (now - usage["last_used"]).total_seconds() < self._rate_limits["min_interval_seconds"]:
-            self.logger.warning(f"⚠️ Intervalo mínimo não respeitado para {api_key_name}")
-            return False
-        
-        return True
+        """
+        Verifica se a API key pode ser usada baseado no rate limiting e, se
+        puder, reserva a vez dela (outra thread passa a contar o intervalo a
+        partir desta chamada). Espera até `_espera_maxima_intervalo` segundos
+        pelo intervalo mínimo antes de desistir da chave.
+        """
+        prazo = time.monotonic() + self._espera_maxima_intervalo
+        while True:
+            with _USO_API_LOCK:
+                now = datetime.now()
+                usage = self._api_usage[api_key_name]
+
+                # Reset diário se necessário
+                if usage["last_reset"] is None or (now - usage["last_reset"]).days >= 1:
+                    usage["daily_count"] = 0
+                    usage["last_reset"] = now
+                    self.logger.info(f"🔄 Reset diário do contador para {api_key_name}")
+
+                # Verifica limite diário
+                if usage["daily_count"] >= self._rate_limits["requests_per_day"]:
+                    self.logger.warning(f"⚠️ Limite diário atingido para {api_key_name}: {usage['daily_count']}/{self._rate_limits['requests_per_day']}")
+                    return False
+
+                # Verifica intervalo mínimo
+                espera = 0
+                if usage["last_used"]:
+                    espera = self._rate_limits["min_interval_seconds"] - (now - usage["last_used"]).total_seconds()
+                if espera <= 0:
+                    usage["last_used"] = now
+                    return True
+
+            if time.monotonic() + espera > prazo:
+                self.logger.warning(f"⚠️ Intervalo mínimo não respeitado para {api_key_name}")
+                return False
+            time.sleep(espera)
 
     def _update_usage(self, api_key_name: str):
         """Atualiza o contador de uso da API key."""
-        now = datetime.now()
-        self._api_usage[api_key_name]["last_used"] = now
-        self._api_usage[api_key_name]["daily_count"] += 1
+        with _USO_API_LOCK:
+            now = datetime.now()
+            self._api_usage[api_key_name]["last_used"] = now
+            self._api_usage[api_key_name]["daily_count"] += 1
         self.logger.info(f"📊 Uso atualizado para {api_key_name}: {self._api_usage[api_key_name]['daily_count']}/{self._rate_limits['requests_per_day']}")
 
     def _generate_cache_key(self, prompt_final: str) -> str:
@@ -154,7 +231,6 @@ class BaseGenerativeService:
     # APLICAÇÃO DO CACHE COM O DECORATOR @cache.memoize
     @cache.memoize(timeout=3600)  # Cache por 1 hora
     def _call_generative_model(self, prompt_final: str) -> str:
-        import google.generativeai as genai
         import os
         
         # Log detalhado do cache
@@ -187,8 +263,8 @@ class BaseGenerativeService:
                 continue
                 
             try:
-                # Configura a API key específica
-                genai.configure(api_key=api_key)
+                # Cliente preso à API key específica (sem genai.configure global)
+                cliente = _cliente_gemini(api_key)
                 self.logger.info(f"🔑 Usando {api_key_name} para chamada Gemini.")
                 
                 # Sistema de fallback inteligente para modelos
@@ -207,8 +283,7 @@ class BaseGenerativeService:
                 for model_name in models_to_try:
                     try:
                         self.logger.info(f"🤖 Tentando modelo {model_name} com {api_key_name}")
-                        model = genai.GenerativeModel(model_name)
-                        response = model.generate_content(prompt_final)
+                        response = _gerar_conteudo(cliente, model_name, prompt_final)
                         used_model = model_name
                         self.logger.info(f"✅ Sucesso com modelo {model_name}")
                         break
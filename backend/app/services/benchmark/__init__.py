@@ -0,0 +1,3 @@
+# app/services/benchmark/__init__.py
+from .corpus import gerar_log_whatsapp, gerar_planilha_rondas, gerar_textos_ocorrencia
+from .suite import CASOS, carregar_baseline, comparar_com_baseline, executar_suite, salvar_baseline
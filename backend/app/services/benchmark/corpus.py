@@ -0,0 +1,152 @@
+# app/services/benchmark/corpus.py
+"""
+Gerador determinístico de entradas realistas para o benchmark: logs de
+WhatsApp de rondas/paradas, planilhas de rondas (.xlsx) e textos de
+ocorrência. A mesma `seed` e o mesmo tamanho geram sempre a mesma entrada.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from app.classificador_config import MAPA_PALAVRAS_CHAVE_TIPO
+from app.services.event_matcher import gerar_mensagens_sinteticas
+
+SEED_PADRAO = 34
+DATA_PLANTAO_PADRAO = date(2025, 7, 1)
+ESCALA_PADRAO = "18h às 06h"  # Atravessa a meia-noite
+CONDOMINIO_PADRAO = "Residencial Benchmark"
+
+_VTRS = ["VTR 05", "VTR 09", "VTR 12", "Águia 04", "Águia 2"]
+_REMETENTES = ["Supervisor João", "Douglas VTR 09 x", "Central"]
+_SEM_EVENTO = ["QRA fulano", "Data: 03/04/2025", "Sem alteração", "<Mídia oculta>", "Portão 3 ok"]
+_LOCAIS = ["Rua das Flores, 120", "Av. Brasil, 455 - Bloco B", "Portaria principal", "Quadra 7, lote 12"]
+_NOMES = ["Carlos Souza", "Marcos Lima", "Ana Pereira", "Joana Alves", "Pedro Rocha"]
+
+
+def _inicio_plantao(data_plantao, escala):
+    hora = 18 if escala.startswith("18") else 6
+    return datetime(data_plantao.year, data_plantao.month, data_plantao.day, hora)
+
+
+def _prefixar(rnd, quando, remetente, mensagem):
+    """Aplica um dos formatos de linha do export do WhatsApp."""
+    hora, data = quando.strftime("%H:%M"), quando.strftime("%d/%m/%Y")
+    sorteio = rnd.random()
+    if sorteio < 0.70:
+        return f"[{hora}, {data}] {remetente}: {mensagem}"
+    if sorteio < 0.80:
+        return f"\\[{hora}, {quando.strftime('%d/%m/%y')}\\] {remetente}: {mensagem}"
+    return f"{data} {hora} - {rnd.choice(_REMETENTES + [remetente])}: {mensagem}"
+
+
+def gerar_log_whatsapp(
+    linhas: int,
+    tipo: str = "rondas",
+    seed: int = SEED_PADRAO,
+    data_plantao: date = DATA_PLANTAO_PADRAO,
+    escala: str = ESCALA_PADRAO,
+) -> str:
+    """
+    Log com `linhas` linhas dentro do plantão (12h a partir do início da
+    escala, cruzando a meia-noite no noturno). Cerca de metade das linhas são
+    pares de início/término de ronda (ou de parada, com `tipo="paradas"`); o
+    resto é conversa comum, linhas só com a VTR e continuações sem prefixo.
+    """
+    rnd = random.Random(seed)
+    ruido = gerar_mensagens_sinteticas(500, seed=seed, proporcao_ruido=1.0)
+    evento = "ronda" if tipo == "rondas" else "parada"
+    inicio = _inicio_plantao(data_plantao, escala)
+    minutos_plantao = 12 * 60 - 1
+
+    resultado = []
+    pendentes = {}  # VTR -> hora de início ainda sem término
+    while len(resultado) < linhas:
+        quando = inicio + timedelta(minutes=len(resultado) * minutos_plantao // max(linhas, 1))
+        vtr = rnd.choice(_VTRS)
+        sorteio = rnd.random()
+        if sorteio < 0.50:
+            if vtr in pendentes:
+                mensagem = f"Término {evento} {quando.strftime('%H:%M')}"
+                del pendentes[vtr]
+            else:
+                mensagem = f"Início {evento} {quando.strftime('%H:%M')}"
+                pendentes[vtr] = quando
+            resultado.append(_prefixar(rnd, quando, vtr, mensagem))
+        elif sorteio < 0.80:
+            resultado.append(_prefixar(rnd, quando, vtr, rnd.choice(ruido)))
+        elif sorteio < 0.88:
+            resultado.append(vtr)
+        elif sorteio < 0.95:
+            resultado.append(rnd.choice(_SEM_EVENTO))
+        else:
+            resultado.append("")
+    return "\n".join(resultado)
+
+
+def gerar_planilha_rondas(caminho: str, linhas: int, seed: int = SEED_PADRAO, data_plantao: date = DATA_PLANTAO_PADRAO) -> str:
+    """
+    Grava em `caminho` uma planilha no layout lido por
+    `ExcelProcessor.parse_excel_file` (aba "Rondas", cabeçalho com
+    supervisor/turno/data e blocos "Residencial:" ... "Total") com cerca de
+    `linhas` linhas. Retorna o caminho.
+    """
+    import openpyxl
+
+    rnd = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Rondas")
+    ws.append([f"Supervisor: {rnd.choice(_NOMES)} | Turno: Noturno 18:00 às 06:00"])
+    ws.append([f"Data: {data_plantao.strftime('%d/%m/%Y')}"])
+    ws.append([])
+
+    escritas, condominio = 3, 0
+    while escritas < linhas:
+        condominio += 1
+        ws.append([f"Residencial: Condomínio {condominio:04d}"])
+        ws.append(["Ronda", "Início", "Término", "Duração", "VTR/Agente"])
+        escritas += 2
+        inicio = _inicio_plantao(data_plantao, ESCALA_PADRAO) + timedelta(minutes=rnd.randint(0, 30))
+        for numero in range(1, rnd.randint(4, 12) + 1):
+            if escritas >= linhas - 1:
+                break
+            duracao = rnd.randint(5, 50)
+            termino = inicio + timedelta(minutes=duracao)
+            ws.append([
+                f"Ronda {numero}",
+                inicio.strftime("%H:%M"),
+                termino.strftime("%H:%M") if rnd.random() > 0.05 else "--",
+                f"{duracao} min",
+                f"MT-{rnd.randint(1, 15):02d}",
+            ])
+            escritas += 1
+            inicio = termino + timedelta(minutes=rnd.randint(10, 90))
+        ws.append(["Total"])
+        escritas += 1
+    wb.save(caminho)
+    return caminho
+
+
+def gerar_textos_ocorrencia(quantidade: int, seed: int = SEED_PADRAO) -> list:
+    """
+    Textos de ocorrência no formato colado pelos supervisores (Data/Hora/
+    Local/Relato/Responsável), com palavras-chave de tipos variados do
+    classificador e, às vezes, nenhuma.
+    """
+    rnd = random.Random(seed)
+    palavras = [palavra for lista in MAPA_PALAVRAS_CHAVE_TIPO.values() for palavra in lista]
+    textos = []
+    for _ in range(quantidade):
+        quando = datetime(2025, 7, 1) + timedelta(minutes=rnd.randint(0, 60 * 24 * 60))
+        relato = " ".join(rnd.choice(["Morador informou", "Agente constatou", "Em ronda, verificou-se"]) for _ in range(2))
+        if rnd.random() < 0.85:
+            relato += f" {rnd.choice(palavras)} próximo ao portão."
+        textos.append(
+            "\n".join([
+                f"Data: {quando.strftime('%d/%m/%Y')}",
+                f"Hora: {quando.strftime('%H:%M')}",
+                f"Local: {rnd.choice(_LOCAIS)}",
+                f"Ocorrência: {relato}",
+                f"Ações realizadas: acionado {rnd.choice(['supervisor', 'morador', 'PM'])}.",
+                f"Responsável pelo registro: Agente {rnd.choice(_NOMES)}",
+            ])
+        )
+    return textos
@@ -0,0 +1,79 @@
+# app/services/benchmark/respostas.py
+"""
+Tamanho e latência dos payloads dos dashboards, sem e com compressão.
+
+Cada endpoint é chamado pelo test client do próprio app (pilha completa:
+JWT, queries, serialização e o `after_request` de compressão) com
+`Accept-Encoding` identity, gzip e br, e o corpo devolvido é medido como
+sai para a rede. O JSON também é re-serializado com o `json` da stdlib e
+com orjson para isolar o ganho do encoder.
+
+Os números dependem do banco configurado: rode contra uma cópia com volume
+de produção para que as séries (dia × supervisor) tenham o tamanho real.
+"""
+import json
+import statistics
+import time
+
+from flask_jwt_extended import create_access_token
+
+ENDPOINTS_DASHBOARD = (
+    "/api/dashboard/stats",
+    "/api/dashboard/chart-data",
+    "/api/dashboard/recent-ocorrencias?limit=100",
+    "/api/dashboard/recent-rondas?limit=100",
+    "/api/dashboard/comparativo",
+    "/api/admin/dashboard/comparativo",
+    "/api/admin/dashboard/ocorrencias",
+    "/api/admin/dashboard/rondas",
+    "/api/paradas/dashboard",
+)
+CODIFICACOES = ("identity", "gzip", "br")
+
+
+def _mediana_ms(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(max(1, repeticoes)):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def medir_serializacao(obj, repeticoes: int = 5) -> dict:
+    """Mediana (ms) de `json.dumps` da stdlib e de `orjson.dumps` (se instalado)."""
+    resultado = {"stdlib": _mediana_ms(lambda: json.dumps(obj, ensure_ascii=False), repeticoes)}
+    try:
+        import orjson
+    except ImportError:
+        return resultado
+    resultado["orjson"] = _mediana_ms(lambda: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), repeticoes)
+    return resultado
+
+
+def medir_endpoint(client, endpoint: str, headers: dict, repeticoes: int = 5) -> dict:
+    linha = {"endpoint": endpoint, "bytes": {}, "content_encoding": {}, "latencia_ms": {}}
+    client.get(endpoint, headers=headers)  # aquecimento: identidade JWT, caches e compilação das queries
+    for codificacao in CODIFICACOES:
+        cabecalhos = dict(headers, **{"Accept-Encoding": codificacao})
+        respostas = []
+        linha["latencia_ms"][codificacao] = _mediana_ms(
+            lambda: respostas.append(client.get(endpoint, headers=cabecalhos)), repeticoes
+        )
+        resposta = respostas[-1]
+        linha["status"] = resposta.status_code
+        # O test client não descomprime: get_data() são os bytes que iriam para a rede
+        linha["bytes"][codificacao] = len(resposta.get_data())
+        linha["content_encoding"][codificacao] = resposta.headers.get("Content-Encoding", "identity")
+        if codificacao == "identity":
+            corpo = resposta.get_json(silent=True)
+    linha["serializacao_ms"] = medir_serializacao(corpo, repeticoes) if corpo is not None else {}
+    return linha
+
+
+def medir_respostas(app, user_id: int, endpoints=ENDPOINTS_DASHBOARD, repeticoes: int = 5) -> list:
+    """Uma linha por endpoint com bytes, latência mediana e custo do encoder."""
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user_id)}"}
+    client = app.test_client()
+    return [medir_endpoint(client, endpoint, headers, repeticoes) for endpoint in endpoints]
@@ -0,0 +1,124 @@
+# app/services/benchmark/startup.py
+"""
+Orçamento de inicialização do worker: tempo do `create_app`, RSS depois do
+boot e dependências pesadas carregadas sem necessidade.
+
+Cada medição roda em um processo Python novo (o processo atual já tem tudo
+importado), do mesmo jeito que o gunicorn sobe um worker: importa `app`,
+chama `create_app()` e informa o tempo, o pico de RSS e quais módulos
+pesados ficaram em `sys.modules`. Uma execução extra com `-X importtime`
+dá o detalhamento por módulo.
+
+As dependências pesadas (SDK do Gemini, reportlab, python-docx, openpyxl,
+requests...) devem ser importadas dentro das funções que as usam; um
+import de topo em qualquer módulo alcançado pelos blueprints aparece aqui.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Módulos que não podem estar carregados logo após o create_app
+MODULOS_PESADOS = (
+    "google.generativeai",
+    "google.genai",
+    "grpc",
+    "reportlab",
+    "docx",
+    "openpyxl",
+    "bs4",
+    "requests",
+)
+
+MARCADOR = "@@boot@@"
+
+SCRIPT_BOOT = """
+import importlib, json, resource, sys, time
+inicio = time.perf_counter()
+from app import create_app
+config = sys.argv[1]
+if config:
+    modulo, _, classe = config.rpartition(".")
+    app = create_app(getattr(importlib.import_module(modulo), classe))
+else:
+    app = create_app()
+boot = time.perf_counter() - inicio
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss_kb //= 1024
+pesados = [m for m in json.loads(sys.argv[2]) if m in sys.modules]
+print(%r + json.dumps({"boot_ms": boot * 1000, "rss_mb": rss_kb / 1024, "pesados": pesados, "modulos": len(sys.modules)}))
+""" % MARCADOR
+
+_LINHA_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def analisar_importtime(saida: str) -> list:
+    """
+    Linhas de `-X importtime` em dicts {modulo, proprio_ms, cumulativo_ms,
+    nivel}; nivel 1 são os imports feitos diretamente pelo script.
+    """
+    modulos = []
+    for linha in saida.splitlines():
+        m = _LINHA_IMPORTTIME.match(linha)
+        if m:
+            modulos.append({
+                "modulo": m.group(4),
+                "proprio_ms": int(m.group(1)) / 1000,
+                "cumulativo_ms": int(m.group(2)) / 1000,
+                "nivel": (len(m.group(3)) - 1) // 2 + 1,
+            })
+    return modulos
+
+
+def _executar_boot(diretorio: str, config: str, importtime: bool = False) -> tuple:
+    comando = [sys.executable]
+    if importtime:
+        comando += ["-X", "importtime"]
+    comando += ["-c", SCRIPT_BOOT, config or "", json.dumps(MODULOS_PESADOS)]
+    ambiente = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [diretorio, os.environ.get("PYTHONPATH")])))
+    processo = subprocess.run(comando, cwd=diretorio, env=ambiente, capture_output=True, text=True, timeout=300)
+    linha = next((l for l in processo.stdout.splitlines() if l.startswith(MARCADOR)), None)
+    if processo.returncode != 0 or linha is None:
+        raise RuntimeError(f"create_app falhou no processo de medição:\n{processo.stderr[-4000:]}")
+    return json.loads(linha[len(MARCADOR):]), processo.stderr
+
+
+def medir_boot(diretorio: str, config: str = None, repeticoes: int = 3, top: int = 15) -> dict:
+    """
+    Mede o boot `repeticoes` vezes (vale o melhor tempo e o maior RSS) e
+    detalha os imports mais caros em uma execução com -X importtime.
+    """
+    medicoes = [_executar_boot(diretorio, config)[0] for _ in range(max(1, repeticoes))]
+    _, stderr = _executar_boot(diretorio, config, importtime=True)
+    modulos = analisar_importtime(stderr)
+    return {
+        "boot_ms": min(m["boot_ms"] for m in medicoes),
+        "rss_mb": max(m["rss_mb"] for m in medicoes),
+        "modulos_carregados": medicoes[0]["modulos"],
+        "pesados": medicoes[0]["pesados"],
+        "importacao_ms": sum(m["cumulativo_ms"] for m in modulos if m["nivel"] == 1),
+        "mais_lentos": sorted(
+            (m for m in modulos if m["modulo"].split(".")[0] != "app"),
+            key=lambda m: m["proprio_ms"], reverse=True,
+        )[:top],
+        "app_mais_lentos": sorted(
+            (m for m in modulos if m["modulo"].startswith("app.")),
+            key=lambda m: m["cumulativo_ms"], reverse=True,
+        )[:top],
+    }
+
+
+def verificar_orcamento(resultado: dict, max_boot_ms: float = None, max_rss_mb: float = None,
+                        permitir: tuple = ()) -> list:
+    """Lista de violações do orçamento (vazia quando está tudo dentro)."""
+    violacoes = []
+    if max_boot_ms and resultado["boot_ms"] > max_boot_ms:
+        violacoes.append(f"create_app levou {resultado['boot_ms']:.0f} ms (limite {max_boot_ms:.0f} ms)")
+    if max_rss_mb and resultado["rss_mb"] > max_rss_mb:
+        violacoes.append(f"RSS após o boot: {resultado['rss_mb']:.1f} MB (limite {max_rss_mb:.0f} MB)")
+    for modulo in resultado["pesados"]:
+        if modulo not in permitir:
+            violacoes.append(f"módulo pesado carregado no boot: {modulo}")
+    return violacoes
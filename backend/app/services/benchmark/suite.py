@@ -0,0 +1,172 @@
+# app/services/benchmark/suite.py
+"""
+Suíte de benchmark dos parsers e importadores.
+
+Cada caso recebe uma entrada gerada por `corpus` com N linhas e mede o
+melhor tempo de `repeticoes` execuções. Os resultados são comparados com
+um baseline JSON; um caso regride quando fica mais de `limite` (fração)
+mais lento que o baseline. O logging é silenciado durante as medições para
+que a saída no console não domine o tempo.
+"""
+import json
+import logging
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+
+from . import corpus
+
+LINHAS_POR_OCORRENCIA = 6  # Linhas de cada texto gerado por gerar_textos_ocorrencia
+TAMANHOS_PADRAO = (100, 1_000, 10_000)
+LIMITE_PADRAO = 0.25
+
+
+def _preparar_log(tipo):
+    def preparar(tamanho, seed, _diretorio):
+        return corpus.gerar_log_whatsapp(tamanho, tipo=tipo, seed=seed)
+
+    return preparar
+
+
+def _preparar_planilha(tamanho, seed, diretorio):
+    return corpus.gerar_planilha_rondas(os.path.join(diretorio, f"rondas_{tamanho}.xlsx"), tamanho, seed=seed)
+
+
+def _preparar_ocorrencias(tamanho, seed, _diretorio):
+    return corpus.gerar_textos_ocorrencia(max(1, tamanho // LINHAS_POR_OCORRENCIA), seed=seed)
+
+
+def _executar_rondas(log):
+    from app.services.ronda_logic import processar_log_de_rondas
+
+    processar_log_de_rondas(log, corpus.CONDOMINIO_PADRAO, corpus.DATA_PLANTAO_PADRAO.strftime("%d/%m/%Y"), corpus.ESCALA_PADRAO)
+
+
+def _executar_paradas(log):
+    from app.services.parada_logic import processar_log_de_paradas
+
+    processar_log_de_paradas(log, corpus.CONDOMINIO_PADRAO, corpus.DATA_PLANTAO_PADRAO.strftime("%d/%m/%Y"), corpus.ESCALA_PADRAO)
+
+
+def _executar_planilha(caminho):
+    from app.services.excel_processor import ExcelProcessor
+
+    resultado = ExcelProcessor.parse_excel_file(caminho)
+    if not resultado["success"]:
+        raise RuntimeError(resultado["message"])
+
+
+def _executar_classificador(textos):
+    from app.utils.classificador import classificar_ocorrencia
+
+    for texto in textos:
+        classificar_ocorrencia(texto)
+
+
+def _executar_extracao(textos):
+    # Lê o snapshot de tipos, colaboradores e condomínios: exige app context com banco
+    from app.services.ocorrencia_parser import OcorrenciaParser
+
+    for texto in textos:
+        OcorrenciaParser.extrair_dados_relatorio(texto)
+
+
+# nome -> (preparar(tamanho, seed, diretório) -> entrada, executar(entrada))
+CASOS = {
+    "processar_log_de_rondas": (_preparar_log("rondas"), _executar_rondas),
+    "processar_log_de_paradas": (_preparar_log("paradas"), _executar_paradas),
+    "excel_parse_excel_file": (_preparar_planilha, _executar_planilha),
+    "classificar_ocorrencia": (_preparar_ocorrencias, _executar_classificador),
+    "ocorrencia_extrair_dados_relatorio": (_preparar_ocorrencias, _executar_extracao),
+}
+
+
+def chave_resultado(caso: str, tamanho: int) -> str:
+    return f"{caso}@{tamanho}"
+
+
+def medir(funcao, entrada, repeticoes: int = 3) -> float:
+    """Melhor tempo (segundos) de `repeticoes` chamadas de `funcao(entrada)`."""
+    melhor = None
+    nivel_anterior = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao(entrada)
+            duracao = time.perf_counter() - inicio
+            melhor = duracao if melhor is None else min(melhor, duracao)
+    finally:
+        logging.disable(nivel_anterior)
+    return melhor
+
+
+def executar_suite(tamanhos=TAMANHOS_PADRAO, casos=None, repeticoes: int = 3, seed: int = corpus.SEED_PADRAO, ao_medir=None) -> dict:
+    """
+    Executa os `casos` (padrão: todos) em cada tamanho. Retorna
+    {"caso@tamanho": {"caso", "tamanho", "segundos", "linhas_por_segundo"}}.
+    `ao_medir(chave, resultado)` é chamado a cada medição.
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as diretorio:
+        for nome in casos or CASOS:
+            preparar, executar = CASOS[nome]
+            for tamanho in tamanhos:
+                segundos = medir(executar, preparar(tamanho, seed, diretorio), repeticoes)
+                resultado = {
+                    "caso": nome,
+                    "tamanho": tamanho,
+                    "segundos": round(segundos, 6),
+                    "linhas_por_segundo": round(tamanho / segundos, 1) if segundos else None,
+                }
+                resultados[chave_resultado(nome, tamanho)] = resultado
+                if ao_medir:
+                    ao_medir(chave_resultado(nome, tamanho), resultado)
+    return resultados
+
+
+def comparar_com_baseline(resultados: dict, baseline: dict, limite: float = LIMITE_PADRAO) -> list:
+    """
+    Regressões em relação ao baseline: casos `segundos` acima de
+    `baseline * (1 + limite)`. Casos ausentes no baseline são ignorados.
+    Retorna [{"chave", "baseline", "atual", "variacao"}], pior primeiro.
+    """
+    regressoes = []
+    for chave, resultado in resultados.items():
+        referencia = baseline.get("resultados", {}).get(chave)
+        if not referencia or not referencia.get("segundos"):
+            continue
+        variacao = resultado["segundos"] / referencia["segundos"] - 1
+        if variacao > limite:
+            regressoes.append(
+                {"chave": chave, "baseline": referencia["segundos"], "atual": resultado["segundos"], "variacao": variacao}
+            )
+    return sorted(regressoes, key=lambda r: r["variacao"], reverse=True)
+
+
+def carregar_baseline(caminho: str) -> dict:
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def salvar_baseline(caminho: str, resultados: dict, baseline_anterior: dict = None) -> dict:
+    """
+    Grava os resultados como baseline, mesclando com os casos/tamanhos do
+    baseline anterior que não foram medidos agora. Retorna o baseline gravado.
+    """
+    mesclados = dict((baseline_anterior or {}).get("resultados", {}))
+    mesclados.update(resultados)
+    baseline = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": dict(sorted(mesclados.items())),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+    return baseline
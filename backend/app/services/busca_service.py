@@ -0,0 +1,273 @@
+# app/services/busca_service.py
+"""
+Busca textual em relatórios de ocorrência e em nomes de colaboradores.
+
+A semântica da consulta é a mesma nos dois bancos: o texto vira termos
+(`termos_da_busca`), todos obrigatórios, cada um casando como prefixo
+("pich port" encontra "Pichação no portão"), sem diferenciar acentos nem
+maiúsculas. Operadores de busca (aspas, OR, -) não são interpretados.
+
+No Postgres (produção):
+- relatórios: `tsvector` com a configuração `portuguese_unaccent` (stemming
+  em português e sem acentos), consultado com `to_tsquery` montada com os
+  termos como prefixo ('pich:* & port:*') e ordenado por `ts_rank_cd`. O
+  índice GIN é de expressão, criado pela migração d3a7c1f9e2b4; a expressão
+  aqui precisa ser idêntica à do índice. Por causa do stemming, um termo
+  completo também encontra as flexões ("pichações" encontra "pichação"),
+  o que o FTS5 só faz quando o termo é prefixo da outra forma.
+- colaboradores: `pg_trgm` sobre `f_unaccent(lower(nome_completo))`, que
+  acelera um LIKE '%termo%' por termo e ordena por similaridade. O LIKE
+  também casa no meio das palavras ("silva" em "Dasilva"), onde o FTS5 só
+  casa no início.
+
+No SQLite (dev/testes) as duas buscas usam tabelas FTS5 de conteúdo
+externo (`ocorrencia_fts`, `colaborador_fts`) com o tokenizador
+`unicode61 remove_diacritics 2`, mantidas por triggers. Elas são criadas
+junto com as tabelas (`db.create_all`) ou pela mesma migração.
+
+Os trechos destacados voltam como HTML seguro: o texto é escapado e só os
+termos encontrados ficam entre <mark></mark>.
+"""
+import html
+import logging
+import re
+
+from sqlalchemy import DDL, column, event, false, func, literal, literal_column, select, table
+
+from app import db
+from app.models import Colaborador, Ocorrencia
+
+logger = logging.getLogger(__name__)
+
+CONFIG_TS = "portuguese_unaccent"
+# Delimitadores dos termos nos trechos; trocados por <mark> depois do escape do HTML
+MARCA_INICIO, MARCA_FIM = "\x02", "\x03"
+OPCOES_HEADLINE = (
+    f'StartSel="{MARCA_INICIO}", StopSel="{MARCA_FIM}", MaxWords=30, MinWords=12, '
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+PALAVRAS_TRECHO_SQLITE = 24
+
+
+def _dialeto() -> str:
+    return db.engine.dialect.name
+
+
+def destacar(trecho: str) -> str:
+    """Escapa o trecho e troca os delimitadores por <mark>."""
+    if not trecho:
+        return ""
+    return html.escape(trecho).replace(MARCA_INICIO, "<mark>").replace(MARCA_FIM, "</mark>")
+
+
+def termos_da_busca(texto: str) -> list:
+    return re.findall(r"\w+", texto or "")
+
+
+def consulta_fts5(texto: str):
+    """Consulta FTS5 com todos os termos como prefixo ('"pichac"* "port"*'), ou None se não houver termos."""
+    termos = termos_da_busca(texto)
+    return " ".join(f'"{termo}"*' for termo in termos) or None
+
+
+def consulta_tsquery_pg(texto: str):
+    """Equivalente Postgres de `consulta_fts5` ('pichac:* & port:*'), ou None se não houver termos."""
+    termos = termos_da_busca(texto)
+    return " & ".join(f"{termo}:*" for termo in termos) or None
+
+
+def _escapar_like(texto: str) -> str:
+    return texto.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+# --- Tabelas FTS5 do SQLite ---
+class IndiceFts5:
+    """Tabela FTS5 de conteúdo externo sobre uma coluna de texto, sincronizada por triggers."""
+
+    def __init__(self, tabela: str, coluna: str):
+        self.tabela = tabela
+        self.coluna = coluna
+        self.nome = f"{tabela}_fts"
+        self.fts = table(self.nome, column("rowid"))
+
+    def ddl(self) -> list:
+        t, c, n = self.tabela, self.coluna, self.nome
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {n} USING fts5({c}, content='{t}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {n}_ai AFTER INSERT ON {t} BEGIN "
+            f"INSERT INTO {n}(rowid, {c}) VALUES (new.id, new.{c}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {n}_ad AFTER DELETE ON {t} BEGIN "
+            f"INSERT INTO {n}({n}, rowid, {c}) VALUES ('delete', old.id, old.{c}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {n}_au AFTER UPDATE OF {c} ON {t} BEGIN "
+            f"INSERT INTO {n}({n}, rowid, {c}) VALUES ('delete', old.id, old.{c}); "
+            f"INSERT INTO {n}(rowid, {c}) VALUES (new.id, new.{c}); END",
+            f"INSERT INTO {n}({n}) VALUES ('rebuild')",
+        ]
+
+    def registrar_eventos(self, tabela_sa) -> None:
+        for comando in self.ddl():
+            event.listen(tabela_sa, "after_create", DDL(comando).execute_if(dialect="sqlite"))
+        event.listen(tabela_sa, "after_drop", DDL(f"DROP TABLE IF EXISTS {self.nome}").execute_if(dialect="sqlite"))
+
+    def corresponde(self, consulta: str):
+        return literal_column(self.nome).op("MATCH")(consulta)
+
+    def ids(self, consulta: str):
+        """Subquery com os ids (rowid) que casam com a consulta FTS5."""
+        return select(self.fts.c.rowid).where(self.corresponde(consulta))
+
+
+FTS_OCORRENCIA = IndiceFts5("ocorrencia", "relatorio_final")
+FTS_COLABORADOR = IndiceFts5("colaborador", "nome_completo")
+FTS_OCORRENCIA.registrar_eventos(Ocorrencia.__table__)
+FTS_COLABORADOR.registrar_eventos(Colaborador.__table__)
+
+
+# --- Expressões do Postgres (iguais às dos índices da migração) ---
+def _config_pg():
+    return literal_column(f"'{CONFIG_TS}'::regconfig")
+
+
+def vetor_pg(coluna):
+    return func.to_tsvector(_config_pg(), func.coalesce(coluna, literal_column("''")))
+
+
+def tsquery_pg(texto: str):
+    # Sem termos, '' vira uma tsquery vazia, que não casa com nada (como o false() dos outros bancos)
+    return func.to_tsquery(_config_pg(), consulta_tsquery_pg(texto) or "")
+
+
+def nome_normalizado_pg(expressao):
+    return func.f_unaccent(func.lower(expressao))
+
+
+# --- Ocorrências ---
+def condicao_texto_relatorio(coluna_texto, coluna_id, texto: str):
+    """
+    Condição de filtro por texto do relatório, para a tabela ou para a view
+    (`coluna_texto`/`coluna_id` de uma ou de outra).
+    """
+    dialeto = _dialeto()
+    if dialeto == "postgresql":
+        return vetor_pg(coluna_texto).op("@@")(tsquery_pg(texto))
+    if dialeto == "sqlite":
+        consulta = consulta_fts5(texto)
+        if consulta:
+            return coluna_id.in_(FTS_OCORRENCIA.ids(consulta))
+    return coluna_texto.ilike(f"%{texto}%")
+
+
+def buscar_ocorrencias(texto: str, filters: dict = None, page: int = 1, per_page: int = 20,
+                       ordenar: str = "relevancia") -> dict:
+    """
+    Busca ranqueada nos relatórios. Só a página pedida é carregada e só ela
+    recebe trecho destacado; `has_next` vem de uma linha a mais, sem COUNT.
+
+    :param ordenar: "relevancia" (padrão) ou "recentes".
+    """
+    from app.services.ocorrencia_service import apply_ocorrencia_filters
+
+    page, per_page = max(1, page), max(1, min(per_page, 100))
+    dialeto = _dialeto()
+    consulta_sqlite = consulta_fts5(texto) if dialeto == "sqlite" else None
+    if dialeto == "postgresql":
+        consulta = tsquery_pg(texto)
+        vetor = vetor_pg(Ocorrencia.relatorio_final)
+        relevancia = func.ts_rank_cd(vetor, consulta)
+        query = db.session.query(Ocorrencia.id, relevancia.label("rank")).filter(vetor.op("@@")(consulta))
+        ordem_relevancia = relevancia.desc()
+    elif consulta_sqlite:
+        # bm25: quanto menor, mais relevante
+        relevancia = -func.bm25(literal_column(FTS_OCORRENCIA.nome))
+        query = (
+            db.session.query(Ocorrencia.id, relevancia.label("rank"))
+            .join(FTS_OCORRENCIA.fts, FTS_OCORRENCIA.fts.c.rowid == Ocorrencia.id)
+            .filter(FTS_OCORRENCIA.corresponde(consulta_sqlite))
+        )
+        ordem_relevancia = relevancia.desc()
+    else:
+        query = db.session.query(Ocorrencia.id, literal(0.0).label("rank")).filter(
+            Ocorrencia.relatorio_final.ilike(f"%{texto}%") if termos_da_busca(texto) else false()
+        )
+        ordem_relevancia = Ocorrencia.id.desc()
+
+    if filters:
+        query = apply_ocorrencia_filters(query, {**filters, "texto_relatorio": ""})
+
+    if ordenar == "recentes":
+        query = query.order_by(Ocorrencia.data_hora_ocorrencia.desc(), Ocorrencia.id.desc())
+    else:
+        query = query.order_by(ordem_relevancia, Ocorrencia.data_hora_ocorrencia.desc(), Ocorrencia.id.desc())
+
+    linhas = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+    has_next = len(linhas) > per_page
+    linhas = linhas[:per_page]
+    ids = [linha.id for linha in linhas]
+
+    trechos = _trechos_ocorrencias(ids, texto, consulta_sqlite) if ids else {}
+    ocorrencias = {
+        o.id: o
+        for o in Ocorrencia.query.options(db.joinedload(Ocorrencia.tipo), db.joinedload(Ocorrencia.condominio))
+        .filter(Ocorrencia.id.in_(ids))
+    } if ids else {}
+
+    resultados = []
+    for linha in linhas:
+        ocorrencia = ocorrencias[linha.id]
+        resultados.append({
+            "id": ocorrencia.id,
+            "data_hora_ocorrencia": ocorrencia.data_hora_ocorrencia.isoformat() if ocorrencia.data_hora_ocorrencia else None,
+            "status": ocorrencia.status,
+            "tipo": ocorrencia.tipo.nome if ocorrencia.tipo else None,
+            "condominio": ocorrencia.condominio.nome if ocorrencia.condominio else None,
+            "rank": round(float(linha.rank or 0), 6),
+            "trecho": destacar(trechos.get(linha.id, "")),
+        })
+
+    return {
+        "resultados": resultados,
+        "pagination": {"page": page, "per_page": per_page, "has_next": has_next, "has_prev": page > 1},
+    }
+
+
+def _trechos_ocorrencias(ids: list, texto: str, consulta_sqlite) -> dict:
+    """id -> trecho com os termos entre MARCA_INICIO/MARCA_FIM, só para os ids da página."""
+    dialeto = _dialeto()
+    if dialeto == "postgresql":
+        trecho = func.ts_headline(_config_pg(), Ocorrencia.relatorio_final, tsquery_pg(texto), OPCOES_HEADLINE)
+        return dict(db.session.query(Ocorrencia.id, trecho).filter(Ocorrencia.id.in_(ids)).all())
+    if dialeto == "sqlite" and consulta_sqlite:
+        trecho = func.snippet(
+            literal_column(FTS_OCORRENCIA.nome), 0, MARCA_INICIO, MARCA_FIM, "…", PALAVRAS_TRECHO_SQLITE
+        )
+        consulta = (
+            select(FTS_OCORRENCIA.fts.c.rowid, trecho)
+            .where(FTS_OCORRENCIA.corresponde(consulta_sqlite))
+            .where(FTS_OCORRENCIA.fts.c.rowid.in_(ids))
+        )
+        return dict(db.session.execute(consulta).all())
+    return {}
+
+
+# --- Colaboradores ---
+def filtrar_colaboradores_por_nome(query, nome: str):
+    """
+    Filtra uma query de Colaborador pelo nome, sem diferenciar acentos nem
+    maiúsculas, e ordena pelos mais parecidos (Postgres) ou pelo nome.
+    """
+    dialeto = _dialeto()
+    if dialeto == "postgresql":
+        normalizado = nome_normalizado_pg(Colaborador.nome_completo)
+        alvo = nome_normalizado_pg(literal(nome))
+        termos = termos_da_busca(nome) or [nome]
+        for termo in termos:
+            padrao = literal("%") + nome_normalizado_pg(literal(_escapar_like(termo))) + literal("%")
+            query = query.filter(normalizado.like(padrao, escape="!"))
+        return query.order_by(func.similarity(normalizado, alvo).desc(), Colaborador.nome_completo)
+    consulta = consulta_fts5(nome) if dialeto == "sqlite" else None
+    if consulta:
+        query = query.filter(Colaborador.id.in_(FTS_COLABORADOR.ids(consulta)))
+    else:
+        query = query.filter(Colaborador.nome_completo.ilike(f"%{nome}%"))
+    return query.order_by(Colaborador.nome_completo)
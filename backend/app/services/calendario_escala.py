@@ -0,0 +1,140 @@
+# app/services/calendario_escala.py
+"""
+Calendário de dias trabalhados pelos supervisores na jornada 12x36.
+
+Cada mês de um supervisor vira uma máscara de bits (bit `dia - 1` ligado =
+dia trabalhado), montada por aritmética a partir dos turnos da escala:
+"... Par" liga os dias pares, "... Impar" os ímpares. Contar os dias
+trabalhados em um intervalo é um AND com a máscara do intervalo seguido da
+contagem de bits, sem percorrer o período dia a dia.
+
+As escalas de todos os meses pedidos são lidas em uma única query e as
+máscaras ficam em cache por (supervisor, ano, mês) no processo. Alterações
+confirmadas em `escala_mensal` incrementam uma versão guardada no cache da
+aplicação, que descarta as máscaras nos demais processos.
+"""
+import calendar
+import logging
+import threading
+from datetime import date
+
+from sqlalchemy import tuple_
+
+from app import db
+from app.models import EscalaMensal
+from app.services.snapshot_versionado import SnapshotVersionado
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_VERSAO = "calendario_escala:versao"
+
+# Bits dos dias pares (índices 1, 3, 5...) e ímpares (0, 2, 4...) de um mês
+_BITS_DIAS_PARES = 0xAAAAAAAA
+_BITS_DIAS_IMPARES = 0x55555555
+
+
+def _contar_bits(mascara: int) -> int:
+    return bin(mascara).count("1")
+
+
+def _bits_do_mes(ano: int, mes: int) -> int:
+    return (1 << calendar.monthrange(ano, mes)[1]) - 1
+
+
+def mascara_paridade(ano: int, mes: int, paridade: str) -> int:
+    """Máscara dos dias "Par" ou "Impar" do mês."""
+    bits = _BITS_DIAS_PARES if paridade == "Par" else _BITS_DIAS_IMPARES if paridade == "Impar" else 0
+    return bits & _bits_do_mes(ano, mes)
+
+
+def mascara_turnos(ano: int, mes: int, turnos) -> int:
+    """Máscara dos dias trabalhados com os turnos dados ("Diurno Par", "Noturno Impar"...)."""
+    mascara = 0
+    for turno in turnos:
+        partes = (turno or "").split()
+        if partes:
+            mascara |= mascara_paridade(ano, mes, partes[-1])
+    return mascara
+
+
+def meses_no_intervalo(inicio: date, fim: date) -> list:
+    """[(ano, mes)] de todos os meses tocados pelo intervalo, em ordem."""
+    primeiro, ultimo = inicio.year * 12 + inicio.month - 1, fim.year * 12 + fim.month - 1
+    return [(indice // 12, indice % 12 + 1) for indice in range(primeiro, ultimo + 1)]
+
+
+def _recortes_por_mes(inicio: date, fim: date):
+    """Gera (ano, mes, máscara dos dias do mês dentro do intervalo)."""
+    for ano, mes in meses_no_intervalo(inicio, fim):
+        primeiro_dia = inicio.day if (ano, mes) == (inicio.year, inicio.month) else 1
+        ultimo_dia = fim.day if (ano, mes) == (fim.year, fim.month) else calendar.monthrange(ano, mes)[1]
+        yield ano, mes, ((1 << ultimo_dia) - 1) & ~((1 << (primeiro_dia - 1)) - 1)
+
+
+def contar_dias_com_paridade(inicio: date, fim: date, paridade: str) -> int:
+    """Quantos dias do intervalo têm a paridade dada (a paridade é a do dia do mês)."""
+    if fim < inicio:
+        return 0
+    return sum(
+        _contar_bits(mascara_paridade(ano, mes, paridade) & recorte)
+        for ano, mes, recorte in _recortes_por_mes(inicio, fim)
+    )
+
+
+class CalendarioEscala:
+    """Máscaras de dias trabalhados por (supervisor, ano, mês), carregadas sob demanda."""
+
+    def __init__(self, versao=None):
+        self.versao = versao
+        self._mascaras = {}  # (supervisor_id, ano, mes) -> int
+        self._meses_carregados = set()  # (ano, mes) com todas as escalas já lidas
+        self._lock = threading.Lock()
+
+    def carregar_meses(self, meses) -> None:
+        """Lê em uma única query as escalas dos meses ainda não carregados."""
+        faltantes = set(meses) - self._meses_carregados
+        if not faltantes:
+            return
+        linhas = (
+            db.session.query(EscalaMensal.supervisor_id, EscalaMensal.ano, EscalaMensal.mes, EscalaMensal.nome_turno)
+            .filter(tuple_(EscalaMensal.ano, EscalaMensal.mes).in_(sorted(faltantes)))
+            .all()
+        )
+        mascaras = {}
+        for supervisor_id, ano, mes, nome_turno in linhas:
+            chave = (supervisor_id, ano, mes)
+            mascaras[chave] = mascaras.get(chave, 0) | mascara_turnos(ano, mes, [nome_turno])
+        with self._lock:
+            self._mascaras.update(mascaras)
+            self._meses_carregados |= faltantes
+
+    def tem_escala(self, supervisor_id: int, inicio: date, fim: date) -> bool:
+        meses = meses_no_intervalo(inicio, fim)
+        self.carregar_meses(meses)
+        return any((supervisor_id, ano, mes) in self._mascaras for ano, mes in meses)
+
+    def dias_trabalhados(self, supervisor_id: int, inicio: date, fim: date) -> int:
+        """Dias do intervalo (inclusivo) em que o supervisor trabalha pela escala do mês."""
+        if fim < inicio:
+            return 0
+        self.carregar_meses(meses_no_intervalo(inicio, fim))
+        return sum(
+            _contar_bits(self._mascaras.get((supervisor_id, ano, mes), 0) & recorte)
+            for ano, mes, recorte in _recortes_por_mes(inicio, fim)
+        )
+
+
+_snapshot = SnapshotVersionado(CACHE_KEY_VERSAO, CalendarioEscala, "calendário de escala")
+
+
+def invalidar_calendario_escala():
+    """Descarta as máscaras deste processo e sinaliza os demais via versão."""
+    _snapshot.invalidar()
+
+
+def get_calendario_escala() -> CalendarioEscala:
+    """Calendário do processo, recriado quando a versão no cache muda."""
+    return _snapshot.obter()
+
+
+_snapshot.monitorar({EscalaMensal: None})
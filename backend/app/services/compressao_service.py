@@ -0,0 +1,112 @@
+# app/services/compressao_service.py
+"""
+Compressão negociada das respostas dinâmicas (COMPRESSION_ENABLED).
+
+No `after_request`, respostas de tipo textual (JSON, HTML, CSV...) acima de
+COMPRESSION_MIN_SIZE bytes são comprimidas com o melhor algoritmo aceito
+pelo cliente em `Accept-Encoding`: brotli (`br`) quando o pacote Brotli
+está instalado, senão gzip. Os níveis padrão privilegiam a latência
+(br 4 / gzip 6): para os payloads do dashboard isso já reduz o JSON em
+80-90% gastando poucos milissegundos.
+
+Ficam de fora: respostas em streaming ou `direct_passthrough` (arquivos),
+as que já têm Content-Encoding, 204/206/304 e os estáticos (servidos e
+comprimidos pelo WhiteNoise). Toda resposta elegível recebe
+`Vary: Accept-Encoding`, e um ETag forte vira fraco quando o corpo é
+comprimido (o conteúdo é o mesmo, os bytes não).
+"""
+import gzip
+import importlib.util
+import logging
+
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+MIMETYPES_PADRAO = (
+    "application/json",
+    "application/javascript",
+    "text/html",
+    "text/css",
+    "text/csv",
+    "text/plain",
+    "text/xml",
+    "image/svg+xml",
+)
+STATUS_SEM_CORPO = (204, 206, 304)
+
+_brotli = None
+
+
+def comprimir_brotli(dados: bytes, qualidade: int) -> bytes:
+    # Import tardio: o módulo só é carregado na primeira resposta comprimida
+    global _brotli
+    if _brotli is None:
+        import brotli
+
+        _brotli = brotli
+    return _brotli.compress(dados, quality=qualidade)
+
+
+def comprimir_gzip(dados: bytes, nivel: int) -> bytes:
+    # mtime=0: mesmo corpo, mesmos bytes (não quebra caches intermediários)
+    return gzip.compress(dados, compresslevel=nivel, mtime=0)
+
+
+def brotli_disponivel() -> bool:
+    return importlib.util.find_spec("brotli") is not None
+
+
+class Compressao:
+    """Hook de `after_request` que negocia e aplica a compressão."""
+
+    def __init__(self, app):
+        self.tamanho_minimo = app.config.get("COMPRESSION_MIN_SIZE", 1024)
+        self.nivel_gzip = app.config.get("COMPRESSION_GZIP_LEVEL", 6)
+        self.qualidade_brotli = app.config.get("COMPRESSION_BROTLI_QUALITY", 4)
+        self.mimetypes = frozenset(app.config.get("COMPRESSION_MIMETYPES") or MIMETYPES_PADRAO)
+        self.algoritmos = ("br", "gzip") if brotli_disponivel() else ("gzip",)
+        app.after_request(self._comprimir)
+
+    def comprimir(self, dados: bytes, algoritmo: str) -> bytes:
+        if algoritmo == "br":
+            return comprimir_brotli(dados, self.qualidade_brotli)
+        return comprimir_gzip(dados, self.nivel_gzip)
+
+    def _comprimir(self, response):
+        if (
+            response.mimetype not in self.mimetypes
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.status_code in STATUS_SEM_CORPO
+            or response.status_code < 200
+            or "Content-Encoding" in response.headers
+            or request.endpoint == "static"
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        algoritmo = request.accept_encodings.best_match(self.algoritmos)
+        if algoritmo is None or request.method == "HEAD":
+            return response
+        dados = response.get_data()
+        if len(dados) < self.tamanho_minimo:
+            return response
+
+        comprimido = self.comprimir(dados, algoritmo)
+        if len(comprimido) >= len(dados):
+            return response
+        response.set_data(comprimido)
+        response.headers["Content-Encoding"] = algoritmo
+        etag, fraco = response.get_etag()
+        if etag and not fraco:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def init_compressao(app):
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+    compressao = Compressao(app)
+    app.extensions["compressao"] = compressao
+    logger.info(f"Compressão de respostas habilitada ({', '.join(compressao.algoritmos)}).")
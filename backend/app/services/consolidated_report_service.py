@@ -1,8 +1,6 @@
 # app/services/consolidated_report_service.py
-import os
-from jinja2 import Environment, FileSystemLoader
-
 from .base_generative_service import BaseGenerativeService
+from .container_servicos import obter_ambiente_prompts
 
 class ConsolidatedReportService(BaseGenerativeService):
     def __init__(
@@ -11,15 +9,10 @@ class ConsolidatedReportService(BaseGenerativeService):
         template_filename="daily_consolidated_report_template.txt",
     ):
         super().__init__(model_name=model_name)
-        self._template = None
+        self._nome_template = None
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            template_folder = os.path.join(current_dir, "prompt_templates")
-
-            jinja_env = Environment(
-                loader=FileSystemLoader(template_folder),
-            )
-            self._template = jinja_env.get_template(template_filename)
+            obter_ambiente_prompts().get_template(template_filename)  # valida já na construção
+            self._nome_template = template_filename
             self.logger.info(
                 f"Template '{template_filename}' carregado para ConsolidatedReportService."
             )
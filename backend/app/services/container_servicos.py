@@ -0,0 +1,119 @@
+# app/services/container_servicos.py
+"""
+Serviços de IA e templates de prompt com escopo de aplicação (um por worker).
+
+Antes cada requisição instanciava o seu serviço (PatrimonialReportService(),
+EmailFormatService()...), e cada construtor criava um `jinja2.Environment`
+novo e recompilava o template. Agora:
+
+- `get_servico(Classe)` devolve a instância única daquela classe no app,
+  construída na primeira chamada (sob lock) e reaproveitada depois: na
+  requisição o custo é uma consulta a um dict. Se a construção falhar
+  (ex.: sem GOOGLE_API_KEY_1/2), nada fica guardado e a próxima chamada tenta
+  de novo.
+- `obter_ambiente_prompts()` devolve o Environment compartilhado sobre
+  `prompt_templates/`, com cache de bytecode em disco (o worker que sobe
+  já encontra os templates compilados) e recarga automática só em
+  desenvolvimento (DEBUG).
+
+Os serviços não guardam estado por requisição: o uso das chaves do Gemini
+já é compartilhado no processo (base_generative_service).
+"""
+import os
+import threading
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+DIRETORIO_PROMPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompt_templates")
+
+# Renderizados sem autoescape desde o início (o ConsolidatedReportService tinha
+# um Environment próprio sem autoescape); os demais mantêm autoescape=True.
+TEMPLATES_SEM_AUTOESCAPE = frozenset({"daily_consolidated_report_template.txt"})
+
+_ambiente_padrao = None
+_ambiente_padrao_lock = threading.Lock()
+
+
+def _autoescape(nome_template) -> bool:
+    return nome_template not in TEMPLATES_SEM_AUTOESCAPE
+
+
+def criar_ambiente_prompts(auto_reload: bool = False, bytecode_cache: bool = False, diretorio_cache: str = None) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(DIRETORIO_PROMPTS),
+        autoescape=_autoescape,
+        auto_reload=auto_reload,
+        bytecode_cache=FileSystemBytecodeCache(diretorio_cache) if bytecode_cache else None,
+    )
+
+
+class ContainerServicos:
+    """Instâncias únicas (preguiçosas) dos serviços e o Environment dos prompts de um app."""
+
+    def __init__(self, app):
+        self.auto_reload = bool(app.debug)
+        self.bytecode_cache = app.config.get("PROMPT_TEMPLATES_BYTECODE_CACHE", True)
+        self.diretorio_cache = app.config.get("PROMPT_TEMPLATES_CACHE_DIR") or None
+        # Reentrante: o construtor de um serviço pede o Environment sob o mesmo lock
+        self._lock = threading.RLock()
+        self._ambiente = None
+        self._instancias = {}
+        self.construcoes = {}  # nome da classe -> quantas vezes foi construída
+
+    @property
+    def ambiente_prompts(self) -> Environment:
+        if self._ambiente is None:
+            with self._lock:
+                if self._ambiente is None:
+                    self._ambiente = criar_ambiente_prompts(self.auto_reload, self.bytecode_cache, self.diretorio_cache)
+        return self._ambiente
+
+    def obter(self, classe):
+        instancia = self._instancias.get(classe)
+        if instancia is None:
+            with self._lock:
+                instancia = self._instancias.get(classe)
+                if instancia is None:
+                    instancia = classe()
+                    self._instancias[classe] = instancia
+                    self.construcoes[classe.__name__] = self.construcoes.get(classe.__name__, 0) + 1
+        return instancia
+
+    def limpar(self) -> None:
+        """Descarta as instâncias e a contagem (as próximas chamadas constroem de novo)."""
+        with self._lock:
+            self._instancias.clear()
+            self.construcoes.clear()
+
+
+def init_servicos(app):
+    app.extensions["servicos"] = ContainerServicos(app)
+
+
+def get_container(app=None) -> ContainerServicos:
+    from flask import current_app
+
+    return (app or current_app).extensions["servicos"]
+
+
+def get_servico(classe, app=None):
+    return get_container(app).obter(classe)
+
+
+def obter_ambiente_prompts() -> Environment:
+    """
+    Environment do app atual; fora de um app (scripts, testes que constroem
+    o serviço direto) cai em um Environment padrão do processo, sem cache em
+    disco nem recarga.
+    """
+    from flask import current_app, has_app_context
+
+    if has_app_context() and "servicos" in current_app.extensions:
+        return current_app.extensions["servicos"].ambiente_prompts
+
+    global _ambiente_padrao
+    if _ambiente_padrao is None:
+        with _ambiente_padrao_lock:
+            if _ambiente_padrao is None:
+                _ambiente_padrao = criar_ambiente_prompts()
+    return _ambiente_padrao
@@ -0,0 +1,248 @@
+# app/services/dados_referencia.py
+"""
+Snapshot dos dados de referência usados na extração de relatórios de
+ocorrência: tipos de ocorrência, colaboradores e condomínios.
+
+As tabelas são lidas uma vez por versão e compiladas em um único autômato
+Aho-Corasick sobre o texto "dobrado" (minúsculas, sem acentos e com o mesmo
+comprimento do original, para que as posições valham nos dois). Uma passada
+pelo texto encontra de uma vez os nomes de tipos, as palavras-chave de
+tipo, os nomes de colaboradores e os de condomínios, sem queries.
+
+Como no `EntityResolver`, o snapshot é mantido por processo e descartado
+quando uma das tabelas muda: os eventos do ORM incrementam uma versão
+guardada no cache da aplicação.
+"""
+import logging
+import unicodedata
+from collections import deque
+from typing import Optional
+
+from app import db
+from app.models import Colaborador, Condominio, OcorrenciaTipo
+from app.services.snapshot_versionado import SnapshotVersionado
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_VERSAO = "dados_referencia:versao"
+
+# Palavras-chave de cada tipo de ocorrência (pelo nome do tipo)
+PALAVRAS_CHAVE_TIPOS = {
+    "Auxílio ao Residencial": ["porta", "residência", "residencial", "morador", "auxílio", "ajuda"],
+    "Verificação": ["verificação", "verificar", "checagem", "inspeção", "observação"],
+    "Perturbação de sossego": ["barulho", "som", "música", "festa", "perturbação", "sossego"],
+    "Tentativa de furto": ["tentativa", "furto", "roubo", "invasão", "suspeito"],
+    "Furtos": ["furto", "roubo", "furtado", "desapareceu"],
+    "Vandalismo": ["vandalismo", "destruição", "danificado", "quebrado", "pichação"],
+}
+
+# Categorias dos padrões no autômato
+TIPO = "tipo"
+PALAVRA_TIPO = "palavra_tipo"
+COLABORADOR = "colaborador"
+CONDOMINIO = "condominio"
+
+
+def _dobrar_caractere(c: str) -> str:
+    base = "".join(x for x in unicodedata.normalize("NFKD", c) if not unicodedata.combining(x)).lower()
+    if len(base) == 1:
+        return base
+    minuscula = c.lower()
+    return minuscula if len(minuscula) == 1 else c
+
+
+_TABELA_ASCII = {i: chr(i).lower() for i in range(128)}
+
+
+def dobrar_texto(texto: str) -> str:
+    """Minúsculas e sem acentos, caractere a caractere: 'São JOSÉ' -> 'sao jose' (mesmo comprimento)."""
+    if not texto:
+        return ""
+    if texto.isascii():
+        return texto.lower()
+    return "".join(_TABELA_ASCII.get(ord(c)) or _dobrar_caractere(c) for c in texto)
+
+
+class AutomatoPadroes:
+    """
+    Autômato Aho-Corasick: encontra todas as ocorrências de um conjunto de
+    padrões em uma única passada pelo texto. Cada padrão carrega um ou mais
+    valores (payloads).
+    """
+
+    def __init__(self):
+        self._transicoes = [{}]  # nó -> {caractere: nó}
+        self._falha = [0]
+        self._saidas = [[]]  # nó -> [(comprimento, payload)]
+        self._compilado = False
+
+    def adicionar(self, padrao: str, payload) -> None:
+        if not padrao:
+            return
+        no = 0
+        for c in padrao:
+            proximo = self._transicoes[no].get(c)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[no][c] = proximo
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._saidas.append([])
+            no = proximo
+        self._saidas[no].append((len(padrao), payload))
+        self._compilado = False
+
+    def compilar(self) -> "AutomatoPadroes":
+        """Calcula os links de falha (BFS) e herda as saídas dos sufixos."""
+        fila = deque(self._transicoes[0].values())
+        for no in fila:
+            self._falha[no] = 0
+        while fila:
+            no = fila.popleft()
+            for c, filho in self._transicoes[no].items():
+                fila.append(filho)
+                falha = self._falha[no]
+                while falha and c not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                destino = self._transicoes[falha].get(c, 0)
+                self._falha[filho] = destino if destino != filho else 0
+                self._saidas[filho] = self._saidas[filho] + self._saidas[self._falha[filho]]
+        self._compilado = True
+        return self
+
+    def buscar(self, texto: str):
+        """Gera (início, fim, payload) de cada ocorrência, em ordem de fim."""
+        if not self._compilado:
+            self.compilar()
+        transicoes, falha, saidas = self._transicoes, self._falha, self._saidas
+        no = 0
+        for posicao, c in enumerate(texto):
+            while no and c not in transicoes[no]:
+                no = falha[no]
+            no = transicoes[no].get(c, 0)
+            for comprimento, payload in saidas[no]:
+                yield posicao - comprimento + 1, posicao + 1, payload
+
+
+class OcorrenciasNoTexto:
+    """Resultado de uma passada do autômato sobre um relatório."""
+
+    def __init__(self):
+        self.tipos = set()  # ids de tipos cujo nome aparece no texto
+        self.palavras_tipo = set()  # palavras-chave (dobradas) presentes
+        self.colaboradores = {}  # id -> posição da primeira ocorrência do nome completo
+        self.condominios = set()
+
+
+class SnapshotReferencia:
+    """Tipos, colaboradores e condomínios compilados para extração sem queries."""
+
+    def __init__(self, tipos, colaboradores, condominios, versao=None):
+        """tipos/colaboradores/condominios: listas de (id, nome), na ordem de prioridade."""
+        self.versao = versao
+        self.tipos = list(tipos)
+        self.ordem_tipo = {tipo_id: ordem for ordem, (tipo_id, _) in enumerate(self.tipos)}
+        self.nome_tipo = dict(self.tipos)
+        self.tipo_por_nome = {}
+        for tipo_id, nome in self.tipos:
+            self.tipo_por_nome.setdefault(nome, tipo_id)
+        self.colaboradores = dict(colaboradores)
+        self.comprimento_colaborador = {}
+        self.condominios = dict(condominios)
+        self.comprimento_condominio = {}
+
+        # Índice de palavras-chave: id do tipo -> {palavras dobradas}
+        self.palavras_por_tipo = {}
+        for nome, palavras in PALAVRAS_CHAVE_TIPOS.items():
+            tipo_id = self.tipo_por_nome.get(nome)
+            if tipo_id is not None:
+                self.palavras_por_tipo[tipo_id] = {dobrar_texto(p) for p in palavras}
+
+        automato = AutomatoPadroes()
+        for tipo_id, nome in self.tipos:
+            automato.adicionar(dobrar_texto(nome), (TIPO, tipo_id))
+        for palavra in {p for palavras in self.palavras_por_tipo.values() for p in palavras}:
+            automato.adicionar(palavra, (PALAVRA_TIPO, palavra))
+        for colaborador_id, nome in self.colaboradores.items():
+            nome_dobrado = dobrar_texto(nome or "").strip()
+            if nome_dobrado:
+                automato.adicionar(nome_dobrado, (COLABORADOR, colaborador_id))
+                self.comprimento_colaborador[colaborador_id] = len(nome_dobrado)
+        for condominio_id, nome in self.condominios.items():
+            nome_dobrado = dobrar_texto(nome or "").strip()
+            if nome_dobrado:
+                automato.adicionar(nome_dobrado, (CONDOMINIO, condominio_id))
+                self.comprimento_condominio[condominio_id] = len(nome_dobrado)
+        self.automato = automato.compilar()
+
+    @classmethod
+    def carregar(cls, versao=None):
+        tipos = db.session.query(OcorrenciaTipo.id, OcorrenciaTipo.nome).order_by(OcorrenciaTipo.id).all()
+        colaboradores = db.session.query(Colaborador.id, Colaborador.nome_completo).order_by(Colaborador.id).all()
+        condominios = db.session.query(Condominio.id, Condominio.nome).order_by(Condominio.id).all()
+        logger.info(
+            f"Dados de referência carregados: {len(tipos)} tipos, {len(colaboradores)} colaboradores, "
+            f"{len(condominios)} condomínios (versão {versao})."
+        )
+        return cls(tipos, colaboradores, condominios, versao)
+
+    def analisar(self, texto_dobrado: str) -> OcorrenciasNoTexto:
+        """Uma passada do autômato sobre o texto já dobrado."""
+        resultado = OcorrenciasNoTexto()
+        for inicio, _fim, (categoria, valor) in self.automato.buscar(texto_dobrado):
+            if categoria == PALAVRA_TIPO:
+                resultado.palavras_tipo.add(valor)
+            elif categoria == TIPO:
+                resultado.tipos.add(valor)
+            elif categoria == COLABORADOR:
+                resultado.colaboradores.setdefault(valor, inicio)
+            else:
+                resultado.condominios.add(valor)
+        return resultado
+
+    def tipo_por_nome_exato(self, encontrados: OcorrenciasNoTexto) -> Optional[int]:
+        """Primeiro tipo (na ordem da tabela) cujo nome aparece no texto."""
+        return min(encontrados.tipos, key=self.ordem_tipo.__getitem__, default=None)
+
+    def tipo_por_palavras_chave(self, encontrados: OcorrenciasNoTexto) -> tuple:
+        """(id, score) do tipo com mais palavras-chave presentes; empate fica com o primeiro da tabela."""
+        melhor_id, melhor_score = None, 0
+        for tipo_id, _ in self.tipos:
+            palavras = self.palavras_por_tipo.get(tipo_id)
+            if palavras:
+                score = len(palavras & encontrados.palavras_tipo)
+                if score > melhor_score:
+                    melhor_id, melhor_score = tipo_id, score
+        return melhor_id, melhor_score
+
+    def primeiro_tipo_id(self) -> Optional[int]:
+        return self.tipos[0][0] if self.tipos else None
+
+    def condominio_encontrado(self, encontrados: OcorrenciasNoTexto) -> Optional[int]:
+        """Condomínio citado no texto; com vários, o de nome mais longo (o mais específico)."""
+        return max(
+            encontrados.condominios,
+            key=lambda condominio_id: (self.comprimento_condominio[condominio_id], -condominio_id),
+            default=None,
+        )
+
+
+_snapshot = SnapshotVersionado(CACHE_KEY_VERSAO, SnapshotReferencia.carregar, "dados de referência")
+
+
+def invalidar_dados_referencia():
+    """Incrementa a versão compartilhada; os processos recompilam o snapshot na próxima leitura."""
+    _snapshot.invalidar()
+
+
+def get_dados_referencia() -> SnapshotReferencia:
+    """Snapshot do processo, recarregado se a versão mudou."""
+    return _snapshot.obter()
+
+
+# Só os nomes alimentam o snapshot: outras colunas (ex.: status do colaborador) não invalidam
+_snapshot.monitorar({
+    OcorrenciaTipo: ("nome",),
+    Colaborador: ("nome_completo",),
+    Condominio: ("nome",),
+})
@@ -1,7 +1,8 @@
 # app/services/dashboard/helpers/__init__.py
 from . import chart_data
+from . import comparison
 from . import date_utils
 from . import filters
 from . import kpis
 
-__all__ = ['chart_data', 'date_utils', 'filters', 'kpis']
+__all__ = ['chart_data', 'comparison', 'date_utils', 'filters', 'kpis']
@@ -14,3 +14,62 @@ def fill_series_with_zeros(
     """
     data_map = {str(date): count for date, count in data_query_result}
     return [data_map.get(label, 0) for label in labels]
+
+
+def shift_date_expression(column, hours: int = 6):
+    """
+    Expressão SQL da data do plantão: o timestamp deslocado `hours` horas
+    para trás e truncado no dia (o plantão vira às 06:00, então 05:59 conta
+    no dia anterior). No PostgreSQL usa `date_trunc` sobre o timestamp
+    deslocado; no SQLite, `date(col, '-N hours')`.
+    """
+    from sqlalchemy import Date, cast, func, literal_column
+
+    from app import db
+
+    # Constantes como SQL literal: o mesmo texto no SELECT e no GROUP BY,
+    # sem depender de como o driver trata parâmetros repetidos
+    hours = int(hours)
+    if db.engine.dialect.name == "sqlite":
+        return func.date(column, literal_column(f"'-{hours} hours'"))
+    return cast(
+        func.date_trunc(literal_column("'day'"), column - literal_column(f"interval '{hours} hours'")),
+        Date,
+    )
+
+
+def build_daily_series(
+    grouped_rows: list[tuple], start_date, end_date
+) -> tuple[list[str], dict[str, list[int]], list[int]]:
+    """
+    Monta séries diárias densas a partir de linhas agrupadas (nome, dia, total).
+
+    Cada série é um array pré-alocado com um zero por dia do intervalo,
+    indexado pelo deslocamento em dias desde `start_date`; dias fora do
+    intervalo são ignorados.
+
+    Returns:
+        (labels 'YYYY-MM-DD', {nome: valores por dia}, totais por dia)
+    """
+    from datetime import date
+
+    from .date_utils import generate_date_labels
+
+    labels = generate_date_labels(start_date, end_date)
+    days = len(labels)
+    series: dict[str, list[int]] = {}
+    totals = [0] * days
+    for name, day, count in grouped_rows:
+        if isinstance(day, str):  # SQLite devolve a data como texto
+            day = date.fromisoformat(day[:10])
+        elif hasattr(day, "date"):
+            day = day.date()
+        offset = (day - start_date).days
+        if not 0 <= offset < days:
+            continue
+        values = series.get(name)
+        if values is None:
+            values = series[name] = [0] * days
+        values[offset] += count
+        totals[offset] += count
+    return labels, series, totals
@@ -0,0 +1,228 @@
+# app/services/dashboard/helpers/comparison.py
+"""
+Comparação do período filtrado com o período anterior (mesmos dias do mês
+anterior) e, opcionalmente, com o mesmo período do ano anterior.
+
+Todas as janelas saem de uma única query com agregação condicional
+(`SUM(CASE WHEN data na janela THEN medida ELSE 0 END)` por janela), com os
+filtros não temporais aplicados uma vez só. O WHERE é a união das janelas,
+para não varrer os meses entre o período atual e o do ano anterior.
+"""
+import calendar
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Callable, NamedTuple
+
+import pytz
+from flask import current_app
+from sqlalchemy import and_, case, func, literal, or_
+
+from app import db
+from app.models import Ocorrencia, Parada, VWRondasDetalhadas
+from app.services import ocorrencia_service
+
+logger = logging.getLogger(__name__)
+
+DIAS_PARA_DESATUALIZADO = 3
+LIMITE_ESTAVEL = 10
+# Filtros de data do dashboard: as janelas da comparação é que definem o período
+_CHAVES_DE_DATA = ("data_inicio_str", "data_inicio", "data_fim_str", "data_fim")
+
+
+class EspecificacaoComparacao(NamedTuple):
+    """Como medir um tipo de registro: coluna de data, medida somada e filtros."""
+
+    coluna_data: object
+    medida: Callable  # () -> expressão somada por linha
+    aplicar_filtros: Callable  # (query, filters) -> query
+    coluna_com_hora: bool = False  # True: janela em timestamps UTC do fuso local
+    menos_e_melhor: bool = False  # Ocorrências: queda é o resultado bom
+
+
+def _filtros_rondas(query, filters):
+    if filters.get("supervisor_id"):
+        query = query.filter(VWRondasDetalhadas.supervisor_id == filters["supervisor_id"])
+    if filters.get("condominio_id"):
+        query = query.filter(VWRondasDetalhadas.condominio_id == filters["condominio_id"])
+    if filters.get("turno"):
+        query = query.filter(VWRondasDetalhadas.turno_ronda == filters["turno"])
+    return query
+
+
+def _filtros_paradas(query, filters):
+    if filters.get("supervisor_id"):
+        query = query.filter(Parada.supervisor_id == filters["supervisor_id"])
+    if filters.get("condominio_id"):
+        query = query.filter(Parada.condominio_id == filters["condominio_id"])
+    if filters.get("turno"):
+        query = query.filter(Parada.turno_parada == filters["turno"])
+    return query
+
+
+def _filtros_ocorrencias(query, filters):
+    nao_temporais = {chave: valor for chave, valor in filters.items() if chave not in _CHAVES_DE_DATA}
+    return ocorrencia_service.apply_ocorrencia_filters(query, nao_temporais)
+
+
+ESPECIFICACOES = {
+    "rondas": EspecificacaoComparacao(
+        VWRondasDetalhadas.data_plantao_ronda,
+        lambda: func.coalesce(VWRondasDetalhadas.total_rondas_no_log, 0),
+        _filtros_rondas,
+    ),
+    "paradas": EspecificacaoComparacao(
+        Parada.data_plantao_parada,
+        lambda: func.coalesce(Parada.total_paradas_no_log, 0),
+        _filtros_paradas,
+    ),
+    "ocorrencias": EspecificacaoComparacao(
+        Ocorrencia.data_hora_ocorrencia,
+        lambda: literal(1),
+        _filtros_ocorrencias,
+        coluna_com_hora=True,
+        menos_e_melhor=True,
+    ),
+}
+TIPOS = tuple(ESPECIFICACOES)
+
+
+def _deslocar_meses(dia: date, meses: int) -> date:
+    """Mesmo dia `meses` meses antes/depois, limitado ao último dia do mês de destino."""
+    indice = dia.year * 12 + dia.month - 1 + meses
+    ano, mes = indice // 12, indice % 12 + 1
+    return date(ano, mes, min(dia.day, calendar.monthrange(ano, mes)[1]))
+
+
+def calcular_janelas(date_start_range: date, date_end_range: date, incluir_ano_anterior: bool = False) -> dict:
+    """
+    {"atual", "anterior"[, "ano_anterior"]: (início, fim)}, inclusivas.
+    O período anterior começa no mesmo dia do mês anterior e tem a mesma
+    duração: 01/08 a 15/08 -> 01/07 a 15/07; 29/08 a 05/09 -> 29/07 a 05/08.
+    """
+    duracao = date_end_range - date_start_range
+    anterior_start = _deslocar_meses(date_start_range, -1)
+    janelas = {
+        "atual": (date_start_range, date_end_range),
+        "anterior": (anterior_start, anterior_start + duracao),
+    }
+    if incluir_ano_anterior:
+        ano_anterior_start = _deslocar_meses(date_start_range, -12)
+        janelas["ano_anterior"] = (ano_anterior_start, ano_anterior_start + duracao)
+    return janelas
+
+
+def _limites_utc(inicio: date, fim: date):
+    """[meia-noite local de `inicio`, meia-noite local do dia seguinte a `fim`) em UTC."""
+    local_tz = pytz.timezone(current_app.config.get("DEFAULT_TIMEZONE", "America/Sao_Paulo"))
+    return tuple(
+        local_tz.localize(datetime.combine(dia, time.min)).astimezone(pytz.utc)
+        for dia in (inicio, fim + timedelta(days=1))
+    )
+
+
+def _condicao_janela(especificacao: EspecificacaoComparacao, inicio: date, fim: date):
+    coluna = especificacao.coluna_data
+    if especificacao.coluna_com_hora:
+        limite_inferior, limite_superior = _limites_utc(inicio, fim)
+        return and_(coluna >= limite_inferior, coluna < limite_superior)
+    return and_(coluna >= inicio, coluna <= fim)
+
+
+def variacao_percentual(total_atual, total_anterior) -> float:
+    if total_anterior > 0:
+        return round(((total_atual - total_anterior) / total_anterior) * 100, 1)
+    return 0 if total_atual == 0 else 100
+
+
+def _status(variacao: float, menos_e_melhor: bool) -> tuple:
+    if menos_e_melhor:
+        if variacao < -LIMITE_ESTAVEL:
+            return "success", "Redução"
+        if variacao < LIMITE_ESTAVEL:
+            return "warning", "Estável"
+        return "danger", "Aumento"
+    if variacao > LIMITE_ESTAVEL:
+        return "success", "Crescimento"
+    if variacao > -LIMITE_ESTAVEL:
+        return "warning", "Estável"
+    return "danger", "Queda"
+
+
+def _comparacao_indisponivel(incluir_ano_anterior: bool) -> dict:
+    resultado = {
+        "total_atual": 0,
+        "total_anterior": 0,
+        "variacao_percentual": 0,
+        "status": "secondary",
+        "status_text": "N/A",
+        "dados_atualizados": False,
+        "ultima_atualizacao": None,
+        "dias_desde_ultima": None,
+    }
+    if incluir_ano_anterior:
+        resultado.update(total_ano_anterior=0, variacao_ano_anterior=0)
+    return resultado
+
+
+def comparar_periodos(
+    tipo: str, filters: dict, date_start_range: date, date_end_range: date, incluir_ano_anterior: bool = False
+) -> dict:
+    """
+    Totais de `tipo` ("rondas", "paradas" ou "ocorrencias") no período atual,
+    no anterior e, se pedido, no mesmo período do ano anterior, com a variação
+    e o status (cor/texto) do período atual frente ao anterior.
+
+    Retorna as mesmas chaves usadas pelos dashboards (`total_atual`,
+    `total_anterior`, `variacao_percentual`, `status`, `status_text`,
+    `dados_atualizados`, `ultima_atualizacao`, `dias_desde_ultima`) e, com
+    `incluir_ano_anterior`, `total_ano_anterior` e `variacao_ano_anterior`.
+    """
+    try:
+        especificacao = ESPECIFICACOES[tipo]
+        janelas = calcular_janelas(date_start_range, date_end_range, incluir_ano_anterior)
+        condicoes = {nome: _condicao_janela(especificacao, *janela) for nome, janela in janelas.items()}
+        medida = especificacao.medida()
+
+        colunas = [
+            func.coalesce(func.sum(case((condicao, medida), else_=0)), 0).label(nome)
+            for nome, condicao in condicoes.items()
+        ]
+        colunas.append(
+            func.max(case((condicoes["atual"], especificacao.coluna_data), else_=None)).label("ultima_data")
+        )
+        query = especificacao.aplicar_filtros(db.session.query(*colunas), filters or {})
+        linha = query.filter(or_(*condicoes.values())).one()
+
+        totais = {nome: int(getattr(linha, nome) or 0) for nome in janelas}
+        variacao = variacao_percentual(totais["atual"], totais["anterior"])
+        status, status_text = _status(variacao, especificacao.menos_e_melhor)
+
+        ultima_data = linha.ultima_data
+        if isinstance(ultima_data, str):
+            # SQLite devolve MAX(CASE ...) como texto: o tipo da coluna se perde no CASE
+            ultima_data = (
+                datetime.fromisoformat(ultima_data) if especificacao.coluna_com_hora else date.fromisoformat(ultima_data)
+            )
+        dias_desde_ultima = None
+        if ultima_data:
+            dia_ultima = ultima_data.date() if isinstance(ultima_data, datetime) else ultima_data
+            dias_desde_ultima = (datetime.now().date() - dia_ultima).days
+
+        resultado = {
+            "total_atual": totais["atual"],
+            "total_anterior": totais["anterior"],
+            "variacao_percentual": variacao,
+            "status": status,
+            "status_text": status_text,
+            "dados_atualizados": dias_desde_ultima is None or dias_desde_ultima <= DIAS_PARA_DESATUALIZADO,
+            "ultima_atualizacao": ultima_data,
+            "dias_desde_ultima": dias_desde_ultima,
+        }
+        if incluir_ano_anterior:
+            resultado["total_ano_anterior"] = totais["ano_anterior"]
+            resultado["variacao_ano_anterior"] = variacao_percentual(totais["atual"], totais["ano_anterior"])
+        return resultado
+
+    except Exception as e:
+        logger.error(f"Erro ao calcular comparação de períodos ({tipo}): {e}", exc_info=True)
+        return _comparacao_indisponivel(incluir_ano_anterior)
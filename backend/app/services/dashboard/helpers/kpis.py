@@ -1,13 +1,13 @@
 
 # app/services/dashboard/helpers/kpis.py
 import logging
-from datetime import timedelta, datetime
+from datetime import datetime
 
-from sqlalchemy import func, tuple_, text
+from sqlalchemy import func
 
 from app import db
-from app.models import EscalaMensal, Ocorrencia, Ronda, User
-from app.services import ocorrencia_service
+from app.models import Ronda
+from app.services.calendario_escala import contar_dias_com_paridade, get_calendario_escala, mascara_turnos
 
 logger = logging.getLogger(__name__)
 
@@ -80,53 +80,15 @@ def calculate_average_rondas_per_day(
     date_end_range_real = min(date_end_range, ultima_data_registrada)
 
     if supervisor_id_filter:
-        meses_anos = set()
-        current_date_for_months = date_start_range
-        while current_date_for_months <= date_end_range_real:
-            meses_anos.add(
-                (current_date_for_months.year, current_date_for_months.month)
-            )
-            # Avança para o próximo mês
-            next_month_year = current_date_for_months.year + (
-                current_date_for_months.month // 12
-            )
-            next_month = current_date_for_months.month % 12 + 1
-            current_date_for_months = current_date_for_months.replace(
-                year=next_month_year, month=next_month, day=1
-            )
-
-        turnos_supervisor_db = (
-            db.session.query(EscalaMensal.nome_turno)
-            .filter(
-                EscalaMensal.supervisor_id == supervisor_id_filter,
-                tuple_(EscalaMensal.ano, EscalaMensal.mes).in_(meses_anos),
-            )
-            .distinct()
-            .all()
+        num_dias_divisor = get_calendario_escala().dias_trabalhados(
+            supervisor_id_filter, date_start_range, date_end_range_real
         )
-        turnos_do_supervisor = {turno[0] for turno in turnos_supervisor_db}
-
-        if turnos_do_supervisor:
-            current_day = date_start_range
-            while current_day <= date_end_range_real:
-                paridade = "Par" if current_day.day % 2 == 0 else "Impar"
-                turno_diurno_do_dia = f"Diurno {paridade}"
-                turno_noturno_do_dia = f"Noturno {paridade}"
-
-                if (
-                    turno_diurno_do_dia in turnos_do_supervisor
-                    or turno_noturno_do_dia in turnos_do_supervisor
-                ):
-                    num_dias_divisor += 1
-                current_day += timedelta(days=1)
 
     elif turno_filter:
-        current_day = date_start_range
-        while current_day <= date_end_range_real:
-            paridade = "Par" if current_day.day % 2 == 0 else "Impar"
-            if paridade in turno_filter:
-                num_dias_divisor += 1
-            current_day += timedelta(days=1)
+        # Mesma regra de antes: "Impar"/"Par" contido no nome do turno
+        paridade = "Impar" if "Impar" in turno_filter else "Par" if "Par" in turno_filter else None
+        if paridade:
+            num_dias_divisor = contar_dias_com_paridade(date_start_range, date_end_range_real, paridade)
 
     else:
         # [MELHORADO] Usa a data real até onde há registros
@@ -367,6 +329,9 @@ def _calculate_supervisor_working_days(supervisor_id: int, date_start: datetime.
     - Trabalha 12 horas por dia
     - Trabalha em dias alternados (par ou ímpar)
     - Trabalha em turnos alternados (diurno ou noturno)
+
+    Usa a escala de cada mês do período (calendário em máscara de bits,
+    em cache por supervisor e mês).
     
     Args:
         supervisor_id: ID do supervisor
@@ -377,57 +342,15 @@ def _calculate_supervisor_working_days(supervisor_id: int, date_start: datetime.
         Número de dias trabalhados pelo supervisor no período
     """
     try:
-        from app.models import EscalaMensal
-        
-        # [CORRIGIDO] Busca escalas do supervisor para todos os meses do período
-        meses_anos = set()
-        current_date = date_start
-        while current_date <= date_end:
-            meses_anos.add((current_date.year, current_date.month))
-            # Avança para o próximo mês
-            next_month_year = current_date.year + (
-                current_date.month // 12
-            )
-            next_month = current_date.month % 12 + 1
-            current_date = current_date.replace(
-                year=next_month_year, month=next_month, day=1
-            )
-            if current_date > date_end:
-                break
-        
-        escalas = EscalaMensal.query.filter(
-            EscalaMensal.supervisor_id == supervisor_id,
-            tuple_(EscalaMensal.ano, EscalaMensal.mes).in_(meses_anos)
-        ).all()
-        
-        if not escalas:
+        calendario = get_calendario_escala()
+        if not calendario.tem_escala(supervisor_id, date_start, date_end):
             logger.warning(f"Supervisor {supervisor_id} não tem escala definida no período {date_start} a {date_end}")
             return 0
-        
-        # Mapeia os turnos para determinar quais dias da semana o supervisor trabalha
-        turnos_supervisor = {escala.nome_turno for escala in escalas}
-        
-        # Calcula os dias trabalhados
-        dias_trabalhados = 0
-        current_date = date_start
-        
-        logger.info(f"Turnos do supervisor: {turnos_supervisor}")
-        logger.info(f"Período analisado: {date_start} a {date_end}")
-        
-        while current_date <= date_end:
-            # Verifica se o supervisor trabalha neste dia baseado na escala
-            trabalha = _is_supervisor_working_day(current_date, turnos_supervisor)
-            if trabalha:
-                dias_trabalhados += 1
-                logger.info(f"  {current_date.strftime('%d/%m/%Y')} (dia {'par' if current_date.day % 2 == 0 else 'ímpar'}): ✅ Trabalha")
-            else:
-                logger.info(f"  {current_date.strftime('%d/%m/%Y')} (dia {'par' if current_date.day % 2 == 0 else 'ímpar'}): ❌ Folga")
-            
-            current_date += timedelta(days=1)
-        
+
+        dias_trabalhados = calendario.dias_trabalhados(supervisor_id, date_start, date_end)
         logger.info(f"Supervisor {supervisor_id} trabalhou {dias_trabalhados} dias no período {date_start} a {date_end}")
         return dias_trabalhados
-        
+
     except Exception as e:
         logger.error(f"Erro ao calcular dias trabalhados do supervisor {supervisor_id}: {e}", exc_info=True)
         return 0
@@ -450,232 +373,94 @@ def _is_supervisor_working_day(date: datetime.date, turnos_supervisor: set) -> b
     Returns:
         True se o supervisor trabalha na data, False caso contrário
     """
-    # Determina se o dia é par ou ímpar
-    is_par = date.day % 2 == 0
-    
-    # Verifica se o supervisor tem escala para este tipo de dia
-    # IMPORTANTE: O supervisor só trabalha se tiver escala EXATA para o tipo de dia
-    if is_par:
-        # Dia par - verifica se tem escala para dias pares (Diurno Par OU Noturno Par)
-        return any("Par" in turno for turno in turnos_supervisor)
-    else:
-        # Dia ímpar - verifica se tem escala para dias ímpares (Diurno Impar OU Noturno Impar)
-        return any("Impar" in turno for turno in turnos_supervisor)
+    return bool(mascara_turnos(date.year, date.month, turnos_supervisor) >> (date.day - 1) & 1)
+
+
+def _resolution_minutes_expression():
+    """Minutos entre o registro e a última modificação da ocorrência, em SQL."""
+    from app.models import VWOcorrenciasDetalhadas
+
+    if db.engine.dialect.name == "sqlite":
+        return (
+            func.julianday(VWOcorrenciasDetalhadas.data_modificacao)
+            - func.julianday(VWOcorrenciasDetalhadas.data_hora_ocorrencia)
+        ) * 1440.0
+    return func.extract(
+        "epoch", VWOcorrenciasDetalhadas.data_modificacao - VWOcorrenciasDetalhadas.data_hora_ocorrencia
+    ) / 60.0
+
 
+def _concluded_ocorrencias_query(base_kpi_query):
+    from app.models import VWOcorrenciasDetalhadas
 
-def calculate_period_comparison(base_kpi_query, date_start_range, date_end_range, supervisor_id=None, filters=None) -> dict:
+    return base_kpi_query.filter(
+        VWOcorrenciasDetalhadas.status == "Concluída",
+        VWOcorrenciasDetalhadas.data_modificacao.isnot(None),
+        VWOcorrenciasDetalhadas.data_modificacao > VWOcorrenciasDetalhadas.data_hora_ocorrencia,
+    )
+
+
+def _percentile_cont_by_offset(query, expression, total: int, fraction: float):
     """
-    Calcula comparações com o período anterior para mostrar tendências nos KPIs.
-    Se supervisor_id for fornecido, compara apenas as rondas desse supervisor.
-    
-    A comparação é feita com o período correspondente do mês anterior:
-    - Se o período atual é 01/08 a 15/08, compara com 01/07 a 15/07
-    - Se o período atual é 01/08 a 31/08, compara com 01/07 a 31/07
-    - Se o período atual é 29/08 a 05/09, compara com 29/07 a 05/08
+    Equivalente ao `percentile_cont` (interpolação linear) para bancos sem a
+    função (SQLite): busca só os dois valores vizinhos com ORDER BY/OFFSET.
     """
-    try:
-        from app.models import VWRondasDetalhadas
-        from datetime import timedelta
-        
-        # Calcula o período anterior correspondente (mesmo dia do mês anterior)
-        # Exemplo: 01/08 a 15/08 -> 01/07 a 15/07
-        # Exemplo: 29/08 a 05/09 -> 29/07 a 05/08
-        
-        # Calcula a diferença em dias entre start e end
-        dias_diferenca = (date_end_range - date_start_range).days
-        
-        # Calcula o período anterior mantendo a mesma diferença de dias
-        if date_start_range.month == 1:
-            # Se estamos em janeiro, vai para dezembro do ano anterior
-            anterior_start = date_start_range.replace(year=date_start_range.year - 1, month=12)
-        else:
-            anterior_start = date_start_range.replace(month=date_start_range.month - 1)
-        
-        # Calcula o final do período anterior mantendo a mesma diferença de dias
-        anterior_end = anterior_start + timedelta(days=dias_diferenca)
-        
-        # Query para o período atual
-        total_atual = base_kpi_query.with_entities(
-            func.coalesce(func.sum(VWRondasDetalhadas.total_rondas_no_log), 0)
-        ).scalar()
-        
-        # Query para o período anterior - aplica os mesmos filtros do período atual
-        anterior_query = db.session.query(
-            func.coalesce(func.sum(VWRondasDetalhadas.total_rondas_no_log), 0)
-        ).filter(
-            VWRondasDetalhadas.data_plantao_ronda >= anterior_start,
-            VWRondasDetalhadas.data_plantao_ronda <= anterior_end
-        )
-        
-        # Aplica os mesmos filtros do período atual no período anterior
-        if supervisor_id:
-            anterior_query = anterior_query.filter(
-                VWRondasDetalhadas.supervisor_id == supervisor_id
-            )
-        
-        # Aplica filtros adicionais se fornecidos
-        if filters:
-            if filters.get("condominio_id"):
-                anterior_query = anterior_query.filter(
-                    VWRondasDetalhadas.condominio_id == filters["condominio_id"]
-                )
-            if filters.get("turno"):
-                anterior_query = anterior_query.filter(
-                    VWRondasDetalhadas.turno_ronda == filters["turno"]
-                )
-        
-        total_anterior = anterior_query.scalar()
-        
-        # Calcula variação percentual
-        if total_anterior > 0:
-            variacao_percentual = round(((total_atual - total_anterior) / total_anterior) * 100, 1)
-        else:
-            variacao_percentual = 0 if total_atual == 0 else 100
-        
-        # Determina status baseado na variação
-        if variacao_percentual > 10:
-            status = "success"
-            status_text = "Crescimento"
-        elif variacao_percentual > -10:
-            status = "warning"
-            status_text = "Estável"
-        else:
-            status = "danger"
-            status_text = "Queda"
-        
-        # Verifica se os dados estão atualizados (última data não é muito antiga)
-        ultima_data = base_kpi_query.with_entities(
-            func.max(VWRondasDetalhadas.data_plantao_ronda)
-        ).scalar()
-        
-        dados_atualizados = True
-        if ultima_data:
-            dias_desde_ultima = (datetime.now().date() - ultima_data).days
-            dados_atualizados = dias_desde_ultima <= 3  # Considera atualizado se não passou de 3 dias
-        
-        return {
-            "total_atual": total_atual,
-            "total_anterior": total_anterior,
-            "variacao_percentual": variacao_percentual,
-            "status": status,
-            "status_text": status_text,
-            "dados_atualizados": dados_atualizados,
-            "ultima_atualizacao": ultima_data,
-            "dias_desde_ultima": (datetime.now().date() - ultima_data).days if ultima_data else None
-        }
-        
-    except Exception as e:
-        logger.error(f"Erro ao calcular comparação de períodos: {e}", exc_info=True)
-        return {
-            "total_atual": 0,
-            "total_anterior": 0,
-            "variacao_percentual": 0,
-            "status": "secondary",
-            "status_text": "N/A",
-            "dados_atualizados": False,
-            "ultima_atualizacao": None,
-            "dias_desde_ultima": None
-        }
+    if not total:
+        return None
+    position = fraction * (total - 1)
+    lower = int(position)
+    values = [
+        value for (value,) in query.with_entities(expression).order_by(expression).offset(lower).limit(2).all()
+    ]
+    if len(values) == 1 or position == lower:
+        return values[0]
+    return values[0] + (values[1] - values[0]) * (position - lower)
+
+
+def calculate_ocorrencia_resolution_stats(base_kpi_query) -> dict:
+    """
+    Tempo de resolução (registro -> última modificação) das ocorrências
+    concluídas da query base: média, mediana e p90 em minutos, todos
+    agregados no banco.
+    """
+    minutes = _resolution_minutes_expression()
+    concluded_q = _concluded_ocorrencias_query(base_kpi_query)
+
+    if db.engine.dialect.name == "postgresql":
+        total, mean, median, p90 = concluded_q.with_entities(
+            func.count(),
+            func.avg(minutes),
+            func.percentile_cont(0.5).within_group(minutes),
+            func.percentile_cont(0.9).within_group(minutes),
+        ).one()
+    else:
+        total, mean = concluded_q.with_entities(func.count(), func.avg(minutes)).one()
+        median = _percentile_cont_by_offset(concluded_q, minutes, total, 0.5)
+        p90 = _percentile_cont_by_offset(concluded_q, minutes, total, 0.9)
+
+    def _round(value):
+        return round(float(value), 1) if value is not None else None
 
-def calculate_ocorrencia_period_comparison(base_kpi_query, date_start_range, date_end_range, supervisor_id=None) -> dict:
+    return {"total": total or 0, "media": _round(mean), "mediana": _round(median), "p90": _round(p90)}
+
+
+def calculate_resolution_time_by_condominio(base_kpi_query) -> tuple:
     """
-    Calcula comparações com o período anterior para mostrar tendências nos KPIs de ocorrências.
-    Se supervisor_id for fornecido, compara apenas as ocorrências desse supervisor.
-    
-    A comparação é feita com o período correspondente do mês anterior:
-    - Se o período atual é 01/08 a 15/08, compara com 01/07 a 15/07
-    - Se o período atual é 01/08 a 31/08, compara com 01/07 a 31/07
-    - Se o período atual é 29/08 a 05/09, compara com 29/07 a 05/08
+    Tempo médio de resolução por condomínio (ocorrências concluídas), do
+    mais lento para o mais rápido. Retorna (labels, médias em minutos, totais).
     """
-    try:
-        from datetime import timedelta
-        from app.models import VWOcorrenciasDetalhadas
-        
-        # Calcula o período anterior correspondente (mesmo dia do mês anterior)
-        # Exemplo: 01/08 a 15/08 -> 01/07 a 15/07
-        # Exemplo: 29/08 a 05/09 -> 29/07 a 05/08
-        
-        # Calcula a diferença em dias entre start e end
-        dias_diferenca = (date_end_range - date_start_range).days
-        
-        # Calcula o período anterior mantendo a mesma diferença de dias
-        if date_start_range.month == 1:
-            # Se estamos em janeiro, vai para dezembro do ano anterior
-            anterior_start = date_start_range.replace(year=date_start_range.year - 1, month=12)
-        else:
-            anterior_start = date_start_range.replace(month=date_start_range.month - 1)
-        
-        # Calcula o final do período anterior mantendo a mesma diferença de dias
-        anterior_end = anterior_start + timedelta(days=dias_diferenca)
-        
-        # Query para o período atual
-        total_atual = base_kpi_query.count()
-        
-        # Query para o período anterior - aplica os mesmos filtros do período atual
-        anterior_query = db.session.query(VWOcorrenciasDetalhadas).filter(
-            VWOcorrenciasDetalhadas.data_hora_ocorrencia >= anterior_start,
-            VWOcorrenciasDetalhadas.data_hora_ocorrencia <= anterior_end
-        )
-        
-        # Se um supervisor foi filtrado, aplica o mesmo filtro no período anterior
-        if supervisor_id:
-            # Busca o nome do supervisor para filtrar na view
-            from app.models import User
-            supervisor = User.query.get(supervisor_id)
-            if supervisor:
-                anterior_query = anterior_query.filter(
-                    VWOcorrenciasDetalhadas.supervisor == supervisor.username
-                )
-        
-        total_anterior = anterior_query.count()
-        
-        # Calcula variação percentual
-        if total_anterior > 0:
-            variacao_percentual = round(((total_atual - total_anterior) / total_anterior) * 100, 1)
-        else:
-            variacao_percentual = 0 if total_atual == 0 else 100
-        
-        # Determina status baseado na variação (para ocorrências, menos é melhor)
-        if variacao_percentual < -10:
-            status = "success"
-            status_text = "Redução"
-        elif variacao_percentual < 10:
-            status = "warning"
-            status_text = "Estável"
-        else:
-            status = "danger"
-            status_text = "Aumento"
-        
-        # Verifica se os dados estão atualizados (última data não é muito antiga)
-        ultima_data = base_kpi_query.with_entities(
-            func.max(VWOcorrenciasDetalhadas.data_hora_ocorrencia)
-        ).scalar()
-        
-        dados_atualizados = True
-        if ultima_data:
-            dias_desde_ultima = (datetime.now().date() - ultima_data.date()).days
-            dados_atualizados = dias_desde_ultima <= 3  # Considera atualizado se não passou de 3 dias
-        
-        return {
-            "total_atual": total_atual,
-            "total_anterior": total_anterior,
-            "variacao_percentual": variacao_percentual,
-            "status": status,
-            "status_text": status_text,
-            "dados_atualizados": dados_atualizados,
-            "ultima_atualizacao": ultima_data,
-            "dias_desde_ultima": (datetime.now().date() - ultima_data.date()).days if ultima_data else None
-        }
-        
-    except Exception as e:
-        logger.error(f"Erro ao calcular comparação de períodos de ocorrências: {e}", exc_info=True)
-        return {
-            "total_atual": 0,
-            "total_anterior": 0,
-            "variacao_percentual": 0,
-            "status": "secondary",
-            "status_text": "N/A",
-            "dados_atualizados": False,
-            "ultima_atualizacao": None,
-            "dias_desde_ultima": None
-        }
+    from app.models import VWOcorrenciasDetalhadas
+
+    minutes = _resolution_minutes_expression()
+    rows = (
+        _concluded_ocorrencias_query(base_kpi_query)
+        .filter(VWOcorrenciasDetalhadas.condominio.isnot(None))
+        .with_entities(VWOcorrenciasDetalhadas.condominio, func.avg(minutes), func.count())
+        .group_by(VWOcorrenciasDetalhadas.condominio)
+        .order_by(func.avg(minutes).desc())
+        .all()
+    )
+    labels = [nome for nome, _, _ in rows]
+    data = [round(float(media), 1) for _, media, _ in rows]
+    counts = [total for _, _, total in rows]
+    return labels, data, counts
@@ -12,7 +12,8 @@ from app.models import (Colaborador, Condominio, OcorrenciaTipo,
 from app.services import ocorrencia_service
 from app.utils.date_utils import parse_date_range
 
-from .helpers import chart_data, date_utils
+from .helpers import chart_data
+from .helpers import comparison as comparison_helper
 from .helpers import kpis as kpis_helper
 
 logger = logging.getLogger(__name__)
@@ -144,69 +145,16 @@ def get_ocorrencia_dashboard_data(filters):
     logger.info(f"Filtros aplicados: {filters}")
 
     # [NOVO] Evolução por Supervisor Diário - Ajustado para Plantão 12x36
-    # Subtraímos 6 horas do horário da ocorrência. Como o plantão vira às 06:00,
-    # ocorrências entre 00:00 e 05:59 entram na contagem do dia anterior.
-    from datetime import timedelta
-    
-    logger.info("🔍 DEBUG: Iniciando query de evolução diária por supervisor")
-    
-    ocorrencias_raw_q = db.session.query(
-        VWOcorrenciasDetalhadas.data_hora_ocorrencia,
-        VWOcorrenciasDetalhadas.supervisor
-    )
-    
-    # Aplicar os mesmos filtros
-    ocorrencias_raw_q = ocorrencia_service.apply_ocorrencia_filters(ocorrencias_raw_q, filters)
-    
-    from datetime import time, timezone, datetime
-    date_start_range_dt = datetime.combine(date_start_range, time.min, tzinfo=timezone.utc)
-    date_end_range_dt = datetime.combine(date_end_range, time.max, tzinfo=timezone.utc)
-    
-    ocorrencias_raw_q = ocorrencias_raw_q.filter(
-        VWOcorrenciasDetalhadas.data_hora_ocorrencia >= date_start_range_dt,
-        VWOcorrenciasDetalhadas.data_hora_ocorrencia <= date_end_range_dt
-    )
-    
-    ocorrencias_raw = ocorrencias_raw_q.all()
-
+    # A data do plantão (horário - 6h, truncado no dia) e a contagem por
+    # supervisor são feitas no banco; só chegam (supervisor, dia, total).
     evolucao_date_labels = []
     evolucao_series_data = []
     evolucao_total_data = [] # mantido para caso de necessidade de log
-    
+
     if (date_end_range - date_start_range).days < 366:
-        evolucao_date_labels = date_utils.generate_date_labels(
-            date_start_range, date_end_range
+        evolucao_date_labels, evolucao_series_data, evolucao_total_data = _get_evolucao_por_supervisor(
+            filters, date_start_range, date_end_range
         )
-        
-        dados_por_data = { d: {} for d in evolucao_date_labels }
-        supervisores_set = set()
-        
-        for dt_ocorrencia, supervisor in ocorrencias_raw:
-            # Ajuste de 6 horas (plantão vira às 06:00. ex: ocorrência 05:59 -> 23:59 do dia anterior)
-            shift_date = (dt_ocorrencia - timedelta(hours=6)).date()
-            shift_date_str = shift_date.strftime("%Y-%m-%d")
-            
-            sup_name = supervisor or "Sem Supervisor"
-            supervisores_set.add(sup_name)
-            
-            if shift_date_str in dados_por_data:
-                dados_por_data[shift_date_str][sup_name] = dados_por_data[shift_date_str].get(sup_name, 0) + 1
-
-        for sup in supervisores_set:
-            serie_data = []
-            for d in evolucao_date_labels:
-                serie_data.append(dados_por_data[d].get(sup, 0))
-            
-            evolucao_series_data.append({
-                "name": sup,
-                "type": "line",
-                "smooth": True,
-                "data": serie_data
-            })
-            
-        for d in evolucao_date_labels:
-            evolucao_total_data.append(sum(dados_por_data[d].values()))
-
         logger.info(f"Labels de data gerados: {len(evolucao_date_labels)}")
         logger.info(f"Séries geradas: {len(evolucao_series_data)}")
 
@@ -292,28 +240,19 @@ def get_ocorrencia_dashboard_data(filters):
     )
 
     # [NOVO] Comparação com período anterior
-    comparacao_periodo = kpis_helper.calculate_ocorrencia_period_comparison(
-        base_kpi_query, date_start_range, date_end_range,
-        supervisor_id=filters.get("supervisor_id")
+    comparacao_periodo = comparison_helper.comparar_periodos(
+        "ocorrencias", filters, date_start_range, date_end_range, incluir_ano_anterior=True
     )
 
-    # [NOVO] Tempo médio de resolução das ocorrências concluídas
-    # Detecta se estamos usando a view ou a tabela
-    is_view = hasattr(base_kpi_query.column_descriptions[0]['type'], '__tablename__') and \
-              base_kpi_query.column_descriptions[0]['type'].__tablename__ == 'vw_ocorrencias_detalhadas'
-    
-    if is_view:
-        # A view não tem data_modificacao, então não podemos calcular o tempo de resolução
-        tempo_medio_resolucao_minutos = None
-    else:
-        # Usando a tabela original, podemos calcular o tempo de resolução
-        ocorrencias_concluidas_q = base_kpi_query.filter(Ocorrencia.status == 'Concluída', Ocorrencia.data_modificacao.isnot(None))
-        tempos_resolucao = [
-            (o.data_modificacao - o.data_hora_ocorrencia).total_seconds() / 60.0
-            for o in ocorrencias_concluidas_q.all()
-            if o.data_modificacao and o.data_hora_ocorrencia and o.data_modificacao > o.data_hora_ocorrencia
-        ]
-        tempo_medio_resolucao_minutos = round(sum(tempos_resolucao) / len(tempos_resolucao), 1) if tempos_resolucao else None
+    # [NOVO] Tempo de resolução das ocorrências concluídas (média, mediana e p90),
+    # agregado no banco a partir da view (data_modificacao - data_hora_ocorrencia)
+    resolucao_stats = kpis_helper.calculate_ocorrencia_resolution_stats(base_kpi_query)
+    tempo_medio_resolucao_minutos = resolucao_stats["media"]
+    (
+        resolucao_por_condominio_labels,
+        resolucao_por_condominio_data,
+        resolucao_por_condominio_totais,
+    ) = kpis_helper.calculate_resolution_time_by_condominio(base_kpi_query)
 
     # [NOVO] Média diária de ocorrências
     # Se supervisor_id for fornecido, calcula apenas nos dias trabalhados pelo supervisor (jornada 12x36)
@@ -362,6 +301,11 @@ def get_ocorrencia_dashboard_data(filters):
         "comparacao_periodo": comparacao_periodo,
         # [NOVO] Tempo médio de resolução
         "tempo_medio_resolucao_minutos": tempo_medio_resolucao_minutos,
+        "tempo_mediano_resolucao_minutos": resolucao_stats["mediana"],
+        "tempo_p90_resolucao_minutos": resolucao_stats["p90"],
+        "resolucao_por_condominio_labels": resolucao_por_condominio_labels,
+        "resolucao_por_condominio_data": resolucao_por_condominio_data,
+        "resolucao_por_condominio_totais": resolucao_por_condominio_totais,
         # [NOVO] Média diária de ocorrências
         "media_diaria_ocorrencias": media_diaria_ocorrencias,
         # [NOVO] Descrição da métrica de média
@@ -369,6 +313,40 @@ def get_ocorrencia_dashboard_data(filters):
     }
 
 
+def _get_evolucao_por_supervisor(filters, date_start_range, date_end_range):
+    """
+    Ocorrências por dia de plantão e supervisor em uma única query agrupada.
+    Retorna (labels, séries no formato do gráfico, totais por dia).
+    """
+    from datetime import time, timezone
+
+    date_start_range_dt = datetime.combine(date_start_range, time.min, tzinfo=timezone.utc)
+    date_end_range_dt = datetime.combine(date_end_range, time.max, tzinfo=timezone.utc)
+    data_plantao = chart_data.shift_date_expression(VWOcorrenciasDetalhadas.data_hora_ocorrencia)
+
+    evolucao_q = db.session.query(
+        VWOcorrenciasDetalhadas.supervisor,
+        data_plantao.label("data_plantao"),
+        func.count(VWOcorrenciasDetalhadas.id),
+    )
+    evolucao_q = ocorrencia_service.apply_ocorrencia_filters(evolucao_q, filters)
+    evolucao_q = evolucao_q.filter(
+        VWOcorrenciasDetalhadas.data_hora_ocorrencia >= date_start_range_dt,
+        VWOcorrenciasDetalhadas.data_hora_ocorrencia <= date_end_range_dt
+    ).group_by(VWOcorrenciasDetalhadas.supervisor, data_plantao)
+
+    labels, series, totals = chart_data.build_daily_series(
+        [(supervisor or "Sem Supervisor", dia, total) for supervisor, dia, total in evolucao_q.all()],
+        date_start_range,
+        date_end_range,
+    )
+    series_data = [
+        {"name": supervisor, "type": "line", "smooth": True, "data": valores}
+        for supervisor, valores in sorted(series.items())
+    ]
+    return labels, series_data, totals
+
+
 def _get_media_diaria_description(supervisor_id, periodo_info):
     """
     Gera uma descrição clara da métrica de média diária.
@@ -9,6 +9,7 @@ from app.models import Condominio, Parada, User
 from app.utils.date_utils import parse_date_range
 
 from .helpers import chart_data, date_utils
+from .helpers import comparison as comparison_helper
 
 logger = logging.getLogger(__name__)
 
@@ -195,6 +196,11 @@ def get_parada_dashboard_data(filters):
         parada_date_labels = date_utils.generate_date_labels(date_start_range, date_end_range)
         parada_activity_data = chart_data.fill_series_with_zeros(paradas_por_dia, parada_date_labels)
 
+    # Comparação com período anterior
+    comparacao_periodo = comparison_helper.comparar_periodos(
+        "paradas", filters, date_start_range, date_end_range
+    )
+
     # 4. Retorno dos dados consolidados
     return {
         "total_paradas": total_paradas,
@@ -214,4 +220,5 @@ def get_parada_dashboard_data(filters):
         "parada_activity_data": parada_activity_data,
         "selected_data_inicio_str": date_start_range.strftime("%Y-%m-%d"),
         "selected_data_fim_str": date_end_range.strftime("%Y-%m-%d"),
+        "comparacao_periodo": comparacao_periodo,
     }
@@ -11,6 +11,7 @@ from app.utils.date_utils import parse_date_range
 
 # [NOVO] Importa o helper de KPIs
 from .helpers import chart_data, date_utils
+from .helpers import comparison as comparison_helper
 from .helpers import filters as filters_helper
 from .helpers import kpis as kpis_helper
 
@@ -250,10 +251,8 @@ def get_ronda_dashboard_data(filters):
     )
     
     # [NOVO] Comparação com período anterior
-    comparacao_periodo = kpis_helper.calculate_period_comparison(
-        base_kpi_query, date_start_range, date_end_range, 
-        supervisor_id=filters.get("supervisor_id"),
-        filters=filters
+    comparacao_periodo = comparison_helper.comparar_periodos(
+        "rondas", filters, date_start_range, date_end_range, incluir_ano_anterior=True
     )
 
     # [REMOVIDO] Blocos de código para calcular KPIs foram extraídos para helpers/kpis.py
@@ -1,9 +1,6 @@
 # app/services/email_format_service.py
-import os
-
-from jinja2 import Environment, FileSystemLoader  # Adicionado Jinja2
-
 from .base_generative_service import BaseGenerativeService
+from .container_servicos import obter_ambiente_prompts
 
 
 class EmailFormatService(BaseGenerativeService):
@@ -14,16 +11,10 @@ class EmailFormatService(BaseGenerativeService):
     ):
         super().__init__(model_name=model_name)
         # self.logger já é inicializado pela BaseGenerativeService
-        self._template = (
-            None  # Alterado para _template para armazenar o objeto template Jinja2
-        )
+        self._nome_template = None  # o Template é buscado a cada uso (ver BaseGenerativeService._template)
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            template_folder = os.path.join(current_dir, "prompt_templates")
-            jinja_env = Environment(
-                loader=FileSystemLoader(template_folder), autoescape=True
-            )
-            self._template = jinja_env.get_template(template_filename)
+            obter_ambiente_prompts().get_template(template_filename)  # valida já na construção
+            self._nome_template = template_filename
             self.logger.info(
                 f"Template '{template_filename}' carregado para EmailFormatService."
             )
@@ -1,8 +1,5 @@
-import os
-
-from jinja2 import Environment, FileSystemLoader
-
 from .base_generative_service import BaseGenerativeService
+from .container_servicos import obter_ambiente_prompts
 
 
 class EmailPatrimonialFormatService(BaseGenerativeService):
@@ -12,15 +9,13 @@ class EmailPatrimonialFormatService(BaseGenerativeService):
         template_filename="email_patrimonial_format_template.txt",
     ):
         super().__init__(model_name=model_name)
-        self._template = None
+        self._nome_template_padrao = "email_patrimonial_format_template.txt"
+        self._nome_template_consolidado = "email_consolidado_format_template.txt"
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            template_folder = os.path.join(current_dir, "prompt_templates")
-            jinja_env = Environment(
-                loader=FileSystemLoader(template_folder), autoescape=True
-            )
-            self._template_padrao = jinja_env.get_template("email_patrimonial_format_template.txt")
-            self._template_consolidado = jinja_env.get_template("email_consolidado_format_template.txt")
+            # Valida já na construção; o Template é buscado a cada uso
+            jinja_env = obter_ambiente_prompts()
+            jinja_env.get_template(self._nome_template_padrao)
+            jinja_env.get_template(self._nome_template_consolidado)
             self.logger.info("Templates de formatação carregados para EmailPatrimonialFormatService.")
         except Exception as e:
             self.logger.error(
@@ -32,7 +27,9 @@ class EmailPatrimonialFormatService(BaseGenerativeService):
             ) from e
 
     def _construir_prompt(self, dados_brutos: str, consolidado=False) -> str:
-        template = self._template_consolidado if consolidado else self._template_padrao
+        template = self._template_prompt(
+            self._nome_template_consolidado if consolidado else self._nome_template_padrao
+        )
         
         if not template:
             raise RuntimeError("Template de formatação não está carregado.")
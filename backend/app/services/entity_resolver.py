@@ -0,0 +1,176 @@
+# app/services/entity_resolver.py
+"""
+Resolução em memória de nomes de supervisores e condomínios durante importações.
+
+Supervisores e condomínios são carregados uma vez em índices normalizados
+(sem acentos, minúsculas, pontuação removida): um mapa exato, um índice de
+tokens e uma pontuação fuzzy barata para os candidatos. O índice é mantido
+por processo e reconstruído quando `user` ou `condominio` mudam (após o
+commit, eventos do ORM incrementam uma versão guardada no cache da aplicação).
+"""
+import logging
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Optional
+
+from app import db
+from app.models import Condominio, User
+from app.services.snapshot_versionado import SnapshotVersionado
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_VERSAO = "entity_resolver:versao"
+SCORE_MINIMO_PADRAO = 0.75
+
+_REGEX_NAO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def normalizar_nome(texto: str) -> str:
+    """'Residencial São José - Fase II' -> 'residencial sao jose fase ii'."""
+    if not texto:
+        return ""
+    sem_acentos = "".join(
+        c for c in unicodedata.normalize("NFKD", str(texto)) if not unicodedata.combining(c)
+    )
+    return _REGEX_NAO_ALFANUMERICO.sub(" ", sem_acentos.lower()).strip()
+
+
+class IndiceNomes:
+    """Índice (exato + tokens) de nomes normalizados para ids."""
+
+    def __init__(self, entradas):
+        self.nomes = {}      # id -> nome original
+        self.exato = {}      # nome normalizado -> id
+        self.tokens = {}     # token -> {ids}
+        self.normalizados = {}  # id -> nome normalizado
+        for entidade_id, nome in entradas:
+            normalizado = normalizar_nome(nome)
+            if not normalizado:
+                continue
+            self.nomes[entidade_id] = nome
+            self.normalizados[entidade_id] = normalizado
+            self.exato.setdefault(normalizado, entidade_id)
+            for token in normalizado.split():
+                self.tokens.setdefault(token, set()).add(entidade_id)
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def resolver_exato(self, nome: str) -> Optional[int]:
+        return self.exato.get(normalizar_nome(nome))
+
+    def _pontuar(self, consulta: str, candidato: str) -> float:
+        if consulta == candidato:
+            return 1.0
+        # Mantém a regra das importações: um nome contido no outro é um match forte
+        if f" {consulta} " in f" {candidato} " or f" {candidato} " in f" {consulta} ":
+            return 0.95
+        tokens_consulta, tokens_candidato = set(consulta.split()), set(candidato.split())
+        jaccard = len(tokens_consulta & tokens_candidato) / len(tokens_consulta | tokens_candidato)
+        return max(jaccard, SequenceMatcher(None, consulta, candidato).ratio()) * 0.9
+
+    def resolver(self, nome: str, score_minimo: float = SCORE_MINIMO_PADRAO) -> Optional[int]:
+        """Match exato; senão, o melhor candidato que compartilha tokens com o nome."""
+        consulta = normalizar_nome(nome)
+        if not consulta:
+            return None
+        if consulta in self.exato:
+            return self.exato[consulta]
+        candidatos = set()
+        for token in consulta.split():
+            candidatos |= self.tokens.get(token, set())
+        melhor_id, melhor_score = None, 0.0
+        for entidade_id in candidatos:
+            score = self._pontuar(consulta, self.normalizados[entidade_id])
+            if score > melhor_score or (score == melhor_score and melhor_id is not None and entidade_id < melhor_id):
+                melhor_id, melhor_score = entidade_id, score
+        return melhor_id if melhor_score >= score_minimo else None
+
+    def encontrar_contido(self, texto: str) -> Optional[int]:
+        """Id cujo nome aparece inteiro em `texto` (ex.: nome de arquivo). Prefere o nome mais longo."""
+        normalizado = f" {normalizar_nome(texto)} "
+        candidatos = set()
+        for token in normalizado.split():
+            candidatos |= self.tokens.get(token, set())
+        contidos = [i for i in candidatos if f" {self.normalizados[i]} " in normalizado]
+        if not contidos:
+            # Nomes colados a outros caracteres (ex.: "ZERMATT20250130")
+            contidos = [i for i, nome in self.normalizados.items() if nome in normalizado]
+        if not contidos:
+            return None
+        return max(contidos, key=lambda i: (len(self.normalizados[i]), -i))
+
+
+class EntityResolver:
+    """Snapshot de supervisores e condomínios para resolver nomes sem consultas."""
+
+    def __init__(self, supervisores, condominios, versao=None):
+        self.supervisores = IndiceNomes(supervisores)
+        self.condominios = IndiceNomes(condominios)
+        self.versao = versao
+
+    @classmethod
+    def carregar(cls, versao=None):
+        supervisores = db.session.query(User.id, User.username).filter(User.is_supervisor.is_(True)).all()
+        condominios = db.session.query(Condominio.id, Condominio.nome).all()
+        logger.info(
+            f"EntityResolver carregado: {len(supervisores)} supervisores, {len(condominios)} condomínios (versão {versao})."
+        )
+        return cls(supervisores, condominios, versao)
+
+    def resolver_supervisor_id(self, nome: str) -> Optional[int]:
+        return self.supervisores.resolver(nome)
+
+    def resolver_condominio_id(self, nome: str) -> Optional[int]:
+        """Somente match exato normalizado: um match fuzzy poderia gravar no condomínio errado."""
+        return self.condominios.resolver_exato(nome)
+
+    def inferir_condominio_id(self, texto: str) -> Optional[int]:
+        return self.condominios.encontrar_contido(texto)
+
+    def registrar_condominio(self, condominio_id: int, nome: str) -> None:
+        """Inclui no snapshot local um condomínio criado durante o lote."""
+        normalizado = normalizar_nome(nome)
+        if not normalizado:
+            return
+        self.condominios.nomes[condominio_id] = nome
+        self.condominios.normalizados[condominio_id] = normalizado
+        self.condominios.exato.setdefault(normalizado, condominio_id)
+        for token in normalizado.split():
+            self.condominios.tokens.setdefault(token, set()).add(condominio_id)
+
+
+_snapshot = SnapshotVersionado(CACHE_KEY_VERSAO, EntityResolver.carregar, "EntityResolver")
+
+
+def invalidar_entity_resolver():
+    """Incrementa a versão compartilhada; os processos reconstroem o índice na próxima leitura."""
+    _snapshot.invalidar()
+
+
+def get_entity_resolver() -> EntityResolver:
+    """Retorna o resolver do processo, recarregando-o se a versão mudou."""
+    return _snapshot.obter()
+
+
+# Só as colunas que alimentam os índices disparam invalidação em updates
+# (ex.: atualizar User.last_login no login não deve reconstruir o índice).
+_snapshot.monitorar({
+    User: ("username", "is_supervisor"),
+    Condominio: ("nome",),
+})
+
+
+def obter_ou_criar_condominio_id(nome: str, resolver: Optional[EntityResolver] = None) -> int:
+    """Resolve o condomínio pelo nome normalizado; cria (flush, sem commit) se não existir."""
+    resolver = resolver or get_entity_resolver()
+    condominio_id = resolver.resolver_condominio_id(nome)
+    if condominio_id:
+        return condominio_id
+    condominio = Condominio(nome=nome.strip())
+    db.session.add(condominio)
+    db.session.flush()
+    resolver.registrar_condominio(condominio.id, condominio.nome)
+    logger.info(f"Condomínio '{condominio.nome}' criado automaticamente durante importação.")
+    return condominio.id
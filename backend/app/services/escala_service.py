@@ -1,6 +1,7 @@
 # app/services/escala_service.py
 from app import db
 from app.models import EscalaMensal
+from app.services.calendario_escala import invalidar_calendario_escala
 
 
 def get_escala_mensal(ano, mes):
@@ -42,6 +43,8 @@ def salvar_escala_mensal(ano, mes, dados_formulario):
                 db.session.add(escala)
 
         db.session.commit()
+        # O delete em lote acima não dispara os eventos do ORM
+        invalidar_calendario_escala()
         return True, f"Escala de supervisores para {mes}/{ano} atualizada com sucesso!"
 
     except Exception as e:
@@ -0,0 +1,192 @@
+# app/services/event_matcher.py
+"""
+Casamento de eventos (início/término) em mensagens de log em uma única passada.
+
+Os parsers de ronda e parada testavam uma lista ordenada de regex com
+`.search()` até a primeira que casasse. O `EventMatcher` preserva exatamente
+essa semântica, mas:
+
+1. aplica um pré-filtro barato (ex.: a linha precisa ter um dígito e uma
+   palavra-chave); a maioria das linhas de um export do WhatsApp para aqui;
+2. detecta quais "requisitos" (trechos obrigatórios dos padrões, como a
+   palavra-chave de início ou o formato de hora) a linha contém e descarta os
+   padrões que não podem casar;
+3. avalia os padrões restantes em uma única alternação compilada (cacheada por
+   combinação de requisitos). Cada padrão vira um lookahead ancorado no início
+   do texto, `(?=(?s:.*?)(?:padrão))(?P<_pN>)`. Como as alternativas são
+   tentadas em ordem na posição 0 e o `.*?` preguiçoso encontra a ocorrência
+   mais à esquerda, o padrão escolhido e o grupo capturado são os mesmos da
+   busca sequencial.
+
+Quando o primeiro padrão casa mas a hora capturada não serve ao chamador, a
+iteração continua pelos padrões seguintes (busca sequencial, caso raro),
+como no loop original.
+
+Premissas: os padrões não usam backreferences nem grupos nomeados, e um
+trecho listado em `requisitos` nunca aparece como parte opcional de um padrão.
+`comparar_com_busca_sequencial` verifica a equivalência sobre um corpus.
+"""
+import random
+import re
+import threading
+import time
+
+_MARCADOR = "_p"
+
+
+class EventMatcher:
+    def __init__(self, padroes, flags=re.IGNORECASE, prefiltros=(), requisitos=None):
+        """
+        padroes: lista ordenada de {"tipo": str, "regex_str": str}.
+        prefiltros: regex que TODAS as linhas com evento precisam conter;
+            linhas que falham em qualquer uma são descartadas de imediato.
+        requisitos: {nome: trecho_regex}; um padrão que contém o trecho só é
+            avaliado se a linha também o contiver.
+        """
+        self.flags = flags
+        self.padroes = []
+        for padrao in padroes:
+            compilado = re.compile(padrao["regex_str"], flags)
+            self.padroes.append(
+                {
+                    "tipo": padrao["tipo"],
+                    "regex_str": padrao["regex_str"],
+                    "regex": compilado,
+                    "requisitos": frozenset(
+                        nome for nome, trecho in (requisitos or {}).items() if trecho in padrao["regex_str"]
+                    ),
+                }
+            )
+        self.prefiltros = [re.compile(p, flags) if isinstance(p, str) else p for p in prefiltros]
+        self.requisitos = {nome: re.compile(trecho, flags) for nome, trecho in (requisitos or {}).items()}
+        self._combinados = {}
+        self._lock = threading.Lock()
+
+    def passa_prefiltro(self, texto):
+        return all(p.search(texto) for p in self.prefiltros)
+
+    def _combinado_para(self, presentes):
+        """(regex combinada, [(índice do padrão, grupo da hora)]) para os padrões viáveis."""
+        combinado = self._combinados.get(presentes)
+        if combinado is not None:
+            return combinado
+        partes, alternativas, grupos_antes = [], [], 0
+        for indice, padrao in enumerate(self.padroes):
+            if not padrao["requisitos"] <= presentes:
+                continue
+            regex_str = padrao["regex_str"]
+            # Um padrão com "^" só pode casar na posição 0: dispensa a varredura do lookahead
+            varredura = "" if regex_str.startswith("^") else "(?s:.*?)"
+            partes.append(f"(?={varredura}(?:{regex_str}))(?P<{_MARCADOR}{len(alternativas)}>)")
+            alternativas.append((indice, grupos_antes + 1 if padrao["regex"].groups else None))
+            grupos_antes += padrao["regex"].groups + 1
+        combinado = (re.compile("|".join(partes), self.flags) if partes else None, alternativas)
+        with self._lock:
+            self._combinados[presentes] = combinado
+        return combinado
+
+    def iterar(self, texto):
+        """
+        Gera (tipo, hora_raw) na ordem de prioridade dos padrões que casam com
+        `texto`. `hora_raw` é o grupo 1 do padrão (None se ausente).
+        """
+        if not texto or not self.passa_prefiltro(texto):
+            return
+        presentes = frozenset(nome for nome, regex in self.requisitos.items() if regex.search(texto))
+        regex, alternativas = self._combinado_para(presentes)
+        if regex is None:
+            return
+        match = regex.match(texto)
+        if match is None:
+            return
+        indice, grupo_hora = alternativas[int(match.lastgroup[len(_MARCADOR):])]
+        yield self.padroes[indice]["tipo"], match.group(grupo_hora) if grupo_hora else None
+
+        for padrao in self.padroes[indice + 1:]:
+            if not padrao["requisitos"] <= presentes:
+                continue
+            match_seq = padrao["regex"].search(texto)
+            if match_seq:
+                yield padrao["tipo"], match_seq.group(1) if padrao["regex"].groups else None
+
+
+def iterar_busca_sequencial(padroes_compilados, texto):
+    """Referência: o loop original (`.search()` padrão a padrão), usado nas comparações."""
+    for r_info in padroes_compilados:
+        match_evento = r_info["regex"].search(texto)
+        if match_evento:
+            yield r_info["tipo"], match_evento.group(1) if r_info["regex"].groups else None
+
+
+def comparar_com_busca_sequencial(matcher, padroes_compilados, linhas):
+    """
+    Harness de equivalência: retorna as linhas em que o matcher e a busca
+    sequencial divergem, como (linha, esperado, obtido).
+    """
+    divergencias = []
+    for linha in linhas:
+        esperado = list(iterar_busca_sequencial(padroes_compilados, linha))
+        obtido = list(matcher.iterar(linha))
+        if esperado != obtido:
+            divergencias.append((linha, esperado, obtido))
+    return divergencias
+
+
+def medir_throughput(funcao, linhas, repeticoes=3):
+    """
+    Linhas por segundo de `funcao(linha)` (melhor de `repeticoes` passadas),
+    consumindo só o primeiro evento de cada linha, como fazem os parsers.
+    """
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for linha in linhas:
+            for _evento in funcao(linha):
+                break
+        duracao = time.perf_counter() - inicio
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    return len(linhas) / melhor if melhor else float("inf")
+
+
+_PALAVRAS_CHAVE = [
+    "início", "inicio", "Ínicio", "iniciou", "iniciada", "começo", "comecou", "inicial", "INICIO",
+    "término", "termino", "terminou", "fim", "final", "finalizada", "encerrou", "Termino:", "Fim:",
+]
+_TIPOS = ["ronda", "vigilância", "vigilancia", "patrulha", "parada", "estacionado", "ponto fixo", ""]
+_PREPOSICOES = [" de ", " da ", " às ", " as ", "s de ", " ", ""]
+_HORAS = ["19:20", "3;19", "8h30", "8h", "18 : 48", "25:99", "06:11", "6:31", "23h59", "7 h", "12:5", "00:00", "1h"]
+_RUIDO = [
+    "Bom dia a todos", "ok", "👍", "VTR 05 na base", "Chegando no condomínio 2", "Áudio omitido",
+    "<Mídia oculta>", "Senhores, atenção ao portão 3 às 14", "mensagem apagada",
+    "Rondas ok sem alteração", "Fim de semana tranquilo", "Início do plantão, todos cientes",
+]
+
+
+def gerar_mensagens_sinteticas(quantidade=5000, seed=31, proporcao_ruido=0.5):
+    """
+    Corpus determinístico de mensagens (já sem o prefixo de data/VTR) misturando
+    conversa comum e variações de início/término, inclusive horas inválidas e
+    caixa alta. Usado no harness de equivalência e no benchmark.
+    """
+    rnd = random.Random(seed)
+    mensagens = []
+    for _ in range(quantidade):
+        if rnd.random() < proporcao_ruido:
+            hora = f" {rnd.choice(_HORAS)}" if rnd.random() < 0.3 else ""
+            mensagens.append(rnd.choice(_RUIDO) + hora)
+            continue
+        chave, hora = rnd.choice(_PALAVRAS_CHAVE), rnd.choice(_HORAS)
+        tipo, prep = rnd.choice(_TIPOS), rnd.choice(_PREPOSICOES)
+        formatos = (
+            f"{chave} {hora}",
+            f"{hora} {chave}",
+            f"{chave}{prep}{tipo} {hora}",
+            f"{hora} {chave}{prep}{tipo}",
+            f"{rnd.choice(_RUIDO)} {chave}{prep}{tipo} às {hora} {rnd.choice(_RUIDO)}",
+            f"{hora}{chave}",
+            f"{chave}{hora}",
+            f"{hora} - {rnd.choice(_RUIDO)} {chave} {rnd.choice(_HORAS)}",
+        )
+        mensagem = rnd.choice(formatos)
+        mensagens.append(mensagem.upper() if rnd.random() < 0.2 else mensagem)
+    return mensagens
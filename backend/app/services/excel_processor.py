@@ -3,7 +3,6 @@
 import os
 import re
 import logging
-import openpyxl
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -21,6 +20,8 @@ class ExcelProcessor:
             return {"success": False, "message": "Arquivo não encontrado."}
 
         try:
+            import openpyxl  # importação tardia: openpyxl é pesado e só serve aqui
+
             wb = openpyxl.load_workbook(filepath, data_only=True)
             if "Rondas" not in wb.sheetnames:
                 logger.warning(f"Planilha 'Rondas' não encontrada no arquivo {filepath}.")
@@ -166,6 +167,8 @@ class ExcelProcessor:
             return {"success": False, "message": "Arquivo não encontrado."}
 
         try:
+            import openpyxl
+
             wb = openpyxl.load_workbook(filepath, data_only=True)
             if "Paradas" not in wb.sheetnames:
                 logger.warning(f"Planilha 'Paradas' não encontrada no arquivo {filepath}.")
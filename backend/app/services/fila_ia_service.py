@@ -0,0 +1,188 @@
+# app/services/fila_ia_service.py
+"""
+Execução das chamadas ao Gemini fora da thread da requisição.
+
+No Render o gunicorn roda `gthread` com 2 threads: duas requisições de IA
+(vários segundos em `generate_content`) seguram as duas threads e até as
+listagens baratas esperam. Em modo assíncrono a rota só enfileira o trabalho
+e responde 202 com um `job_id`; o cliente consulta o job até ele terminar.
+
+- Pool próprio e limitado (FILA_IA_WORKERS threads), separado das threads do
+  gunicorn; no máximo FILA_IA_MAX_PENDENTES jobs aguardando ou em execução
+  por processo (acima disso `FilaIACheia` -> 503 com Retry-After).
+- Cada job roda em um app context próprio (sessão do banco isolada).
+- O estado do job fica no cache (FILA_IA_JOB_TTL): com Redis a consulta pode
+  cair em qualquer worker. Falha ao gravar no cache só é registrada no log:
+  os contadores da fila são sempre devolvidos, senão cada erro do Redis
+  ocuparia uma vaga até o worker reiniciar.
+- `metricas()` expõe a profundidade da fila e os tempos de espera/execução.
+
+Só as rotas de `/api/analisador/*` (JWT, mesma autenticação da consulta do
+job) oferecem o modo assíncrono; as demais rotas de IA seguem síncronas.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from app import cache
+
+logger = logging.getLogger(__name__)
+
+PREFIXO_CACHE = "fila_ia:job"
+JANELA_TEMPOS = 200  # últimos jobs considerados nas médias
+TAMANHO_MAXIMO_ERRO = 500
+
+NA_FILA, EXECUTANDO, CONCLUIDO, ERRO = "na_fila", "executando", "concluido", "erro"
+
+
+class FilaIACheia(Exception):
+    pass
+
+
+def _agora_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _chave_job(job_id: str) -> str:
+    return f"{PREFIXO_CACHE}:{job_id}"
+
+
+class FilaIA:
+    """Pool limitado para o trabalho de IA, com estado dos jobs no cache e métricas da fila."""
+
+    def __init__(self, app, max_workers: int = 2, max_pendentes: int = 20, job_ttl: int = 900):
+        self.app = app
+        self.max_workers = max(1, max_workers)
+        self.max_pendentes = max(1, max_pendentes)
+        self.job_ttl = job_ttl
+        self._lock = threading.Lock()
+        self._executor = None
+        self._na_fila = 0
+        self._em_execucao = 0
+        self._totais = {"enfileirados": 0, "concluidos": 0, "falhas": 0, "rejeitados": 0}
+        self._esperas = deque(maxlen=JANELA_TEMPOS)
+        self._execucoes = deque(maxlen=JANELA_TEMPOS)
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fila-ia")
+        return self._executor
+
+    def fechar(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    # --- Estado dos jobs ---
+    def _gravar(self, job: dict) -> bool:
+        try:
+            cache.set(_chave_job(job["id"]), job, timeout=self.job_ttl)
+            return True
+        except Exception as e:  # cache fora do ar (timeout do Redis etc.)
+            logger.warning(f"Não foi possível gravar o job de IA {job['id']} ({job['status']}) no cache: {e}")
+            return False
+
+    def obter_job(self, job_id: str):
+        return cache.get(_chave_job(job_id))
+
+    # --- Execução ---
+    def submeter(self, tipo: str, funcao, *args, user_id=None, **kwargs) -> dict:
+        """
+        Enfileira `funcao(*args, **kwargs)` e devolve o job (status 'na_fila').
+        O valor de retorno da função (serializável em JSON) vira o `resultado`.
+        """
+        with self._lock:
+            if self._na_fila + self._em_execucao >= self.max_pendentes:
+                self._totais["rejeitados"] += 1
+                raise FilaIACheia(f"Fila de IA cheia ({self.max_pendentes} jobs pendentes)")
+            self._na_fila += 1
+            self._totais["enfileirados"] += 1
+
+        try:
+            job = {
+                "id": uuid.uuid4().hex,
+                "tipo": tipo,
+                "user_id": user_id,
+                "status": NA_FILA,
+                "criado_em": _agora_iso(),
+                "iniciado_em": None,
+                "concluido_em": None,
+                "resultado": None,
+                "erro": None,
+            }
+            self._gravar(job)
+            self.executor.submit(self._executar, job, time.perf_counter(), funcao, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._na_fila -= 1
+            raise
+        return job
+
+    def _executar(self, job: dict, enfileirado_em: float, funcao, args, kwargs) -> None:
+        inicio = time.perf_counter()
+        with self._lock:
+            self._na_fila -= 1
+            self._em_execucao += 1
+            self._esperas.append(inicio - enfileirado_em)
+
+        sucesso = False
+        try:
+            with self.app.app_context():
+                try:
+                    job.update(status=EXECUTANDO, iniciado_em=_agora_iso())
+                    self._gravar(job)
+                    resultado = funcao(*args, **kwargs)
+                    job.update(status=CONCLUIDO, resultado=resultado)
+                    sucesso = True
+                except Exception as e:
+                    logger.error(f"Job de IA {job['id']} ({job['tipo']}) falhou: {e}", exc_info=True)
+                    job.update(status=ERRO, erro=str(e)[:TAMANHO_MAXIMO_ERRO])
+                job["concluido_em"] = _agora_iso()
+                self._gravar(job)
+        finally:
+            # Fora do app context e depois de tudo: a vaga volta mesmo se algo acima levantar
+            with self._lock:
+                self._em_execucao -= 1
+                self._execucoes.append(time.perf_counter() - inicio)
+                self._totais["concluidos" if sucesso else "falhas"] += 1
+
+    # --- Métricas ---
+    def metricas(self) -> dict:
+        with self._lock:
+            esperas, execucoes = list(self._esperas), list(self._execucoes)
+            metricas = {
+                "workers": self.max_workers,
+                "max_pendentes": self.max_pendentes,
+                "na_fila": self._na_fila,
+                "em_execucao": self._em_execucao,
+                **self._totais,
+            }
+        metricas.update(
+            espera_media_ms=round(1000 * sum(esperas) / len(esperas), 1) if esperas else None,
+            espera_max_ms=round(1000 * max(esperas), 1) if esperas else None,
+            execucao_media_ms=round(1000 * sum(execucoes) / len(execucoes), 1) if execucoes else None,
+        )
+        return metricas
+
+
+def init_fila_ia(app):
+    app.extensions["fila_ia"] = FilaIA(
+        app,
+        max_workers=app.config.get("FILA_IA_WORKERS", 2),
+        max_pendentes=app.config.get("FILA_IA_MAX_PENDENTES", 20),
+        job_ttl=app.config.get("FILA_IA_JOB_TTL", 900),
+    )
+
+
+def get_fila_ia(app=None) -> FilaIA:
+    from flask import current_app
+
+    return (app or current_app).extensions["fila_ia"]
@@ -1,9 +1,6 @@
 # app/services/justificativa_service.py
-import os
-
-from jinja2 import Environment, FileSystemLoader
-
 from .base_generative_service import BaseGenerativeService
+from .container_servicos import obter_ambiente_prompts
 
 
 class JustificativaAtestadoService(BaseGenerativeService):
@@ -13,14 +10,10 @@ class JustificativaAtestadoService(BaseGenerativeService):
         template_filename="justificativa_atestado_medico_template.txt",
     ):
         super().__init__(model_name=model_name)
-        self._template = None
+        self._nome_template = None
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            template_folder = os.path.join(current_dir, "prompt_templates")
-            jinja_env = Environment(
-                loader=FileSystemLoader(template_folder), autoescape=True
-            )
-            self._template = jinja_env.get_template(template_filename)
+            obter_ambiente_prompts().get_template(template_filename)  # valida já na construção
+            self._nome_template = template_filename
             self.logger.info(
                 f"Template '{template_filename}' carregado para JustificativaAtestadoService."
             )
@@ -0,0 +1,260 @@
+# app/services/languagetool_service.py
+"""
+Verificação ortográfica/gramatical no LanguageTool (público ou self-hosted)
+para o editor, que chama `/api/text/analyze` a cada pausa na digitação.
+
+- Uma `requests.Session` por processo com pool de conexões keep-alive:
+  as chamadas reaproveitam a conexão TCP/TLS em vez de abrir uma nova.
+- Modo incremental (padrão): o texto é dividido em parágrafos (linhas em
+  branco) e cada parágrafo é verificado e guardado no cache pelo hash do
+  conteúdo. Só os parágrafos que mudaram vão ao LanguageTool, juntos em uma
+  única requisição (a API pública limita requisições por IP): os matches
+  voltam para o parágrafo de cada um pelo offset. Acima de
+  LANGUAGE_TOOL_MAX_CARACTERES os parágrafos são divididos em mais de uma
+  requisição, enviadas em paralelo em um pool limitado
+  (LANGUAGE_TOOL_MAX_WORKERS). Os offsets de cada parágrafo são deslocados
+  para a posição dele no documento.
+- Modo completo: o documento inteiro em uma chamada (regras que cruzam
+  parágrafos), com cache pelo hash do texto.
+
+Os offsets seguem o LanguageTool (unidades UTF-16, como no JavaScript do
+editor). Falhas não vão para o cache; a resposta traz os matches dos
+parágrafos verificados e o erro. Se o próprio cache falhar, a verificação
+segue sem ele (leitura vira miss, escrita é ignorada).
+"""
+import bisect
+import hashlib
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from app import cache
+
+logger = logging.getLogger(__name__)
+
+PREFIXO_CACHE = "lt:v1"
+MAX_SUGESTOES = 5
+_SEPARADOR_PARAGRAFOS = re.compile(r"\n[ \t\r]*\n\s*")
+SEPARADOR_LOTE = "\n\n"
+
+
+def dividir_paragrafos(texto: str) -> List[tuple]:
+    """(início, parágrafo) de cada bloco separado por linha em branco; blocos vazios ficam de fora."""
+    paragrafos = []
+    inicio = 0
+    for separador in _SEPARADOR_PARAGRAFOS.finditer(texto):
+        paragrafos.append((inicio, texto[inicio:separador.start()]))
+        inicio = separador.end()
+    paragrafos.append((inicio, texto[inicio:]))
+    return [(inicio, paragrafo) for inicio, paragrafo in paragrafos if paragrafo.strip()]
+
+
+def tamanho_utf16(texto: str) -> int:
+    """Comprimento em unidades UTF-16 (a unidade dos offsets do LanguageTool)."""
+    return len(texto.encode("utf-16-le")) // 2
+
+
+def normalizar_match(m: Dict[str, Any]) -> Dict[str, Any]:
+    regra = m.get("rule") or {}
+    return {
+        "message": m.get("message", ""),
+        "shortMessage": m.get("shortMessage", ""),
+        "offset": m.get("offset", 0),
+        "length": m.get("length", 0),
+        "replacements": [r.get("value") for r in m.get("replacements", [])][:MAX_SUGESTOES],
+        "rule": {"id": regra.get("id", ""), "description": regra.get("description", "")},
+    }
+
+
+def agrupar_paragrafos(pendentes: Dict[str, str], max_caracteres: int) -> List[List[tuple]]:
+    """[(chave, parágrafo), ...] em grupos de até `max_caracteres` (um parágrafo maior fica sozinho)."""
+    grupos, atual, tamanho = [], [], 0
+    for chave, paragrafo in pendentes.items():
+        if atual and tamanho + len(SEPARADOR_LOTE) + len(paragrafo) > max_caracteres:
+            grupos.append(atual)
+            atual, tamanho = [], 0
+        tamanho += (len(SEPARADOR_LOTE) if atual else 0) + len(paragrafo)
+        atual.append((chave, paragrafo))
+    if atual:
+        grupos.append(atual)
+    return grupos
+
+
+def separar_matches(itens: List[tuple], matches: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Matches do texto juntado (parágrafos separados por SEPARADOR_LOTE) ->
+    {chave: matches com offset relativo ao parágrafo}. Um match que cruze o
+    separador não pertence a nenhum parágrafo e é descartado, como seria
+    verificando cada parágrafo sozinho.
+    """
+    inicios, fins, chaves = [], [], []
+    posicao = 0
+    for chave, paragrafo in itens:
+        inicios.append(posicao)
+        posicao += tamanho_utf16(paragrafo)
+        fins.append(posicao)
+        chaves.append(chave)
+        posicao += tamanho_utf16(SEPARADOR_LOTE)
+    resultado = {chave: [] for chave in chaves}
+    for m in matches:
+        i = bisect.bisect_right(inicios, m["offset"]) - 1
+        if i >= 0 and m["offset"] + m["length"] <= fins[i]:
+            resultado[chaves[i]].append(dict(m, offset=m["offset"] - inicios[i]))
+    return resultado
+
+
+def _chave_cache(language: str, texto: str) -> str:
+    return f"{PREFIXO_CACHE}:{language}:{hashlib.sha1(texto.encode('utf-8')).hexdigest()}"
+
+
+class ErroLanguageTool(Exception):
+    pass
+
+
+class LanguageToolChecker:
+    """Cliente do LanguageTool com sessão compartilhada, cache por parágrafo e pool de threads."""
+
+    def __init__(self, url: str, timeout: float = 8, max_workers: int = 4, cache_timeout: int = 86400,
+                 max_caracteres: int = 15000):
+        self.url = url.rstrip("/") + "/v2/check"
+        self.timeout = timeout
+        self.max_workers = max(1, max_workers)
+        self.cache_timeout = cache_timeout
+        self.max_caracteres = max(1, max_caracteres)
+        self._lock = threading.Lock()
+        self._session = None
+        self._executor = None
+
+    # --- Recursos compartilhados (criados na primeira verificação) ---
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests  # importação tardia: não pesa no boot do worker
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=1)
+                    session.mount("http://", adaptador)
+                    session.mount("https://", adaptador)
+                    self._session = session
+        return self._session
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="languagetool")
+        return self._executor
+
+    def fechar(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    # --- Chamada HTTP (roda nas threads do pool, sem contexto do Flask) ---
+    def _consultar(self, texto: str, language: str) -> List[Dict[str, Any]]:
+        try:
+            resp = self.session.post(self.url, data={"text": texto, "language": language}, timeout=self.timeout)
+        except Exception as e:
+            raise ErroLanguageTool(str(e)) from e
+        if resp.status_code != 200:
+            raise ErroLanguageTool(f"LT status {resp.status_code}")
+        try:
+            return [normalizar_match(m) for m in resp.json().get("matches", [])]
+        except Exception as e:  # corpo que não é o JSON do LanguageTool (página de erro de proxy etc.)
+            raise ErroLanguageTool(f"LT resposta inválida: {e}") from e
+
+    def _consultar_grupo(self, itens: List[tuple], language: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Uma requisição para vários parágrafos: {chave: matches do parágrafo}."""
+        if len(itens) == 1:
+            chave, paragrafo = itens[0]
+            return {chave: self._consultar(paragrafo, language)}
+        texto = SEPARADOR_LOTE.join(paragrafo for _, paragrafo in itens)
+        return separar_matches(itens, self._consultar(texto, language))
+
+    # --- API ---
+    def verificar(self, texto: str, language: str, incremental: bool = True) -> Dict[str, Any]:
+        """
+        {'matches': [...], 'paragrafos': n, 'verificados': k, 'em_cache': n - k}
+        e 'error' se alguma chamada falhou.
+        """
+        if not texto or not texto.strip():
+            return {"matches": [], "paragrafos": 0, "verificados": 0, "em_cache": 0}
+        blocos = dividir_paragrafos(texto) if incremental else [(0, texto)]
+
+        chaves = [_chave_cache(language, paragrafo) for _, paragrafo in blocos]
+        try:
+            em_cache = dict(zip(chaves, cache.get_many(*chaves)))
+        except Exception as e:  # cache fora do ar (timeout do Redis etc.): tudo vira miss
+            logger.warning(f"Cache do LanguageTool indisponível na leitura: {e}")
+            em_cache = dict.fromkeys(chaves)
+        pendentes = {}  # chave -> parágrafo (parágrafos repetidos vão uma vez só)
+        for chave, (_, paragrafo) in zip(chaves, blocos):
+            if em_cache[chave] is None:
+                pendentes.setdefault(chave, paragrafo)
+
+        erros = []
+        if pendentes:
+            def consultar(grupo):
+                try:
+                    return self._consultar_grupo(grupo, language)
+                except ErroLanguageTool as e:
+                    erros.append(str(e))
+                    return {}
+
+            grupos = agrupar_paragrafos(pendentes, self.max_caracteres)
+            # caso comum: uma requisição só, sem passar pelo pool
+            respostas = map(consultar, grupos) if len(grupos) == 1 else self.executor.map(consultar, grupos)
+            novos = {}
+            for resposta in respostas:
+                novos.update(resposta)
+            if novos:
+                try:
+                    cache.set_many(novos, timeout=self.cache_timeout)
+                except Exception as e:  # sem cache a resposta continua valendo
+                    logger.warning(f"Cache do LanguageTool indisponível na escrita: {e}")
+            em_cache.update(novos)
+
+        matches = []
+        deslocamento_utf16, anterior = 0, 0
+        for chave, (inicio, _) in zip(chaves, blocos):
+            deslocamento_utf16 += tamanho_utf16(texto[anterior:inicio])
+            anterior = inicio
+            for m in em_cache.get(chave) or ():
+                matches.append(dict(m, offset=m["offset"] + deslocamento_utf16))
+
+        resultado = {
+            "matches": matches,
+            "paragrafos": len(blocos),
+            "verificados": len(pendentes),
+            "em_cache": len(blocos) - len(pendentes),
+        }
+        if erros:
+            logger.warning(f"LanguageTool falhou em {len(erros)} chamada(s) para {len(pendentes)} parágrafos: {erros[0]}")
+            resultado["error"] = erros[0]
+        return resultado
+
+
+def init_languagetool(app):
+    app.extensions["languagetool"] = LanguageToolChecker(
+        url=app.config.get("LANGUAGE_TOOL_URL") or "https://api.languagetool.org",
+        timeout=app.config.get("LANGUAGE_TOOL_TIMEOUT", 8),
+        max_workers=app.config.get("LANGUAGE_TOOL_MAX_WORKERS", 4),
+        cache_timeout=app.config.get("LANGUAGE_TOOL_CACHE_TIMEOUT", 86400),
+        max_caracteres=app.config.get("LANGUAGE_TOOL_MAX_CARACTERES", 15000),
+    )
+
+
+def get_languagetool(app=None) -> LanguageToolChecker:
+    from flask import current_app
+
+    return (app or current_app).extensions["languagetool"]
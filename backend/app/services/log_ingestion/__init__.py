@@ -0,0 +1,20 @@
+# app/services/log_ingestion/__init__.py
+"""
+Núcleo compartilhado de ingestão dos exports do WhatsApp: normalização,
+tokenização de linhas (prefixo, data, VTR, mensagem) e intervalo do plantão.
+Os estágios de pareamento ficam em `ronda_logic` e `parada_logic`
+(`EstagioRondas`/`EstagioParadas`, alimentados por `tokenizar_log`).
+"""
+from .normalizacao import limpar_mensagem, normalizar_data_capturada, normalizar_hora_capturada
+from .plantao import calcular_intervalo_plantao
+from .tokenizer import TokenLinha, tokenizar_linha, tokenizar_log
+
+__all__ = [
+    "TokenLinha",
+    "calcular_intervalo_plantao",
+    "limpar_mensagem",
+    "normalizar_data_capturada",
+    "normalizar_hora_capturada",
+    "tokenizar_linha",
+    "tokenizar_log",
+]
@@ -0,0 +1,82 @@
+# app/services/log_ingestion/plantao.py
+import logging
+import re
+from datetime import datetime, timedelta
+
+from .normalizacao import normalizar_data_capturada
+from .tokenizer import FALLBACK_DATA_INDEFINIDA
+
+logger = logging.getLogger(__name__)
+
+
+def calcular_intervalo_plantao(data_plantao_str: str, escala_plantao_str: str):
+    """
+    Calcula o datetime de início e fim do plantão.
+    A data de entrada é SEMPRE considerada a DATA DE INÍCIO do plantão.
+    Retorna (datetime_inicio, datetime_fim, data_para_cabecalho_valida).
+    """
+    if not data_plantao_str or not escala_plantao_str:
+        return None, None, FALLBACK_DATA_INDEFINIDA
+
+    data_base_dt = None
+    data_cabecalho = FALLBACK_DATA_INDEFINIDA
+    try:
+        data_norm = normalizar_data_capturada(data_plantao_str)
+        if not data_norm or len(data_norm.split("/")[2]) != 4:
+            raise ValueError("Data normalizada inválida ou ano não tem 4 dígitos")
+        data_base_dt = datetime.strptime(data_norm, "%d/%m/%Y")
+        data_cabecalho = data_norm
+    except ValueError as e:
+        logger.error(
+            f"Data de plantão manual ('{data_plantao_str}') inválida: {e}. Não é possível calcular intervalo."
+        )
+        return None, None, data_plantao_str
+
+    escala_normalizada_para_parse = escala_plantao_str.strip()
+    match_escala_humanizada = re.match(
+        r"(\d{1,2})h\s*às\s*(\d{1,2})h", escala_normalizada_para_parse, re.IGNORECASE
+    )
+    if match_escala_humanizada:
+        escala_normalizada_para_parse = (
+            f"{match_escala_humanizada.group(1)}-{match_escala_humanizada.group(2)}"
+        )
+        logger.info(
+            f"Escala '{escala_plantao_str}' normalizada para '{escala_normalizada_para_parse}' para processamento."
+        )
+
+    partes_escala = escala_normalizada_para_parse.split("-")
+    if len(partes_escala) != 2:
+        logger.error(
+            f"Escala de plantão ('{escala_plantao_str}') inválida. Use formato HH-MM ou HHh às MMh."
+        )
+        return None, None, data_cabecalho
+
+    try:
+        hora_inicio_escala = int(partes_escala[0])
+        hora_fim_escala = int(partes_escala[1])
+    except ValueError:
+        logger.error(
+            f"Horas da escala ('{escala_normalizada_para_parse}') não são numéricas."
+        )
+        return None, None, data_cabecalho
+
+    inicio_plantao = data_base_dt.replace(
+        hour=hora_inicio_escala, minute=0, second=0, microsecond=0
+    )
+
+    data_para_cabecalho_valida = data_cabecalho
+
+    if hora_inicio_escala < hora_fim_escala:
+        fim_plantao = data_base_dt.replace(
+            hour=hora_fim_escala, minute=0, second=0, microsecond=0
+        )
+    else:
+        fim_plantao_dia_seguinte = data_base_dt + timedelta(days=1)
+        fim_plantao = fim_plantao_dia_seguinte.replace(
+            hour=hora_fim_escala, minute=0, second=0, microsecond=0
+        )
+
+    logger.info(
+        f"Intervalo de plantão calculado: de {inicio_plantao.strftime('%d/%m/%Y %H:%M')} a {fim_plantao.strftime('%d/%m/%Y %H:%M')}"
+    )
+    return inicio_plantao, fim_plantao, data_para_cabecalho_valida
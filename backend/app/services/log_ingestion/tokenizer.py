@@ -0,0 +1,137 @@
+# app/services/log_ingestion/tokenizer.py
+import re
+from typing import NamedTuple, Optional
+
+from .normalizacao import limpar_mensagem, normalizar_data_capturada, normalizar_hora_capturada
+
+DEFAULT_VTR_ID = "VTR_DESCONHECIDA"
+FALLBACK_DATA_INDEFINIDA = "[Data Indefinida]"
+
+# --- Constantes de Expressões Regulares Pré-compiladas ---
+REGEX_PREFIXO_LINHA = re.compile(
+    r"^\s*\["  # Início da linha e '['
+    r"([^,\]]*?)"  # Grupo 1: Hora do log no prefixo (ex: "19:41" ou "22:08")
+    r"(?:[, ]\s*| )?"  # Separador opcional (vírgula ou espaço) ou apenas um espaço
+    r"(\d{1,2}/\d{1,2}/\d{2,4})\s*"  # Grupo 2: Data do log (DD/MM/YYYY ou DD/MM/YY) - AJUSTADO PARA ACEITAR ANO COM 2 OU 4 DIGITOS NA CAPTURA INICIAL
+    r"\]\s*"  # Fim do ']' do prefixo
+    r"(?:(VTR\s*\d+|Águia\s*\d+):\s*)?"  # Grupo 3 (opcional): Identificador da VTR (ex: "VTR 05:", "Águia 04:")
+    r"(.*)$",  # Grupo 4: Restante da mensagem
+    re.IGNORECASE,
+)
+
+# --- Regex para formato "DD/MM/YYYY HH:MM - Sender: Message" (sem colchetes) ---
+REGEX_PREFIXO_LINHA_SEM_COLCHETES = re.compile(
+    r"^(\d{1,2}/\d{1,2}/\d{2,4})"  # Grupo 1: Data (DD/MM/YYYY)
+    r"\s+"                         # Espaço obrigatório
+    r"(\d{1,2}:\d{1,2})"           # Grupo 2: Hora (HH:MM)
+    r"\s+-\s+"                     # Separador " - " obrigatório
+    r"(?:(.*?):\s*)?"              # Grupo 3 (opcional): Sender/VTR (qualquer coisa até dois pontos)
+    r"(.*)$",                      # Grupo 4: Restante da mensagem
+    re.IGNORECASE,
+)
+
+REGEX_VTR_MENSAGEM_ALTERNATIVA = re.compile(
+    r"^(VTR\s*\d+|Águia\s*\d+):\s*(.*)$", re.IGNORECASE
+)
+
+# --- Expressão para detectar VTR em linhas simples ---
+REGEX_VTR_LINHA_SIMPLES = re.compile(
+    r"^(VTR\s*\d+|Águia\s*\d+)$", re.IGNORECASE
+)
+
+REGEX_VTR_NO_REMETENTE = re.compile(r"(VTR\s*\d+|Águia\s*\d+)", re.IGNORECASE)
+
+# Formato em que a linha foi reconhecida
+FORMATO_VTR = "vtr"  # Linha só com o identificador da VTR
+FORMATO_COLCHETES = "colchetes"  # "[HH:MM, DD/MM/YYYY] ..."
+FORMATO_SEM_COLCHETES = "sem_colchetes"  # "DD/MM/YYYY HH:MM - Remetente: ..."
+FORMATO_LIVRE = "livre"  # Continuação de mensagem, sem prefixo
+
+
+class TokenLinha(NamedTuple):
+    """
+    Uma linha do export já analisada, independente do contexto das anteriores.
+    `vtr` é só a VTR citada NA linha; quem consome o token resolve o contexto
+    (`vtr or ultima_vtr`), o que permite tokenizar uma vez para vários parsers.
+    """
+
+    bruta: str
+    linha: str
+    formato: str
+    hora: Optional[str]
+    data: Optional[str]
+    vtr: Optional[str]
+    mensagem: str
+
+
+def _normalizar_vtr(vtr_str: str) -> str:
+    return vtr_str.upper().replace(" ", "")
+
+
+def _separar_vtr_da_mensagem(vtr, mensagem):
+    match_vtr_na_mensagem = REGEX_VTR_MENSAGEM_ALTERNATIVA.match(mensagem)
+    if match_vtr_na_mensagem:
+        return _normalizar_vtr(match_vtr_na_mensagem.group(1)), match_vtr_na_mensagem.group(2).strip()
+    return vtr, mensagem
+
+
+def tokenizar_linha(linha_strip: str, bruta: str = None) -> TokenLinha:
+    """Reconhece prefixo (hora/data), VTR e mensagem normalizada de uma linha não vazia."""
+    bruta = linha_strip if bruta is None else bruta
+
+    match_vtr_simples = REGEX_VTR_LINHA_SIMPLES.match(linha_strip)
+    if match_vtr_simples:
+        # Linha de VTR não tem mensagem de evento
+        return TokenLinha(bruta, linha_strip, FORMATO_VTR, None, None, _normalizar_vtr(match_vtr_simples.group(1)), "")
+
+    match_prefixo = REGEX_PREFIXO_LINHA.match(linha_strip)
+    if match_prefixo:
+        vtr = _normalizar_vtr(match_prefixo.group(3)) if match_prefixo.group(3) else None
+        vtr, mensagem = _separar_vtr_da_mensagem(vtr, match_prefixo.group(4).strip())
+        return TokenLinha(
+            bruta,
+            linha_strip,
+            FORMATO_COLCHETES,
+            normalizar_hora_capturada(match_prefixo.group(1)),
+            normalizar_data_capturada(match_prefixo.group(2)),
+            vtr,
+            limpar_mensagem(mensagem),
+        )
+
+    match_sem_colchetes = REGEX_PREFIXO_LINHA_SEM_COLCHETES.match(linha_strip)
+    if match_sem_colchetes:
+        remetente = match_sem_colchetes.group(3)
+        vtr = None
+        # Remetente com "VTR"/"Águia" é tratado como VTR (extraindo só o identificador, se houver
+        # lixo em volta); caso contrário é o supervisor e vale a última VTR conhecida.
+        if remetente and re.search(r"(VTR|Águia)", remetente, re.IGNORECASE):
+            match_vtr_clean = REGEX_VTR_NO_REMETENTE.search(remetente)
+            vtr = _normalizar_vtr(match_vtr_clean.group(1) if match_vtr_clean else remetente)
+        # Verifica se há VTR no início da mensagem (comum quando o remetente é o supervisor)
+        vtr, mensagem = _separar_vtr_da_mensagem(vtr, match_sem_colchetes.group(4).strip())
+        return TokenLinha(
+            bruta,
+            linha_strip,
+            FORMATO_SEM_COLCHETES,
+            normalizar_hora_capturada(match_sem_colchetes.group(2)),
+            normalizar_data_capturada(match_sem_colchetes.group(1)),
+            vtr,
+            limpar_mensagem(mensagem),
+        )
+
+    return TokenLinha(bruta, linha_strip, FORMATO_LIVRE, None, None, None, limpar_mensagem(linha_strip))
+
+
+def preparar_linhas(log_bruto: str):
+    """Desfaz o escape de colchetes do export e separa as linhas (sem descartar as vazias)."""
+    return log_bruto.replace("\\[", "[").replace("\\]", "]").strip().split("\n")
+
+
+def tokenizar_log(log_bruto: str):
+    """Gera um `TokenLinha` por linha não vazia do log, na ordem original."""
+    if not log_bruto:
+        return
+    for linha in preparar_linhas(log_bruto):
+        linha_strip = linha.strip()
+        if linha_strip:
+            yield tokenizar_linha(linha_strip, linha)
@@ -0,0 +1,249 @@
+# app/services/lookup_service.py
+"""
+Cache versionado das listas de apoio (lookups) consumidas pelo PWA e pelos
+formulários: condomínios, supervisores, tipos de ocorrência, colaboradores,
+órgãos públicos, logradouros e as listas fixas de rondas.
+
+Cada tabela tem um contador de versão no cache da aplicação. O payload
+serializado de um lookup fica em cache sob a chave das versões das tabelas
+de que depende, junto com um ETag forte (hash do conteúdo). Assim, uma
+requisição condicional (`If-None-Match`) com o ETag atual recebe 304 sem
+consultar o banco, e uma escrita em qualquer tabela troca a chave e força
+a releitura.
+
+As versões são trocadas pelos eventos do ORM, mas só depois do commit: as
+tabelas alteradas no flush ficam anotadas na sessão e são publicadas no
+`after_commit` (um rollback descarta a anotação). Publicar antes do commit
+deixaria outra requisição guardar a lista antiga sob a versão nova.
+"""
+import hashlib
+import json
+import logging
+import time
+from typing import NamedTuple, Callable, Tuple
+
+from flask import current_app, jsonify, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app import cache, db
+from app.models import Colaborador, Condominio, Logradouro, OcorrenciaTipo, OrgaoPublico, User
+
+logger = logging.getLogger(__name__)
+
+# Trocar quando o formato de algum payload mudar: invalida o que estiver no Redis
+FORMATO_PAYLOAD = 1
+CHAVE_SESSAO = "lookup_tabelas_alteradas"
+
+STATUS_RONDA = ["Agendada", "Em Andamento", "Concluída", "Cancelada", "Pausada"]
+TIPOS_RONDA = ["Regular", "Esporádica", "Emergencial", "Noturna", "Diurna"]
+
+
+def _condominios():
+    return [
+        {"id": c.id, "nome": c.nome, "endereco": None}
+        for c in db.session.query(Condominio.id, Condominio.nome).order_by(Condominio.nome)
+    ]
+
+
+def _supervisores():
+    consulta = (
+        db.session.query(User.id, User.username, User.email)
+        .filter(User.is_supervisor.is_(True), User.is_approved.is_(True))
+        .order_by(User.username)
+    )
+    return [{"id": u.id, "username": u.username, "email": u.email} for u in consulta]
+
+
+def _tipos_ocorrencia():
+    return [
+        {"id": t.id, "nome": t.nome, "descricao": t.descricao}
+        for t in db.session.query(OcorrenciaTipo.id, OcorrenciaTipo.nome, OcorrenciaTipo.descricao)
+        .order_by(OcorrenciaTipo.nome)
+    ]
+
+
+def _colaboradores():
+    return [
+        {"id": c.id, "nome": c.nome_completo, "cargo": c.cargo, "matricula": c.matricula}
+        for c in db.session.query(
+            Colaborador.id, Colaborador.nome_completo, Colaborador.cargo, Colaborador.matricula
+        ).order_by(Colaborador.nome_completo)
+    ]
+
+
+def _orgaos_publicos():
+    return [
+        {"id": o.id, "nome": o.nome, "contato": o.contato}
+        for o in db.session.query(OrgaoPublico.id, OrgaoPublico.nome, OrgaoPublico.contato).order_by(OrgaoPublico.nome)
+    ]
+
+
+def _logradouros():
+    return [{"id": l.id, "nome": l.nome} for l in db.session.query(Logradouro.id, Logradouro.nome).order_by(Logradouro.nome)]
+
+
+class Lookup(NamedTuple):
+    tabelas: Tuple[str, ...]
+    carregar: Callable[[], list]
+
+
+LOOKUPS = {
+    "condominios": Lookup(("condominio",), _condominios),
+    "supervisores": Lookup(("user",), _supervisores),
+    "tipos_ocorrencia": Lookup(("ocorrencia_tipo",), _tipos_ocorrencia),
+    "colaboradores": Lookup(("colaborador",), _colaboradores),
+    "orgaos_publicos": Lookup(("orgao_publico",), _orgaos_publicos),
+    "logradouros": Lookup(("logradouro",), _logradouros),
+    "status_ronda": Lookup((), lambda: list(STATUS_RONDA)),
+    "tipos_ronda": Lookup((), lambda: list(TIPOS_RONDA)),
+}
+
+# Colunas que aparecem em algum payload: alterar outras (ex.: last_login) não invalida
+_ATRIBUTOS_RELEVANTES = {
+    Condominio: ("nome",),
+    User: ("username", "email", "is_supervisor", "is_approved"),
+    OcorrenciaTipo: ("nome", "descricao"),
+    Colaborador: ("nome_completo", "cargo", "matricula"),
+    OrgaoPublico: ("nome", "contato"),
+    Logradouro: ("nome",),
+}
+
+
+# --- Versões ---
+def _chave_versao(tabela: str) -> str:
+    return f"lookup:versao:{tabela}"
+
+
+def versoes(tabelas) -> tuple:
+    """
+    Versão atual de cada tabela. Uma versão ausente (cache novo ou chave
+    despejada) é criada com o relógio, nunca com 0, para não reaproveitar
+    payloads guardados sob uma versão antiga.
+    """
+    if not tabelas:
+        return ()
+    chaves = [_chave_versao(t) for t in tabelas]
+    try:
+        valores = list(cache.get_many(*chaves))
+        for i, valor in enumerate(valores):
+            if valor is None:
+                cache.add(chaves[i], time.time_ns(), timeout=0)
+                valores[i] = cache.get(chaves[i])
+        return tuple(valores)
+    except Exception as e:
+        logger.warning(f"Não foi possível ler as versões dos lookups no cache: {e}")
+        return (None,) * len(tabelas)
+
+
+def invalidar_lookups(*tabelas: str) -> None:
+    """Troca a versão das tabelas; os payloads que dependem delas deixam de ser usados."""
+    for tabela in tabelas:
+        try:
+            cache.set(_chave_versao(tabela), time.time_ns(), timeout=0)
+        except Exception as e:
+            logger.warning(f"Não foi possível atualizar a versão do lookup '{tabela}': {e}")
+
+
+# --- Payloads ---
+def _etag_do_conteudo(dados) -> str:
+    serializado = json.dumps(dados, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(serializado.encode("utf-8")).hexdigest()[:20]
+
+
+def obter_lookup(nome: str) -> tuple:
+    """(etag, dados) do lookup, do cache quando as versões das tabelas não mudaram."""
+    lookup = LOOKUPS[nome]
+    versoes_atuais = versoes(lookup.tabelas)
+    if not lookup.tabelas or None in versoes_atuais:
+        dados = lookup.carregar()
+        return _etag_do_conteudo(dados), dados
+
+    chave = f"lookup:dados:{FORMATO_PAYLOAD}:{nome}:" + ".".join(str(v) for v in versoes_atuais)
+    try:
+        guardado = cache.get(chave)
+    except Exception:
+        guardado = None
+    if guardado is not None:
+        return guardado
+
+    dados = lookup.carregar()
+    resultado = (_etag_do_conteudo(dados), dados)
+    try:
+        cache.set(chave, resultado, timeout=current_app.config.get("LOOKUP_CACHE_TIMEOUT", 3600))
+    except Exception:
+        pass
+    return resultado
+
+
+def obter_pacote(nomes) -> tuple:
+    """(etag, {nome: dados}) de vários lookups; o ETag combina os ETags de cada um."""
+    etags, pacote = [], {}
+    for nome in nomes:
+        etag, dados = obter_lookup(nome)
+        etags.append(f"{nome}={etag}")
+        pacote[nome] = dados
+    return hashlib.sha1(";".join(etags).encode("utf-8")).hexdigest()[:20], pacote
+
+
+# --- Respostas HTTP ---
+def responder_condicional(etag: str, montar_resposta: Callable):
+    """
+    304 se o cliente já tem `etag` (If-None-Match), senão a resposta de
+    `montar_resposta()`; as duas levam ETag forte e Cache-Control. A
+    comparação é fraca porque a compressão devolve o ETag como W/"...".
+    """
+    if request.if_none_match.contains_weak(etag):
+        resposta = current_app.response_class(status=304)
+    else:
+        resposta = montar_resposta()
+        if isinstance(resposta, tuple):
+            resposta = current_app.make_response(resposta)
+    resposta.set_etag(etag)
+    resposta.headers["Cache-Control"] = current_app.config.get("LOOKUP_CACHE_CONTROL", "private, no-cache")
+    return resposta
+
+
+def responder_lookup(nome: str, chave: str, message: str = None, envelope: bool = True):
+    """
+    Resposta de um endpoint de lista: `{chave: dados}` no formato padrão da
+    API (`success_response`) ou, com envelope=False, no JSON simples das
+    rotas de configuração.
+    """
+    from app.blueprints.api.utils import success_response
+
+    etag, dados = obter_lookup(nome)
+    if envelope:
+        return responder_condicional(etag, lambda: success_response(data={chave: dados}, message=message))
+    return responder_condicional(etag, lambda: (jsonify({chave: dados}), 200))
+
+
+# --- Invalidação pelos eventos do ORM ---
+def _anotar_tabela(mapper, connection, target):
+    sessao = object_session(target)
+    if sessao is not None:
+        sessao.info.setdefault(CHAVE_SESSAO, set()).add(mapper.local_table.name)
+
+
+def _anotar_se_relevante(mapper, connection, target):
+    estado = inspect(target)
+    if any(estado.attrs[attr].history.has_changes() for attr in _ATRIBUTOS_RELEVANTES[type(target)]):
+        _anotar_tabela(mapper, connection, target)
+
+
+def _publicar_alteracoes(sessao):
+    tabelas = sessao.info.pop(CHAVE_SESSAO, None)
+    if tabelas:
+        invalidar_lookups(*sorted(tabelas))
+
+
+def _descartar_alteracoes(sessao):
+    sessao.info.pop(CHAVE_SESSAO, None)
+
+
+for _modelo in _ATRIBUTOS_RELEVANTES:
+    event.listen(_modelo, "after_insert", _anotar_tabela)
+    event.listen(_modelo, "after_delete", _anotar_tabela)
+    event.listen(_modelo, "after_update", _anotar_se_relevante)
+event.listen(Session, "after_commit", _publicar_alteracoes)
+event.listen(Session, "after_rollback", _descartar_alteracoes)
@@ -1,12 +1,39 @@
 import re
 import logging
 from datetime import datetime
-from app import db
-from app.models import OcorrenciaTipo, Colaborador, Condominio, OrgaoPublico
+from app.services.dados_referencia import dobrar_texto, get_dados_referencia
 
 logger = logging.getLogger(__name__)
 
+# Termos (já sem acentos) que decidem se um nome citado é de um colaborador do sistema
+INDICADORES_COLABORADOR = (
+    'aguia', 'agente', 'seguranca', 'vigilante', 'ronda', 'patrulha',
+    'supervisor', 'coordenador', 'responsavel pelo registro'
+)
+INDICADORES_NAO_COLABORADOR = (
+    'morador', 'residente', 'socio', 'responsavel pela mudanca', 'testemunha',
+    'envolvido', 'cpf', 'endereco', 'escritorio', 'estabelecimento'
+)
+INDICADORES_RESIDENCIAL = ('residencial', 'morador', 'porta', 'residencia')
+
+
 class OcorrenciaParser:
+    @staticmethod
+    def _eh_colaborador_no_contexto(contexto):
+        """Decide, pelo contexto (dobrado) em volta do nome, se a pessoa é um colaborador."""
+        is_colaborador = any(indicador in contexto for indicador in INDICADORES_COLABORADOR)
+        for indicador in INDICADORES_NAO_COLABORADOR:
+            if indicador in contexto:
+                # "envolvido na ocorrência" não descarta o colaborador
+                if indicador == 'envolvido' and 'envolvido na ocorrencia' in contexto:
+                    continue
+                is_colaborador = False
+                break
+        # Próximo de "responsável pelo registro" é sempre colaborador
+        if 'responsavel pelo registro' in contexto:
+            is_colaborador = True
+        return is_colaborador
+
     @staticmethod
     def processar_e_corrigir_texto(texto):
         """Processa e corrige o texto do relatório"""
@@ -117,151 +144,49 @@ class OcorrenciaParser:
                 dados['endereco_especifico'] = endereco
                 logger.info(f"Endereço limpo extraído: {endereco}")
             
+            # Tipos, colaboradores e condomínios saem de uma única passada do autômato
+            # do snapshot de referência sobre o texto dobrado (sem acentos/minúsculas)
+            referencia = get_dados_referencia()
+            texto_dobrado = dobrar_texto(texto)
+            encontrados = referencia.analisar(texto_dobrado)
+
             # ============================================================================
             # EXTRAÇÃO DE TIPO DE OCORRÊNCIA - LÓGICA INTELIGENTE
             # ============================================================================
-            logger.info("Iniciando busca por tipo de ocorrência...")
-            
-            tipos_ocorrencia = OcorrenciaTipo.query.all()
-            tipo_encontrado = False
-            
-            # Palavras-chave para cada tipo de ocorrência
-            palavras_chave_tipos = {
-                'Auxílio ao Residencial': ['porta', 'residência', 'residencial', 'morador', 'auxílio', 'ajuda'],
-                'Verificação': ['verificação', 'verificar', 'checagem', 'inspeção', 'observação'],
-                'Perturbação de sossego': ['barulho', 'som', 'música', 'festa', 'perturbação', 'sossego'],
-                'Tentativa de furto': ['tentativa', 'furto', 'roubo', 'invasão', 'suspeito'],
-                'Furtos': ['furto', 'roubo', 'furtado', 'desapareceu'],
-                'Vandalismo': ['vandalismo', 'destruição', 'danificado', 'quebrado', 'pichação']
-            }
-            
-            # Primeiro: tentar encontrar por nome exato
-            for tipo in tipos_ocorrencia:
-                if tipo.nome.lower() in texto.lower():
-                    dados['ocorrencia_tipo_id'] = tipo.id
-                    logger.info(f"Tipo de ocorrência identificado (nome exato): {tipo.nome} (ID: {tipo.id})")
-                    tipo_encontrado = True
-                    break
-            
-            # Segundo: se não encontrou, usar palavras-chave
-            if not tipo_encontrado:
-                logger.info("Buscando por palavras-chave...")
-                melhor_match = None
-                melhor_score = 0
-                
-                for tipo in tipos_ocorrencia:
-                    if tipo.nome in palavras_chave_tipos:
-                        palavras_chave = palavras_chave_tipos[tipo.nome]
-                        score = 0
-                        
-                        for palavra in palavras_chave:
-                            if palavra.lower() in texto.lower():
-                                score += 1
-                        
-                        if score > melhor_score:
-                            melhor_score = score
-                            melhor_match = tipo
-                
-                if melhor_match and melhor_score > 0:
-                    dados['ocorrencia_tipo_id'] = melhor_match.id
-                    logger.info(f"Tipo identificado por palavras-chave: {melhor_match.nome} (ID: {melhor_match.id}, score: {melhor_score})")
-                    tipo_encontrado = True
-            
-            # Terceiro: se ainda não encontrou, usar tipo padrão inteligente
-            if not tipo_encontrado:
-                logger.info("Usando tipo padrão inteligente...")
-                
-                # Verificar se é algo relacionado a residencial/morador
-                if any(palavra in texto.lower() for palavra in ['residencial', 'morador', 'porta', 'residência']):
-                    tipo_padrao = OcorrenciaTipo.query.filter_by(nome="Auxílio ao Residencial").first()
-                    if tipo_padrao:
-                        dados['ocorrencia_tipo_id'] = tipo_padrao.id
-                        logger.info(f"Tipo padrão inteligente (residencial): {tipo_padrao.nome} (ID: {tipo_padrao.id})")
-                    else:
-                        # Fallback para o primeiro tipo disponível
-                        primeiro_tipo = OcorrenciaTipo.query.first()
-                        if primeiro_tipo:
-                            dados['ocorrencia_tipo_id'] = primeiro_tipo.id
-                            logger.info(f"Fallback para primeiro tipo: {primeiro_tipo.nome} (ID: {primeiro_tipo.id})")
+            # Primeiro: nome exato; segundo: palavras-chave; terceiro: tipo padrão
+            tipo_id = referencia.tipo_por_nome_exato(encontrados)
+            if tipo_id is not None:
+                logger.info(f"Tipo de ocorrência identificado (nome exato): {referencia.nome_tipo[tipo_id]} (ID: {tipo_id})")
+            else:
+                tipo_id, score = referencia.tipo_por_palavras_chave(encontrados)
+                if tipo_id is not None:
+                    logger.info(f"Tipo identificado por palavras-chave: {referencia.nome_tipo[tipo_id]} (ID: {tipo_id}, score: {score})")
+            if tipo_id is None:
+                # Relacionado a residencial/morador -> "Auxílio ao Residencial"; senão "Verificação"
+                if any(palavra in texto_dobrado for palavra in INDICADORES_RESIDENCIAL):
+                    tipo_id = referencia.tipo_por_nome.get("Auxílio ao Residencial")
                 else:
-                    # Fallback para "Verificação" se existir
-                    tipo_verificacao = OcorrenciaTipo.query.filter_by(nome="Verificação").first()
-                    if tipo_verificacao:
-                        dados['ocorrencia_tipo_id'] = tipo_verificacao.id
-                        logger.info(f"Tipo padrão (verificação): {tipo_verificacao.nome} (ID: {tipo_verificacao.id})")
-                    else:
-                        # Último fallback
-                        primeiro_tipo = OcorrenciaTipo.query.first()
-                        if primeiro_tipo:
-                            dados['ocorrencia_tipo_id'] = primeiro_tipo.id
-                            logger.info(f"Fallback final: {primeiro_tipo.nome} (ID: {primeiro_tipo.id})")
-            
+                    tipo_id = referencia.tipo_por_nome.get("Verificação")
+                if tipo_id is None:
+                    tipo_id = referencia.primeiro_tipo_id()
+                if tipo_id is not None:
+                    logger.info(f"Tipo padrão: {referencia.nome_tipo[tipo_id]} (ID: {tipo_id})")
+            if tipo_id is not None:
+                dados['ocorrencia_tipo_id'] = tipo_id
+
             # ============================================================================
             # EXTRAÇÃO DE COLABORADORES - LÓGICA CORRIGIDA E MELHORADA
             # ============================================================================
-            logger.info("Iniciando busca por colaboradores...")
-            
             colaboradores_envolvidos = []
-            colaboradores = Colaborador.query.all()
-            
-            # Palavras-chave que indicam que a pessoa é um colaborador do sistema
-            indicadores_colaborador = [
-                'águia', 'agente', 'segurança', 'vigilante', 'ronda', 'patrulha',
-                'supervisor', 'coordenador', 'responsável pelo registro'
-            ]
-            
-            # Palavras-chave que indicam que a pessoa NÃO é um colaborador
-            indicadores_nao_colaborador = [
-                'morador', 'residente', 'sócio', 'responsável pela mudança', 'testemunha',
-                'envolvido', 'cpf', 'endereço', 'escritório', 'estabelecimento'
-            ]
-            
-            for colaborador in colaboradores:
-                nome_completo = colaborador.nome_completo.lower()
-                primeiro_nome = colaborador.nome_completo.split()[0].lower()
-                
-                # Verificar se o nome aparece no texto
-                if nome_completo in texto.lower() or primeiro_nome in texto.lower():
-                    # Buscar o contexto onde o nome aparece
-                    nome_para_buscar = nome_completo if len(nome_completo) > 3 else primeiro_nome
-                    pos_inicio = texto.lower().find(nome_para_buscar)
-                    
-                    if pos_inicio != -1:
-                        # Pegar contexto antes e depois do nome (100 caracteres para mais contexto)
-                        contexto_inicio = max(0, pos_inicio - 100)
-                        contexto_fim = min(len(texto), pos_inicio + len(nome_para_buscar) + 100)
-                        contexto = texto[contexto_inicio:contexto_fim]
-                        
-                        # Verificar se é realmente um colaborador
-                        is_colaborador = False
-                        
-                        # Se contém indicadores de colaborador, é válido
-                        for indicador in indicadores_colaborador:
-                            if indicador in contexto.lower():
-                                is_colaborador = True
-                                break
-                        
-                        # Se contém indicadores de NÃO colaborador, verificar se não é um falso positivo
-                        for indicador in indicadores_nao_colaborador:
-                            if indicador in contexto.lower():
-                                # Verificar se é um falso positivo (ex: "responsável pelo registro" vs "responsável pela mudança")
-                                if indicador == 'responsável pelo registro':
-                                    continue
-                                elif indicador == 'envolvido' and 'envolvido na ocorrência' in contexto.lower():
-                                    continue
-                                else:
-                                    is_colaborador = False
-                                    break
-                        
-                        # Lógica adicional: se o nome aparece próximo a "responsável pelo registro", é colaborador
-                        if 'responsável pelo registro' in contexto.lower() and nome_para_buscar in contexto.lower():
-                            is_colaborador = True
-                        
-                        if is_colaborador:
-                            colaboradores_envolvidos.append(colaborador.id)
-            
+            for colaborador_id, pos_inicio in encontrados.colaboradores.items():
+                # Contexto antes e depois da primeira ocorrência do nome (100 caracteres)
+                contexto_inicio = max(0, pos_inicio - 100)
+                contexto_fim = min(len(texto), pos_inicio + referencia.comprimento_colaborador[colaborador_id] + 100)
+                if OcorrenciaParser._eh_colaborador_no_contexto(texto_dobrado[contexto_inicio:contexto_fim]):
+                    colaboradores_envolvidos.append(colaborador_id)
+
             if colaboradores_envolvidos:
-                dados['colaboradores_envolvidos'] = list(set(colaboradores_envolvidos)) # Remove duplicatas
+                dados['colaboradores_envolvidos'] = sorted(colaboradores_envolvidos)
                 logger.info(f"Total de colaboradores identificados: {len(dados['colaboradores_envolvidos'])}")
             
             # ============================================================================
@@ -278,12 +203,10 @@ class OcorrenciaParser:
             # ============================================================================
             # IDENTIFICAÇÃO DE CONDOMÍNIO
             # ============================================================================
-            condominios = Condominio.query.all()
-            for condominio in condominios:
-                if condominio.nome.lower() in texto.lower():
-                    dados['condominio_id'] = condominio.id
-                    logger.info(f"Condomínio identificado: {condominio.nome} (ID: {condominio.id})")
-                    break
+            condominio_id = referencia.condominio_encontrado(encontrados)
+            if condominio_id is not None:
+                dados['condominio_id'] = condominio_id
+                logger.info(f"Condomínio identificado: {referencia.condominios[condominio_id]} (ID: {condominio_id})")
             
             logger.info(f"Dados extraídos finais: {dados}")
                 
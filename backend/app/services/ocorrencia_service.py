@@ -193,11 +193,13 @@ def apply_ocorrencia_filters(query, filters):
             logger.warning(f"Formato de data de fim inválido: '{data_fim_str}'")
 
     if filters.get("texto_relatorio"):
-        # Agora a view tem o campo relatorio_final, então podemos filtrar
-        if is_view:
-            query = query.filter(VWOcorrenciasDetalhadas.relatorio_final.ilike(f"%{filters['texto_relatorio']}%"))
-        else:
-            query = query.filter(Ocorrencia.relatorio_final.ilike(f"%{filters['texto_relatorio']}%"))
+        # Busca textual indexada (tsvector no Postgres, FTS5 no SQLite), ver busca_service
+        from app.services.busca_service import condicao_texto_relatorio
+
+        modelo = VWOcorrenciasDetalhadas if is_view else Ocorrencia
+        query = query.filter(
+            condicao_texto_relatorio(modelo.relatorio_final, modelo.id, filters["texto_relatorio"])
+        )
 
     logger.info("🔍 DEBUG: apply_ocorrencia_filters - Finalizando")
     logger.info(f"   Query final: {query}")
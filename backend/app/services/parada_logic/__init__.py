@@ -1,3 +1,3 @@
-from .processor import processar_log_de_paradas
+from .processor import analisar_log_de_paradas, processar_log_de_paradas
 
-__all__ = ["processar_log_de_paradas"]
+__all__ = ["analisar_log_de_paradas", "processar_log_de_paradas"]
@@ -1,25 +1,16 @@
 import re
 
-# --- Constantes de Expressões Regulares Pré-compiladas ---
-REGEX_PREFIXO_LINHA = re.compile(
-    r"^\s*\["  # Início da linha e '['
-    r"([^,\]]*?)"  # Grupo 1: Hora do log no prefixo (ex: "19:41" ou "22:08")
-    r"(?:[, ]\s*| )?"  # Separador opcional (vírgula ou espaço) ou apenas um espaço
-    r"(\d{1,2}/\d{1,2}/\d{2,4})\s*"  # Grupo 2: Data do log (DD/MM/YYYY ou DD/MM/YY)
-    r"\]\s*"  # Fim do ']' do prefixo
-    r"(?:(VTR\s*\d+|Águia\s*\d+):\s*)?"  # Grupo 3 (opcional): Identificador da VTR (ex: "VTR 05:", "Águia 04:")
-    r"(.*)$",  # Grupo 4: Restante da mensagem
-    re.IGNORECASE,
-)
-
-REGEX_VTR_MENSAGEM_ALTERNATIVA = re.compile(
-    r"^(VTR\s*\d+|Águia\s*\d+):\s*(.*)$", re.IGNORECASE
-)
-
-REGEX_VTR_LINHA_SIMPLES = re.compile(
-    r"^(VTR\s*\d+|Águia\s*\d+)$", re.IGNORECASE
+from ..event_matcher import EventMatcher
+# Prefixo de linha, VTR e fallbacks são compartilhados pelos parsers de ronda e parada
+from ..log_ingestion.tokenizer import (
+    DEFAULT_VTR_ID,
+    FALLBACK_DATA_INDEFINIDA,
+    REGEX_PREFIXO_LINHA,
+    REGEX_VTR_LINHA_SIMPLES,
+    REGEX_VTR_MENSAGEM_ALTERNATIVA,
 )
 
+# --- Constantes de Expressões Regulares Pré-compiladas ---
 REGEX_BLOCO_DATA = re.compile(
     r"Data:\s*(\d{1,2}/\d{1,2}/\d{2,4})", re.IGNORECASE
 )
@@ -95,6 +86,17 @@ COMPILED_PARADA_EVENT_REGEXES = [
     for p in PARADA_EVENT_REGEX_PATTERNS
 ]
 
-DEFAULT_VTR_ID = "VTR_DESCONHECIDA"
-FALLBACK_DATA_INDEFINIDA = "[Data Indefinida]"
+# Padrões com hora (exclui os keyword_only, tratados na lógica de bloco) em uma passada.
+PARADA_EVENT_MATCHER = EventMatcher(
+    [p for p in PARADA_EVENT_REGEX_PATTERNS if not p.get("keyword_only")],
+    prefiltros=(r"\d", rf"{INICIO_KEYWORDS_REGEX_PART}|{TERMINO_KEYWORDS_REGEX_PART}"),
+    requisitos={
+        "inicio": INICIO_KEYWORDS_REGEX_PART,
+        "termino": TERMINO_KEYWORDS_REGEX_PART,
+        "tipo": TIPO_PARADA_REGEX_PART,
+        "hora": TIME_CAPTURE_REGEX_PART,
+        "hora_simples": SIMPLE_HOUR_CAPTURE_REGEX_PART,
+    },
+)
+
 FALLBACK_ESCALA_NAO_INFORMADA = "[Escala não Informada]"
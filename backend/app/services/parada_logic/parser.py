@@ -1,83 +1,13 @@
 import logging
-import re
-import unicodedata
 from datetime import datetime, timedelta
 
+from ..log_ingestion.normalizacao import converter_data_hora, limpar_mensagem as _limpar_e_normalizar_mensagem
 from . import config
-from .utils import normalizar_data_capturada, normalizar_hora_capturada
+from .utils import normalizar_hora_capturada
 
 logger = logging.getLogger(__name__)
 
 
-def _limpar_e_normalizar_mensagem(texto: str) -> str:
-    if not texto:
-        return ""
-    texto_normalizado = unicodedata.normalize("NFC", texto)
-    texto_com_espacos_padronizados = re.sub(r"\s+", " ", texto_normalizado)
-    return texto_com_espacos_padronizados.strip()
-
-
-def parse_linha_log_prefixo(linha_strip: str, ultima_vtr_conhecida_global: str):
-    hora_linha_log_raw = None
-    data_linha_original = None
-    mensagem_eventos = linha_strip
-    id_vtr_para_eventos_desta_linha = ultima_vtr_conhecida_global
-    vtr_contexto_geral_para_proximas_linhas = ultima_vtr_conhecida_global
-
-    match_vtr_simples = config.REGEX_VTR_LINHA_SIMPLES.match(linha_strip)
-    if match_vtr_simples:
-        vtr_especifica_da_linha = match_vtr_simples.group(1).upper().replace(" ", "")
-        id_vtr_para_eventos_desta_linha = vtr_especifica_da_linha
-        vtr_contexto_geral_para_proximas_linhas = vtr_especifica_da_linha
-        return (
-            None,
-            None,
-            id_vtr_para_eventos_desta_linha,
-            "",
-            vtr_contexto_geral_para_proximas_linhas,
-        )
-
-    match_prefixo = config.REGEX_PREFIXO_LINHA.match(linha_strip)
-    if match_prefixo:
-        hora_linha_log_raw_temp = match_prefixo.group(1)
-        data_str_raw = match_prefixo.group(2)
-        hora_linha_log_raw = normalizar_hora_capturada(hora_linha_log_raw_temp)
-        data_linha_original = normalizar_data_capturada(data_str_raw)
-        vtr_do_prefixo_str = match_prefixo.group(3)
-        mensagem_eventos = match_prefixo.group(4).strip()
-        if vtr_do_prefixo_str:
-            vtr_do_prefixo_normalizada = vtr_do_prefixo_str.upper().replace(" ", "")
-            vtr_contexto_geral_para_proximas_linhas = vtr_do_prefixo_normalizada
-            id_vtr_para_eventos_desta_linha = vtr_do_prefixo_normalizada
-        
-        match_vtr_na_mensagem = config.REGEX_VTR_MENSAGEM_ALTERNATIVA.match(
-            mensagem_eventos
-        )
-        if match_vtr_na_mensagem:
-            vtr_especifica_da_mensagem = (
-                match_vtr_na_mensagem.group(1).upper().replace(" ", "")
-            )
-            id_vtr_para_eventos_desta_linha = vtr_especifica_da_mensagem
-            mensagem_eventos = match_vtr_na_mensagem.group(2).strip()
-            vtr_contexto_geral_para_proximas_linhas = id_vtr_para_eventos_desta_linha
-            
-        return (
-            hora_linha_log_raw,
-            data_linha_original,
-            id_vtr_para_eventos_desta_linha,
-            _limpar_e_normalizar_mensagem(mensagem_eventos),
-            vtr_contexto_geral_para_proximas_linhas,
-        )
-    else:
-        return (
-            None,
-            None,
-            ultima_vtr_conhecida_global,
-            _limpar_e_normalizar_mensagem(linha_strip),
-            ultima_vtr_conhecida_global,
-        )
-
-
 def _ajustar_data_evento_para_plantao(
     dt_obj, data_str_original, inicio_plantao, fim_plantao, log_entry_datetime=None
 ):
@@ -116,9 +46,7 @@ def _ajustar_data_evento_para_plantao(
 
 def _criar_evento(tipo, hora_formatada, data_contexto, vtr_contexto, linha_original, inicio_plantao, fim_plantao, log_entry_datetime):
     try:
-        dt_obj_inicial = datetime.strptime(
-            f"{data_contexto} {hora_formatada}", "%d/%m/%Y %H:%M"
-        )
+        dt_obj_inicial = converter_data_hora(data_contexto, hora_formatada)
         dt_obj_final = _ajustar_data_evento_para_plantao(
             dt_obj_inicial,
             data_contexto,
@@ -159,28 +87,19 @@ def extrair_eventos_de_mensagem_simples(
         return []
     mensagem = _limpar_e_normalizar_mensagem(mensagem_raw)
 
-    for r_info in config.COMPILED_PARADA_EVENT_REGEXES:
-        if r_info.get("keyword_only"):
+    for tipo, hora_evento_raw in config.PARADA_EVENT_MATCHER.iterar(mensagem):
+        if hora_evento_raw is None:
+            continue
+        hora_formatada = normalizar_hora_capturada(hora_evento_raw)
+        if not hora_formatada:
             continue
 
-        match_evento = r_info["regex"].search(mensagem)
-        if match_evento:
-            try:
-                hora_evento_raw = match_evento.group(1)
-            except IndexError:
-                continue
-            if hora_evento_raw is None:
-                continue
-            hora_formatada = normalizar_hora_capturada(hora_evento_raw)
-            if not hora_formatada:
-                continue
-            
-            evento = _criar_evento(
-                r_info["tipo"], hora_formatada, data_log_contexto, id_vtr_contexto, 
-                linha_original_str, inicio_plantao, fim_plantao, log_entry_datetime
-            )
-            if evento:
-                return [evento]
+        evento = _criar_evento(
+            tipo, hora_formatada, data_log_contexto, id_vtr_contexto,
+            linha_original_str, inicio_plantao, fim_plantao, log_entry_datetime
+        )
+        if evento:
+            return [evento]
 
     return []
 
@@ -119,10 +119,13 @@ def get_system_user() -> Optional[User]:
 
 def infer_condominio_from_filename(filename: str) -> Optional[Condominio]:
     try:
-        nome_arquivo = filename.upper().replace('.TXT', '')
-        condominios = Condominio.query.all()
-        for condominio in condominios:
-            if condominio.nome.upper() in nome_arquivo:
+        from app import db
+        from app.services.entity_resolver import get_entity_resolver
+
+        condominio_id = get_entity_resolver().inferir_condominio_id(filename.rsplit('.', 1)[0])
+        if condominio_id:
+            condominio = db.session.get(Condominio, condominio_id)
+            if condominio:
                 logger.info(f"Condomínio identificado: {condominio.nome} (arquivo: {filename})")
                 return condominio
         logger.warning(f"Não foi possível identificar condomínio no arquivo: {filename}")
@@ -1,10 +1,7 @@
 # app/services/patrimonial_report_service.py
-import os
-
-from jinja2 import Environment, FileSystemLoader  # Para carregar o template
-
 from .base_generative_service import \
     BaseGenerativeService  # Importa a classe base
+from .container_servicos import obter_ambiente_prompts
 
 
 class PatrimonialReportService(BaseGenerativeService):
@@ -17,18 +14,10 @@ class PatrimonialReportService(BaseGenerativeService):
             model_name=model_name
         )  # Chama o construtor da BaseGenerativeService
         # self.logger já é inicializado na BaseGenerativeService com o nome desta classe.
-        self._template = None
+        self._nome_template = None
         try:
-            # Obtém o diretório atual do arquivo de serviço
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Constrói o caminho para a pasta de templates de prompt
-            template_folder = os.path.join(current_dir, "prompt_templates")
-
-            jinja_env = Environment(
-                loader=FileSystemLoader(template_folder),
-                autoescape=True,  # Boa prática para templates, embora este seja texto.
-            )
-            self._template = jinja_env.get_template(template_filename)
+            obter_ambiente_prompts().get_template(template_filename)  # valida já na construção
+            self._nome_template = template_filename
             self.logger.info(
                 f"Template '{template_filename}' carregado para PatrimonialReportService."
             )
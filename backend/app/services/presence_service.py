@@ -0,0 +1,295 @@
+# app/services/presence_service.py
+"""
+Presença de usuários (quem está online) sem tocar no banco a cada requisição.
+
+O middleware grava o "último visto" de cada sessão em um tier rápido:
+- Redis (sorted set `presence:last_seen`, score = timestamp) quando o cache
+  da aplicação é RedisCache, compartilhado entre workers;
+- memória do processo, caso contrário.
+
+Um flusher periódico (thread daemon, um por processo) faz o upsert em lote
+das sessões alteradas na tabela `user_online` e remove as expiradas. A tela
+de usuários online lê apenas do tier rápido.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from app import db
+from app.models.user_online import UserOnline
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_ZSET = "presence:last_seen"
+PRESENCE_META = "presence:meta"
+PRESENCE_DIRTY = "presence:dirty"
+
+
+class MemoryPresenceStore:
+    """Tier rápido em memória (um por processo)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessoes = {}  # session_id -> {"user_id", "ip_address", "user_agent", "last_seen"}
+        self._sujas = set()
+
+    def registrar(self, session_id, dados):
+        with self._lock:
+            self._sessoes[session_id] = dados
+            self._sujas.add(session_id)
+
+    def sessoes_desde(self, desde_ts):
+        with self._lock:
+            return {sid: dict(d) for sid, d in self._sessoes.items() if d["last_seen"] >= desde_ts}
+
+    def drenar_sujas(self):
+        with self._lock:
+            sujas, self._sujas = self._sujas, set()
+            return {sid: dict(self._sessoes[sid]) for sid in sujas if sid in self._sessoes}
+
+    def expirar(self, antes_ts):
+        with self._lock:
+            for sid in [sid for sid, d in self._sessoes.items() if d["last_seen"] < antes_ts]:
+                del self._sessoes[sid]
+                self._sujas.discard(sid)
+
+    def limpar(self):
+        with self._lock:
+            self._sessoes.clear()
+            self._sujas.clear()
+
+
+class RedisPresenceStore:
+    """Tier rápido no Redis, compartilhado entre workers."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def registrar(self, session_id, dados):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zadd(PRESENCE_ZSET, {session_id: dados["last_seen"]})
+        pipe.hset(PRESENCE_META, session_id, json.dumps(dados))
+        pipe.sadd(PRESENCE_DIRTY, session_id)
+        pipe.execute()
+
+    def _carregar_meta(self, session_ids):
+        if not session_ids:
+            return {}
+        valores = self.client.hmget(PRESENCE_META, session_ids)
+        return {
+            sid.decode() if isinstance(sid, bytes) else sid: json.loads(valor)
+            for sid, valor in zip(session_ids, valores)
+            if valor
+        }
+
+    def sessoes_desde(self, desde_ts):
+        return self._carregar_meta(self.client.zrangebyscore(PRESENCE_ZSET, desde_ts, "+inf"))
+
+    def drenar_sujas(self):
+        # SPOP é atômico: cada sessão suja é gravada por um único worker
+        total = self.client.scard(PRESENCE_DIRTY)
+        if not total:
+            return {}
+        return self._carregar_meta(list(self.client.spop(PRESENCE_DIRTY, total) or []))
+
+    def expirar(self, antes_ts):
+        expiradas = self.client.zrangebyscore(PRESENCE_ZSET, "-inf", f"({antes_ts}")
+        if expiradas:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.zrem(PRESENCE_ZSET, *expiradas)
+            pipe.hdel(PRESENCE_META, *expiradas)
+            pipe.execute()
+
+    def limpar(self):
+        self.client.delete(PRESENCE_ZSET, PRESENCE_META, PRESENCE_DIRTY)
+
+
+def _criar_store(app):
+    redis_url = app.config.get("CACHE_REDIS_URL") if app.config.get("CACHE_TYPE") == "RedisCache" else None
+    if redis_url:
+        try:
+            import redis
+
+            client = redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2)
+            client.ping()
+            return RedisPresenceStore(client)
+        except Exception as e:
+            logger.warning(f"Redis indisponível para presença, usando memória do processo: {e}")
+    return MemoryPresenceStore()
+
+
+class PresenceTracker:
+    """Registra atividade no tier rápido e sincroniza `user_online` em lote."""
+
+    def __init__(self, app):
+        self.app = app
+        self.store = _criar_store(app)
+        self.intervalo_flush = app.config.get("PRESENCE_FLUSH_INTERVAL", 60)
+        self.intervalo_minimo = app.config.get("PRESENCE_MIN_UPDATE_INTERVAL", 30)
+        self.expiracao_minutos = app.config.get("PRESENCE_EXPIRATION_MINUTES", 30)
+        self._ultimo_registro = {}  # session_id -> ts, evita escrever no tier rápido a cada request
+        self._flusher = None
+        self._flusher_pid = None
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ escrita
+    def registrar_atividade(self, user_id, session_id, ip_address=None, user_agent=None, agora=None):
+        agora = agora or time.time()
+        if agora - self._ultimo_registro.get(session_id, 0) < self.intervalo_minimo:
+            return False
+        self._ultimo_registro[session_id] = agora
+        self.store.registrar(
+            session_id,
+            {
+                "user_id": int(user_id),
+                "ip_address": ip_address,
+                "user_agent": (user_agent or "")[:500],
+                "last_seen": agora,
+            },
+        )
+        self._garantir_flusher()
+        return True
+
+    # ------------------------------------------------------------------ leitura
+    def listar_sessoes(self, minutes_threshold=15):
+        return self.store.sessoes_desde(time.time() - minutes_threshold * 60)
+
+    def listar_online(self, minutes_threshold=15):
+        """Usuários ativos nos últimos X minutos (mais recente primeiro), sem consultar o banco."""
+        from app.auth.jwt_auth import carregar_identidade_usuario
+
+        ultimo_por_usuario = {}
+        for dados in self.listar_sessoes(minutes_threshold).values():
+            user_id = dados["user_id"]
+            ultimo_por_usuario[user_id] = max(ultimo_por_usuario.get(user_id, 0), dados["last_seen"])
+
+        usuarios = []
+        for user_id, ultimo in sorted(ultimo_por_usuario.items(), key=lambda item: item[1], reverse=True):
+            identidade = carregar_identidade_usuario(user_id)
+            if identidade is None:
+                continue
+            usuarios.append(
+                {
+                    "id": identidade.id,
+                    "username": identidade.username,
+                    "email": identidade.email,
+                    "last_activity": datetime.fromtimestamp(ultimo, tz=timezone.utc),
+                }
+            )
+        return usuarios
+
+    # ------------------------------------------------------------------ flush
+    def flush(self):
+        """Upsert em lote das sessões alteradas e remoção das expiradas. Retorna nº de sessões gravadas."""
+        sujas = self.store.drenar_sujas()
+        limite_ts = time.time() - self.expiracao_minutos * 60
+        self.store.expirar(limite_ts)
+        for sid in [sid for sid, ts in self._ultimo_registro.items() if ts < limite_ts]:
+            self._ultimo_registro.pop(sid, None)
+        if not sujas:
+            return 0
+
+        linhas = [
+            {
+                "session_id": sid,
+                "user_id": dados["user_id"],
+                "ip_address": dados.get("ip_address"),
+                "user_agent": dados.get("user_agent"),
+                "last_activity": datetime.fromtimestamp(dados["last_seen"], tz=timezone.utc),
+            }
+            for sid, dados in sujas.items()
+        ]
+        try:
+            upsert_sessoes_online(linhas)
+            db.session.execute(
+                delete(UserOnline).where(
+                    UserOnline.last_activity < datetime.now(timezone.utc) - timedelta(minutes=self.expiracao_minutos)
+                )
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # Devolve as sessões ao tier rápido para a próxima rodada
+            for sid, dados in sujas.items():
+                self.store.registrar(sid, dados)
+            logger.error(f"Erro ao gravar presença em user_online: {e}")
+            return 0
+        return len(linhas)
+
+    def _loop_flush(self):
+        while not self._parar.wait(self.intervalo_flush):
+            try:
+                with self.app.app_context():
+                    self.flush()
+            except Exception as e:
+                logger.error(f"Erro no flusher de presença: {e}")
+
+    def _garantir_flusher(self):
+        # Com preload_app do gunicorn o tracker é criado no master; a thread precisa nascer em cada worker
+        if self._flusher_pid == os.getpid() or self.app.config.get("TESTING"):
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._parar = threading.Event()
+            self._flusher = threading.Thread(target=self._loop_flush, name="presence-flusher", daemon=True)
+            self._flusher.start()
+            self._flusher_pid = os.getpid()
+
+    def parar(self):
+        self._parar.set()
+
+
+def upsert_sessoes_online(linhas):
+    """INSERT ... ON CONFLICT (session_id) DO UPDATE em um único comando. Não faz commit."""
+    if not linhas:
+        return
+    dialeto = db.engine.dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return _upsert_sessoes_online_orm(linhas)
+    stmt = dialect_insert(UserOnline.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["session_id"],
+        set_={
+            "user_id": stmt.excluded.user_id,
+            "ip_address": stmt.excluded.ip_address,
+            "user_agent": stmt.excluded.user_agent,
+            "last_activity": stmt.excluded.last_activity,
+        },
+    )
+    db.session.execute(stmt, linhas)
+
+
+def _upsert_sessoes_online_orm(linhas):
+    """Mesmo efeito de upsert_sessoes_online pelo ORM (uma consulta), para bancos sem ON CONFLICT."""
+    existentes = {
+        sessao.session_id: sessao
+        for sessao in UserOnline.query.filter(UserOnline.session_id.in_([linha["session_id"] for linha in linhas]))
+    }
+    for linha in linhas:
+        sessao = existentes.get(linha["session_id"])
+        if sessao is None:
+            db.session.add(UserOnline(**linha))
+        else:
+            for campo in ("user_id", "ip_address", "user_agent", "last_activity"):
+                setattr(sessao, campo, linha[campo])
+
+
+def init_presence(app):
+    app.extensions["presence_tracker"] = PresenceTracker(app)
+
+
+def get_presence_tracker(app=None):
+    from flask import current_app
+
+    return (app or current_app).extensions["presence_tracker"]
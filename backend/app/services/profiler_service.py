@@ -0,0 +1,170 @@
+# app/services/profiler_service.py
+"""
+Profiler por amostragem de pilha para investigar requisições lentas em produção.
+
+Um admin "arma" o profiler para um endpoint (ou qualquer endpoint) pelas
+próximas N requisições. Em cada requisição escolhida, uma thread amostradora
+lê a pilha da thread que atende a requisição (`sys._current_frames()`) a
+cada PROFILER_INTERVAL_MS e conta as pilhas iguais. Ao fim, as amostras
+viram texto no formato "collapsed stack" (`a;b;c 42`, uma pilha por linha),
+aceito pelo flamegraph.pl e pelo speedscope. Os últimos
+PROFILER_MAX_PROFILES perfis ficam em memória para download.
+
+Usa só a stdlib e não depende de sinais: no Render o gunicorn roda workers
+gthread (threads = 2, ver gunicorn.conf.py), então a requisição é atendida
+fora da thread principal, a única que recebe sinais, e a outra thread do
+worker pode estar atendendo outra requisição ao mesmo tempo. Amostrar só a
+thread da requisição escolhida evita misturar as duas pilhas. Desarmado, o
+custo por requisição é a leitura de um atributo no `before_request`.
+"""
+import itertools
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+PROFUNDIDADE_MAXIMA = 200
+# Endpoints do próprio profiler nunca são perfilados
+PREFIXO_ENDPOINTS_PROFILER = "admin.profiler"
+
+
+def _nome_do_frame(frame) -> str:
+    codigo = frame.f_code
+    modulo = frame.f_globals.get("__name__", "?")
+    return f"{modulo}:{codigo.co_name}:{frame.f_lineno}"
+
+
+def pilha_colapsada(frame) -> str:
+    """Pilha do frame, da raiz até a folha, separada por ';'."""
+    nomes = []
+    while frame is not None and len(nomes) < PROFUNDIDADE_MAXIMA:
+        nomes.append(_nome_do_frame(frame))
+        frame = frame.f_back
+    return ";".join(reversed(nomes))
+
+
+def formatar_colapsado(amostras: Counter) -> str:
+    """Texto "collapsed stack" (pilha contagem), das pilhas mais frequentes para as menos."""
+    return "".join(f"{pilha} {total}\n" for pilha, total in amostras.most_common())
+
+
+class AmostradorPilha:
+    """Thread que amostra periodicamente a pilha de outra thread."""
+
+    def __init__(self, thread_id: int, intervalo: float):
+        self.thread_id = thread_id
+        self.intervalo = intervalo
+        self.amostras = Counter()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name="profiler-amostrador", daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.amostras[pilha_colapsada(frame)] += 1
+
+    def parar(self) -> Counter:
+        self._parar.set()
+        self._thread.join()
+        return self.amostras
+
+
+class ProfilerService:
+    """Estado do profiler do processo: alvo armado e últimos perfis coletados."""
+
+    def __init__(self, app):
+        self.intervalo = app.config.get("PROFILER_INTERVAL_MS", 5) / 1000
+        self.max_requisicoes = app.config.get("PROFILER_MAX_REQUESTS", 50)
+        self.armado = False
+        self.endpoint_alvo = None
+        self.restantes = 0
+        self._lock = threading.Lock()
+        self._perfis = deque(maxlen=app.config.get("PROFILER_MAX_PROFILES", 10))
+        self._ids = itertools.count(1)
+
+        app.before_request(self._iniciar_requisicao)
+        app.teardown_request(self._finalizar_requisicao)
+
+    # --- Controle ---
+    def armar(self, requisicoes: int, endpoint: str = None) -> None:
+        with self._lock:
+            self.endpoint_alvo = endpoint or None
+            self.restantes = max(1, min(int(requisicoes), self.max_requisicoes))
+            self.armado = True
+        logger.info(f"Profiler armado: {self.restantes} requisição(ões), endpoint={self.endpoint_alvo or 'qualquer'}")
+
+    def desarmar(self) -> None:
+        with self._lock:
+            self.armado = False
+            self.restantes = 0
+            self.endpoint_alvo = None
+
+    def _reservar(self, endpoint: str) -> bool:
+        """Consome uma das requisições armadas, se `endpoint` for elegível."""
+        if not endpoint or endpoint == "static" or endpoint.startswith(PREFIXO_ENDPOINTS_PROFILER):
+            return False
+        with self._lock:
+            if not self.armado or (self.endpoint_alvo and endpoint != self.endpoint_alvo):
+                return False
+            self.restantes -= 1
+            if self.restantes <= 0:
+                self.armado = False
+            return True
+
+    # --- Hooks do Flask ---
+    def _iniciar_requisicao(self):
+        if not self.armado or not self._reservar(request.endpoint):
+            return
+        g.profiler_amostrador = AmostradorPilha(threading.get_ident(), self.intervalo).iniciar()
+        g.profiler_inicio = time.perf_counter()
+
+    def _finalizar_requisicao(self, exception=None):
+        amostrador = g.pop("profiler_amostrador", None)
+        if amostrador is None:
+            return
+        duracao_ms = (time.perf_counter() - g.pop("profiler_inicio")) * 1000
+        amostras = amostrador.parar()
+        perfil = {
+            "id": next(self._ids),
+            "endpoint": request.endpoint,
+            "metodo": request.method,
+            "caminho": request.full_path.rstrip("?"),
+            "criado_em": datetime.now(),
+            "duracao_ms": round(duracao_ms, 1),
+            "amostras": sum(amostras.values()),
+            "intervalo_ms": self.intervalo * 1000,
+            "colapsado": formatar_colapsado(amostras),
+        }
+        with self._lock:
+            self._perfis.append(perfil)
+
+    # --- Consulta ---
+    def listar(self) -> list:
+        with self._lock:
+            return [{k: v for k, v in perfil.items() if k != "colapsado"} for perfil in reversed(self._perfis)]
+
+    def obter(self, perfil_id: int):
+        with self._lock:
+            return next((perfil for perfil in self._perfis if perfil["id"] == perfil_id), None)
+
+
+def init_profiler(app):
+    app.extensions["profiler"] = ProfilerService(app)
+
+
+def get_profiler(app=None):
+    from flask import current_app
+
+    return (app or current_app).extensions["profiler"]
@@ -0,0 +1,162 @@
+# app/services/reclassificacao_service.py
+"""
+Reclassificação em lote das ocorrências já gravadas.
+
+`classificar_ocorrencia` só roda no registro: quando MAPA_PALAVRAS_CHAVE_TIPO
+(app/classificador_config.py) muda, o `ocorrencia_tipo_id` das ocorrências
+antigas fica defasado. Este serviço percorre `relatorio_final` em lotes por id
+(memória limitada ao lote), classifica os textos em um pool de processos,
+acumula a matriz de confusão tipo atual x tipo novo e, fora do dry-run, grava
+as mudanças de cada lote em um único UPDATE ... FROM (VALUES ...) no
+PostgreSQL (UPDATE em lote por chave primária nos demais bancos).
+
+Textos sem nenhuma palavra-chave mantêm o tipo atual, a menos que
+`incluir_padrao` seja usado (aí vão para o tipo padrão, como no registro).
+Tipos devolvidos pelo classificador que não existem em ocorrencia_tipo são
+contados e não alteram a ocorrência.
+"""
+import csv
+import logging
+import multiprocessing
+from collections import Counter
+
+from sqlalchemy import Integer, bindparam, column, update, values
+
+from app import db
+from app.models import Ocorrencia, OcorrenciaTipo
+from app.services.reprocessamento_service import iterar_lotes_por_id
+from app.utils.classificador import TIPO_PADRAO, encontrar_tipo_ocorrencia
+
+logger = logging.getLogger(__name__)
+
+SEM_TIPO = "(sem tipo)"
+
+
+def classificar_item(item: tuple) -> tuple:
+    """Worker (picklável) do pool: (id, relatorio_final) -> (id, tipo ou None)."""
+    ocorrencia_id, texto = item
+    return ocorrencia_id, encontrar_tipo_ocorrencia(texto or "")
+
+
+def novo_resumo() -> dict:
+    return {
+        "processados": 0,
+        "alterados": 0,
+        "sem_palavra_chave": 0,
+        "tipos_inexistentes": Counter(),  # nome devolvido pelo classificador -> ocorrências
+        "matriz": Counter(),  # (tipo atual, tipo novo) -> ocorrências
+    }
+
+
+def aplicar_reclassificacao(alterados: list) -> None:
+    """
+    Grava [(ocorrencia_id, novo_tipo_id), ...] em um único UPDATE.
+
+    `data_modificacao` é mantida explicitamente: o onupdate da coluna marcaria
+    toda ocorrência reclassificada com a hora da execução e distorceria os KPIs
+    de tempo de resolução (data_modificacao - data_hora_ocorrencia).
+    """
+    if db.session.get_bind().dialect.name == "postgresql":
+        novos = values(column("id", Integer), column("tipo_id", Integer), name="novos").data(alterados)
+        db.session.execute(
+            update(Ocorrencia)
+            .where(Ocorrencia.id == novos.c.id)
+            .values(ocorrencia_tipo_id=novos.c.tipo_id, data_modificacao=Ocorrencia.data_modificacao)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        # SQLite não aceita VALUES com nomes de coluna no FROM: UPDATE em lote (executemany) por id
+        tabela = Ocorrencia.__table__
+        db.session.execute(
+            update(tabela)
+            .where(tabela.c.id == bindparam("b_id"))
+            .values(ocorrencia_tipo_id=bindparam("b_tipo_id"), data_modificacao=tabela.c.data_modificacao),
+            [{"b_id": i, "b_tipo_id": tipo_id} for i, tipo_id in alterados],
+        )
+
+
+def reclassificar_ocorrencias(
+    tamanho_lote: int = 1000,
+    workers: int = None,
+    aplicar: bool = False,
+    incluir_padrao: bool = False,
+    ao_concluir_lote=None,
+) -> dict:
+    """
+    Reclassifica todas as ocorrências. Com `aplicar`, cada lote é gravado e
+    confirmado antes do próximo; sem, nada é gravado (dry-run) e só o resumo
+    é calculado. `ao_concluir_lote(ultimo_id, resumo)` é chamado após cada lote.
+    """
+    tipos = dict(db.session.query(OcorrenciaTipo.id, OcorrenciaTipo.nome))
+    ids_por_nome = {nome: tipo_id for tipo_id, nome in tipos.items()}
+    resumo = novo_resumo()
+    matriz, inexistentes = resumo["matriz"], resumo["tipos_inexistentes"]
+
+    query = db.session.query(Ocorrencia.id, Ocorrencia.relatorio_final, Ocorrencia.ocorrencia_tipo_id)
+
+    workers = workers or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(processes=workers) if workers > 1 else None
+    try:
+        for lote in iterar_lotes_por_id(query, Ocorrencia.id, tamanho_lote):
+            itens = [(row[0], row[1]) for row in lote]
+            if pool:
+                novos = pool.map(classificar_item, itens, chunksize=max(1, len(itens) // (workers * 4)))
+            else:
+                novos = [classificar_item(i) for i in itens]
+
+            alterados = []
+            for row, (ocorrencia_id, novo_nome) in zip(lote, novos):
+                tipo_atual_id = row[2]
+                novo_id = tipo_atual_id
+                if novo_nome is None:
+                    resumo["sem_palavra_chave"] += 1
+                    if incluir_padrao:
+                        novo_nome = TIPO_PADRAO
+                if novo_nome is not None:
+                    if novo_nome in ids_por_nome:
+                        novo_id = ids_por_nome[novo_nome]
+                    else:
+                        inexistentes[novo_nome] += 1
+                matriz[(tipos.get(tipo_atual_id, SEM_TIPO), tipos.get(novo_id, SEM_TIPO))] += 1
+                if novo_id != tipo_atual_id:
+                    alterados.append((ocorrencia_id, novo_id))
+
+            resumo["processados"] += len(lote)
+            resumo["alterados"] += len(alterados)
+            if aplicar:
+                try:
+                    if alterados:
+                        aplicar_reclassificacao(alterados)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+            if ao_concluir_lote:
+                ao_concluir_lote(lote[-1][0], resumo)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    if inexistentes:
+        logger.warning(f"Tipos do classificador sem cadastro em ocorrencia_tipo: {dict(inexistentes)}")
+    return resumo
+
+
+def mudancas_da_matriz(matriz: Counter) -> list:
+    """Células fora da diagonal, [(tipo atual, tipo novo, ocorrências)] da maior para a menor."""
+    return sorted(
+        ((antigo, novo, n) for (antigo, novo), n in matriz.items() if antigo != novo),
+        key=lambda celula: (-celula[2], celula[0], celula[1]),
+    )
+
+
+def salvar_matriz_csv(matriz: Counter, caminho: str) -> None:
+    """Matriz completa: uma linha por tipo atual, uma coluna por tipo novo."""
+    antigos = sorted({antigo for antigo, _ in matriz})
+    novos = sorted({novo for _, novo in matriz})
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["tipo atual \\ tipo novo", *novos])
+        for antigo in antigos:
+            escritor.writerow([antigo, *(matriz.get((antigo, novo), 0) for novo in novos)])
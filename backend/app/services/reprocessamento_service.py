@@ -0,0 +1,267 @@
+# app/services/reprocessamento_service.py
+"""
+Reprocessamento em lote dos logs brutos já gravados (rondas e paradas).
+
+Quando as regras de parsing mudam, `relatorio_processado`, os totais e as
+durações gravados ficam defasados. Este serviço percorre os registros em
+lotes por id, reprocessa os logs em um pool de processos e grava só as
+linhas que mudaram, com UPDATE em lote por chave primária. O progresso
+fica em um checkpoint JSON para que uma execução interrompida continue de
+onde parou; ao terminar um tipo, a entrada dele sai do checkpoint e a
+próxima execução recomeça do primeiro id (com as regras de parsing atuais).
+"""
+import json
+import logging
+import multiprocessing
+import os
+from datetime import date, datetime, timezone
+
+import pytz
+from sqlalchemy import update
+
+from app import db
+from app.models import Condominio, Parada, Ronda
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TZ = pytz.timezone("America/Sao_Paulo")
+
+# Colunas de cada tipo: (modelo, log bruto, data do plantão, total, duração)
+ESPECIFICACOES = {
+    "rondas": (Ronda, "log_ronda_bruto", "data_plantao_ronda", "total_rondas_no_log", "duracao_total_rondas_minutos"),
+    "paradas": (Parada, "log_parada_bruto", "data_plantao_parada", "total_paradas_no_log", "duracao_total_paradas_minutos"),
+}
+TIPOS = tuple(ESPECIFICACOES)
+
+
+def _para_utc(dt_local):
+    if dt_local is None:
+        return None
+    return LOCAL_TZ.localize(dt_local).astimezone(pytz.utc)
+
+
+def _normalizar_dt(valor):
+    # SQLite devolve datetimes sem fuso; o que foi gravado está em UTC
+    if isinstance(valor, datetime) and valor.tzinfo is None:
+        return valor.replace(tzinfo=timezone.utc)
+    return valor
+
+
+def reprocessar_registro(item: tuple) -> dict:
+    """
+    Worker (picklável) do pool. Recebe (tipo, id, log_bruto, nome_condominio,
+    data_plantao, escala) e retorna os novos valores das colunas derivadas do
+    log, ou {"id", "erro"} se o parser falhar.
+    """
+    from app.services.parada_logic import analisar_log_de_paradas
+    from app.services.ronda_evento_service import construir_linhas_ronda_evento
+    from app.services.ronda_logic import analisar_log_de_rondas
+
+    tipo, registro_id, log_bruto, nome_condominio, data_plantao, escala = item
+    _, _, _, coluna_total, coluna_duracao = ESPECIFICACOES[tipo]
+    data_plantao_str = (
+        data_plantao.strftime("%d/%m/%Y") if isinstance(data_plantao, date) else data_plantao
+    )
+    analisar = analisar_log_de_rondas if tipo == "rondas" else analisar_log_de_paradas
+    try:
+        resultado = analisar(log_bruto or "", nome_condominio or "", data_plantao_str, escala)
+    except Exception as e:
+        return {"id": registro_id, "erro": str(e)}
+
+    novo = {
+        "id": registro_id,
+        "relatorio_processado": resultado["relatorio"],
+        coluna_total: resultado["total_rondas" if tipo == "rondas" else "total_paradas"],
+        "primeiro_evento_log_dt": _para_utc(resultado["primeiro_evento_dt"]),
+        "ultimo_evento_log_dt": _para_utc(resultado["ultimo_evento_dt"]),
+        coluna_duracao: resultado["duracao_total_minutos"],
+    }
+    if tipo == "rondas":
+        novo["_eventos"] = construir_linhas_ronda_evento(registro_id, resultado["rondas_pareadas"])
+    return novo
+
+
+def novo_resumo() -> dict:
+    return {
+        "processados": 0,
+        "alterados": 0,
+        "erros": 0,
+        "relatorios_alterados": 0,
+        "totais_alterados": 0,
+        "totais_aumentaram": 0,
+        "totais_diminuiram": 0,
+        "totais_zerados": 0,
+        "delta_total": 0,
+        "duracoes_alteradas": 0,
+        "delta_duracao_minutos": 0,
+        "maior_variacao_total": None,  # {"id", "antes", "depois"}
+    }
+
+
+def registrar_diferenca(resumo: dict, atual: dict, novo: dict, coluna_total: str, coluna_duracao: str) -> bool:
+    """Acumula no resumo as diferenças entre o registro gravado e o reprocessado."""
+    alterou = False
+    if (atual["relatorio_processado"] or "") != (novo["relatorio_processado"] or ""):
+        resumo["relatorios_alterados"] += 1
+        alterou = True
+
+    total_antes, total_depois = atual[coluna_total] or 0, novo[coluna_total] or 0
+    if total_antes != total_depois:
+        delta = total_depois - total_antes
+        resumo["totais_alterados"] += 1
+        resumo["delta_total"] += delta
+        resumo["totais_aumentaram" if delta > 0 else "totais_diminuiram"] += 1
+        if total_depois == 0:
+            resumo["totais_zerados"] += 1
+        maior = resumo["maior_variacao_total"]
+        if maior is None or abs(delta) > abs(maior["depois"] - maior["antes"]):
+            resumo["maior_variacao_total"] = {"id": novo["id"], "antes": total_antes, "depois": total_depois}
+        alterou = True
+
+    duracao_antes, duracao_depois = atual[coluna_duracao] or 0, novo[coluna_duracao] or 0
+    if duracao_antes != duracao_depois:
+        resumo["duracoes_alteradas"] += 1
+        resumo["delta_duracao_minutos"] += duracao_depois - duracao_antes
+        alterou = True
+
+    for coluna in ("primeiro_evento_log_dt", "ultimo_evento_log_dt"):
+        if _normalizar_dt(atual[coluna]) != _normalizar_dt(novo[coluna]):
+            alterou = True
+
+    resumo["processados"] += 1
+    if alterou:
+        resumo["alterados"] += 1
+    return alterou
+
+
+def iterar_lotes_por_id(query, coluna_id, tamanho_lote, a_partir_de=0):
+    """Percorre a query em lotes por keyset (id crescente), sem carregar tudo em memória."""
+    ultimo_id = a_partir_de
+    while True:
+        lote = query.filter(coluna_id > ultimo_id).order_by(coluna_id).limit(tamanho_lote).all()
+        if not lote:
+            break
+        yield lote
+        ultimo_id = lote[-1][0]
+
+
+def carregar_checkpoint(caminho: str) -> dict:
+    if caminho and os.path.exists(caminho):
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def salvar_checkpoint(caminho: str, checkpoint: dict) -> None:
+    if not caminho:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    # Troca atômica: um kill no meio da escrita não corrompe o checkpoint
+    os.replace(temporario, caminho)
+
+
+def descartar_checkpoint(caminho: str, checkpoint: dict, tipo: str) -> None:
+    """Remove o tipo concluído do checkpoint (e o arquivo, se não sobrar nenhum tipo pendente)."""
+    checkpoint.pop(tipo, None)
+    if not caminho:
+        return
+    if checkpoint:
+        salvar_checkpoint(caminho, checkpoint)
+    elif os.path.exists(caminho):
+        os.remove(caminho)
+
+
+def _aplicar_atualizacoes(tipo: str, modelo, alterados: list) -> None:
+    from app.services.ronda_evento_service import inserir_linhas_ronda_evento, remover_eventos_das_rondas
+
+    linhas = [{k: v for k, v in novo.items() if not k.startswith("_")} for novo in alterados]
+    # UPDATE em lote por chave primária (executemany)
+    db.session.execute(update(modelo), linhas)
+    if tipo == "rondas":
+        remover_eventos_das_rondas(novo["id"] for novo in alterados)
+        inserir_linhas_ronda_evento([ev for novo in alterados for ev in novo["_eventos"]])
+
+
+def reprocessar_logs(
+    tipo: str,
+    tamanho_lote: int = 500,
+    workers: int = None,
+    checkpoint_path: str = None,
+    dry_run: bool = False,
+    ao_concluir_lote=None,
+) -> dict:
+    """
+    Reprocessa todos os registros de `tipo` ("rondas" ou "paradas") com id
+    acima do checkpoint. Cada lote é gravado e confirmado antes de o
+    checkpoint avançar; concluído o tipo, o checkpoint dele é descartado.
+    Em `dry_run` nada é gravado (nem o checkpoint), só o resumo das
+    diferenças é calculado.
+
+    `ao_concluir_lote(tipo, ultimo_id, resumo)` é chamado após cada lote.
+    Retorna o resumo acumulado (incluindo execuções anteriores retomadas).
+    """
+    modelo, coluna_log, coluna_data, coluna_total, coluna_duracao = ESPECIFICACOES[tipo]
+    checkpoint = {} if dry_run else carregar_checkpoint(checkpoint_path)
+    estado = checkpoint.setdefault(tipo, {"ultimo_id": 0, "resumo": novo_resumo()})
+    resumo = estado["resumo"]
+
+    query = db.session.query(
+        modelo.id,
+        getattr(modelo, coluna_log),
+        Condominio.nome,
+        getattr(modelo, coluna_data),
+        modelo.escala_plantao,
+        modelo.relatorio_processado,
+        getattr(modelo, coluna_total),
+        modelo.primeiro_evento_log_dt,
+        modelo.ultimo_evento_log_dt,
+        getattr(modelo, coluna_duracao),
+    ).join(Condominio, modelo.condominio_id == Condominio.id)
+
+    workers = workers or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(processes=workers) if workers > 1 else None
+    try:
+        for lote in iterar_lotes_por_id(query, modelo.id, tamanho_lote, estado["ultimo_id"]):
+            itens = [(tipo, *row[:5]) for row in lote]
+            novos = pool.map(reprocessar_registro, itens) if pool else [reprocessar_registro(i) for i in itens]
+
+            alterados = []
+            for row, novo in zip(lote, novos):
+                if "erro" in novo:
+                    resumo["erros"] += 1
+                    logger.error(f"Erro ao reprocessar {tipo} {novo['id']}: {novo['erro']}")
+                    continue
+                atual = {
+                    "relatorio_processado": row[5],
+                    coluna_total: row[6],
+                    "primeiro_evento_log_dt": row[7],
+                    "ultimo_evento_log_dt": row[8],
+                    coluna_duracao: row[9],
+                }
+                if registrar_diferenca(resumo, atual, novo, coluna_total, coluna_duracao):
+                    alterados.append(novo)
+
+            if not dry_run:
+                try:
+                    if alterados:
+                        _aplicar_atualizacoes(tipo, modelo, alterados)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+            estado["ultimo_id"] = lote[-1][0]
+            if not dry_run:
+                salvar_checkpoint(checkpoint_path, checkpoint)
+            if ao_concluir_lote:
+                ao_concluir_lote(tipo, estado["ultimo_id"], resumo)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    if not dry_run:
+        descartar_checkpoint(checkpoint_path, checkpoint, tipo)
+    return resumo
@@ -0,0 +1,212 @@
+# app/services/request_metrics.py
+"""
+Instrumentação opcional de queries e latência por requisição
+(REQUEST_METRICS_ENABLED).
+
+Os hooks `before_cursor_execute`/`after_cursor_execute` do engine (e
+`handle_error`, para statements que falham) contam os statements, somam o tempo de banco e agrupam os statements por "impressão
+digital" (SQL com literais e listas de parâmetros normalizados), o que expõe
+N+1 e queries repetidas. Ao fim da requisição:
+
+- o header `Server-Timing` recebe `db` (tempo e número de queries), `app`
+  (tempo fora do banco) e `dup` (execuções repetidas), visíveis no DevTools;
+- o resumo por endpoint (janela das últimas N requisições, por processo)
+  é atualizado para a tela de administração;
+- requisições acima de REQUEST_METRICS_SLOW_MS são logadas com as
+  impressões digitais mais repetidas.
+
+Desligada, nada é registrado no engine nem no app.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+TOP_REPETIDAS = 5
+TAMANHO_MAXIMO_FINGERPRINT = 300
+
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTA = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+|\$\d+|%s)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+|\$\d+|%s)\s*\)")
+_RE_POSTCOMPILE = re.compile(r"\(?__\[POSTCOMPILE_\w+\]\)?")
+_RE_ESPACOS = re.compile(r"\s+")
+
+
+def fingerprint_sql(statement: str) -> str:
+    """SQL normalizado: literais viram `?` e listas de parâmetros viram `(...)`."""
+    sql = _RE_STRING.sub("?", statement)
+    sql = _RE_NUMERO.sub("?", sql)
+    sql = _RE_POSTCOMPILE.sub("(...)", sql)
+    sql = _RE_LISTA.sub("(...)", sql)
+    sql = _RE_ESPACOS.sub(" ", sql).strip()
+    return sql[:TAMANHO_MAXIMO_FINGERPRINT]
+
+
+def _percentil(valores_ordenados, fracao: float) -> float:
+    if not valores_ordenados:
+        return 0.0
+    indice = min(len(valores_ordenados) - 1, int(round(fracao * (len(valores_ordenados) - 1))))
+    return valores_ordenados[indice]
+
+
+class MetricasRequisicao:
+    """Contadores de uma requisição (guardados em `g`)."""
+
+    __slots__ = ("inicio", "queries", "tempo_db", "fingerprints")
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.queries = 0
+        self.tempo_db = 0.0
+        self.fingerprints = Counter()
+
+    def registrar_query(self, statement: str, duracao: float) -> None:
+        self.queries += 1
+        self.tempo_db += duracao
+        self.fingerprints[fingerprint_sql(statement)] += 1
+
+    @property
+    def repetidas(self) -> int:
+        """Execuções além da primeira de cada impressão digital."""
+        return sum(n - 1 for n in self.fingerprints.values() if n > 1)
+
+    def top_repetidas(self, limite: int = TOP_REPETIDAS) -> list:
+        return [(sql, n) for sql, n in self.fingerprints.most_common(limite) if n > 1]
+
+
+class RequestMetrics:
+    """Resumo por endpoint das últimas requisições e hooks de instrumentação."""
+
+    def __init__(self, app):
+        self.janela = app.config.get("REQUEST_METRICS_WINDOW", 200)
+        self.lento_ms = app.config.get("REQUEST_METRICS_SLOW_MS", 1000)
+        self.server_timing = app.config.get("REQUEST_METRICS_SERVER_TIMING", True)
+        self._lock = threading.Lock()
+        self._amostras = {}  # endpoint -> deque[(duracao_ms, tempo_db_ms, queries, repetidas)]
+        self._repetidas = {}  # endpoint -> Counter(fingerprint -> execuções repetidas)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", self._antes_do_cursor)
+        event.listen(engine, "after_cursor_execute", self._depois_do_cursor)
+        event.listen(engine, "handle_error", self._erro_no_cursor)
+        # Primeiro before_request do app: as queries dos demais hooks (ex.: carga do usuário) também contam
+        app.before_request_funcs.setdefault(None, []).insert(0, self._iniciar_requisicao)
+        app.after_request(self._finalizar_requisicao)
+
+    # --- Hooks do engine ---
+    @staticmethod
+    def _antes_do_cursor(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("request_metrics_inicio", []).append(time.perf_counter())
+
+    @staticmethod
+    def _depois_do_cursor(conn, cursor, statement, parameters, context, executemany):
+        inicios = conn.info.get("request_metrics_inicio")
+        if not inicios:
+            return
+        duracao = time.perf_counter() - inicios.pop()
+        if has_request_context():
+            metricas = g.get("request_metrics")
+            if metricas is not None:
+                metricas.registrar_query(statement, duracao)
+
+    @staticmethod
+    def _erro_no_cursor(contexto):
+        # Sem after_cursor_execute: o início empilhado ficaria na conexão (que volta ao pool)
+        if contexto.connection is None or contexto.statement is None:
+            return
+        RequestMetrics._depois_do_cursor(contexto.connection, None, contexto.statement, None, None, False)
+
+    # --- Hooks do Flask ---
+    @staticmethod
+    def _iniciar_requisicao():
+        g.request_metrics = MetricasRequisicao()
+
+    def _finalizar_requisicao(self, response):
+        metricas = g.pop("request_metrics", None)
+        if metricas is None or request.endpoint == "static":
+            return response
+        duracao_ms = (time.perf_counter() - metricas.inicio) * 1000
+        tempo_db_ms = metricas.tempo_db * 1000
+
+        if self.server_timing:
+            response.headers.add(
+                "Server-Timing",
+                f'db;dur={tempo_db_ms:.1f};desc="{metricas.queries} queries", '
+                f"app;dur={max(duracao_ms - tempo_db_ms, 0):.1f}, "
+                f'dup;desc="{metricas.repetidas} repetidas"',
+            )
+
+        endpoint = request.endpoint or request.path
+        self.registrar(endpoint, duracao_ms, tempo_db_ms, metricas)
+        if self.lento_ms and duracao_ms >= self.lento_ms:
+            repetidas = "; ".join(f"{n}x {sql}" for sql, n in metricas.top_repetidas()) or "nenhuma"
+            logger.warning(
+                f"Requisição lenta {request.method} {request.path} ({endpoint}): "
+                f"{duracao_ms:.0f} ms, {metricas.queries} queries em {tempo_db_ms:.0f} ms, "
+                f"{metricas.repetidas} repetidas. Mais repetidas: {repetidas}"
+            )
+        return response
+
+    # --- Resumo ---
+    def registrar(self, endpoint: str, duracao_ms: float, tempo_db_ms: float, metricas: MetricasRequisicao) -> None:
+        with self._lock:
+            amostras = self._amostras.get(endpoint)
+            if amostras is None:
+                amostras = self._amostras[endpoint] = deque(maxlen=self.janela)
+                self._repetidas[endpoint] = Counter()
+            amostras.append((duracao_ms, tempo_db_ms, metricas.queries, metricas.repetidas))
+            for sql, n in metricas.top_repetidas():
+                self._repetidas[endpoint][sql] += n - 1
+
+    def resumo(self) -> list:
+        """Uma linha por endpoint, ordenada pelo tempo total gasto na janela."""
+        with self._lock:
+            copia = {endpoint: (list(amostras), self._repetidas[endpoint].most_common(TOP_REPETIDAS))
+                     for endpoint, amostras in self._amostras.items()}
+        linhas = []
+        for endpoint, (amostras, repetidas) in copia.items():
+            duracoes = sorted(a[0] for a in amostras)
+            n = len(amostras)
+            linhas.append({
+                "endpoint": endpoint,
+                "requisicoes": n,
+                "latencia_media_ms": round(sum(duracoes) / n, 1),
+                "latencia_p50_ms": round(_percentil(duracoes, 0.5), 1),
+                "latencia_p95_ms": round(_percentil(duracoes, 0.95), 1),
+                "latencia_max_ms": round(duracoes[-1], 1),
+                "db_medio_ms": round(sum(a[1] for a in amostras) / n, 1),
+                "queries_media": round(sum(a[2] for a in amostras) / n, 1),
+                "queries_max": max(a[2] for a in amostras),
+                "repetidas_media": round(sum(a[3] for a in amostras) / n, 1),
+                "top_repetidas": [{"sql": sql, "repeticoes": total} for sql, total in repetidas],
+                "tempo_total_ms": round(sum(duracoes), 1),
+            })
+        return sorted(linhas, key=lambda linha: linha["tempo_total_ms"], reverse=True)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._amostras.clear()
+            self._repetidas.clear()
+
+
+def init_request_metrics(app):
+    if not app.config.get("REQUEST_METRICS_ENABLED", False):
+        return
+    app.extensions["request_metrics"] = RequestMetrics(app)
+    logger.info("Instrumentação de queries por requisição habilitada.")
+
+
+def get_request_metrics(app=None):
+    """Instância do app, ou None se a instrumentação estiver desligada."""
+    from flask import current_app
+
+    return (app or current_app).extensions.get("request_metrics")
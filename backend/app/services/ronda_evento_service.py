@@ -0,0 +1,113 @@
+# app/services/ronda_evento_service.py
+"""
+Persistência das rondas individuais (pares início/término) na tabela
+`ronda_evento`, permitindo análises por par diretamente em SQL
+(histogramas de duração, lacunas de cobertura, carga por VTR).
+"""
+import logging
+from datetime import date
+
+import pytz
+from sqlalchemy import delete, insert
+
+from app import db
+from app.models import RondaEvento
+from app.services.ronda_logic import analisar_log_de_rondas
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TZ = pytz.timezone("America/Sao_Paulo")
+
+STATUS_COMPLETA = "completa"
+STATUS_SEM_TERMINO = "sem_termino"
+STATUS_SEM_INICIO = "sem_inicio"
+STATUS_HORARIO_INVALIDO = "horario_invalido"
+
+
+def _para_utc(dt_local):
+    if dt_local is None:
+        return None
+    if dt_local.tzinfo is None:
+        dt_local = LOCAL_TZ.localize(dt_local)
+    return dt_local.astimezone(pytz.utc)
+
+
+def classificar_ronda_pareada(ronda_pareada: dict) -> str:
+    """Define o status de um par retornado por `parear_eventos_ronda`."""
+    inicio_dt = ronda_pareada.get("inicio_dt")
+    termino_dt = ronda_pareada.get("termino_dt")
+    if inicio_dt and not termino_dt:
+        return STATUS_SEM_TERMINO
+    if termino_dt and not inicio_dt:
+        return STATUS_SEM_INICIO
+    if termino_dt <= inicio_dt:
+        return STATUS_HORARIO_INVALIDO
+    return STATUS_COMPLETA
+
+
+def construir_linhas_ronda_evento(ronda_id: int, rondas_pareadas: list) -> list:
+    """Converte os pares do parser em linhas prontas para bulk insert."""
+    linhas = []
+    for par in rondas_pareadas or []:
+        if not par.get("inicio_dt") and not par.get("termino_dt"):
+            continue
+        status = classificar_ronda_pareada(par)
+        linhas.append(
+            {
+                "ronda_id": ronda_id,
+                "vtr": par.get("vtr"),
+                "inicio": _para_utc(par.get("inicio_dt")),
+                "termino": _para_utc(par.get("termino_dt")),
+                "duracao_min": par.get("duracao_minutos") if status == STATUS_COMPLETA else None,
+                "status": status,
+            }
+        )
+    return linhas
+
+
+def inserir_linhas_ronda_evento(linhas: list) -> int:
+    """Bulk insert (executemany) de linhas já montadas. Não faz commit."""
+    if not linhas:
+        return 0
+    db.session.execute(insert(RondaEvento), linhas)
+    return len(linhas)
+
+
+def remover_eventos_das_rondas(ronda_ids) -> None:
+    """Remove os eventos das rondas informadas. Não faz commit."""
+    ronda_ids = list(ronda_ids)
+    if ronda_ids:
+        db.session.execute(
+            delete(RondaEvento).where(RondaEvento.ronda_id.in_(ronda_ids))
+        )
+
+
+def substituir_eventos_da_ronda(ronda_id: int, rondas_pareadas: list) -> int:
+    """
+    Regrava os eventos de uma ronda dentro da transação corrente.
+    O commit fica a cargo do chamador, junto com a própria Ronda.
+    """
+    remover_eventos_das_rondas([ronda_id])
+    return inserir_linhas_ronda_evento(
+        construir_linhas_ronda_evento(ronda_id, rondas_pareadas)
+    )
+
+
+def analisar_ronda_para_eventos(item: tuple) -> tuple:
+    """
+    Worker (picklável) usado pelo backfill paralelo.
+    Recebe (ronda_id, log_bruto, nome_condominio, data_plantao, escala) e
+    retorna (ronda_id, linhas_ronda_evento).
+    """
+    ronda_id, log_bruto, nome_condominio, data_plantao, escala = item
+    data_plantao_str = (
+        data_plantao.strftime("%d/%m/%Y") if isinstance(data_plantao, date) else data_plantao
+    )
+    try:
+        resultado = analisar_log_de_rondas(
+            log_bruto or "", nome_condominio or "", data_plantao_str, escala
+        )
+    except Exception as e:
+        logger.error(f"Erro ao analisar ronda {ronda_id} para ronda_evento: {e}")
+        return ronda_id, []
+    return ronda_id, construir_linhas_ronda_evento(ronda_id, resultado["rondas_pareadas"])
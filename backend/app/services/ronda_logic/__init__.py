@@ -1,3 +1,3 @@
-from .processor import processar_log_de_rondas
+from .processor import analisar_log_de_rondas, processar_log_de_rondas
 
-__all__ = ["processar_log_de_rondas"]
+__all__ = ["analisar_log_de_rondas", "processar_log_de_rondas"]
@@ -1,38 +1,18 @@
 # config.py
 import re
 
-# --- Constantes de Expressões Regulares Pré-compiladas ---
-REGEX_PREFIXO_LINHA = re.compile(
-    r"^\s*\["  # Início da linha e '['
-    r"([^,\]]*?)"  # Grupo 1: Hora do log no prefixo (ex: "19:41" ou "22:08")
-    r"(?:[, ]\s*| )?"  # Separador opcional (vírgula ou espaço) ou apenas um espaço
-    r"(\d{1,2}/\d{1,2}/\d{2,4})\s*"  # Grupo 2: Data do log (DD/MM/YYYY ou DD/MM/YY) - AJUSTADO PARA ACEITAR ANO COM 2 OU 4 DIGITOS NA CAPTURA INICIAL
-    r"\]\s*"  # Fim do ']' do prefixo
-    r"(?:(VTR\s*\d+|Águia\s*\d+):\s*)?"  # Grupo 3 (opcional): Identificador da VTR (ex: "VTR 05:", "Águia 04:")
-    r"(.*)$",  # Grupo 4: Restante da mensagem
-    re.IGNORECASE,
-)
-
-# --- NOVO: Regex para formato "DD/MM/YYYY HH:MM - Sender: Message" (sem colchetes) ---
-REGEX_PREFIXO_LINHA_SEM_COLCHETES = re.compile(
-    r"^(\d{1,2}/\d{1,2}/\d{2,4})"  # Grupo 1: Data (DD/MM/YYYY)
-    r"\s+"                         # Espaço obrigatório
-    r"(\d{1,2}:\d{1,2})"           # Grupo 2: Hora (HH:MM)
-    r"\s+-\s+"                     # Separador " - " obrigatório
-    r"(?:(.*?):\s*)?"              # Grupo 3 (opcional): Sender/VTR (qualquer coisa até dois pontos)
-    r"(.*)$",                      # Grupo 4: Restante da mensagem
-    re.IGNORECASE,
-)
-
-REGEX_VTR_MENSAGEM_ALTERNATIVA = re.compile(
-    r"^(VTR\s*\d+|Águia\s*\d+):\s*(.*)$", re.IGNORECASE
-)
-
-# --- NOVO: Expressão para detectar VTR em linhas simples ---
-REGEX_VTR_LINHA_SIMPLES = re.compile(
-    r"^(VTR\s*\d+|Águia\s*\d+)$", re.IGNORECASE
+from ..event_matcher import EventMatcher
+# Prefixo de linha, VTR e fallbacks são compartilhados pelos parsers de ronda e parada
+from ..log_ingestion.tokenizer import (
+    DEFAULT_VTR_ID,
+    FALLBACK_DATA_INDEFINIDA,
+    REGEX_PREFIXO_LINHA,
+    REGEX_PREFIXO_LINHA_SEM_COLCHETES,
+    REGEX_VTR_LINHA_SIMPLES,
+    REGEX_VTR_MENSAGEM_ALTERNATIVA,
 )
 
+# --- Constantes de Expressões Regulares Pré-compiladas ---
 REGEX_BLOCO_DATA = re.compile(
     r"Data:\s*(\d{1,2}/\d{1,2}/\d{2,4})", re.IGNORECASE
 )  # Aceita ano com 2 ou 4 digitos
@@ -161,6 +141,19 @@ COMPILED_RONDA_EVENT_REGEXES = [
     for p in RONDA_EVENT_REGEX_PATTERNS
 ]
 
-DEFAULT_VTR_ID = "VTR_DESCONHECIDA"
-FALLBACK_DATA_INDEFINIDA = "[Data Indefinida]"
+# Mesma lista e prioridade, avaliadas em uma passada. Todo padrão exige um dígito
+# (hora) e uma palavra-chave de início/término: linhas sem isso são descartadas antes;
+# os requisitos podam os padrões cujos trechos obrigatórios não aparecem na linha.
+RONDA_EVENT_MATCHER = EventMatcher(
+    RONDA_EVENT_REGEX_PATTERNS,
+    prefiltros=(r"\d", rf"{INICIO_KEYWORDS_REGEX_PART}|{TERMINO_KEYWORDS_REGEX_PART}"),
+    requisitos={
+        "inicio": INICIO_KEYWORDS_REGEX_PART,
+        "termino": TERMINO_KEYWORDS_REGEX_PART,
+        "tipo": TIPO_RONDA_REGEX_PART,
+        "hora": TIME_CAPTURE_REGEX_PART,
+        "hora_simples": SIMPLE_HOUR_CAPTURE_REGEX_PART,
+    },
+)
+
 FALLBACK_ESCALA_NAO_INFORMADA = "[Escala não Informada]"
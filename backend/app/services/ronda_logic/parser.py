@@ -1,130 +1,14 @@
 # app/services/ronda_logic/parser.py
 import logging
-import re
-import unicodedata
 from datetime import datetime, timedelta
 
+from ..log_ingestion.normalizacao import converter_data_hora, limpar_mensagem as _limpar_e_normalizar_mensagem
 from . import config
-from .utils import normalizar_data_capturada, normalizar_hora_capturada
+from .utils import normalizar_hora_capturada
 
 logger = logging.getLogger(__name__)
 
 
-def _limpar_e_normalizar_mensagem(texto: str) -> str:
-    if not texto:
-        return ""
-    texto_normalizado = unicodedata.normalize("NFC", texto)
-    texto_com_espacos_padronizados = re.sub(r"\s+", " ", texto_normalizado)
-    return texto_com_espacos_padronizados.strip()
-
-
-def parse_linha_log_prefixo(linha_strip: str, ultima_vtr_conhecida_global: str):
-    hora_linha_log_raw = None
-    data_linha_original = None
-    mensagem_eventos = linha_strip
-    id_vtr_para_eventos_desta_linha = ultima_vtr_conhecida_global
-    vtr_contexto_geral_para_proximas_linhas = ultima_vtr_conhecida_global
-
-    # --- NOVO: Verificar se é uma linha simples de VTR ---
-    match_vtr_simples = config.REGEX_VTR_LINHA_SIMPLES.match(linha_strip)
-    if match_vtr_simples:
-        vtr_especifica_da_linha = match_vtr_simples.group(1).upper().replace(" ", "")
-        id_vtr_para_eventos_desta_linha = vtr_especifica_da_linha
-        vtr_contexto_geral_para_proximas_linhas = vtr_especifica_da_linha
-        return (
-            None,
-            None,
-            id_vtr_para_eventos_desta_linha,
-            "",  # Linha de VTR não tem mensagem de evento
-            vtr_contexto_geral_para_proximas_linhas,
-        )
-
-    match_prefixo = config.REGEX_PREFIXO_LINHA.match(linha_strip)
-    if match_prefixo:
-        hora_linha_log_raw_temp = match_prefixo.group(1)
-        data_str_raw = match_prefixo.group(2)
-        hora_linha_log_raw = normalizar_hora_capturada(hora_linha_log_raw_temp)
-        data_linha_original = normalizar_data_capturada(data_str_raw)
-        vtr_do_prefixo_str = match_prefixo.group(3)
-        mensagem_eventos = match_prefixo.group(4).strip()
-        vtr_do_prefixo_normalizada = None
-        if vtr_do_prefixo_str:
-            vtr_do_prefixo_normalizada = vtr_do_prefixo_str.upper().replace(" ", "")
-            vtr_contexto_geral_para_proximas_linhas = vtr_do_prefixo_normalizada
-            id_vtr_para_eventos_desta_linha = vtr_do_prefixo_normalizada
-        match_vtr_na_mensagem = config.REGEX_VTR_MENSAGEM_ALTERNATIVA.match(
-            mensagem_eventos
-        )
-        if match_vtr_na_mensagem:
-            vtr_especifica_da_mensagem = (
-                match_vtr_na_mensagem.group(1).upper().replace(" ", "")
-            )
-            id_vtr_para_eventos_desta_linha = vtr_especifica_da_mensagem
-            mensagem_eventos = match_vtr_na_mensagem.group(2).strip()
-            vtr_contexto_geral_para_proximas_linhas = id_vtr_para_eventos_desta_linha
-        return (
-            hora_linha_log_raw,
-            data_linha_original,
-            id_vtr_para_eventos_desta_linha,
-            _limpar_e_normalizar_mensagem(mensagem_eventos),
-            vtr_contexto_geral_para_proximas_linhas,
-        )
-
-    
-    # --- NOVO: Tentar Regex sem colchetes ---
-    match_sem_colchetes = config.REGEX_PREFIXO_LINHA_SEM_COLCHETES.match(linha_strip)
-    if match_sem_colchetes:
-        data_str_raw = match_sem_colchetes.group(1)
-        hora_linha_log_raw_temp = match_sem_colchetes.group(2)
-        vtr_do_prefixo_str = match_sem_colchetes.group(3)
-        mensagem_eventos = match_sem_colchetes.group(4).strip()
-
-        hora_linha_log_raw = normalizar_hora_capturada(hora_linha_log_raw_temp)
-        data_linha_original = normalizar_data_capturada(data_str_raw)
-
-        if vtr_do_prefixo_str:
-            # Tenta limpar o sender para ver se é uma VTR ou se é apenas um nome
-            # Se contiver "VTR" ou "Águia", tratamos como VTR.
-            # Caso contrário, mantemos a última VTR conhecida (pois pode ser mensagem de supervisor)
-            if re.search(r"(VTR|Águia)", vtr_do_prefixo_str, re.IGNORECASE):
-                vtr_normalizada = vtr_do_prefixo_str.upper().replace(" ", "")
-                # Extrai apenas a parte da VTR se houver lixo (ex: "Douglas Supervisor Líder: 00:45 VTR 09 Felipe")
-                match_vtr_clean = re.search(r"(VTR\s*\d+|Águia\s*\d+)", vtr_do_prefixo_str, re.IGNORECASE)
-                if match_vtr_clean:
-                    vtr_normalizada = match_vtr_clean.group(1).upper().replace(" ", "")
-                
-                vtr_contexto_geral_para_proximas_linhas = vtr_normalizada
-                id_vtr_para_eventos_desta_linha = vtr_normalizada
-            else:
-                # Se o sender não parece VTR (ex: Supervisor), verificamos se a mensagem começa com VTR
-                pass 
-        
-        # Verifica se há VTR no início da mensagem (comum quando o sender é o supervisor)
-        match_vtr_na_mensagem = config.REGEX_VTR_MENSAGEM_ALTERNATIVA.match(mensagem_eventos)
-        if match_vtr_na_mensagem:
-            vtr_especifica_da_mensagem = match_vtr_na_mensagem.group(1).upper().replace(" ", "")
-            id_vtr_para_eventos_desta_linha = vtr_especifica_da_mensagem
-            mensagem_eventos = match_vtr_na_mensagem.group(2).strip()
-            vtr_contexto_geral_para_proximas_linhas = id_vtr_para_eventos_desta_linha
-
-        return (
-            hora_linha_log_raw,
-            data_linha_original,
-            id_vtr_para_eventos_desta_linha,
-            _limpar_e_normalizar_mensagem(mensagem_eventos),
-            vtr_contexto_geral_para_proximas_linhas,
-        )
-
-    else:
-        return (
-            None,
-            None,
-            ultima_vtr_conhecida_global,
-            _limpar_e_normalizar_mensagem(linha_strip),
-            ultima_vtr_conhecida_global,
-        )
-
-
 def _ajustar_data_evento_para_plantao(
     dt_obj, data_str_original, inicio_plantao, fim_plantao, log_entry_datetime=None
 ):
@@ -181,44 +65,36 @@ def extrair_eventos_de_mensagem_simples(
         return []
     mensagem = _limpar_e_normalizar_mensagem(mensagem_raw)
 
-    for r_info in config.COMPILED_RONDA_EVENT_REGEXES:
-        match_evento = r_info["regex"].search(mensagem)
-        if match_evento:
-            try:
-                hora_evento_raw = match_evento.group(1)
-            except IndexError:
-                continue
-            if hora_evento_raw is None:
-                continue
-            hora_formatada = normalizar_hora_capturada(hora_evento_raw)
-            if not hora_formatada:
-                continue
-
-            try:
-                dt_obj_inicial = datetime.strptime(
-                    f"{data_log_contexto} {hora_formatada}", "%d/%m/%Y %H:%M"
-                )
-                dt_obj_final = _ajustar_data_evento_para_plantao(
-                    dt_obj_inicial,
-                    data_log_contexto,
-                    inicio_plantao,
-                    fim_plantao,
-                    log_entry_datetime,
-                )
+    for tipo, hora_evento_raw in config.RONDA_EVENT_MATCHER.iterar(mensagem):
+        if hora_evento_raw is None:
+            continue
+        hora_formatada = normalizar_hora_capturada(hora_evento_raw)
+        if not hora_formatada:
+            continue
+
+        try:
+            dt_obj_inicial = converter_data_hora(data_log_contexto, hora_formatada)
+            dt_obj_final = _ajustar_data_evento_para_plantao(
+                dt_obj_inicial,
+                data_log_contexto,
+                inicio_plantao,
+                fim_plantao,
+                log_entry_datetime,
+            )
 
-                evento = {
-                    "vtr": id_vtr_contexto or config.DEFAULT_VTR_ID,
-                    "tipo": r_info["tipo"],
-                    "hora_str": hora_formatada,
-                    "data_str": dt_obj_final.strftime("%d/%m/%Y"),
-                    "datetime_obj": dt_obj_final,
-                    "linha_original": linha_original_str,
-                }
-                return [evento]
-            except ValueError as ve:
-                logger.error(
-                    f"Erro de data/hora ao parsear evento: {ve}. Linha: '{linha_original_str}'"
-                )
+            evento = {
+                "vtr": id_vtr_contexto or config.DEFAULT_VTR_ID,
+                "tipo": tipo,
+                "hora_str": hora_formatada,
+                "data_str": dt_obj_final.strftime("%d/%m/%Y"),
+                "datetime_obj": dt_obj_final,
+                "linha_original": linha_original_str,
+            }
+            return [evento]
+        except ValueError as ve:
+            logger.error(
+                f"Erro de data/hora ao parsear evento: {ve}. Linha: '{linha_original_str}'"
+            )
     return []
 
 
@@ -58,4 +58,89 @@ def get_top_supervisor(query):
         .order_by(func.sum(VWRondasDetalhadas.total_rondas_no_log).desc())
         .first()
     )
-    return top_supervisor_q[0] if top_supervisor_q else "N/A" 
\ No newline at end of file
+    return top_supervisor_q[0] if top_supervisor_q else "N/A" 
+
+RONDA_CHAVE_UNICA = ("condominio_id", "data_plantao_ronda", "turno_ronda")
+
+# Colunas sobrescritas quando a chave (condomínio, data, turno) já existe
+RONDA_COLUNAS_UPSERT = (
+    "log_ronda_bruto",
+    "relatorio_processado",
+    "escala_plantao",
+    "total_rondas_no_log",
+    "primeiro_evento_log_dt",
+    "ultimo_evento_log_dt",
+    "duracao_total_rondas_minutos",
+)
+
+
+def buscar_rondas_por_chaves(chaves):
+    """
+    Carrega, em uma única consulta, as rondas existentes para as chaves
+    (condominio_id, data_plantao_ronda, turno_ronda). Retorna {chave: Ronda}.
+    """
+    from sqlalchemy import tuple_
+    from sqlalchemy.orm import undefer
+
+    chaves = list(chaves)
+    if not chaves:
+        return {}
+    rondas = (
+        Ronda.query.options(undefer(Ronda.log_ronda_bruto))
+        .filter(
+            tuple_(Ronda.condominio_id, Ronda.data_plantao_ronda, Ronda.turno_ronda).in_(chaves)
+        )
+        .all()
+    )
+    return {(r.condominio_id, r.data_plantao_ronda, r.turno_ronda): r for r in rondas}
+
+
+def upsert_rondas(linhas):
+    """
+    INSERT ... ON CONFLICT (condominio_id, data_plantao_ronda, turno_ronda) DO UPDATE
+    para todas as linhas em um único comando. Não faz commit.
+    Retorna {chave: ronda_id} na mesma ordem das linhas.
+    """
+    if not linhas:
+        return {}
+    dialeto = db.engine.dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return _upsert_rondas_orm(linhas)
+
+    tabela = Ronda.__table__
+    stmt = dialect_insert(tabela)
+    set_ = {col: stmt.excluded[col] for col in RONDA_COLUNAS_UPSERT}
+    # Mantém o supervisor atual quando o lote não informa um
+    set_["supervisor_id"] = func.coalesce(stmt.excluded.supervisor_id, tabela.c.supervisor_id)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(RONDA_CHAVE_UNICA), set_=set_
+    ).returning(
+        tabela.c.id, tabela.c.condominio_id, tabela.c.data_plantao_ronda, tabela.c.turno_ronda,
+        sort_by_parameter_order=True,
+    )
+    resultado = db.session.execute(stmt, linhas)
+    return {(row[1], row[2], row[3]): row[0] for row in resultado}
+
+
+def _upsert_rondas_orm(linhas):
+    """Mesmo efeito de upsert_rondas pelo ORM (uma consulta e um flush), para bancos sem ON CONFLICT."""
+    rondas = {}
+    existentes = buscar_rondas_por_chaves(tuple(linha[c] for c in RONDA_CHAVE_UNICA) for linha in linhas)
+    for linha in linhas:
+        chave = tuple(linha[c] for c in RONDA_CHAVE_UNICA)
+        ronda = existentes.get(chave)
+        if ronda is None:
+            ronda = existentes[chave] = Ronda(**linha)
+            db.session.add(ronda)
+        else:
+            for col in RONDA_COLUNAS_UPSERT:
+                setattr(ronda, col, linha[col])
+            if linha.get("supervisor_id") is not None:
+                ronda.supervisor_id = linha["supervisor_id"]
+        rondas[chave] = ronda
+    db.session.flush()
+    return {chave: ronda.id for chave, ronda in rondas.items()}
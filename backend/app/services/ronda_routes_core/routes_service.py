@@ -2,7 +2,8 @@ import logging
 from datetime import datetime
 from app import db
 from app.models import Condominio, User, Ronda, EscalaMensal
-from app.services.rondaservice import processar_log_de_rondas
+from app.services.rondaservice import analisar_log_de_rondas, processar_log_de_rondas
+from app.services.ronda_evento_service import substituir_eventos_da_ronda
 from sqlalchemy import func
 import pytz
 from app.services.ronda_routes_core.helpers import inferir_turno
@@ -15,6 +16,18 @@ from typing import Optional # Importa Optional para tipagem
 
 logger = logging.getLogger(__name__)
 
+
+def _analisar_item_lote(argumentos):
+    """Worker picklável para o processamento paralelo em `salvar_rondas_em_lote`."""
+    log_bruto, nome_condominio, data_plantao_str, escala_plantao = argumentos
+    return analisar_log_de_rondas(
+        log_bruto_rondas_str=log_bruto,
+        nome_condominio_str=nome_condominio,
+        data_plantao_manual_str=data_plantao_str,
+        escala_plantao_str=escala_plantao,
+    )
+
+
 class RondaRoutesService:
     @staticmethod
     def preparar_dados_formulario():
@@ -123,12 +136,17 @@ class RondaRoutesService:
                 return False, msg, 400, None
 
             data_plantao = date.fromisoformat(data_plantao_str)
-            relatorio, total, p_evento, u_evento, duracao = processar_log_de_rondas(
+            analise = analisar_log_de_rondas(
                 log_bruto_rondas_str=log_bruto,
                 nome_condominio_str=condominio_obj.nome,
                 data_plantao_manual_str=data_plantao.strftime("%d/%m/%Y"),
                 escala_plantao_str=escala_plantao,
             )
+            relatorio = analise["relatorio"]
+            total = analise["total_rondas"]
+            p_evento = analise["primeiro_evento_dt"]
+            u_evento = analise["ultimo_evento_dt"]
+            duracao = analise["duracao_total_minutos"]
 
             if total == 0:
                 return False, "Não foi possível salvar: Nenhum evento de ronda válido foi encontrado no log fornecido.", 400, None
@@ -167,6 +185,7 @@ class RondaRoutesService:
                 ronda.primeiro_evento_log_dt = primeiro_evento_utc
                 ronda.ultimo_evento_log_dt = ultimo_evento_utc
                 ronda.duracao_total_rondas_minutos = duracao
+                substituir_eventos_da_ronda(ronda.id, analise["rondas_pareadas"])
                 update_ronda()
                 mensagem_sucesso = "Ronda atualizada com sucesso!"
             else:
@@ -206,12 +225,17 @@ class RondaRoutesService:
 
                     # Reprocessa com o log MERGEADO
                     # OBS: Usamos processar_log_de_rondas novamente para garantir estatísticas corretas sobre o TOTAL
-                    relatorio_merge, total_m, p_evento_m, u_evento_m, duracao_m = processar_log_de_rondas(
+                    analise_merge = analisar_log_de_rondas(
                         log_bruto_rondas_str=log_merged,
                         nome_condominio_str=condominio_obj.nome,
                         data_plantao_manual_str=data_plantao.strftime("%d/%m/%Y"),
                         escala_plantao_str=escala_plantao,
                     )
+                    relatorio_merge = analise_merge["relatorio"]
+                    total_m = analise_merge["total_rondas"]
+                    p_evento_m = analise_merge["primeiro_evento_dt"]
+                    u_evento_m = analise_merge["ultimo_evento_dt"]
+                    duracao_m = analise_merge["duracao_total_minutos"]
 
                     # Ajuste de Fuso
                     local_tz_merge = pytz.timezone("America/Sao_Paulo")
@@ -228,7 +252,8 @@ class RondaRoutesService:
                     # Nota: Não atualizamos user_id (quem criou), mas podemos atualizar supervisor se mudou
                     if supervisor_id_para_db and supervisor_id_para_db != ronda_existente.supervisor_id:
                          ronda_existente.supervisor_id = supervisor_id_para_db
-                    
+
+                    substituir_eventos_da_ronda(ronda_existente.id, analise_merge["rondas_pareadas"])
                     update_ronda()
                     
                     msg_acao = "incrementada" if novas_adicionadas_count > 0 else "atualizada"
@@ -250,6 +275,9 @@ class RondaRoutesService:
                     duracao_total_rondas_minutos=duracao,
                     data_hora_inicio=datetime.now(timezone.utc),
                 )
+                db.session.add(ronda)
+                db.session.flush()  # Garante ronda.id para os eventos
+                substituir_eventos_da_ronda(ronda.id, analise["rondas_pareadas"])
                 save_ronda(ronda)
                 mensagem_sucesso = "Ronda registrada com sucesso!"
                 return True, mensagem_sucesso, 200, ronda.id
@@ -258,6 +286,236 @@ class RondaRoutesService:
             logger.error(f"Erro ao salvar/finalizar ronda: {e}", exc_info=True)
             return False, f"Erro interno ao salvar ronda: {str(e)}", 500, None
 
+    @staticmethod
+    def salvar_rondas_em_lote(itens: list, user: User, max_workers: Optional[int] = None):
+        """
+        Salva várias rondas em uma única transação.
+
+        Cada item tem o mesmo formato aceito por `salvar_ronda` (condominio_id ou
+        "Outro" + nome_condominio_outro, data_plantao, escala_plantao, log_bruto,
+        supervisor_id), ou `nome_condominio` no lugar de condominio_id.
+        Condomínios, escalas e rondas existentes são carregados uma vez por lote;
+        os logs são mesclados em memória, processados (em paralelo se
+        `max_workers` for informado) e gravados com um único
+        INSERT ... ON CONFLICT (condominio_id, data_plantao_ronda, turno_ronda).
+
+        Retorna uma lista (na ordem dos itens) de dicts com
+        success, message, status_code e ronda_id.
+        """
+        from collections import OrderedDict
+        from datetime import date, timezone
+        from sqlalchemy import tuple_
+        from app.services.ronda_evento_service import (
+            construir_linhas_ronda_evento, inserir_linhas_ronda_evento, remover_eventos_das_rondas,
+        )
+        from app.services.entity_resolver import get_entity_resolver, normalizar_nome
+        from app.services.ronda_routes_core.persistence_service import buscar_rondas_por_chaves, upsert_rondas
+
+        resultados = [None] * len(itens)
+
+        def registrar(indice, success, message, status_code, ronda_id=None):
+            resultados[indice] = {
+                "indice": indice,
+                "success": success,
+                "message": message,
+                "status_code": status_code,
+                "ronda_id": ronda_id,
+            }
+
+        # --- 1. Condomínios: nomes resolvidos em memória, uma consulta por ids ---
+        def nome_do_item(item):
+            if item.get("condominio_id") == "Outro":
+                return (item.get("nome_condominio_outro") or "").strip()
+            return (item.get("nome_condominio") or "").strip()
+
+        resolver = get_entity_resolver()
+        ids_por_nome = {}
+        for item in itens:
+            nome = nome_do_item(item)
+            if nome and not str(item.get("condominio_id") or "").isdigit():
+                ids_por_nome[normalizar_nome(nome)] = resolver.resolver_condominio_id(nome)
+        ids_condominio = {
+            int(item["condominio_id"]) for item in itens
+            if str(item.get("condominio_id") or "").isdigit()
+        } | {i for i in ids_por_nome.values() if i}
+        condominios_por_id = {}
+        if ids_condominio:
+            condominios_por_id = {
+                c.id: c for c in Condominio.query.filter(Condominio.id.in_(ids_condominio)).all()
+            }
+        condominios_por_nome = {
+            nome_normalizado: condominios_por_id.get(condominio_id)
+            for nome_normalizado, condominio_id in ids_por_nome.items()
+            if condominio_id
+        }
+
+        try:
+            novos_condominios = False
+            preparados = []
+            for indice, item in enumerate(itens):
+                log_bruto = item.get("log_bruto")
+                data_plantao_str = item.get("data_plantao")
+                escala_plantao = item.get("escala_plantao")
+                condominio_id_str = str(item.get("condominio_id") or "")
+
+                condominio_obj = None
+                nome = nome_do_item(item)
+                if condominio_id_str.isdigit():
+                    condominio_obj = condominios_por_id.get(int(condominio_id_str))
+                elif nome:
+                    condominio_obj = condominios_por_nome.get(normalizar_nome(nome))
+                    if not condominio_obj:
+                        condominio_obj = Condominio(nome=nome)
+                        db.session.add(condominio_obj)
+                        condominios_por_nome[normalizar_nome(nome)] = condominio_obj
+                        novos_condominios = True
+                elif condominio_id_str == "Outro":
+                    registrar(indice, False, "O nome do condomínio é obrigatório.", 400)
+                    continue
+
+                valid, msg = validar_campos_essenciais(log_bruto, condominio_obj, data_plantao_str, escala_plantao)
+                if not valid:
+                    registrar(indice, False, msg, 400)
+                    continue
+                try:
+                    data_plantao = date.fromisoformat(data_plantao_str)
+                except (TypeError, ValueError):
+                    registrar(indice, False, "Data de plantão inválida.", 400)
+                    continue
+
+                supervisor_str = str(item.get("supervisor_id") or "")
+                preparados.append({
+                    "indice": indice,
+                    "condominio": condominio_obj,
+                    "data_plantao": data_plantao,
+                    "escala_plantao": escala_plantao,
+                    "turno_ronda": inferir_turno(data_plantao, escala_plantao),
+                    "supervisor_id": int(supervisor_str) if supervisor_str.isdigit() and supervisor_str != "0" else None,
+                    "linhas": [l.strip() for l in log_bruto.splitlines() if l.strip()],
+                })
+
+            if novos_condominios:
+                db.session.flush()  # Atribui ids a todos os condomínios criados de uma vez
+
+            if not preparados:
+                return resultados
+
+            # --- 2. Escalas dos meses envolvidos (supervisor automático) ---
+            meses = {(p["data_plantao"].year, p["data_plantao"].month) for p in preparados}
+            escalas = {
+                (e.ano, e.mes, e.nome_turno): e.supervisor_id
+                for e in EscalaMensal.query.filter(tuple_(EscalaMensal.ano, EscalaMensal.mes).in_(meses)).all()
+            }
+
+            # --- 3. Agrupa por chave única e mescla com as rondas existentes ---
+            grupos = OrderedDict()
+            for p in preparados:
+                chave = (p["condominio"].id, p["data_plantao"], p["turno_ronda"])
+                supervisor_id = p["supervisor_id"] or escalas.get(
+                    (p["data_plantao"].year, p["data_plantao"].month, p["turno_ronda"])
+                )
+                grupo = grupos.setdefault(chave, {
+                    "condominio": p["condominio"],
+                    "data_plantao": p["data_plantao"],
+                    "escala_plantao": p["escala_plantao"],
+                    "supervisor_id": supervisor_id,
+                    "itens": [],
+                })
+                if supervisor_id:
+                    grupo["supervisor_id"] = supervisor_id
+                grupo["itens"].append(p)
+
+            existentes = buscar_rondas_por_chaves(grupos.keys())
+            for chave, grupo in grupos.items():
+                ronda_existente = existentes.get(chave)
+                linhas_finais = (
+                    [l.strip() for l in (ronda_existente.log_ronda_bruto or "").splitlines() if l.strip()]
+                    if ronda_existente else []
+                )
+                linhas_vistas = set(linhas_finais)
+                for p in grupo["itens"]:
+                    p["novas_linhas"] = 0
+                    for linha in p["linhas"]:
+                        if linha not in linhas_vistas:
+                            linhas_finais.append(linha)
+                            linhas_vistas.add(linha)
+                            p["novas_linhas"] += 1
+                grupo["existente"] = ronda_existente is not None
+                grupo["log_merged"] = "\n".join(linhas_finais)
+
+            # --- 4. Processamento dos logs (opcionalmente em paralelo) ---
+            argumentos = [
+                (g["log_merged"], g["condominio"].nome, g["data_plantao"].strftime("%d/%m/%Y"), g["escala_plantao"])
+                for g in grupos.values()
+            ]
+            if max_workers and len(argumentos) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    analises = list(executor.map(_analisar_item_lote, argumentos))
+            else:
+                analises = [_analisar_item_lote(a) for a in argumentos]
+
+            # --- 5. Upsert em um único comando ---
+            local_tz = pytz.timezone("America/Sao_Paulo")
+            agora = datetime.now(timezone.utc)
+            linhas_upsert = []
+            grupos_validos = []
+            for (chave, grupo), analise in zip(grupos.items(), analises):
+                if analise["total_rondas"] == 0:
+                    for p in grupo["itens"]:
+                        registrar(
+                            p["indice"], False,
+                            "Não foi possível salvar: Nenhum evento de ronda válido foi encontrado no log fornecido.",
+                            400,
+                        )
+                    continue
+                p_evento, u_evento = analise["primeiro_evento_dt"], analise["ultimo_evento_dt"]
+                linhas_upsert.append({
+                    "condominio_id": chave[0],
+                    "data_plantao_ronda": chave[1],
+                    "turno_ronda": chave[2],
+                    "escala_plantao": grupo["escala_plantao"],
+                    "log_ronda_bruto": grupo["log_merged"],
+                    "relatorio_processado": analise["relatorio"],
+                    "total_rondas_no_log": analise["total_rondas"],
+                    "primeiro_evento_log_dt": local_tz.localize(p_evento).astimezone(pytz.utc) if p_evento else None,
+                    "ultimo_evento_log_dt": local_tz.localize(u_evento).astimezone(pytz.utc) if u_evento else None,
+                    "duracao_total_rondas_minutos": analise["duracao_total_minutos"],
+                    "supervisor_id": grupo["supervisor_id"],
+                    "user_id": user.id,
+                    "data_hora_inicio": agora,
+                })
+                grupos_validos.append((chave, grupo, analise))
+
+            ids_por_chave = upsert_rondas(linhas_upsert)
+
+            # --- 6. Eventos individuais (ronda_evento) ---
+            remover_eventos_das_rondas(ids_por_chave.values())
+            for chave, grupo, analise in grupos_validos:
+                inserir_linhas_ronda_evento(
+                    construir_linhas_ronda_evento(ids_por_chave[chave], analise["rondas_pareadas"])
+                )
+
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Erro ao salvar lote de rondas: {e}", exc_info=True)
+            for indice, resultado in enumerate(resultados):
+                if resultado is None or resultado["success"]:
+                    registrar(indice, False, f"Erro interno ao salvar lote de rondas: {str(e)}", 500)
+            return resultados
+
+        for chave, grupo, analise in grupos_validos:
+            ronda_id = ids_por_chave[chave]
+            for p in grupo["itens"]:
+                if grupo["existente"]:
+                    msg_acao = "incrementada" if p["novas_linhas"] > 0 else "atualizada"
+                    mensagem = f"Ronda existente encontrada e {msg_acao} com sucesso! (+{p['novas_linhas']} linhas)"
+                else:
+                    mensagem = "Ronda registrada com sucesso!"
+                registrar(p["indice"], True, mensagem, 200, ronda_id)
+        return resultados
+
     @staticmethod
     def listar_rondas(page=1, filter_params=None):
         """
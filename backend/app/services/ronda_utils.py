@@ -219,7 +219,8 @@ def get_system_user() -> Optional[User]:
 def infer_condominio_from_filename(filename: str) -> Optional[Condominio]:
     """
     Infere o condomínio baseado no nome do arquivo.
-    Tenta encontrar um condomínio cujo nome esteja contido no nome do arquivo.
+    Procura, no índice em memória do EntityResolver, um condomínio cujo nome
+    (sem acentos/maiúsculas) esteja contido no nome do arquivo.
 
     Args:
         filename: Nome do arquivo (ex: "ZERMATT_20250130.txt")
@@ -228,18 +229,16 @@ def infer_condominio_from_filename(filename: str) -> Optional[Condominio]:
         Condominio ou None se não encontrado
     """
     try:
-        # Remove extensão e converte para maiúsculas
-        nome_arquivo = filename.upper().replace('.TXT', '').replace('.TXT', '')
-        
-        # Busca todos os condomínios
-        condominios = Condominio.query.all()
-        
-        # Procura por condomínio cujo nome esteja contido no nome do arquivo
-        for condominio in condominios:
-            if condominio.nome.upper() in nome_arquivo:
+        from app import db
+        from app.services.entity_resolver import get_entity_resolver
+
+        condominio_id = get_entity_resolver().inferir_condominio_id(filename.rsplit('.', 1)[0])
+        if condominio_id:
+            condominio = db.session.get(Condominio, condominio_id)
+            if condominio:
                 logger.info(f"Condomínio identificado: {condominio.nome} (arquivo: {filename})")
                 return condominio
-        
+
         logger.warning(f"Não foi possível identificar condomínio no arquivo: {filename}")
         return None
         
@@ -1,7 +1,9 @@
 import logging
 
-from .ronda_logic import \
-    processar_log_de_rondas  # Importa a função principal do subpacote
+from .ronda_logic import (  # Importa as funções principais do subpacote
+    analisar_log_de_rondas,
+    processar_log_de_rondas,
+)
 
 # Este logger é para o arquivo 'rondaservice.py' especificamente,
 # caso você adicione alguma lógica de fachada aqui.
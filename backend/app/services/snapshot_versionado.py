@@ -0,0 +1,100 @@
+# app/services/snapshot_versionado.py
+"""
+Snapshot em memória por processo, invalidado entre processos por uma versão
+guardada no cache da aplicação.
+
+Cada processo mantém o seu objeto carregado junto com a versão em que foi
+montado; a leitura compara com a versão no cache (uma consulta barata) e só
+recarrega quando ela mudou. A invalidação incrementa a versão com
+`inc` do backend do cache (INCR atômico no Redis), então duas invalidações
+concorrentes nunca resultam na mesma versão.
+
+Como em lookup_service, a versão só muda depois do commit: os eventos do
+ORM (`monitorar`) anotam na sessão os snapshots afetados pelo flush e a
+anotação é publicada no `after_commit` (um rollback a descarta). Publicar
+no flush deixaria outra thread recarregar o snapshot sem as linhas ainda
+não confirmadas e guardá-lo sob a versão nova.
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app import cache
+
+logger = logging.getLogger(__name__)
+
+CHAVE_SESSAO = "snapshots_alterados"
+
+
+class SnapshotVersionado:
+    """`carregar(versao)` monta o snapshot; `obter()` devolve o do processo, recarregado se a versão mudou."""
+
+    def __init__(self, chave_versao: str, carregar: Callable[[int], Any], nome: str):
+        self.chave_versao = chave_versao
+        self.nome = nome
+        self._carregar = carregar
+        self._lock = threading.Lock()
+        self._atual: Optional[Tuple[int, Any]] = None
+
+    def versao_atual(self) -> int:
+        try:
+            return cache.get(self.chave_versao) or 0
+        except Exception:
+            return 0
+
+    def invalidar(self) -> None:
+        """Incrementa a versão compartilhada e descarta o snapshot deste processo."""
+        try:
+            if cache.cache.inc(self.chave_versao) is None:
+                logger.warning(f"Cache não incrementou a versão de {self.nome}")
+        except Exception as e:
+            logger.warning(f"Não foi possível incrementar a versão de {self.nome} no cache: {e}")
+        self._atual = None
+
+    def monitorar(self, atributos_relevantes: Dict[type, Optional[Tuple[str, ...]]]) -> None:
+        """
+        Invalida após o commit de inserts/deletes nos modelos e de updates que
+        mudem um dos atributos listados (None: qualquer update).
+        """
+        for modelo, atributos in atributos_relevantes.items():
+            event.listen(modelo, "after_insert", self._anotar)
+            event.listen(modelo, "after_delete", self._anotar)
+            event.listen(modelo, "after_update", self._anotar_se_relevante(atributos))
+
+    def _anotar(self, mapper, connection, target) -> None:
+        sessao = object_session(target)
+        if sessao is not None:
+            sessao.info.setdefault(CHAVE_SESSAO, set()).add(self)
+
+    def _anotar_se_relevante(self, atributos):
+        def anotar(mapper, connection, target):
+            estado = inspect(target)
+            if atributos is None or any(estado.attrs[attr].history.has_changes() for attr in atributos):
+                self._anotar(mapper, connection, target)
+        return anotar
+
+    def obter(self):
+        versao = self.versao_atual()
+        atual = self._atual
+        if atual is not None and atual[0] == versao:
+            return atual[1]
+        with self._lock:
+            if self._atual is None or self._atual[0] != versao:
+                self._atual = (versao, self._carregar(versao))
+            return self._atual[1]
+
+
+def _publicar_alteracoes(sessao):
+    for snapshot in sessao.info.pop(CHAVE_SESSAO, ()):
+        snapshot.invalidar()
+
+
+def _descartar_alteracoes(sessao):
+    sessao.info.pop(CHAVE_SESSAO, None)
+
+
+event.listen(Session, "after_commit", _publicar_alteracoes)
+event.listen(Session, "after_rollback", _descartar_alteracoes)
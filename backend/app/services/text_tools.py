@@ -7,7 +7,6 @@ import unicodedata
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-import requests
 from flask import current_app
 from email import policy
 from email.parser import BytesParser
@@ -56,46 +55,18 @@ class LTMatch:
     rule_description: str
 
 
-def languagetool_check(text: str, language: Optional[str] = None) -> Dict[str, Any]:
+def languagetool_check(text: str, language: Optional[str] = None, incremental: bool = True) -> Dict[str, Any]:
     """Chama LanguageTool (público ou self-hosted) se configurado.
 
-    Retorna dict com lista de matches ou {'matches': []} em caso de indisponibilidade.
+    Usa o verificador do app (sessão com pool, cache por parágrafo e, no
+    modo incremental, só os parágrafos alterados vão ao servidor).
+    Retorna dict com lista de matches ou {'matches': [], 'error': ...} em caso de indisponibilidade
+    (erro de rede, status diferente de 200 ou resposta que não é JSON); falhas do cache não interrompem.
     """
-    language = language or (current_app.config.get("DEFAULT_LANGUAGE") or "pt-BR")
-    lt_base = current_app.config.get("LANGUAGE_TOOL_URL") or "https://api.languagetool.org"
-    url = lt_base.rstrip("/") + "/v2/check"
+    from app.services.languagetool_service import get_languagetool
 
-    try:
-        resp = requests.post(
-            url,
-            data={
-                "text": text,
-                "language": language,
-            },
-            timeout=8,
-        )
-        if resp.status_code != 200:
-            return {"matches": [], "error": f"LT status {resp.status_code}"}
-        data = resp.json()
-        # Normaliza estrutura de retorno
-        matches: List[Dict[str, Any]] = []
-        for m in data.get("matches", []):
-            matches.append(
-                {
-                    "message": m.get("message", ""),
-                    "shortMessage": m.get("shortMessage", ""),
-                    "offset": m.get("offset", 0),
-                    "length": m.get("length", 0),
-                    "replacements": [r.get("value") for r in m.get("replacements", [])][:5],
-                    "rule": {
-                        "id": (m.get("rule") or {}).get("id", ""),
-                        "description": (m.get("rule") or {}).get("description", ""),
-                    },
-                }
-            )
-        return {"matches": matches}
-    except Exception as e:
-        return {"matches": [], "error": str(e)}
+    language = language or (current_app.config.get("DEFAULT_LANGUAGE") or "pt-BR")
+    return get_languagetool().verificar(text, language, incremental=incremental)
 
 
 def ai_transform(text: str, mode: str = "formal", tone: Optional[str] = None, max_chars: Optional[int] = None) -> str:
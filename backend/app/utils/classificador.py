@@ -3,6 +3,9 @@ import unicodedata
 
 from app.classificador_config import MAPA_PALAVRAS_CHAVE_TIPO
 
+# Tipo usado quando nenhuma palavra-chave é encontrada
+TIPO_PADRAO = "verificação"
+
 
 def normalizar_texto(texto):
     """Remove acentuação e converte para minúsculas."""
@@ -11,17 +14,27 @@ def normalizar_texto(texto):
     return texto.lower()
 
 
-def classificar_ocorrencia(texto):
-    """
-    Retorna o tipo de ocorrência com base no texto informado.
-    Se nenhuma palavra-chave for encontrada, retorna um tipo padrão.
-    """
+# Palavras-chave normalizadas uma vez, na ordem do mapa (o primeiro tipo que casar vence)
+_PALAVRAS_CHAVE_NORMALIZADAS = [
+    (tipo, [normalizar_texto(palavra) for palavra in palavras_chave])
+    for tipo, palavras_chave in MAPA_PALAVRAS_CHAVE_TIPO.items()
+]
+
+
+def encontrar_tipo_ocorrencia(texto):
+    """Tipo da primeira palavra-chave encontrada no texto, ou None se nenhuma casar."""
     texto_normalizado = normalizar_texto(texto)
 
-    for tipo, palavras_chave in MAPA_PALAVRAS_CHAVE_TIPO.items():
+    for tipo, palavras_chave in _PALAVRAS_CHAVE_NORMALIZADAS:
         for palavra in palavras_chave:
-            if normalizar_texto(palavra) in texto_normalizado:
+            if palavra in texto_normalizado:
                 return tipo
+    return None
+
 
-    # Retorna um tipo padrão se nenhuma palavra-chave for encontrada
-    return "verificação"
+def classificar_ocorrencia(texto):
+    """
+    Retorna o tipo de ocorrência com base no texto informado.
+    Se nenhuma palavra-chave for encontrada, retorna um tipo padrão.
+    """
+    return encontrar_tipo_ocorrencia(texto) or TIPO_PADRAO
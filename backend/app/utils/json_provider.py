@@ -0,0 +1,72 @@
+# app/utils/json_provider.py
+"""
+Provider JSON do app (`app.json`): usa orjson quando instalado e cai no
+`json` da stdlib caso contrário, com a mesma saída nos dois caminhos.
+
+`jsonify`, `success_response` e afins passam a aceitar direto:
+
+- datetime/date/time -> ISO 8601 (o mesmo texto de `.isoformat()`);
+- Decimal -> número (os `func.avg` do Postgres chegam como Decimal);
+- UUID, dataclasses e objetos com `__html__` (Markup).
+
+Por isso as rotas podem devolver os campos de data sem `.isoformat()`
+linha a linha. As chaves saem na ordem de inserção (sem ordenar).
+"""
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # dependência opcional: sem ela vale o encoder da stdlib
+    orjson = None
+
+
+def _default(o):
+    """Tipos que nenhum dos dois encoders converte sozinho."""
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Objeto do tipo {type(o).__name__} não é serializável em JSON")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider do Flask com orjson no caminho quente."""
+
+    default = staticmethod(_default)
+    sort_keys = False
+
+    @property
+    def usa_orjson(self) -> bool:
+        return orjson is not None
+
+    def _opcoes(self, indentar: bool = False) -> int:
+        # OPT_NON_STR_KEYS: chaves int (ex.: mês -> total) viram texto, como na stdlib
+        opcoes = orjson.OPT_NON_STR_KEYS
+        if indentar:
+            opcoes |= orjson.OPT_INDENT_2
+        return opcoes
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Argumentos específicos da stdlib (separators, indent...) ficam com ela
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._opcoes()).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indentar = self.compact is False or (self.compact is None and self._app.debug)
+        corpo = orjson.dumps(obj, default=_default, option=self._opcoes(indentar))
+        return self._app.response_class(corpo + b"\n", mimetype=self.mimetype)
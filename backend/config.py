@@ -22,10 +22,56 @@ class Config:
     SESSION_PERMANENT = False  # Desabilita sessões permanentes para economizar DB
 
     # Controle de recursos/DB
-    USER_ACTIVITY_ENABLED = os.environ.get("USER_ACTIVITY_ENABLED", "false").lower() == "true"
+    # Presença fica em memória/Redis; o banco só recebe upserts em lote a cada PRESENCE_FLUSH_INTERVAL s
+    USER_ACTIVITY_ENABLED = os.environ.get("USER_ACTIVITY_ENABLED", "true").lower() == "true"
+    PRESENCE_FLUSH_INTERVAL = int(os.environ.get("PRESENCE_FLUSH_INTERVAL", "60"))
+    PRESENCE_MIN_UPDATE_INTERVAL = int(os.environ.get("PRESENCE_MIN_UPDATE_INTERVAL", "30"))
+    PRESENCE_EXPIRATION_MINUTES = int(os.environ.get("PRESENCE_EXPIRATION_MINUTES", "30"))
     DB_CLOSE_ON_TEARDOWN = os.environ.get("DB_CLOSE_ON_TEARDOWN", "true").lower() == "true"
     SQLALCHEMY_USE_NULLPOOL = os.environ.get("SQLALCHEMY_USE_NULLPOOL", "false").lower() == "true"
 
+    # Instrumentação de queries/latência por requisição (Server-Timing, resumo no admin, log de lentas)
+    REQUEST_METRICS_ENABLED = os.environ.get("REQUEST_METRICS_ENABLED", "false").lower() == "true"
+    REQUEST_METRICS_SLOW_MS = int(os.environ.get("REQUEST_METRICS_SLOW_MS", "1000"))
+    REQUEST_METRICS_WINDOW = int(os.environ.get("REQUEST_METRICS_WINDOW", "200"))
+    REQUEST_METRICS_SERVER_TIMING = os.environ.get("REQUEST_METRICS_SERVER_TIMING", "true").lower() == "true"
+
+    # Profiler por amostragem de pilha (armado pelo admin em Ferramentas; desarmado não custa nada)
+    PROFILER_INTERVAL_MS = int(os.environ.get("PROFILER_INTERVAL_MS", "5"))
+    PROFILER_MAX_PROFILES = int(os.environ.get("PROFILER_MAX_PROFILES", "10"))
+    PROFILER_MAX_REQUESTS = int(os.environ.get("PROFILER_MAX_REQUESTS", "50"))
+
+    # Compressão das respostas dinâmicas (br quando o pacote Brotli existe, senão gzip)
+    COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+
+    # LanguageTool do editor: público por padrão; self-hosted via LANGUAGE_TOOL_URL
+    LANGUAGE_TOOL_URL = os.environ.get("LANGUAGE_TOOL_URL", "https://api.languagetool.org")
+    LANGUAGE_TOOL_TIMEOUT = float(os.environ.get("LANGUAGE_TOOL_TIMEOUT", "8"))
+    LANGUAGE_TOOL_MAX_WORKERS = int(os.environ.get("LANGUAGE_TOOL_MAX_WORKERS", "4"))
+    LANGUAGE_TOOL_CACHE_TIMEOUT = int(os.environ.get("LANGUAGE_TOOL_CACHE_TIMEOUT", "86400"))
+    LANGUAGE_TOOL_MAX_CARACTERES = int(os.environ.get("LANGUAGE_TOOL_MAX_CARACTERES", "15000"))
+
+    # Análise de relatórios em lote (/api/analisador/processar-relatorios)
+    ANALISE_LOTE_MAX_RELATORIOS = int(os.environ.get("ANALISE_LOTE_MAX_RELATORIOS", "30"))
+    ANALISE_LOTE_TOKENS_POR_CHAMADA = int(os.environ.get("ANALISE_LOTE_TOKENS_POR_CHAMADA", "8000"))
+    ANALISE_LOTE_MAX_ITENS_POR_CHAMADA = int(os.environ.get("ANALISE_LOTE_MAX_ITENS_POR_CHAMADA", "8"))
+    ANALISE_LOTE_CONCORRENCIA = int(os.environ.get("ANALISE_LOTE_CONCORRENCIA", "3"))
+    ANALISE_LOTE_ESPERA_MAXIMA = int(os.environ.get("ANALISE_LOTE_ESPERA_MAXIMA", "30"))
+
+    # Templates de prompt da IA: cache de bytecode em disco (diretório temporário do sistema
+    # se PROMPT_TEMPLATES_CACHE_DIR não for definido); recarga automática só com DEBUG
+    PROMPT_TEMPLATES_BYTECODE_CACHE = os.environ.get("PROMPT_TEMPLATES_BYTECODE_CACHE", "true").lower() == "true"
+    PROMPT_TEMPLATES_CACHE_DIR = os.environ.get("PROMPT_TEMPLATES_CACHE_DIR")
+
+    # Fila de IA do modo assíncrono: threads próprias (fora das threads do gunicorn),
+    # limite de jobs pendentes por processo e validade do estado do job no cache
+    FILA_IA_WORKERS = int(os.environ.get("FILA_IA_WORKERS", "2"))
+    FILA_IA_MAX_PENDENTES = int(os.environ.get("FILA_IA_MAX_PENDENTES", "20"))
+    FILA_IA_JOB_TTL = int(os.environ.get("FILA_IA_JOB_TTL", "900"))
+
     # Fuso horário padrão da aplicação
     DEFAULT_TIMEZONE = os.environ.get("DEFAULT_TIMEZONE", "America/Sao_Paulo")
 
@@ -36,6 +82,13 @@ class Config:
     # Timeout de inatividade (minutos) para logout forçado - REDUZIDO para economizar DB
     INACTIVITY_TIMEOUT_MIN = int(os.environ.get("INACTIVITY_TIMEOUT_MIN", "60"))
 
+    # Tempo (s) que o snapshot do usuário do JWT fica em cache entre requisições da API
+    JWT_IDENTITY_CACHE_TIMEOUT = int(os.environ.get("JWT_IDENTITY_CACHE_TIMEOUT", "60"))
+
+    # Listas de apoio (lookups): payload em cache por versão das tabelas e revalidação por ETag
+    LOOKUP_CACHE_TIMEOUT = int(os.environ.get("LOOKUP_CACHE_TIMEOUT", "3600"))
+    LOOKUP_CACHE_CONTROL = os.environ.get("LOOKUP_CACHE_CONTROL", "private, no-cache")
+
     # Configuração do Redis - suporta tanto REDIS_URL quanto CACHE_REDIS_URL
     REDIS_URL = os.environ.get("REDIS_URL") or os.environ.get("CACHE_REDIS_URL")
     if REDIS_URL:
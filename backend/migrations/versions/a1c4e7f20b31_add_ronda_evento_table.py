@@ -0,0 +1,43 @@
+"""add_ronda_evento_table
+
+Revision ID: a1c4e7f20b31
+Revises: 26266299674d
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c4e7f20b31'
+down_revision = '26266299674d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Uma linha por ronda pareada (início/término) extraída do log da Ronda
+    op.create_table('ronda_evento',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ronda_id', sa.Integer(), nullable=False),
+    sa.Column('vtr', sa.String(length=30), nullable=True),
+    sa.Column('inicio', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('termino', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('duracao_min', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.ForeignKeyConstraint(['ronda_id'], ['ronda.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ronda_evento_ronda_id', 'ronda_evento', ['ronda_id'], unique=False)
+    op.create_index('ix_ronda_evento_vtr', 'ronda_evento', ['vtr'], unique=False)
+    op.create_index('ix_ronda_evento_inicio', 'ronda_evento', ['inicio'], unique=False)
+    op.create_index('ix_ronda_evento_status', 'ronda_evento', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_ronda_evento_status', table_name='ronda_evento')
+    op.drop_index('ix_ronda_evento_inicio', table_name='ronda_evento')
+    op.drop_index('ix_ronda_evento_vtr', table_name='ronda_evento')
+    op.drop_index('ix_ronda_evento_ronda_id', table_name='ronda_evento')
+    op.drop_table('ronda_evento')
@@ -0,0 +1,45 @@
+"""add_unique_ronda_condominio_data_turno
+
+Revision ID: b7d2f9a4c610
+Revises: a1c4e7f20b31
+Create Date: 2026-10-19 10:03:17.552091
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f9a4c610'
+down_revision = 'a1c4e7f20b31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Chave usada pelo upsert em lote (INSERT ... ON CONFLICT) de rondas.
+    # O salvamento já fazia merge por esta chave, mas sem garantia no banco.
+    conn = op.get_bind()
+    duplicadas = conn.execute(sa.text(
+        """
+        SELECT condominio_id, data_plantao_ronda, turno_ronda, COUNT(*)
+        FROM ronda
+        GROUP BY condominio_id, data_plantao_ronda, turno_ronda
+        HAVING COUNT(*) > 1
+        """
+    )).fetchall()
+    if duplicadas:
+        raise RuntimeError(
+            f"Existem {len(duplicadas)} combinações duplicadas de (condominio_id, data_plantao_ronda, "
+            "turno_ronda) na tabela ronda. Mescle-as antes de aplicar esta migração."
+        )
+    with op.batch_alter_table('ronda', schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_ronda_condominio_data_turno',
+            ['condominio_id', 'data_plantao_ronda', 'turno_ronda']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('ronda', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_ronda_condominio_data_turno', type_='unique')
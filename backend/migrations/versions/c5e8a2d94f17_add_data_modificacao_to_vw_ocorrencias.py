@@ -0,0 +1,51 @@
+"""add data_modificacao to vw_ocorrencias_detalhadas
+
+Revision ID: c5e8a2d94f17
+Revises: b7d2f9a4c610
+Create Date: 2026-10-19 16:02:41.318204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e8a2d94f17'
+down_revision = 'b7d2f9a4c610'
+branch_labels = None
+depends_on = None
+
+
+VIEW_COLUNAS = """
+        o.id,
+        o.data_hora_ocorrencia,
+        o.status,
+        o.turno,
+        o.endereco_especifico,
+        t.nome AS tipo,
+        c.nome AS condominio,
+        u.username AS registrado_por,
+        s.username AS supervisor,
+        o.relatorio_final{extra}
+"""
+
+VIEW_DEFINICAO = """
+    CREATE VIEW vw_ocorrencias_detalhadas AS
+    SELECT {colunas}
+    FROM
+        ocorrencia o
+    LEFT JOIN ocorrencia_tipo t ON o.ocorrencia_tipo_id = t.id
+    LEFT JOIN condominio c ON o.condominio_id = c.id
+    LEFT JOIN "user" u ON o.registrado_por_user_id = u.id
+    LEFT JOIN "user" s ON o.supervisor_id = s.id;
+"""
+
+
+def upgrade():
+    # data_modificacao permite calcular o tempo de resolução direto da view
+    op.execute("DROP VIEW IF EXISTS vw_ocorrencias_detalhadas;")
+    op.execute(VIEW_DEFINICAO.format(colunas=VIEW_COLUNAS.format(extra=",\n        o.data_modificacao")))
+
+
+def downgrade():
+    op.execute("DROP VIEW IF EXISTS vw_ocorrencias_detalhadas;")
+    op.execute(VIEW_DEFINICAO.format(colunas=VIEW_COLUNAS.format(extra="")))
@@ -0,0 +1,84 @@
+"""add busca textual em ocorrencias e colaboradores
+
+Revision ID: d3a7c1f9e2b4
+Revises: c5e8a2d94f17
+Create Date: 2026-10-19 18:21:07.402113
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7c1f9e2b4'
+down_revision = 'c5e8a2d94f17'
+branch_labels = None
+depends_on = None
+
+
+# As expressões dos índices Postgres precisam ser idênticas às de app/services/busca_service.py
+# (no SQLite o DDL das tabelas FTS5 vem do próprio busca_service)
+POSTGRES_PREPARACAO = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # unaccent() é STABLE; o wrapper IMMUTABLE permite usá-la em índice de expressão
+    """
+    CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """,
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portuguese_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+            ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+        END IF;
+    END
+    $$
+    """,
+]
+
+POSTGRES_INDICES = [
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ocorrencia_relatorio_fts ON ocorrencia
+    USING gin (to_tsvector('portuguese_unaccent'::regconfig, coalesce(relatorio_final, '')))
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_colaborador_nome_trgm ON colaborador
+    USING gin (f_unaccent(lower(nome_completo)) gin_trgm_ops)
+    """,
+]
+
+
+def upgrade():
+    dialeto = op.get_bind().dialect.name
+    if dialeto == 'postgresql':
+        for comando in POSTGRES_PREPARACAO:
+            op.execute(comando)
+        # CONCURRENTLY não bloqueia escritas em tabelas grandes, mas não roda dentro de transação
+        with op.get_context().autocommit_block():
+            for comando in POSTGRES_INDICES:
+                op.execute(comando)
+    elif dialeto == 'sqlite':
+        from app.services.busca_service import FTS_COLABORADOR, FTS_OCORRENCIA
+
+        for comando in FTS_OCORRENCIA.ddl() + FTS_COLABORADOR.ddl():
+            op.execute(comando)
+
+
+def downgrade():
+    dialeto = op.get_bind().dialect.name
+    if dialeto == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_colaborador_nome_trgm")
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_ocorrencia_relatorio_fts")
+        op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent")
+        op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
+    elif dialeto == 'sqlite':
+        from app.services.busca_service import FTS_COLABORADOR, FTS_OCORRENCIA
+
+        for indice in (FTS_OCORRENCIA, FTS_COLABORADOR):
+            for sufixo in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {indice.nome}_{sufixo}")
+            op.execute(f"DROP TABLE IF EXISTS {indice.nome}")
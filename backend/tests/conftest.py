@@ -10,7 +10,7 @@ BACKEND_DIR = os.path.join(PROJECT_ROOT, 'backend')
 if BACKEND_DIR not in sys.path:
     sys.path.insert(0, BACKEND_DIR)
 
-from app import create_app, db as _db
+from app import create_app, cache, db as _db
 from app.models import Condominio, Ronda, User
 from config import TestingConfig
 
@@ -30,6 +30,8 @@ def db(app):
         # Garante que a sessão seja fechada e o banco de dados limpo
         _db.session.close()
         _db.drop_all()
+        # Ids são reaproveitados entre testes; snapshots em cache (ex.: identidade JWT) não podem vazar
+        cache.clear()
 
 @pytest.fixture(scope='function')
 def client(app, db): # Adicionamos a dependência 'db' para garantir a ordem
@@ -0,0 +1,94 @@
+# tests/services/test_analise_lote_service.py
+import json
+import threading
+
+from flask_jwt_extended import create_access_token
+
+from app.models.processing_history import ProcessingHistory
+from app.services.analise_lote_service import AnaliseLoteService, empacotar_itens, separar_resposta
+
+MARCADOR_LOTE = "**RELATÓRIOS BRUTOS (JSON):**"
+
+
+def test_empacota_por_orcamento_de_tokens_e_separa_a_resposta():
+    itens = [{"id": i, "relatorio_bruto": "x" * tamanho} for i, tamanho in enumerate([100, 100, 100, 2000, 50], start=1)]
+    lotes = empacotar_itens(itens, tokens_por_chamada=300, max_itens=2)
+    assert [[item["id"] for item in lote] for lote in lotes] == [[1, 2], [3], [4], [5]]
+
+    resposta = '```json\n[{"id": "1", "relatorio_processado": " Data: 01/07 "}, {"id": 2, "relatorio_processado": ""}]\n```'
+    assert separar_resposta(resposta) == {"1": "Data: 01/07"}
+
+
+def test_lote_via_api_com_itens_reprocessados_e_historico_em_lote(app, client, db, admin_user, monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY_1", "chave-de-teste")
+    monkeypatch.setitem(app.config, "ANALISE_LOTE_MAX_ITENS_POR_CHAMADA", 2)
+    prompts, threads = [], set()
+
+    def gemini_falso(self, prompt):
+        prompts.append(prompt)
+        threads.add(threading.get_ident())
+        if MARCADOR_LOTE in prompt:
+            itens = json.loads(prompt.split(MARCADOR_LOTE, 1)[1])
+            return json.dumps([
+                {"id": str(item["id"]), "relatorio_processado": f"Data: lote {item['relatorio_bruto']}"}
+                for item in itens if "omitido" not in item["relatorio_bruto"]
+            ])
+        return "Data: individual"
+
+    monkeypatch.setattr(AnaliseLoteService, "_call_generative_model", gemini_falso)
+    headers = {"Authorization": f"Bearer {create_access_token(identity=admin_user.id)}"}
+    relatorios = [
+        "Furto de bicicleta no bloco 3",
+        {"id": "r-2", "relatorio_bruto": "Portão aberto, omitido pela IA"},
+        "Barulho no salão de festas",
+        "Veículo suspeito na portaria",
+        "Pane na cancela",
+    ]
+
+    resposta = client.post("/api/analisador/processar-relatorios", json={"relatorios": relatorios}, headers=headers)
+    assert resposta.status_code == 200
+    dados = resposta.get_json()
+    assert [r["id"] for r in dados["resultados"]] == [1, "r-2", 3, 4, 5]
+    assert [r["relatorio_processado"] for r in dados["resultados"]] == [
+        "Data: lote Furto de bicicleta no bloco 3",
+        "Data: individual",  # faltou na resposta do lote: refeito com o prompt individual
+        "Data: lote Barulho no salão de festas",
+        "Data: lote Veículo suspeito na portaria",
+        "Data: individual",  # lote de um item só usa o prompt individual
+    ]
+    assert all(r["sucesso"] and r["classificacao"] for r in dados["resultados"])
+    assert dados["resumo"] == {"total": 5, "sucesso": 5, "falhas": 0, "lotes": 3}
+    assert len(prompts) == 4 and sum(MARCADOR_LOTE in p for p in prompts) == 2
+    assert threading.get_ident() not in threads
+    assert ProcessingHistory.query.filter_by(user_id=admin_user.id, success=True).count() == 5
+
+    assert client.post("/api/analisador/processar-relatorios", json={"relatorios": []}, headers=headers).status_code == 400
+    assert client.post("/api/analisador/processar-relatorios", json={"relatorios": ["ok", "  "]}, headers=headers).status_code == 400
+
+
+def test_chamada_gemini_usa_o_cliente_da_propria_key(app, monkeypatch):
+    from unittest.mock import patch
+
+    import google.ai.generativelanguage as glm
+
+    from app import cache
+    from app.services.base_generative_service import _cliente_gemini
+
+    monkeypatch.setenv("GOOGLE_API_KEY_1", "chave-1")
+    monkeypatch.delenv("GOOGLE_API_KEY_2", raising=False)
+    assert _cliente_gemini("chave-1") is _cliente_gemini("chave-1")
+    assert _cliente_gemini("chave-1") is not _cliente_gemini("chave-2")
+
+    with app.app_context():
+        cache.clear()
+        service = AnaliseLoteService()
+        resposta = glm.GenerateContentResponse(candidates=[
+            glm.Candidate(content=glm.Content(parts=[glm.Part(text="Data: ok")]))
+        ])
+        with patch.object(_cliente_gemini("chave-1"), "generate_content", return_value=resposta) as gerar, \
+             patch("google.generativeai.configure") as configure:
+            assert service._call_generative_model("prompt com key presa") == "Data: ok"
+        configure.assert_not_called()  # nenhuma troca global de API key
+        requisicao = gerar.call_args.args[0]
+        assert requisicao.model == f"models/{service.model_name}"
+        assert requisicao.contents[0].parts[0].text == "prompt com key presa"
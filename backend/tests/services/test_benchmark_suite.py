@@ -0,0 +1,49 @@
+# tests/services/test_benchmark_suite.py
+from app.services.benchmark import (
+    carregar_baseline,
+    comparar_com_baseline,
+    executar_suite,
+    gerar_log_whatsapp,
+    gerar_planilha_rondas,
+    salvar_baseline,
+)
+from app.services.excel_processor import ExcelProcessor
+from app.services.ronda_logic import analisar_log_de_rondas
+
+
+def test_corpus_e_deterministico_e_cruza_a_meia_noite(tmp_path):
+    log = gerar_log_whatsapp(500, seed=7)
+    assert log == gerar_log_whatsapp(500, seed=7)
+    assert log != gerar_log_whatsapp(500, seed=8)
+    assert len(log.split("\n")) == 500
+
+    resultado = analisar_log_de_rondas(log, "Residencial", "01/07/2025", "18h às 06h")
+    assert resultado["total_rondas"] > 50
+    assert resultado["primeiro_evento_dt"].day == 1
+    assert resultado["ultimo_evento_dt"].day == 2
+
+    planilha = ExcelProcessor.parse_excel_file(gerar_planilha_rondas(str(tmp_path / "r.xlsx"), 200))
+    assert planilha["success"] and planilha["escala_plantao"] == "18h às 06h"
+    assert sum(len(rondas) for rondas in planilha["condominios"].values()) > 100
+
+
+def test_suite_compara_com_baseline(app, db, tmp_path):
+    with app.app_context():
+        resultados = executar_suite(tamanhos=[60], repeticoes=1)
+    assert set(resultados) == {
+        "processar_log_de_rondas@60",
+        "processar_log_de_paradas@60",
+        "excel_parse_excel_file@60",
+        "classificar_ocorrencia@60",
+        "ocorrencia_extrair_dados_relatorio@60",
+    }
+
+    caminho = str(tmp_path / "baseline.json")
+    baseline = salvar_baseline(caminho, resultados)
+    assert carregar_baseline(caminho) == baseline
+    assert comparar_com_baseline(resultados, baseline, limite=0.25) == []
+
+    mais_lento = {chave: dict(r, segundos=r["segundos"] * 2) for chave, r in resultados.items()}
+    regressoes = comparar_com_baseline(mais_lento, baseline, limite=0.25)
+    assert len(regressoes) == len(resultados)
+    assert all(abs(r["variacao"] - 1.0) < 1e-6 for r in regressoes)
@@ -0,0 +1,91 @@
+# tests/services/test_busca_service.py
+from datetime import datetime, timezone
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy.dialects import postgresql
+
+from app.models import Colaborador, Condominio, Ocorrencia, OcorrenciaTipo
+from app.services import busca_service
+from app.services.busca_service import consulta_fts5, consulta_tsquery_pg, filtrar_colaboradores_por_nome
+from app.services.ocorrencia_service import apply_ocorrencia_filters
+
+
+def test_busca_de_ocorrencias_ranqueada_com_trecho_destacado(client, db, admin_user):
+    tipo = OcorrenciaTipo(nome="Vandalismo")
+    alpha, beta = Condominio(nome="Residencial Alpha"), Condominio(nome="Residencial Beta")
+    db.session.add_all([tipo, alpha, beta])
+    db.session.flush()
+
+    def ocorrencia(texto, condominio, dia):
+        return Ocorrencia(
+            relatorio_final=texto, condominio_id=condominio.id, ocorrencia_tipo_id=tipo.id,
+            registrado_por_user_id=admin_user.id, data_hora_ocorrencia=datetime(2024, 3, dia, tzinfo=timezone.utc),
+        )
+
+    forte = ocorrencia("Pichação no portão. Nova PICHAÇÃO <script> no muro dos fundos.", alpha, 1)
+    fraca = ocorrencia("Ronda sem alterações; pichacao antiga já registrada.", beta, 2)
+    outra = ocorrencia("Portão eletrônico travado.", alpha, 3)
+    db.session.add_all([forte, fraca, outra])
+    db.session.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token(identity=admin_user.id)}"}
+    resposta = client.get("/api/ocorrencias/busca?q=pichacao", headers=headers)
+    assert resposta.status_code == 200
+    dados = resposta.get_json()["data"]
+    assert [r["id"] for r in dados["resultados"]] == [forte.id, fraca.id]  # sem acento, mais ocorrências primeiro
+    trecho = dados["resultados"][0]["trecho"]
+    assert "<mark>Pichação</mark>" in trecho and "&lt;script&gt;" in trecho
+    assert dados["pagination"]["has_next"] is False
+
+    filtrada = client.get(f"/api/ocorrencias/busca?q=pichação&condominio_id={beta.id}", headers=headers)
+    assert [r["id"] for r in filtrada.get_json()["data"]["resultados"]] == [fraca.id]
+    assert client.get("/api/ocorrencias/busca?q=", headers=headers).status_code == 400
+
+    # O filtro texto_relatorio das listagens usa o mesmo índice
+    query = apply_ocorrencia_filters(Ocorrencia.query, {"texto_relatorio": "portao"})
+    assert {o.id for o in query} == {forte.id, outra.id}
+
+    # Índice acompanha UPDATE e DELETE
+    outra.relatorio_final = "Pichação recente no portão lateral."
+    db.session.delete(fraca)
+    db.session.commit()
+    ids = [r["id"] for r in client.get("/api/ocorrencias/busca?q=pichacao", headers=headers).get_json()["data"]["resultados"]]
+    assert sorted(ids) == sorted([forte.id, outra.id])
+
+
+def test_busca_de_colaboradores_ignora_acentos(db):
+    db.session.add_all([
+        Colaborador(nome_completo="José Antônio Silva", cargo="Agente"),
+        Colaborador(nome_completo="Joselito Souza", cargo="Agente"),
+        Colaborador(nome_completo="Maria Antonia", cargo="Agente"),
+    ])
+    db.session.commit()
+
+    nomes = lambda termo: {c.nome_completo for c in filtrar_colaboradores_por_nome(Colaborador.query, termo)}
+    assert nomes("jose") == {"José Antônio Silva", "Joselito Souza"}
+    assert nomes("ANTONIO silva") == {"José Antônio Silva"}
+    assert nomes("anton") == {"José Antônio Silva", "Maria Antonia"}
+    assert nomes("100%") == set()
+
+
+def _sql_postgres(expressao):
+    return str(expressao.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_consulta_postgres_usa_os_mesmos_termos_prefixo_do_fts5(app, db, monkeypatch):
+    assert consulta_fts5("pich, port!") == '"pich"* "port"*'
+    assert consulta_tsquery_pg("pich, port!") == "pich:* & port:*"
+    assert consulta_tsquery_pg(" ?! ") is None
+
+    monkeypatch.setattr(busca_service, "_dialeto", lambda: "postgresql")
+    condicao = _sql_postgres(
+        busca_service.condicao_texto_relatorio(Ocorrencia.relatorio_final, Ocorrencia.id, "Pichação portão")
+    )
+    assert condicao == (
+        "to_tsvector('portuguese_unaccent'::regconfig, coalesce(ocorrencia.relatorio_final, '')) "
+        "@@ to_tsquery('portuguese_unaccent'::regconfig, 'Pichação:* & portão:*')"
+    )
+
+    filtro = _sql_postgres(filtrar_colaboradores_por_nome(db.session.query(Colaborador.id), "silva joão").statement)
+    assert filtro.count("LIKE ('%%' || f_unaccent(lower(") == 2
+    assert "'silva'" in filtro and "'joão'" in filtro and "similarity(" in filtro
@@ -0,0 +1,54 @@
+# tests/services/test_calendario_escala.py
+from datetime import date, timedelta
+
+from app.models import EscalaMensal
+from app.services.calendario_escala import (
+    contar_dias_com_paridade,
+    get_calendario_escala,
+    mascara_turnos,
+)
+
+
+def _dias_por_loop(inicio, fim, paridade_por_mes):
+    """Referência dia a dia (o algoritmo antigo), com a paridade de cada mês."""
+    total, dia = 0, inicio
+    while dia <= fim:
+        paridades = paridade_por_mes.get((dia.year, dia.month), set())
+        if ("Par" if dia.day % 2 == 0 else "Impar") in paridades:
+            total += 1
+        dia += timedelta(days=1)
+    return total
+
+
+def test_mascaras_equivalem_ao_loop_dia_a_dia():
+    assert mascara_turnos(2025, 2, ["Diurno Par"]) == sum(1 << (d - 1) for d in range(2, 29, 2))
+    assert mascara_turnos(2025, 1, ["Noturno Impar", "Diurno Par"]) == (1 << 31) - 1
+
+    inicio = date(2024, 12, 20)
+    for deslocamento in (0, 11, 40, 75):
+        fim = inicio + timedelta(days=deslocamento)
+        for paridade in ("Par", "Impar"):
+            todos_os_meses = {(d.year, d.month): {paridade} for d in (inicio + timedelta(days=i) for i in range(deslocamento + 1))}
+            assert contar_dias_com_paridade(inicio, fim, paridade) == _dias_por_loop(inicio, fim, todos_os_meses)
+
+
+def test_calendario_usa_a_escala_de_cada_mes_e_invalida(app, db, test_user, admin_user):
+    db.session.add_all([
+        EscalaMensal(ano=2025, mes=1, nome_turno="Diurno Par", supervisor_id=test_user.id),
+        EscalaMensal(ano=2025, mes=2, nome_turno="Noturno Impar", supervisor_id=test_user.id),
+        EscalaMensal(ano=2025, mes=2, nome_turno="Diurno Par", supervisor_id=admin_user.id),
+    ])
+    db.session.commit()
+
+    calendario = get_calendario_escala()
+    inicio, fim = date(2025, 1, 20), date(2025, 2, 10)
+    esperado = _dias_por_loop(inicio, fim, {(2025, 1): {"Par"}, (2025, 2): {"Impar"}})
+    assert calendario.dias_trabalhados(test_user.id, inicio, fim) == esperado == 11
+    assert calendario.dias_trabalhados(admin_user.id, inicio, fim) == 5
+    assert get_calendario_escala() is calendario
+
+    db.session.add(EscalaMensal(ano=2025, mes=1, nome_turno="Noturno Par", supervisor_id=admin_user.id))
+    db.session.commit()
+    novo = get_calendario_escala()
+    assert novo is not calendario
+    assert novo.dias_trabalhados(admin_user.id, inicio, fim) == 6 + 5
@@ -0,0 +1,72 @@
+# tests/services/test_compressao_service.py
+import gzip
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import brotli
+from flask_jwt_extended import create_access_token
+
+from app.models import Condominio
+from app.utils import json_provider
+
+
+def test_provider_serializa_datas_decimal_e_chaves_int_nos_dois_encoders(app, monkeypatch):
+    identificador = uuid.uuid4()
+    dados = {
+        "criado": datetime(2025, 7, 1, 18, 30, 5, 120000, tzinfo=timezone.utc),
+        "plantao": date(2025, 7, 1),
+        "media": Decimal("12.5"),
+        "id": identificador,
+        "por_mes": {1: 10, 2: 0},
+        "nome": "São José",
+    }
+    esperado = {
+        "criado": "2025-07-01T18:30:05.120000+00:00",
+        "plantao": "2025-07-01",
+        "media": 12.5,
+        "id": str(identificador),
+        "por_mes": {"1": 10, "2": 0},
+        "nome": "São José",
+    }
+    with app.app_context():
+        assert app.json.usa_orjson
+        assert json.loads(app.json.dumps(dados)) == esperado
+        assert json.loads(app.json.response(dados).get_data()) == esperado
+
+        monkeypatch.setattr(json_provider, "orjson", None)
+        assert json.loads(app.json.dumps(dados)) == esperado
+        assert json.loads(app.json.response(dados).get_data()) == esperado
+
+
+def test_compressao_negociada_acima_do_limite(client, db, admin_user):
+    db.session.add_all([Condominio(nome=f"Residencial {i:03d}") for i in range(80)])
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=admin_user.id)}"}
+    url = "/api/lookups?incluir=condominios"
+
+    simples = client.get(url, headers=headers)
+    assert "Content-Encoding" not in simples.headers
+    assert "Accept-Encoding" in simples.headers["Vary"]
+    original = simples.get_data()
+
+    com_gzip = client.get(url, headers={**headers, "Accept-Encoding": "gzip, deflate"})
+    assert com_gzip.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(com_gzip.get_data()) == original
+    assert int(com_gzip.headers["Content-Length"]) < len(original) / 3
+
+    com_br = client.get(url, headers={**headers, "Accept-Encoding": "gzip;q=0.5, br"})
+    assert com_br.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(com_br.get_data()) == original
+
+    # Corpo comprimido leva ETag fraco, e a revalidação com ele continua dando 304
+    etag = com_br.headers["ETag"]
+    assert etag == f"W/{simples.headers['ETag']}"
+    revalidada = client.get(url, headers={**headers, "Accept-Encoding": "br", "If-None-Match": etag})
+    assert revalidada.status_code == 304
+
+    pequena = client.get("/api/lookups?incluir=status_ronda", headers={**headers, "Accept-Encoding": "br"})
+    assert len(pequena.get_data()) < 1024 and "Content-Encoding" not in pequena.headers
+    recusada = client.get(url, headers={**headers, "Accept-Encoding": "identity, gzip;q=0"})
+    assert "Content-Encoding" not in recusada.headers
@@ -0,0 +1,82 @@
+# tests/services/test_container_servicos.py
+import pytest
+
+from app.services.consolidated_report_service import ConsolidatedReportService
+from app.services.container_servicos import ContainerServicos, get_container, get_servico
+from app.services.justificativa_service import JustificativaAtestadoService
+from app.services.patrimonial_report_service import PatrimonialReportService
+
+
+@pytest.fixture
+def container(app):
+    container = get_container(app)
+    container.limpar()
+    yield container
+    container.limpar()
+
+
+def test_servico_unico_por_app_com_environment_compartilhado(app, container, monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY_1", "chave-de-teste")
+    with app.app_context():
+        patrimonial = get_servico(PatrimonialReportService)
+        assert get_servico(PatrimonialReportService) is patrimonial
+        justificativa = get_servico(JustificativaAtestadoService)
+        consolidado = get_servico(ConsolidatedReportService)
+
+        # Um Environment só, com o cache de bytecode; sem recarga fora do DEBUG
+        ambiente = container.ambiente_prompts
+        assert patrimonial._template.environment is ambiente
+        assert justificativa._template.environment is ambiente
+        assert ambiente.bytecode_cache is not None and not ambiente.auto_reload
+        # O consolidado continua sem autoescape, os demais com
+        assert "a < b" in consolidado._template.render(dados_brutos="a < b")
+    assert consolidado._template.render(dados_brutos="a < b") == ConsolidatedReportService()._template.render(dados_brutos="a < b")
+    assert ambiente.autoescape("justificativa_atestado_medico_template.txt")
+    assert not ambiente.autoescape("daily_consolidated_report_template.txt")
+
+
+def test_rotas_reaproveitam_a_instancia_e_falha_nao_fica_guardada(app, client, admin_user, container, monkeypatch):
+    monkeypatch.delenv("GOOGLE_API_KEY_1", raising=False)
+    monkeypatch.delenv("GOOGLE_API_KEY_2", raising=False)
+    with app.app_context(), pytest.raises(RuntimeError):
+        get_servico(ConsolidatedReportService)
+    assert ConsolidatedReportService not in container._instancias
+
+    monkeypatch.setenv("GOOGLE_API_KEY_1", "chave-de-teste")
+    monkeypatch.setattr(ConsolidatedReportService, "_call_generative_model", lambda self, prompt: "Consolidado")
+    with client.session_transaction() as sessao:
+        sessao["_user_id"] = str(admin_user.id)
+        sessao["_fresh"] = True
+    for _ in range(3):
+        resposta = client.post("/api/text/consolidate", json={"dados_brutos": "Ronda 1\nRonda 2"})
+        assert resposta.get_json() == {"consolidated": "Consolidado"}
+    assert container.construcoes["ConsolidatedReportService"] == 1
+
+
+def test_recarga_de_templates_so_em_desenvolvimento(app, monkeypatch):
+    monkeypatch.setattr(app, "debug", True)
+    assert ContainerServicos(app).ambiente_prompts.auto_reload
+
+
+def test_template_editado_e_recarregado_em_desenvolvimento(app, tmp_path, monkeypatch):
+    import os
+    import shutil
+
+    from app.services import container_servicos
+
+    shutil.copytree(container_servicos.DIRETORIO_PROMPTS, tmp_path, dirs_exist_ok=True)
+    monkeypatch.setattr(container_servicos, "DIRETORIO_PROMPTS", str(tmp_path))
+    monkeypatch.setattr(app, "debug", True)
+    monkeypatch.setitem(app.extensions, "servicos", ContainerServicos(app))
+    monkeypatch.setenv("GOOGLE_API_KEY_1", "chave-de-teste")
+    arquivo = tmp_path / "justificativa_atestado_medico_template.txt"
+
+    with app.app_context():
+        servico = get_servico(JustificativaAtestadoService)
+        assert "VERSÃO EDITADA" not in servico._construir_prompt({})
+
+        arquivo.write_text("VERSÃO EDITADA {{ nome_colaborador }}", encoding="utf-8")
+        mtime = os.path.getmtime(arquivo) + 5
+        os.utime(arquivo, (mtime, mtime))  # garante mtime diferente mesmo no mesmo segundo
+        assert get_servico(JustificativaAtestadoService) is servico
+        assert servico._construir_prompt({"nome_colaborador": "Ana"}) == "VERSÃO EDITADA Ana"
@@ -0,0 +1,73 @@
+# tests/services/test_dados_referencia.py
+import random
+
+from sqlalchemy import event
+
+from app.models import Colaborador, Condominio, OcorrenciaTipo
+from app.services.dados_referencia import AutomatoPadroes, dobrar_texto, get_dados_referencia
+from app.services.ocorrencia_parser import OcorrenciaParser
+
+
+def test_automato_encontra_as_mesmas_ocorrencias_que_a_busca_ingenua():
+    assert dobrar_texto("São JOSÉ, Águia 04") == "sao jose, aguia 04"
+
+    rnd = random.Random(41)
+    padroes = sorted({"".join(rnd.choice("abc ") for _ in range(rnd.randint(1, 5))) for _ in range(40)})
+    automato = AutomatoPadroes()
+    for padrao in padroes:
+        automato.adicionar(padrao, padrao)
+    automato.compilar()
+
+    for _ in range(50):
+        texto = "".join(rnd.choice("abcd ") for _ in range(80))
+        esperado = sorted(
+            (i, i + len(p), p) for p in padroes for i in range(len(texto)) if texto.startswith(p, i)
+        )
+        assert sorted(automato.buscar(texto)) == esperado
+
+
+def test_extracao_usa_o_snapshot_sem_queries(app, db):
+    db.session.add_all([
+        OcorrenciaTipo(nome="Verificação"),
+        OcorrenciaTipo(nome="Vandalismo"),
+        Colaborador(nome_completo="José Antônio Silva", cargo="Agente"),
+        Colaborador(nome_completo="Maria Souza", cargo="Agente"),
+        Condominio(nome="Residencial Alpha"),
+        Condominio(nome="Residencial Alpha II"),
+    ])
+    db.session.commit()
+    tipos = {t.nome: t.id for t in OcorrenciaTipo.query.all()}
+    jose = Colaborador.query.filter_by(nome_completo="José Antônio Silva").one()
+    alpha_ii = Condominio.query.filter_by(nome="Residencial Alpha II").one()
+
+    texto = (
+        "Data: 10/01/2025\nHora: 22:15\nLocal: Rua das Flores, 10\n"
+        "Portão pichado e vidro QUEBRADO no RESIDENCIAL ALPHA II. "
+        "Responsável pelo registro: Agente Jose Antonio Silva.\n"
+        "A equipe permaneceu no local até a chegada do síndico, que acompanhou a vistoria das áreas comuns.\n"
+        "A moradora Maria Souza relatou o ocorrido."
+    )
+    get_dados_referencia()  # aquece o snapshot
+
+    statements = []
+    engine = db.engine
+    contar = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        dados = OcorrenciaParser.extrair_dados_relatorio(texto)
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+
+    assert statements == []
+    assert dados["ocorrencia_tipo_id"] == tipos["Vandalismo"]  # "pichado" não, "quebrado" sim
+    assert dados["colaboradores_envolvidos"] == [jose.id]  # Maria aparece como moradora
+    assert dados["condominio_id"] == alpha_ii.id  # o nome mais específico
+    assert dados["turno"] == "Noturno"
+
+    snapshot = get_dados_referencia()
+    db.session.add(Condominio(nome="Condomínio Beta"))
+    db.session.commit()
+    assert get_dados_referencia() is not snapshot
+    beta = OcorrenciaParser.extrair_dados_relatorio("Verificação de rotina no condominio beta.")
+    assert beta["condominio_id"] == Condominio.query.filter_by(nome="Condomínio Beta").one().id
+    assert beta["ocorrencia_tipo_id"] == tipos["Verificação"]
@@ -0,0 +1,33 @@
+# tests/services/test_entity_resolver.py
+from app.services.entity_resolver import EntityResolver, IndiceNomes, normalizar_nome
+
+
+def test_normalizar_nome_remove_acentos_e_pontuacao():
+    assert normalizar_nome("Residencial São José - Fase II") == "residencial sao jose fase ii"
+    assert normalizar_nome("  ÁGUAS_CLARAS ") == "aguas claras"
+    assert normalizar_nome(None) == ""
+
+
+def test_indice_resolve_exato_contido_e_fuzzy():
+    indice = IndiceNomes([(1, "Luis Royo"), (2, "Carlos Silva"), (3, "Luís")])
+
+    assert indice.resolver("LUIS ROYO") == 1
+    assert indice.resolver("luis") == 3
+    assert indice.resolver("Carlos") == 2
+    assert indice.resolver("Carlos Silv") == 2
+    assert indice.resolver("Fulano") is None
+
+
+def test_resolver_condominio_exige_match_exato_e_infere_pelo_arquivo():
+    resolver = EntityResolver(
+        supervisores=[],
+        condominios=[(10, "Zermatt"), (11, "Vale Verde"), (12, "Vale Verde II")],
+    )
+
+    assert resolver.resolver_condominio_id("ZERMATT") == 10
+    assert resolver.resolver_condominio_id("Zermat") is None
+    assert resolver.inferir_condominio_id("VALE_VERDE_II_20250130") == 12
+    assert resolver.inferir_condominio_id("ZERMATT20250130") == 10
+
+    resolver.registrar_condominio(13, "Água Branca")
+    assert resolver.resolver_condominio_id("agua branca") == 13
@@ -0,0 +1,29 @@
+# tests/services/test_event_matcher.py
+from app.services.event_matcher import comparar_com_busca_sequencial, gerar_mensagens_sinteticas
+from app.services.parada_logic import config as parada_config
+from app.services.ronda_logic import config as ronda_config
+from app.services.ronda_logic.parser import extrair_eventos_de_mensagem_simples
+
+
+def test_matcher_equivale_a_busca_sequencial_em_ronda_e_parada():
+    mensagens = gerar_mensagens_sinteticas(5000, seed=7)
+
+    assert comparar_com_busca_sequencial(
+        ronda_config.RONDA_EVENT_MATCHER, ronda_config.COMPILED_RONDA_EVENT_REGEXES, mensagens
+    ) == []
+    padroes_parada = [p for p in parada_config.COMPILED_PARADA_EVENT_REGEXES if not p["keyword_only"]]
+    assert comparar_com_busca_sequencial(parada_config.PARADA_EVENT_MATCHER, padroes_parada, mensagens) == []
+
+
+def test_matcher_preserva_prioridade_e_descarta_ruido():
+    matcher = ronda_config.RONDA_EVENT_MATCHER
+
+    assert list(matcher.iterar("Bom dia a todos")) == []
+    assert list(matcher.iterar("Termino 06:31"))[0] == ("termino", "06:31")
+    # Hora antes da palavra-chave vence o padrão "palavra-chave ... hora"
+    assert list(matcher.iterar("19:20 início de ronda até 20:00"))[0] == ("inicio", "19:20")
+
+    eventos = extrair_eventos_de_mensagem_simples(
+        "Início de ronda às 19h20", "01/07/2025", "VTR 05", "linha"
+    )
+    assert [(e["tipo"], e["hora_str"]) for e in eventos] == [("inicio", "19:20")]
@@ -0,0 +1,110 @@
+# tests/services/test_fila_ia_service.py
+import threading
+import time
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.models.processing_history import ProcessingHistory
+from app.services.fila_ia_service import FilaIA, FilaIACheia
+from app.services.patrimonial_report_service import PatrimonialReportService
+
+
+def _aguardar_status(obter, status, limite=5):
+    prazo = time.monotonic() + limite
+    while time.monotonic() < prazo:
+        atual = obter()
+        if atual["status"] in status:
+            return atual
+        time.sleep(0.01)
+    raise AssertionError(f"job não chegou a {status}: {atual}")
+
+
+@pytest.fixture
+def fila(app):
+    fila = FilaIA(app, max_workers=1, max_pendentes=2)
+    yield fila
+    fila.fechar()
+
+
+def test_fila_limitada_com_estado_do_job_e_metricas(app, fila):
+    liberar = threading.Event()
+
+    def trabalho(valor):
+        liberar.wait(5)
+        if valor == "falhar":
+            raise RuntimeError("Gemini indisponível")
+        return {"valor": valor}
+
+    with app.app_context():
+        primeiro = fila.submeter("teste", trabalho, "a", user_id=1)
+        segundo = fila.submeter("teste", trabalho, "falhar", user_id=1)
+        _aguardar_status(lambda: fila.obter_job(primeiro["id"]), {"executando"})
+        assert fila.obter_job(segundo["id"])["status"] == "na_fila"
+        assert (fila.metricas()["em_execucao"], fila.metricas()["na_fila"]) == (1, 1)
+        with pytest.raises(FilaIACheia):
+            fila.submeter("teste", trabalho, "b", user_id=1)
+
+        liberar.set()
+        concluido = _aguardar_status(lambda: fila.obter_job(primeiro["id"]), {"concluido", "erro"})
+        falha = _aguardar_status(lambda: fila.obter_job(segundo["id"]), {"concluido", "erro"})
+    assert (concluido["status"], concluido["resultado"]) == ("concluido", {"valor": "a"})
+    assert (falha["status"], falha["erro"]) == ("erro", "Gemini indisponível")
+
+    metricas = fila.metricas()
+    assert (metricas["na_fila"], metricas["em_execucao"]) == (0, 0)
+    assert (metricas["enfileirados"], metricas["concluidos"], metricas["falhas"], metricas["rejeitados"]) == (2, 1, 1, 1)
+    assert metricas["espera_max_ms"] > 0 and metricas["execucao_media_ms"] > 0
+
+
+
+def test_cache_fora_do_ar_nao_vaza_vagas_da_fila(app, fila, monkeypatch):
+    from app import cache
+
+    def cache_fora_do_ar(*args, **kwargs):
+        raise TimeoutError("Redis timeout")
+
+    monkeypatch.setattr(cache, "set", cache_fora_do_ar)
+    feitos = []
+    with app.app_context():
+        for i in range(fila.max_pendentes * 3):  # bem mais jobs do que vagas
+            fila.submeter("teste", feitos.append, i, user_id=1)
+            prazo = time.monotonic() + 5
+            while fila.metricas()["concluidos"] <= i and time.monotonic() < prazo:
+                time.sleep(0.01)
+    metricas = fila.metricas()
+    assert (metricas["na_fila"], metricas["em_execucao"], metricas["concluidos"]) == (0, 0, fila.max_pendentes * 3)
+    assert feitos == list(range(fila.max_pendentes * 3))
+
+def test_rota_assincrona_nao_segura_a_requisicao(app, client, db, admin_user, test_user, fila, monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY_1", "chave-de-teste")
+    monkeypatch.setitem(app.extensions, "fila_ia", fila)
+    liberar, threads = threading.Event(), set()
+
+    def gemini_lento(self, prompt):
+        threads.add(threading.get_ident())
+        liberar.wait(5)
+        return "Data: relatório final"
+
+    monkeypatch.setattr(PatrimonialReportService, "_call_generative_model", gemini_lento)
+    headers = {"Authorization": f"Bearer {create_access_token(identity=admin_user.id)}"}
+
+    resposta = client.post("/api/analisador/processar-relatorio?assincrono=1",
+                           json={"relatorio_bruto": "Portão encontrado aberto"}, headers=headers)
+    assert resposta.status_code == 202
+    job_id, status_url = resposta.get_json()["job_id"], resposta.headers["Location"]
+    assert status_url.endswith(f"/api/analisador/jobs/{job_id}")
+    _aguardar_status(lambda: client.get(status_url, headers=headers).get_json(), {"executando"})
+
+    # Com a IA ainda em andamento, as rotas baratas respondem normalmente
+    assert client.get("/api/analisador/historico", headers=headers).status_code == 200
+    outro_usuario = {"Authorization": f"Bearer {create_access_token(identity=test_user.id)}"}
+    assert client.get(status_url, headers=outro_usuario).status_code == 404
+
+    liberar.set()
+    job = _aguardar_status(lambda: client.get(status_url, headers=headers).get_json(), {"concluido", "erro"})
+    assert job["status"] == "concluido"
+    assert job["resultado"]["relatorio_processado"] == "Data: relatório final"
+    assert job["resultado"]["classificacao"]
+    assert threading.get_ident() not in threads
+    assert ProcessingHistory.query.filter_by(user_id=admin_user.id, success=True).count() == 1
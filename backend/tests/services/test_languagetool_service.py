@@ -0,0 +1,129 @@
+# tests/services/test_languagetool_service.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from app import cache
+from app.services.languagetool_service import LanguageToolChecker, tamanho_utf16
+
+
+class _LanguageToolLocal(BaseHTTPRequestHandler):
+    """Imitação do /v2/check: marca cada "errado", responde 500 com "falhar" e HTML com "proxy"."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, como o servidor real
+
+    def do_POST(self):
+        corpo = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        texto = parse_qs(corpo)["text"][0]
+        self.server.requisicoes.append((self.client_address[1], texto))
+        if "falhar" in texto:
+            resposta, status = b"{}", 500
+        elif "proxy" in texto:
+            resposta, status = b"<html>Bad gateway</html>", 200
+        else:
+            matches, i = [], texto.find("errado")
+            while i >= 0:
+                matches.append({
+                    "message": "Palavra suspeita", "offset": tamanho_utf16(texto[:i]), "length": 6,
+                    "replacements": [{"value": "certo"}], "rule": {"id": "ERRADO", "description": "teste"},
+                })
+                i = texto.find("errado", i + 1)
+            resposta, status = json.dumps({"matches": matches}).encode("utf-8"), 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(resposta)))
+        self.end_headers()
+        self.wfile.write(resposta)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def languagetool_local(app):
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _LanguageToolLocal)
+    servidor.requisicoes = []
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    checker = LanguageToolChecker(f"http://127.0.0.1:{servidor.server_address[1]}", timeout=5, max_workers=2)
+    with app.app_context():
+        yield checker, servidor.requisicoes
+        cache.clear()
+    checker.fechar()
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _trechos(texto, resultado):
+    utf16 = texto.encode("utf-16-le")
+    return [utf16[2 * m["offset"]:2 * (m["offset"] + m["length"])].decode("utf-16-le") for m in resultado["matches"]]
+
+
+def test_incremental_envia_so_paragrafos_alterados_e_remapeia_offsets(languagetool_local):
+    checker, requisicoes = languagetool_local
+    texto = "Portão 😀 ficou errado.\n\nSem alteração na ronda.\n\n\n  Outro errado e mais um errado."
+
+    primeiro = checker.verificar(texto, "pt-BR")
+    assert (primeiro["paragrafos"], primeiro["verificados"], primeiro["em_cache"]) == (3, 3, 0)
+    assert len(requisicoes) == 1  # os três parágrafos numa requisição só
+    assert _trechos(texto, primeiro) == ["errado"] * 3
+    # Mesmos offsets que a verificação do documento inteiro
+    completo = checker.verificar(texto, "pt-BR", incremental=False)
+    assert [m["offset"] for m in completo["matches"]] == [m["offset"] for m in primeiro["matches"]]
+
+    requisicoes.clear()
+    editado = texto.replace("Sem alteração", "Viatura errado")
+    segundo = checker.verificar(editado, "pt-BR")
+    assert (segundo["verificados"], segundo["em_cache"]) == (1, 2)
+    assert [t for _, t in requisicoes] == ["Viatura errado na ronda."]
+    assert _trechos(editado, segundo) == ["errado"] * 4
+
+    # Falha não entra no cache: o parágrafo volta a ser enviado na próxima chamada
+    com_falha = editado + "\n\nfalhar agora"
+    resultado = checker.verificar(com_falha, "pt-BR")
+    assert resultado["error"] == "LT status 500" and len(resultado["matches"]) == 4
+    assert checker.verificar(com_falha, "pt-BR")["verificados"] == 1
+
+
+def test_sessao_reaproveita_conexoes_do_pool(languagetool_local):
+    checker, requisicoes = languagetool_local
+    checker.max_caracteres = 70  # dois parágrafos por requisição
+    paragrafos = [f"Parágrafo {i:02d} com texto errado." for i in range(12)]
+    texto = "\n\n".join(paragrafos)
+    resultado = checker.verificar(texto, "pt-BR")
+    assert resultado["verificados"] == 12 and _trechos(texto, resultado) == ["errado"] * 12
+    assert len(requisicoes) == 6
+    assert len({porta for porta, _ in requisicoes}) <= checker.max_workers
+
+
+def test_rota_analyze_usa_o_verificador_do_app(app, client, admin_user, languagetool_local, monkeypatch):
+    checker, _ = languagetool_local
+    monkeypatch.setitem(app.extensions, "languagetool", checker)
+    with client.session_transaction() as sessao:
+        sessao["_user_id"] = str(admin_user.id)
+        sessao["_fresh"] = True
+    resposta = client.post("/api/text/analyze", json={"text": "Texto errado.\n\nOutro."})
+    dados = resposta.get_json()
+    assert resposta.status_code == 200
+    assert [(m["offset"], m["replacements"]) for m in dados["matches"]] == [(6, ["certo"])]
+    assert dados["paragrafos"] == 2
+
+
+def test_resposta_invalida_e_cache_fora_do_ar_nao_derrubam_a_verificacao(languagetool_local, monkeypatch):
+    checker, requisicoes = languagetool_local
+    resultado = checker.verificar("Texto errado.\n\nproxy devolveu HTML", "pt-BR")
+    assert resultado["error"].startswith("LT resposta inválida") and resultado["matches"] == []
+    # Nada da requisição que falhou foi para o cache
+    assert checker.verificar("Texto errado.", "pt-BR")["verificados"] == 1
+
+    def cache_fora_do_ar(*args, **kwargs):
+        raise TimeoutError("Redis timeout")
+
+    monkeypatch.setattr(cache, "get_many", cache_fora_do_ar)
+    monkeypatch.setattr(cache, "set_many", cache_fora_do_ar)
+    requisicoes.clear()
+    resultado = checker.verificar("Texto errado.\n\nOutro errado.", "pt-BR")
+    assert (resultado["verificados"], resultado["em_cache"], len(resultado["matches"])) == (2, 0, 2)
+    assert "error" not in resultado and len(requisicoes) == 1
@@ -0,0 +1,40 @@
+# tests/services/test_log_ingestion.py
+from app.services.log_ingestion import tokenizar_log
+from app.services.log_ingestion.tokenizer import FORMATO_COLCHETES, FORMATO_LIVRE, FORMATO_SEM_COLCHETES, FORMATO_VTR
+from app.services.parada_logic import analisar_log_de_paradas
+from app.services.ronda_logic import analisar_log_de_rondas
+
+LOG_MISTO = "\n".join([
+    "[19:02, 01/07/2025] VTR 05: Início de ronda 19:00",
+    "[19:40, 01/07/2025] VTR 05: Término de ronda 19:38",
+    "\\[20:05, 01/07/2025\\] Águia 04: Início de parada 20:05",
+    "",
+    "VTR 09",
+    "01/07/2025 21:10 - Supervisor: VTR 09: Inicio de ronda 21:10",
+    "01/07/2025 21:50 - Douglas VTR 09 x: termino de ronda 21:45",
+    "[20:35, 01/07/2025] Águia 04: Término de parada 20:30",
+    "bom plantão a todos",
+])
+
+
+def test_tokenizacao_independe_do_contexto():
+    tokens = list(tokenizar_log(LOG_MISTO))
+
+    assert [t.formato for t in tokens] == [
+        FORMATO_COLCHETES, FORMATO_COLCHETES, FORMATO_COLCHETES, FORMATO_VTR,
+        FORMATO_SEM_COLCHETES, FORMATO_SEM_COLCHETES, FORMATO_COLCHETES, FORMATO_LIVRE,
+    ]
+    assert (tokens[0].hora, tokens[0].data, tokens[0].vtr) == ("19:02", "01/07/2025", "VTR05")
+    assert tokens[0].mensagem == "Início de ronda 19:00"
+    assert tokens[4].vtr == "VTR09" and tokens[4].mensagem == "Inicio de ronda 21:10"
+    assert tokens[5].vtr == "VTR09"
+    assert tokens[7].vtr is None
+
+
+def test_rondas_e_paradas_sobre_o_tokenizador_compartilhado():
+    args = ("Condomínio Teste", "01/07/2025", "18h às 06h")
+
+    # Os dois parsers aceitam "início/término ... HH:MM" genérico: os três pares aparecem em ambos
+    assert analisar_log_de_rondas(LOG_MISTO, *args)["total_rondas"] == 3
+    assert analisar_log_de_paradas(LOG_MISTO, *args)["total_paradas"] == 3
+    assert analisar_log_de_rondas("  \n", *args)["relatorio"].startswith("Nenhum log de ronda")
@@ -0,0 +1,53 @@
+# tests/services/test_lookup_service.py
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app.models import Condominio
+
+
+def test_lookups_revalidam_com_etag_sem_consultar_o_banco(client, db, admin_user):
+    db.session.add_all([Condominio(nome="Residencial Beta"), Condominio(nome="Residencial Alpha")])
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=admin_user.id)}"}
+
+    resposta = client.get("/api/rondas/condominios", headers=headers)
+    assert resposta.status_code == 200
+    etag = resposta.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert resposta.headers["Cache-Control"] == "private, no-cache"
+    nomes = [c["nome"] for c in resposta.get_json()["data"]["condominios"]]
+    assert nomes == ["Residencial Alpha", "Residencial Beta"]
+    client.get("/api/lookups", headers=headers)  # aquece a identidade JWT e o pacote
+
+    statements = []
+    contar = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", contar)
+    try:
+        nao_modificado = client.get("/api/rondas/condominios", headers={**headers, "If-None-Match": etag})
+        pacote = client.get("/api/lookups?incluir=condominios,status_ronda", headers=headers)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", contar)
+    assert nao_modificado.status_code == 304
+    assert nao_modificado.headers["ETag"] == etag
+    assert pacote.status_code == 200
+    assert statements == []
+    assert pacote.get_json()["data"]["status_ronda"][0] == "Agendada"
+
+    # Mesmo conteúdo no endpoint de configuração: o mesmo ETag vale lá
+    assert client.get("/api/config/condominios", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    # Escrita commitada troca a versão; rollback não
+    db.session.add(Condominio(nome="Residencial Descartado"))
+    db.session.flush()
+    db.session.rollback()
+    assert client.get("/api/rondas/condominios", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    condominio = Condominio.query.filter_by(nome="Residencial Beta").one()
+    condominio.nome = "Residencial Gama"
+    db.session.commit()
+    atualizada = client.get("/api/rondas/condominios", headers={**headers, "If-None-Match": etag})
+    assert atualizada.status_code == 200
+    assert atualizada.headers["ETag"] != etag
+    assert "Residencial Gama" in [c["nome"] for c in atualizada.get_json()["data"]["condominios"]]
+
+    assert client.get("/api/lookups?incluir=inexistente", headers=headers).status_code == 400
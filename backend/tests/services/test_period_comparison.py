@@ -0,0 +1,78 @@
+# tests/services/test_period_comparison.py
+from datetime import date, datetime
+
+from app.models import Ocorrencia, OcorrenciaTipo, VWRondasDetalhadas
+from app.services.dashboard.helpers.comparison import calcular_janelas, comparar_periodos
+
+
+def test_janelas_mantem_a_duracao_e_limitam_o_dia_do_mes():
+    assert calcular_janelas(date(2025, 8, 29), date(2025, 9, 5), incluir_ano_anterior=True) == {
+        "atual": (date(2025, 8, 29), date(2025, 9, 5)),
+        "anterior": (date(2025, 7, 29), date(2025, 8, 5)),
+        "ano_anterior": (date(2024, 8, 29), date(2024, 9, 5)),
+    }
+    # 31/03 não existe em fevereiro; 29/02 não existe em 2023
+    assert calcular_janelas(date(2024, 3, 31), date(2024, 3, 31))["anterior"] == (date(2024, 2, 29), date(2024, 2, 29))
+    assert calcular_janelas(date(2024, 2, 29), date(2024, 3, 1), True)["ano_anterior"] == (date(2023, 2, 28), date(2023, 3, 1))
+    assert calcular_janelas(date(2025, 1, 1), date(2025, 1, 31))["anterior"] == (date(2024, 12, 1), date(2024, 12, 31))
+
+
+def test_comparacao_de_rondas_e_ocorrencias_em_uma_query(app, db, test_user, admin_user):
+    for i, (dia, total, supervisor_id) in enumerate([
+        (date(2025, 8, 3), 10, test_user.id),
+        (date(2025, 8, 15), 5, test_user.id),
+        (date(2025, 8, 16), 99, test_user.id),  # fora das janelas
+        (date(2025, 7, 10), 8, test_user.id),
+        (date(2025, 8, 4), 50, admin_user.id),  # outro supervisor
+        (date(2024, 8, 1), 3, test_user.id),
+    ], start=1):
+        db.session.add(VWRondasDetalhadas(id=i, data_plantao_ronda=dia, total_rondas_no_log=total, supervisor_id=supervisor_id))
+
+    tipo = OcorrenciaTipo(nome="Furto")
+    db.session.add(tipo)
+    db.session.flush()
+    for quando in [
+        datetime(2025, 8, 1, 12), datetime(2025, 8, 16, 2, 30),  # 15/08 23:30 em São Paulo: período atual
+        datetime(2025, 7, 2, 12), datetime(2025, 7, 3, 12), datetime(2025, 7, 4, 12), datetime(2025, 7, 5, 12),
+    ]:
+        db.session.add(Ocorrencia(
+            relatorio_final="...", data_hora_ocorrencia=quando, ocorrencia_tipo_id=tipo.id,
+            registrado_por_user_id=test_user.id, supervisor_id=test_user.id,
+        ))
+    db.session.commit()
+
+    filtros = {"supervisor_id": test_user.id}
+    rondas = comparar_periodos("rondas", filtros, date(2025, 8, 1), date(2025, 8, 15), incluir_ano_anterior=True)
+    assert (rondas["total_atual"], rondas["total_anterior"], rondas["total_ano_anterior"]) == (15, 8, 3)
+    assert (rondas["variacao_percentual"], rondas["status_text"]) == (87.5, "Crescimento")
+    assert rondas["variacao_ano_anterior"] == 400.0
+    assert rondas["ultima_atualizacao"] == date(2025, 8, 15)
+
+    # As datas do filtro do dashboard não recortam as janelas da comparação
+    filtros_dashboard = dict(filtros, data_inicio_str="2025-08-01", data_fim_str="2025-08-15")
+    ocorrencias = comparar_periodos("ocorrencias", filtros_dashboard, date(2025, 8, 1), date(2025, 8, 15))
+    assert (ocorrencias["total_atual"], ocorrencias["total_anterior"]) == (2, 4)
+    assert (ocorrencias["status"], ocorrencias["status_text"]) == ("success", "Redução")
+    assert "total_ano_anterior" not in ocorrencias
+
+    vazio = comparar_periodos("ocorrencias", {"supervisor_id": admin_user.id}, date(2025, 8, 1), date(2025, 8, 15))
+    assert (vazio["total_atual"], vazio["variacao_percentual"], vazio["ultima_atualizacao"]) == (0, 0, None)
+
+
+def test_dashboard_de_paradas_traz_a_comparacao(app, db, test_user, condominio_fixture):
+    from app.models import Parada
+    from app.services.dashboard.parada_dashboard import get_parada_dashboard_data
+
+    for dia, total in [(date(2025, 8, 3), 4), (date(2025, 8, 10), 2), (date(2025, 7, 5), 3)]:
+        db.session.add(Parada(
+            log_parada_bruto="...", data_plantao_parada=dia, total_paradas_no_log=total,
+            duracao_total_paradas_minutos=10, turno_parada="Noturno",
+            user_id=test_user.id, supervisor_id=test_user.id, condominio_id=condominio_fixture.id,
+        ))
+    db.session.commit()
+
+    dados = get_parada_dashboard_data({"data_inicio_str": "2025-08-01", "data_fim_str": "2025-08-15"})
+    assert dados["total_paradas"] == 6
+    comparacao = dados["comparacao_periodo"]
+    assert (comparacao["total_atual"], comparacao["total_anterior"]) == (6, 3)
+    assert comparacao["variacao_percentual"] == 100.0
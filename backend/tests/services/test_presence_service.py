@@ -0,0 +1,46 @@
+# tests/services/test_presence_service.py
+import time
+
+import pytest
+
+from app.models import UserOnline
+from app.services.presence_service import PresenceTracker
+
+
+@pytest.mark.parametrize("dialeto", [None, "mssql"])  # mssql: sem ON CONFLICT, upsert pelo ORM
+def test_presenca_agrupa_em_memoria_e_faz_flush_em_lote(app, db, test_user, admin_user, monkeypatch, dialeto):
+    if dialeto:
+        monkeypatch.setattr(db.engine.dialect, "name", dialeto)
+    tracker = PresenceTracker(app)
+    agora = time.time()
+
+    assert tracker.registrar_atividade(test_user.id, "sessao-a", "10.0.0.1", "pytest", agora=agora - 120)
+    assert tracker.registrar_atividade(test_user.id, "sessao-b", "10.0.0.2", "pytest", agora=agora - 60)
+    assert tracker.registrar_atividade(admin_user.id, "sessao-c", "10.0.0.3", "pytest", agora=agora)
+    # Dentro do intervalo mínimo a mesma sessão não é regravada
+    assert not tracker.registrar_atividade(admin_user.id, "sessao-c", agora=agora + 1)
+
+    online = tracker.listar_online()
+    assert [u["username"] for u in online] == [admin_user.username, test_user.username]
+    assert UserOnline.query.count() == 0
+
+    assert tracker.flush() == 3
+    assert UserOnline.query.count() == 3
+    assert tracker.flush() == 0
+
+    tracker.registrar_atividade(test_user.id, "sessao-a", "10.0.0.9", "pytest", agora=agora + 60)
+    assert tracker.flush() == 1
+    sessao = UserOnline.query.filter_by(session_id="sessao-a").one()
+    assert sessao.ip_address == "10.0.0.9"
+    assert UserOnline.query.count() == 3
+
+
+def test_middleware_registra_requisicao_jwt(app, client, test_user):
+    from flask_jwt_extended import create_access_token
+    from app.services.presence_service import get_presence_tracker
+
+    get_presence_tracker(app).store.limpar()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=test_user.id)}'}
+    client.get('/api/dashboard/stats', headers=headers)
+
+    assert [u["id"] for u in get_presence_tracker(app).listar_online()] == [test_user.id]
@@ -0,0 +1,50 @@
+# tests/services/test_profiler_service.py
+import time
+
+from app import create_app
+from app.services.profiler_service import get_profiler
+from config import TestingConfig
+
+
+class ProfilerTestingConfig(TestingConfig):
+    PROFILER_INTERVAL_MS = 1
+
+
+def _trabalho_pesado(segundos):
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        sum(range(1000))
+
+
+def test_profiler_amostra_apenas_as_requisicoes_armadas():
+    app = create_app(config_class=ProfilerTestingConfig)
+
+    @app.route("/_teste_lento")
+    def lento():
+        _trabalho_pesado(0.05)
+        return "ok"
+
+    @app.route("/_teste_rapido")
+    def rapido():
+        return "ok"
+
+    profiler = get_profiler(app)
+    client = app.test_client()
+    client.get("/_teste_lento")
+    assert profiler.listar() == []  # desarmado: nada é coletado
+
+    profiler.armar(2, endpoint="lento")
+    client.get("/_teste_rapido")  # outro endpoint não consome o alvo
+    assert profiler.restantes == 2
+    for _ in range(3):
+        client.get("/_teste_lento")
+
+    perfis = profiler.listar()
+    assert [p["endpoint"] for p in perfis] == ["lento", "lento"]
+    assert not profiler.armado
+
+    perfil = profiler.obter(perfis[0]["id"])
+    assert perfil["amostras"] > 0
+    linhas = perfil["colapsado"].splitlines()
+    assert sum(int(linha.rsplit(" ", 1)[1]) for linha in linhas) == perfil["amostras"]
+    assert any(":_trabalho_pesado:" in linha and ":lento:" in linha for linha in linhas)
@@ -0,0 +1,82 @@
+# tests/services/test_reclassificacao_service.py
+from datetime import datetime
+
+from app.models import Ocorrencia, OcorrenciaTipo
+from app.services.reclassificacao_service import mudancas_da_matriz, reclassificar_ocorrencias
+from app.utils.classificador import classificar_ocorrencia, encontrar_tipo_ocorrencia
+
+
+MODIFICADA_EM = datetime(2024, 1, 1, 12, 0)
+
+
+def _cenario(db, test_user):
+    tipos = {nome: OcorrenciaTipo(nome=nome) for nome in ("Furtos", "Invasão", "verificação")}
+    db.session.add_all(tipos.values())
+    db.session.flush()
+    textos = [
+        ("Indivíduo pulou o muro do bloco 2", "Furtos"),  # mapa mudou: agora é Invasão
+        ("Bicicleta furtaram da garagem", "Furtos"),  # continua certo
+        ("Morador pediu para abrir o portão", "Invasão"),  # sem palavra-chave
+        ("Houve tentativa de roubo na portaria", "verificação"),  # tipo sem cadastro
+    ]
+    ocorrencias = [
+        Ocorrencia(relatorio_final=texto, ocorrencia_tipo_id=tipos[tipo].id, registrado_por_user_id=test_user.id,
+                   data_modificacao=MODIFICADA_EM)
+        for texto, tipo in textos
+    ]
+    db.session.add_all(ocorrencias)
+    db.session.commit()
+    return tipos, ocorrencias
+
+
+def _tipos_gravados(db, ocorrencias):
+    return [db.session.get(Ocorrencia, o.id).tipo.nome for o in ocorrencias]
+
+
+def test_classificador_distingue_texto_sem_palavra_chave():
+    assert encontrar_tipo_ocorrencia("Morador pediu para abrir o portão") is None
+    assert classificar_ocorrencia("Morador pediu para abrir o portão") == "verificação"
+    assert encontrar_tipo_ocorrencia("INVASÃO na área da piscina") == "Invasão"
+
+
+def test_dry_run_calcula_a_matriz_e_commit_grava_em_lotes(app, db, test_user):
+    _, ocorrencias = _cenario(db, test_user)
+    progresso = []
+
+    simulacao = reclassificar_ocorrencias(tamanho_lote=2, workers=1)
+    assert (simulacao["processados"], simulacao["alterados"], simulacao["sem_palavra_chave"]) == (4, 1, 1)
+    assert mudancas_da_matriz(simulacao["matriz"]) == [("Furtos", "Invasão", 1)]
+    assert simulacao["matriz"][("Furtos", "Furtos")] == 1
+    assert simulacao["tipos_inexistentes"] == {"Tentativa de Roubo": 1}
+    assert _tipos_gravados(db, ocorrencias) == ["Furtos", "Furtos", "Invasão", "verificação"]
+
+    resumo = reclassificar_ocorrencias(
+        tamanho_lote=2, workers=1, aplicar=True, incluir_padrao=True,
+        ao_concluir_lote=lambda ultimo_id, r: progresso.append((ultimo_id, r["processados"])),
+    )
+    assert resumo["alterados"] == 2
+    assert mudancas_da_matriz(resumo["matriz"]) == [("Furtos", "Invasão", 1), ("Invasão", "verificação", 1)]
+    assert progresso == [(ocorrencias[1].id, 2), (ocorrencias[3].id, 4)]
+    db.session.expire_all()
+    assert _tipos_gravados(db, ocorrencias) == ["Invasão", "Furtos", "verificação", "verificação"]
+    # Reclassificar não conta como modificação (data_modificacao alimenta o tempo de resolução)
+    modificadas = [db.session.get(Ocorrencia, o.id).data_modificacao for o in ocorrencias]
+    assert [d.replace(tzinfo=None) for d in modificadas] == [MODIFICADA_EM] * 4
+
+    # Nada mais a mudar
+    assert reclassificar_ocorrencias(workers=1, aplicar=True, incluir_padrao=True)["alterados"] == 0
+
+
+def test_reclassify_ocorrencias_cli(app, db, test_user, runner, tmp_path):
+    _, ocorrencias = _cenario(db, test_user)
+    matriz = tmp_path / "matriz.csv"
+
+    saida = runner.invoke(args=["reclassify-ocorrencias", "--workers", "2", "--matriz-csv", str(matriz)])
+    assert saida.exit_code == 0, saida.output
+    assert "Furtos → Invasão" in saida.output and "Dry-run" in saida.output
+    assert matriz.read_text(encoding="utf-8").splitlines()[0] == "tipo atual \\ tipo novo,Furtos,Invasão,verificação"
+
+    saida = runner.invoke(args=["reclassify-ocorrencias", "--commit"])
+    assert saida.exit_code == 0, saida.output
+    db.session.expire_all()
+    assert _tipos_gravados(db, ocorrencias)[0] == "Invasão"
@@ -0,0 +1,90 @@
+# tests/services/test_reprocessamento_service.py
+import json
+from datetime import date
+
+from app.models import Ronda, RondaEvento
+from app.services.reprocessamento_service import novo_resumo, reprocessar_logs
+
+LOG = (
+    "[19:00, 01/07/2025] VTR 01: Início ronda 19:00\n"
+    "[19:30, 01/07/2025] VTR 01: Término ronda 19:30\n"
+    "[20:00, 01/07/2025] VTR 01: Início ronda 20:00\n"
+    "[20:45, 01/07/2025] VTR 01: Término ronda 20:45"
+)
+
+
+def _ronda_defasada(db, test_user, condominio_fixture):
+    ronda = Ronda(
+        log_ronda_bruto=LOG,
+        relatorio_processado="relatório antigo",
+        data_plantao_ronda=date(2025, 7, 1),
+        escala_plantao="18h às 06h",
+        total_rondas_no_log=5,
+        duracao_total_rondas_minutos=0,
+        user_id=test_user.id,
+        condominio_id=condominio_fixture.id,
+    )
+    db.session.add(ronda)
+    db.session.commit()
+    return ronda
+
+
+def test_reprocessar_logs_atualiza_somente_linhas_alteradas(app, db, test_user, condominio_fixture, tmp_path):
+    ronda = _ronda_defasada(db, test_user, condominio_fixture)
+    checkpoint = tmp_path / "checkpoint.json"
+
+    simulacao = reprocessar_logs("rondas", workers=1, checkpoint_path=str(checkpoint), dry_run=True)
+    assert simulacao["alterados"] == 1
+    assert not checkpoint.exists()
+    db.session.refresh(ronda)
+    assert ronda.total_rondas_no_log == 5
+
+    resumo = reprocessar_logs("rondas", tamanho_lote=1, workers=1, checkpoint_path=str(checkpoint))
+    assert resumo["processados"] == 1
+    assert resumo["totais_alterados"] == 1
+    assert resumo["totais_diminuiram"] == 1
+    assert resumo["delta_total"] == -3
+    assert resumo["delta_duracao_minutos"] == 75
+    assert resumo["maior_variacao_total"] == {"id": ronda.id, "antes": 5, "depois": 2}
+
+    db.session.refresh(ronda)
+    assert ronda.total_rondas_no_log == 2
+    assert ronda.duracao_total_rondas_minutos == 75
+    assert ronda.relatorio_processado != "relatório antigo"
+    assert RondaEvento.query.filter_by(ronda_id=ronda.id).count() == 2
+
+    # Concluído, o checkpoint é descartado: a próxima execução recomeça do início
+    assert not checkpoint.exists()
+    ronda.total_rondas_no_log = 9
+    db.session.commit()
+    assert reprocessar_logs("rondas", workers=1, checkpoint_path=str(checkpoint))["alterados"] == 1
+    db.session.refresh(ronda)
+    assert ronda.total_rondas_no_log == 2
+
+
+def test_reprocessar_logs_retoma_checkpoint_interrompido(app, db, test_user, condominio_fixture, tmp_path):
+    ronda = _ronda_defasada(db, test_user, condominio_fixture)
+    checkpoint = tmp_path / "checkpoint.json"
+    resumo_anterior = dict(novo_resumo(), processados=7, alterados=3)
+    checkpoint.write_text(json.dumps({
+        "rondas": {"ultimo_id": ronda.id, "resumo": resumo_anterior},
+        "paradas": {"ultimo_id": 4, "resumo": novo_resumo()},
+    }), encoding="utf-8")
+
+    # A ronda já passou do checkpoint: nada é reprocessado e o resumo anterior continua
+    resumo = reprocessar_logs("rondas", workers=1, checkpoint_path=str(checkpoint))
+    assert (resumo["processados"], resumo["alterados"]) == (7, 3)
+    db.session.refresh(ronda)
+    assert ronda.total_rondas_no_log == 5
+    # Só a entrada do tipo concluído sai do checkpoint
+    assert list(json.loads(checkpoint.read_text(encoding="utf-8"))) == ["paradas"]
+
+
+def test_reprocessar_logs_sem_diferencas_nao_grava(app, db, test_user, condominio_fixture):
+    ronda = _ronda_defasada(db, test_user, condominio_fixture)
+    reprocessar_logs("rondas", workers=1)
+
+    resumo = reprocessar_logs("rondas", workers=1)
+    assert resumo["processados"] == 1
+    assert resumo["alterados"] == 0
+    assert RondaEvento.query.filter_by(ronda_id=ronda.id).count() == 2
@@ -0,0 +1,66 @@
+# tests/services/test_request_metrics.py
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db
+from app.services.request_metrics import fingerprint_sql, get_request_metrics
+from config import TestingConfig
+
+
+class MetricasTestingConfig(TestingConfig):
+    REQUEST_METRICS_ENABLED = True
+    REQUEST_METRICS_SLOW_MS = 0.001
+
+
+def test_fingerprint_normaliza_literais_e_listas():
+    assert fingerprint_sql("SELECT * FROM user WHERE id = 42 AND nome = 'ana'") == \
+        fingerprint_sql("SELECT *  FROM user\nWHERE id = 7 AND nome = 'bruno'") == \
+        "SELECT * FROM user WHERE id = ? AND nome = ?"
+    assert fingerprint_sql("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == fingerprint_sql("SELECT 1 FROM t WHERE id IN (?, ?)")
+
+
+def test_conta_queries_repetidas_e_expoe_server_timing(caplog):
+    app = create_app(config_class=MetricasTestingConfig)
+
+    @app.route("/_teste_n_mais_um")
+    def n_mais_um():
+        for i in range(4):
+            db.session.execute(text(f"SELECT {i}")).scalar()
+        db.session.execute(text("SELECT 1 WHERE 1 = 1")).scalar()
+        return "ok"
+
+    client = app.test_client()
+    with caplog.at_level(logging.WARNING, logger="app.services.request_metrics"):
+        resposta = client.get("/_teste_n_mais_um")
+        client.get("/_teste_n_mais_um")
+
+    assert resposta.status_code == 200
+    server_timing = resposta.headers["Server-Timing"]
+    assert 'desc="5 queries"' in server_timing and 'dup;desc="3 repetidas"' in server_timing
+
+    with app.app_context():
+        resumo = {linha["endpoint"]: linha for linha in get_request_metrics().resumo()}
+    linha = resumo["n_mais_um"]
+    assert (linha["requisicoes"], linha["queries_max"], linha["repetidas_media"]) == (2, 5, 3.0)
+    assert linha["top_repetidas"] == [{"sql": "SELECT ?", "repeticoes": 6}]
+    assert "Requisição lenta GET /_teste_n_mais_um" in caplog.text and "4x SELECT ?" in caplog.text
+
+
+def test_statement_com_erro_nao_deixa_inicio_na_conexao():
+    app = create_app(config_class=MetricasTestingConfig)
+
+    @app.route("/_teste_erro_sql")
+    def erro_sql():
+        try:
+            db.session.execute(text("SELECT * FROM tabela_que_nao_existe"))
+        except OperationalError:  # o erro original chega intacto ao chamador
+            db.session.rollback()
+        db.session.execute(text("SELECT 1")).scalar()
+        assert not db.session.connection().info.get("request_metrics_inicio")
+        return "ok"
+
+    resposta = app.test_client().get("/_teste_erro_sql")
+    assert resposta.status_code == 200
+    assert 'desc="2 queries"' in resposta.headers["Server-Timing"]
@@ -0,0 +1,43 @@
+# tests/services/test_ronda_evento_service.py
+from datetime import datetime
+
+from app.services.ronda_evento_service import (
+    STATUS_COMPLETA,
+    STATUS_HORARIO_INVALIDO,
+    STATUS_SEM_INICIO,
+    STATUS_SEM_TERMINO,
+    construir_linhas_ronda_evento,
+)
+from app.services.ronda_logic import analisar_log_de_rondas
+
+
+def test_construir_linhas_classifica_pares_e_converte_para_utc():
+    pares = [
+        {"inicio_dt": datetime(2025, 7, 1, 19, 0), "termino_dt": datetime(2025, 7, 1, 19, 30), "vtr": "VTR01", "duracao_minutos": 30},
+        {"inicio_dt": datetime(2025, 7, 1, 20, 0), "termino_dt": None, "vtr": "VTR02"},
+        {"inicio_dt": None, "termino_dt": datetime(2025, 7, 1, 21, 0), "vtr": "VTR03"},
+        {"inicio_dt": datetime(2025, 7, 1, 22, 0), "termino_dt": datetime(2025, 7, 1, 22, 0), "vtr": "VTR04", "duracao_minutos": 0},
+    ]
+    linhas = construir_linhas_ronda_evento(7, pares)
+
+    assert [l["status"] for l in linhas] == [
+        STATUS_COMPLETA, STATUS_SEM_TERMINO, STATUS_SEM_INICIO, STATUS_HORARIO_INVALIDO
+    ]
+    assert all(l["ronda_id"] == 7 for l in linhas)
+    assert linhas[0]["duracao_min"] == 30
+    assert linhas[0]["inicio"].utcoffset().total_seconds() == 0
+    assert linhas[0]["inicio"].hour == 22  # 19h em São Paulo = 22h UTC
+    assert linhas[3]["duracao_min"] is None
+
+
+def test_analisar_log_de_rondas_expoe_rondas_pareadas():
+    log = (
+        "[19:00, 01/07/2025] VTR 01: Início ronda 19:00\n"
+        "[19:30, 01/07/2025] VTR 01: Término ronda 19:30"
+    )
+    resultado = analisar_log_de_rondas(log, "Residencial", "01/07/2025", "18h às 06h")
+
+    assert resultado["total_rondas"] == 1
+    assert resultado["duracao_total_minutos"] == 30
+    assert len(resultado["rondas_pareadas"]) == 1
+    assert resultado["rondas_pareadas"][0]["vtr"] == "VTR01"
@@ -0,0 +1,54 @@
+# tests/services/test_snapshot_versionado.py
+from app import cache
+from app.services.snapshot_versionado import SnapshotVersionado
+
+
+def test_recarrega_so_quando_a_versao_muda(app):
+    with app.app_context():
+        cache.delete("teste_snapshot:versao")
+        cargas = []
+        snapshot = SnapshotVersionado("teste_snapshot:versao", lambda versao: cargas.append(versao) or versao, "teste")
+
+        assert snapshot.obter() == snapshot.obter() == 0
+        assert cargas == [0]
+
+        for _ in range(3):
+            snapshot.invalidar()
+        assert snapshot.versao_atual() == 3
+
+        # Outro processo (outra instância) vê a versão nova e recarrega
+        outro = SnapshotVersionado("teste_snapshot:versao", lambda versao: ("outro", versao), "teste")
+        assert outro.obter() == ("outro", 3)
+        assert snapshot.obter() == 3 and cargas == [0, 3]
+
+
+def test_cache_fora_do_ar_nao_impede_a_leitura(app, monkeypatch):
+    with app.app_context():
+        snapshot = SnapshotVersionado("teste_snapshot:fora", lambda versao: {"versao": versao}, "teste")
+
+        def fora_do_ar(*args, **kwargs):
+            raise ConnectionError("Redis fora do ar")
+
+        monkeypatch.setattr(cache, "get", fora_do_ar)
+        monkeypatch.setattr(cache.cache, "inc", fora_do_ar)
+        snapshot.invalidar()
+        assert snapshot.obter() == {"versao": 0}
+
+
+def test_versao_so_muda_depois_do_commit(app, db):
+    from app.models import Condominio
+    from app.services import dados_referencia
+
+    snapshot = dados_referencia._snapshot
+    inicial = snapshot.versao_atual()
+
+    db.session.add(Condominio(nome="Residencial Flush"))
+    db.session.flush()
+    assert snapshot.versao_atual() == inicial  # ainda não confirmado: ninguém recarrega
+    db.session.rollback()
+    assert snapshot.versao_atual() == inicial  # rollback descarta a anotação
+
+    db.session.add(Condominio(nome="Residencial Commit"))
+    db.session.commit()
+    assert snapshot.versao_atual() == inicial + 1
+    assert "Residencial Commit" in dados_referencia.get_dados_referencia().condominios.values()
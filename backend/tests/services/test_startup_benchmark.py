@@ -0,0 +1,36 @@
+# tests/services/test_startup_benchmark.py
+import os
+
+from app.services.benchmark.startup import MODULOS_PESADOS, analisar_importtime, medir_boot, verificar_orcamento
+from config import TestingConfig
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+class BootTestingConfig(TestingConfig):
+    # SQLite em memória não aceita as opções de pool da Config base
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+
+
+def test_analisa_saida_do_importtime_e_aplica_o_orcamento():
+    saida = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       150 |        150 |     _io\n"
+        "import time:      2000 |       2500 |   json\n"
+        "import time:      4000 |     900000 | app\n"
+    )
+    modulos = analisar_importtime(saida)
+    assert [(m["modulo"], m["nivel"]) for m in modulos] == [("_io", 3), ("json", 2), ("app", 1)]
+    assert modulos[2]["cumulativo_ms"] == 900.0
+
+    resultado = {"boot_ms": 1800.0, "rss_mb": 120.0, "pesados": ["reportlab"]}
+    assert verificar_orcamento(resultado, max_boot_ms=2000, max_rss_mb=150, permitir=("reportlab",)) == []
+    violacoes = verificar_orcamento(resultado, max_boot_ms=1500, max_rss_mb=100)
+    assert len(violacoes) == 3 and "reportlab" in violacoes[2]
+
+
+def test_create_app_nao_carrega_dependencias_pesadas():
+    config = "tests.services.test_startup_benchmark.BootTestingConfig"
+    resultado = medir_boot(BACKEND_DIR, config=config, repeticoes=1, top=5)
+    assert resultado["boot_ms"] > 0 and resultado["rss_mb"] > 0
+    assert resultado["pesados"] == [], f"carregados no boot: {resultado['pesados']} (de {MODULOS_PESADOS})"
@@ -36,4 +36,22 @@ def test_admin_can_approve_user(admin_auth_client, test_user, db):
 
     user_after_approval = db.session.get(User, test_user.id)
     # CORREÇÃO: O teste agora afirma que o usuário NÃO foi aprovado
-    assert user_after_approval.is_approved is False
\ No newline at end of file
+    assert user_after_approval.is_approved is False
+
+def test_api_toggle_admin_invalida_identidade_jwt_em_cache(client, admin_user, test_user):
+    """O snapshot do usuário do JWT fica em cache, mas mudanças de papel valem na hora."""
+    from flask_jwt_extended import create_access_token
+    from app import cache
+    from app.auth.jwt_auth import _chave_identidade
+
+    headers_admin = {'Authorization': f'Bearer {create_access_token(identity=admin_user.id)}'}
+    headers_user = {'Authorization': f'Bearer {create_access_token(identity=test_user.id)}'}
+
+    assert client.get('/api/admin/users', headers=headers_user).status_code == 403
+    assert cache.get(_chave_identidade(test_user.id))['is_admin'] is False
+
+    response = client.post(f'/api/admin/users/{test_user.id}/toggle-admin', headers=headers_admin)
+    assert response.status_code == 200
+    assert cache.get(_chave_identidade(test_user.id)) is None
+
+    assert client.get('/api/admin/users', headers=headers_user).status_code == 200
@@ -107,13 +107,14 @@ class TestOcorrenciaDashboard:
         mock_user.query.get.return_value = mock_user
         
         # Mock para kpis_helper
-        with patch('app.services.dashboard.ocorrencia_dashboard.kpis_helper') as mock_kpis:
+        with patch('app.services.dashboard.ocorrencia_dashboard.kpis_helper') as mock_kpis, \
+             patch('app.services.dashboard.ocorrencia_dashboard.comparison_helper') as mock_comparison:
             mock_kpis.get_ocorrencia_period_info.return_value = {
                 "dias_com_dados": 15,
                 "periodo_solicitado_dias": 31,
                 "cobertura_periodo": 48.4
             }
-            mock_kpis.calculate_ocorrencia_period_comparison.return_value = {
+            mock_comparison.comparar_periodos.return_value = {
                 "total_atual": 10,
                 "total_anterior": 8,
                 "variacao_percentual": 25.0
@@ -202,13 +203,14 @@ class TestOcorrenciaDashboard:
         mock_user.query.get.return_value = mock_user
         
         # Mock para kpis_helper
-        with patch('app.services.dashboard.ocorrencia_dashboard.kpis_helper') as mock_kpis:
+        with patch('app.services.dashboard.ocorrencia_dashboard.kpis_helper') as mock_kpis, \
+             patch('app.services.dashboard.ocorrencia_dashboard.comparison_helper') as mock_comparison:
             mock_kpis.get_ocorrencia_period_info.return_value = {
                 "dias_com_dados": 15,
                 "periodo_solicitado_dias": 15,  # Ajustado para dias trabalhados
                 "cobertura_periodo": 100.0  # 100% pois considera apenas dias trabalhados
             }
-            mock_kpis.calculate_ocorrencia_period_comparison.return_value = {
+            mock_comparison.comparar_periodos.return_value = {
                 "total_atual": 6,
                 "total_anterior": 4,
                 "variacao_percentual": 50.0
@@ -266,13 +268,14 @@ class TestOcorrenciaDashboard:
         mock_user.query.get.return_value = mock_user
         
         # Mock para kpis_helper
-        with patch('app.services.dashboard.ocorrencia_dashboard.kpis_helper') as mock_kpis:
+        with patch('app.services.dashboard.ocorrencia_dashboard.kpis_helper') as mock_kpis, \
+             patch('app.services.dashboard.ocorrencia_dashboard.comparison_helper') as mock_comparison:
             mock_kpis.get_ocorrencia_period_info.return_value = {
                 "dias_com_dados": 10,
                 "periodo_solicitado_dias": 31,
                 "cobertura_periodo": 32.3
             }
-            mock_kpis.calculate_ocorrencia_period_comparison.return_value = {
+            mock_comparison.comparar_periodos.return_value = {
                 "total_atual": 5,
                 "total_anterior": 3,
                 "variacao_percentual": 66.7
@@ -324,13 +327,14 @@ class TestOcorrenciaDashboard:
         mock_user.query.get.return_value = mock_user
         
         # Mock para kpis_helper
-        with patch('app.services.dashboard.ocorrencia_dashboard.kpis_helper') as mock_kpis:
+        with patch('app.services.dashboard.ocorrencia_dashboard.kpis_helper') as mock_kpis, \
+             patch('app.services.dashboard.ocorrencia_dashboard.comparison_helper') as mock_comparison:
             mock_kpis.get_ocorrencia_period_info.return_value = {
                 "dias_com_dados": 10,
                 "periodo_solicitado_dias": 31,
                 "cobertura_periodo": 32.3
             }
-            mock_kpis.calculate_ocorrencia_period_comparison.return_value = {
+            mock_comparison.comparar_periodos.return_value = {
                 "total_atual": 5,
                 "total_anterior": 3,
                 "variacao_percentual": 66.7
@@ -352,3 +356,57 @@ class TestOcorrenciaDashboard:
         assert len(result["ocorrencias_por_tipo_data"]) >= 0
         assert len(result["condominio_labels"]) >= 0
         assert len(result["ocorrencias_por_condominio_data"]) >= 0
+
+
+def test_evolucao_por_supervisor_agrupa_por_data_do_plantao(app, db):
+    from app.models import VWOcorrenciasDetalhadas
+    from app.services.dashboard.ocorrencia_dashboard import _get_evolucao_por_supervisor
+
+    for i, (quando, supervisor) in enumerate([
+        (datetime(2024, 1, 2, 5, 59), "ana"),   # antes das 06:00: plantão de 01/01
+        (datetime(2024, 1, 2, 6, 0), "ana"),
+        (datetime(2024, 1, 2, 23, 0), "bruno"),
+        (datetime(2024, 1, 3, 10, 0), None),
+        (datetime(2024, 1, 9, 10, 0), "bruno"),  # fora do intervalo
+    ], start=1):
+        db.session.add(VWOcorrenciasDetalhadas(id=i, data_hora_ocorrencia=quando, supervisor=supervisor))
+    db.session.commit()
+
+    labels, series, totais = _get_evolucao_por_supervisor({}, date(2024, 1, 1), date(2024, 1, 3))
+
+    assert labels == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert {s["name"]: s["data"] for s in series} == {
+        "Sem Supervisor": [0, 0, 1],
+        "ana": [1, 1, 0],
+        "bruno": [0, 1, 0],
+    }
+    assert totais == [1, 2, 1]
+
+
+def test_tempo_de_resolucao_agregado_no_banco(app, db):
+    from datetime import timedelta
+
+    from app.models import VWOcorrenciasDetalhadas
+    from app.services.dashboard.helpers import kpis
+
+    inicio = datetime(2024, 1, 10, 8, 0)
+    for i, (minutos, condominio, status) in enumerate([
+        (10, "Residencial A", "Concluída"),
+        (20, "Residencial A", "Concluída"),
+        (30, "Residencial B", "Concluída"),
+        (100, "Residencial B", "Concluída"),
+        (500, "Residencial B", "Em Andamento"),  # não concluída: ignorada
+    ], start=1):
+        db.session.add(VWOcorrenciasDetalhadas(
+            id=i, data_hora_ocorrencia=inicio, data_modificacao=inicio + timedelta(minutes=minutos),
+            condominio=condominio, status=status,
+        ))
+    db.session.commit()
+
+    base_query = db.session.query(VWOcorrenciasDetalhadas)
+    assert kpis.calculate_ocorrencia_resolution_stats(base_query) == {
+        "total": 4, "media": 40.0, "mediana": 25.0, "p90": 79.0,
+    }
+    assert kpis.calculate_resolution_time_by_condominio(base_query) == (
+        ["Residencial B", "Residencial A"], [65.0, 15.0], [2, 2]
+    )
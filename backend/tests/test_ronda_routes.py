@@ -128,3 +128,62 @@ def test_admin_login_persiste(client, db, admin_user):
         print("[ADMIN DASHBOARD] HTML:\n", resp_admin.data.decode('utf-8'))
         assert resp_admin.status_code == 200
         assert "Dashboard de Métricas de Rondas" in resp_admin.data.decode('utf-8') or "Métricas de Rondas" in resp_admin.data.decode('utf-8')
+
+def test_salvar_rondas_em_lote_upsert_unico(db, admin_user, ronda_existente):
+    """Testa o salvamento em lote: merge com ronda existente, criação de condomínio e falhas por item."""
+    from app.services.ronda_routes_core.routes_service import RondaRoutesService
+
+    itens = [
+        {
+            'condominio_id': str(ronda_existente.condominio_id),
+            'data_plantao': '2025-07-01', 'escala_plantao': '06h às 18h',
+            'log_bruto': "[11:00, 01/07/2025] VTR 01: Início ronda 11:00\n[11:20, 01/07/2025] VTR 01: Término ronda 11:20",
+        },
+        {
+            'nome_condominio': 'Residencial Novo Lote',
+            'data_plantao': '2025-07-01', 'escala_plantao': '06h às 18h',
+            'log_bruto': "[08:00, 01/07/2025] VTR 02: Início ronda 08:00\n[08:30, 01/07/2025] VTR 02: Término ronda 08:30",
+        },
+        {
+            'nome_condominio': 'Residencial Sem Eventos',
+            'data_plantao': '2025-07-01', 'escala_plantao': '06h às 18h',
+            'log_bruto': "mensagem qualquer",
+        },
+    ]
+    resultados = RondaRoutesService.salvar_rondas_em_lote(itens, admin_user)
+
+    assert [r['success'] for r in resultados] == [True, True, False]
+    assert resultados[0]['ronda_id'] == ronda_existente.id
+    assert "incrementada" in resultados[0]['message']
+    assert Ronda.query.count() == 2
+    db.session.refresh(ronda_existente)
+    assert "VTR 01: Início ronda 11:00" in ronda_existente.log_ronda_bruto
+    assert ronda_existente.duracao_total_rondas_minutos == 20
+    assert Condominio.query.filter_by(nome='Residencial Novo Lote').count() == 1
+
+
+def test_upsert_rondas_sem_on_conflict_usa_o_orm(db, admin_user, ronda_existente, monkeypatch):
+    """Bancos sem INSERT ... ON CONFLICT caem no caminho do ORM com o mesmo resultado."""
+    from app.services.ronda_routes_core.persistence_service import upsert_rondas
+
+    ronda_existente.supervisor_id = admin_user.id
+    db.session.commit()
+    monkeypatch.setattr(db.engine.dialect, "name", "mssql")
+
+    def linha(data, total):
+        return {
+            'condominio_id': ronda_existente.condominio_id, 'data_plantao_ronda': data, 'turno_ronda': 'Diurno Impar',
+            'escala_plantao': '06h às 18h', 'log_ronda_bruto': 'log', 'relatorio_processado': 'relatório',
+            'total_rondas_no_log': total, 'primeiro_evento_log_dt': None, 'ultimo_evento_log_dt': None,
+            'duracao_total_rondas_minutos': 10 * total, 'supervisor_id': None, 'user_id': admin_user.id,
+        }
+
+    ids = upsert_rondas([linha(date(2025, 7, 1), 3), linha(date(2025, 7, 3), 1)])
+    db.session.commit()
+
+    chave_existente = (ronda_existente.condominio_id, date(2025, 7, 1), 'Diurno Impar')
+    assert ids[chave_existente] == ronda_existente.id and len(ids) == 2
+    db.session.refresh(ronda_existente)
+    assert (ronda_existente.total_rondas_no_log, ronda_existente.log_ronda_bruto) == (3, 'log')
+    assert ronda_existente.supervisor_id == admin_user.id  # lote sem supervisor mantém o atual
+    assert Ronda.query.count() == 2